@@ -0,0 +1,61 @@
+"""
+DefaultAgent 생성 비용 마이크로벤치마크
+
+레지스트리 캐시를 매번 비우는 경우(그래프 컴파일 + ChatOpenAI 생성)와
+캐시를 재사용하는 경우의 에이전트 생성 시간을 비교합니다.
+
+    python -m benchmarks.bench_agent_construction --iterations 200
+"""
+
+import os
+import statistics
+import time
+
+import typer
+
+# 에이전트 생성만 측정하므로 실제 API 키는 필요하지 않음
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+
+from src.agents import DefaultAgent  # noqa: E402
+from src.agents import registry  # noqa: E402
+
+app = typer.Typer()
+
+
+def _measure(iterations: int, cold: bool, models: list[str]) -> list[float]:
+    """에이전트 생성 시간 측정 (초)"""
+    timings = []
+    for i in range(iterations):
+        if cold:
+            registry.clear()
+        started_at = time.perf_counter()
+        DefaultAgent(model_name=models[i % len(models)])
+        timings.append(time.perf_counter() - started_at)
+    return timings
+
+
+def _report(label: str, timings: list[float]) -> None:
+    timings_ms = sorted(t * 1000 for t in timings)
+    p95 = timings_ms[int(len(timings_ms) * 0.95) - 1]
+    print(
+        f"{label:<28} mean={statistics.mean(timings_ms):8.3f}ms "
+        f"p50={statistics.median(timings_ms):8.3f}ms p95={p95:8.3f}ms"
+    )
+
+
+@app.command()
+def main(
+    iterations: int = typer.Option(200, help="측정 반복 횟수"),
+    models: str = typer.Option("gpt-4o-mini,gpt-4o", help="번갈아 사용할 모델 목록 (쉼표 구분)"),
+):
+    model_list = [m.strip() for m in models.split(",") if m.strip()]
+
+    # 토크나이저 로드 등 1회성 초기화 비용 제외
+    DefaultAgent(model_name=model_list[0])
+
+    _report("cold (컴파일 + 클라이언트 생성)", _measure(iterations, cold=True, models=model_list))
+    _report("warm (레지스트리 캐시)", _measure(iterations, cold=False, models=model_list))
+
+
+if __name__ == "__main__":
+    app()
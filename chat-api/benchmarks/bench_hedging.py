@@ -0,0 +1,118 @@
+"""
+헤지 요청/페일오버 꼬리 지연 벤치마크
+
+지연 시간 분포(로그정규 jitter + 일정 비율의 느린 호출)와 오류를 주입한 가짜 백엔드로
+DefaultAgent.invoke를 반복 호출하고, 헤지/폴백 설정별 p50/p95/p99 지연 시간과
+업스트림 호출 수, 실패 수를 비교합니다.
+
+    python -m benchmarks.bench_hedging --requests 1000 --concurrency 16 --slow-rate 0.02
+"""
+
+import asyncio
+import os
+import random
+import time
+from typing import Dict, List
+
+import typer
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+
+from src.agents import DefaultAgent, registry  # noqa: E402
+from src.agents.hedging import get_hedging_executor  # noqa: E402
+from src.agents.scheduler import get_scheduler  # noqa: E402
+from src.agents.settings import get_settings  # noqa: E402
+
+app = typer.Typer()
+
+
+def _configure(env: Dict[str, str]) -> None:
+    """시나리오 환경변수 적용 후 프로세스 단위 캐시 초기화"""
+    for name in list(os.environ):
+        if name.startswith(("FAKE_LLM_", "LLM_HEDGE_", "LLM_FALLBACK_", "LLM_BACKEND_")):
+            del os.environ[name]
+    os.environ.update(env)
+    get_settings.cache_clear()
+    get_hedging_executor.cache_clear()
+    get_scheduler.cache_clear()
+    registry.clear()
+
+
+async def _run(requests: int, concurrency: int) -> tuple[List[float], int]:
+    agent = DefaultAgent()
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    failures = 0
+
+    async def one(index: int) -> None:
+        nonlocal failures
+        async with semaphore:
+            started_at = time.perf_counter()
+            try:
+                await agent.invoke(f"hedging benchmark {index}")
+            except Exception:
+                failures += 1
+                return
+            latencies.append(time.perf_counter() - started_at)
+
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    return latencies, failures
+
+
+def _percentile(ordered: List[float], q: float) -> float:
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000 if ordered else 0.0
+
+
+def _report(label: str, latencies: List[float], failures: int) -> None:
+    ordered = sorted(latencies)
+    hedging = get_hedging_executor()
+    stats = hedging.stats() if hedging is not None else {"hedges": 0, "hedge_wins": 0, "failovers": 0}
+    print(
+        f"{label:<24} p50={_percentile(ordered, 0.50):8.1f}ms p95={_percentile(ordered, 0.95):8.1f}ms "
+        f"p99={_percentile(ordered, 0.99):8.1f}ms 실패={failures:<3} "
+        f"헤지={stats['hedges']}(승 {stats['hedge_wins']}) 페일오버={stats['failovers']}"
+    )
+
+
+@app.command()
+def main(
+    requests: int = typer.Option(1000, help="시나리오별 요청 수"),
+    concurrency: int = typer.Option(16, help="동시 요청 수"),
+    ttft: float = typer.Option(0.05, help="가짜 모델 첫 토큰 지연 (초)"),
+    response_tokens: int = typer.Option(16, help="응답 토큰 수"),
+    jitter: float = typer.Option(0.2, help="지연 시간 로그정규 sigma"),
+    slow_rate: float = typer.Option(0.02, help="느린 호출 비율"),
+    slow_factor: float = typer.Option(10.0, help="느린 호출의 지연 배율"),
+    error_rate: float = typer.Option(0.05, help="오류 시나리오의 호출 오류 비율"),
+    seed: int = typer.Option(0, help="지연 시간/오류 난수 시드 (시나리오마다 같은 값으로 초기화)"),
+):
+    base = {
+        "LLM_BACKEND": "fake",
+        "AGENT_MAX_RETRIES": "0",
+        "FAKE_LLM_TTFT": str(ttft),
+        "FAKE_LLM_TOKENS_PER_SECOND": "200",
+        "FAKE_LLM_RESPONSE_TOKENS": str(response_tokens),
+        "FAKE_LLM_LATENCY_JITTER": str(jitter),
+        "FAKE_LLM_SLOW_RATE": str(slow_rate),
+        "FAKE_LLM_SLOW_FACTOR": str(slow_factor),
+        # 헤지 임계값을 빨리 학습하도록 하한을 낮춤
+        "LLM_HEDGE_MIN_DELAY": "0.01",
+        "LLM_HEDGE_DEFAULT_DELAY": "0.3",
+    }
+    scenarios = {
+        "헤지 없음": {},
+        "헤지 (같은 모델)": {"LLM_HEDGE_ENABLED": "true"},
+        "헤지 (폴백 모델)": {"LLM_HEDGE_ENABLED": "true", "LLM_FALLBACK_MODELS": "fake:fake-fallback"},
+        "오류 (페일오버 없음)": {"FAKE_LLM_ERROR_RATE": str(error_rate)},
+        "오류 + 페일오버": {"FAKE_LLM_ERROR_RATE": str(error_rate), "LLM_FALLBACK_MODELS": "fake:fake-fallback"},
+    }
+
+    for label, env in scenarios.items():
+        _configure({**base, **env})
+        random.seed(seed)
+        latencies, failures = asyncio.run(_run(requests, concurrency))
+        _report(label, latencies, failures)
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,98 @@
+"""
+계측 오버헤드 마이크로벤치마크
+
+1. tracing.span() 호출 비용 (비활성 no-op / 메트릭 관찰자 연결)
+2. 지연 없는 가짜 모델로 /api/chat 요청을 인프로세스 실행했을 때의 요청당 처리 시간
+   (계측 비활성 / 메트릭 활성)
+
+    python -m benchmarks.bench_instrumentation --iterations 4000
+"""
+
+import asyncio
+import os
+import statistics
+import time
+
+import typer
+
+# 모델 지연을 없애 프레임워크/계측 비용만 측정
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+os.environ.setdefault("LLM_BACKEND", "fake")
+os.environ.setdefault("AGENT_MAX_CONCURRENCY", "0")
+os.environ["FAKE_LLM_TTFT"] = "0"
+os.environ["FAKE_LLM_TOKENS_PER_SECOND"] = "0"
+os.environ["FAKE_LLM_RESPONSE_TOKENS"] = "1"
+
+from benchmarks.harness import _asgi_request, _lifespan, _payload  # noqa: E402
+from src.agents import tracing  # noqa: E402
+from src.app.main import app as asgi_app  # noqa: E402
+from src.app.telemetry import configure_telemetry  # noqa: E402
+
+app = typer.Typer()
+
+
+def _measure_span(iterations: int) -> float:
+    """span 하나를 열고 닫는 평균 시간 (ns, 빈 루프 비용 제외)"""
+    started_at = time.perf_counter()
+    for _ in range(iterations):
+        pass
+    baseline = time.perf_counter() - started_at
+
+    started_at = time.perf_counter()
+    for _ in range(iterations):
+        with tracing.span("bench", model="fake") as span:
+            span.set_attribute("output_tokens", 1)
+    return (time.perf_counter() - started_at - baseline) / iterations * 1e9
+
+
+async def _measure_requests(iterations: int) -> list[float]:
+    """/api/chat 요청 처리 시간 목록 (초)"""
+    timings = []
+    for i in range(iterations):
+        result = await _asgi_request(asgi_app, "/api/chat", _payload(i))
+        timings.append(result.latency)
+    return timings
+
+
+def _report(label: str, timings: list[float]) -> float:
+    timings_us = sorted(t * 1e6 for t in timings)
+    p95 = timings_us[int(len(timings_us) * 0.95) - 1]
+    median = statistics.median(timings_us)
+    print(f"{label:<24} mean={statistics.mean(timings_us):9.1f}us p50={median:9.1f}us p95={p95:9.1f}us")
+    return median
+
+
+async def _run_requests(iterations: int, rounds: int) -> None:
+    async with _lifespan(asgi_app):
+        # 워밍업 (토크나이저 로드, DI 캐시)
+        await _measure_requests(50)
+
+        # 측정 순서에 따른 편향을 줄이기 위해 번갈아 측정
+        disabled, enabled = [], []
+        for _ in range(rounds):
+            configure_telemetry(metrics_enabled=False)
+            disabled += await _measure_requests(iterations // rounds)
+            configure_telemetry(metrics_enabled=True)
+            enabled += await _measure_requests(iterations // rounds)
+
+    base = _report("계측 비활성", disabled)
+    measured = _report("메트릭 활성", enabled)
+    print(f"요청당 오버헤드 (p50): {measured - base:+.1f}us ({(measured - base) / base * 100:+.2f}%)")
+
+
+@app.command()
+def main(
+    iterations: int = typer.Option(4000, help="요청 측정 횟수"),
+    span_iterations: int = typer.Option(1_000_000, help="span 측정 횟수"),
+    rounds: int = typer.Option(20, help="비활성/활성 번갈아 측정할 라운드 수"),
+):
+    configure_telemetry(metrics_enabled=False)
+    print(f"span (no-op)             {_measure_span(span_iterations):9.1f}ns")
+    configure_telemetry(metrics_enabled=True)
+    print(f"span (메트릭 관찰자)      {_measure_span(span_iterations):9.1f}ns")
+
+    asyncio.run(_run_requests(iterations, rounds))
+
+
+if __name__ == "__main__":
+    app()
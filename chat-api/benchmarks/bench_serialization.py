@@ -0,0 +1,144 @@
+"""
+요청/응답 직렬화 마이크로벤치마크
+
+긴 대화 기록(history)이 포함된 /api/chat 본문 하나를 처리할 때의 CPU 시간과 메모리 할당량을
+이전 경로(Pydantic 요청 모델 -> ChatMessage 복사 -> LangChain 메시지 -> Pydantic 응답 덤프)와
+현재 경로(msgspec Struct로 바로 디코딩 -> LangChain 메시지 -> msgspec 인코딩)로 비교합니다.
+
+    python -m benchmarks.bench_serialization --history 200 --iterations 2000
+"""
+
+import json
+import time
+import tracemalloc
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional
+
+import msgspec
+import typer
+from langchain_core.messages import AIMessage, HumanMessage
+from pydantic import BaseModel, Field
+
+from src.agents.base import ChatMessage
+from src.agents.default.agent import DefaultAgent
+from src.app.models import ChatRequest, ChatResponse
+
+app = typer.Typer()
+
+
+# 이전 API 모델 (Pydantic, 비교용)
+class _LegacyRole(str, Enum):
+    USER = "user"
+    ASSISTANT = "assistant"
+    SYSTEM = "system"
+
+
+class _LegacyMessageRequest(BaseModel):
+    role: _LegacyRole
+    content: str
+
+
+class _LegacyChatMessage(BaseModel):
+    role: str
+    content: str
+    metadata: Optional[Dict[str, Any]] = None
+
+
+class _LegacyChatRequest(BaseModel):
+    message: str = Field(..., min_length=1)
+    history: Optional[List[_LegacyMessageRequest]] = None
+    conversation_id: Optional[str] = Field(default=None, min_length=1, max_length=128)
+    agent: Optional[str] = None
+    model: Optional[str] = None
+    temperature: Optional[float] = Field(default=None, ge=0.0, le=2.0)
+
+
+class _LegacyChatResponse(BaseModel):
+    message: str
+    model: str
+    metadata: Optional[Dict[str, Any]] = None
+
+
+def _body(history: int) -> bytes:
+    """history 길이만큼 user/assistant 메시지가 번갈아 있는 요청 본문"""
+    return json.dumps({
+        "message": "마지막 질문입니다.",
+        "history": [
+            {"role": "user" if i % 2 == 0 else "assistant", "content": f"{i}번째 메시지 " + "내용 " * 20}
+            for i in range(history)
+        ],
+        "temperature": 0.3,
+    }, ensure_ascii=False).encode("utf-8")
+
+
+_METADATA = {"agent": "DefaultAgent", "version": "1.0.0", "conversation_id": None, "cached": False}
+
+
+def _legacy_path(body: bytes) -> bytes:
+    request = _LegacyChatRequest.model_validate_json(body)
+    history = [_LegacyChatMessage(role=msg.role.value, content=msg.content) for msg in request.history or []]
+    messages = [
+        HumanMessage(content=msg.content) if msg.role == "user" else AIMessage(content=msg.content)
+        for msg in history
+    ]
+    messages.append(HumanMessage(content=request.message))
+    response = _LegacyChatResponse(message="응답", model="gpt-4o-mini", metadata=_METADATA)
+    return json.dumps(response.model_dump(), ensure_ascii=False).encode("utf-8")
+
+
+_decoder = msgspec.json.Decoder(ChatRequest)
+
+
+def _fast_path(body: bytes) -> bytes:
+    request = _decoder.decode(body)
+    DefaultAgent._build_messages(None, request.message, request.history)  # type: ignore[arg-type]
+    response = ChatResponse(message="응답", model="gpt-4o-mini", metadata=_METADATA)
+    return msgspec.json.encode(response)
+
+
+def _measure(fn: Callable[[bytes], bytes], body: bytes, iterations: int) -> tuple[float, float, int]:
+    """요청당 CPU 시간 (us), 요청당 할당량 (KiB), 최대 메모리 (KiB)"""
+    for _ in range(min(100, iterations)):
+        fn(body)
+
+    started_at = time.process_time()
+    for _ in range(iterations):
+        fn(body)
+    cpu = (time.process_time() - started_at) / iterations * 1e6
+
+    tracemalloc.start()
+    snapshot_before = tracemalloc.take_snapshot()
+    fn(body)
+    snapshot_after = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    allocated = sum(stat.size_diff for stat in snapshot_after.compare_to(snapshot_before, "filename") if stat.size_diff > 0)
+    return cpu, allocated / 1024, peak // 1024
+
+
+@app.command()
+def main(
+    history: int = typer.Option(200, help="요청 본문에 포함할 대화 기록 길이"),
+    iterations: int = typer.Option(2000, help="측정 횟수"),
+):
+    body = _body(history)
+    print(f"본문 크기: {len(body) / 1024:.1f}KiB (history {history}개)")
+
+    # 두 경로가 같은 요청을 같은 메시지로 변환하는지 확인
+    assert [m.content for m in _decoder.decode(body).history or []] == [
+        m.content for m in _LegacyChatRequest.model_validate_json(body).history or []
+    ]
+    assert isinstance(_decoder.decode(body).history[0], ChatMessage)
+
+    results = {}
+    for label, fn in (("이전 (Pydantic)", _legacy_path), ("현재 (msgspec)", _fast_path)):
+        cpu, allocated, peak = _measure(fn, body, iterations)
+        results[label] = cpu
+        print(f"{label:<16} cpu={cpu:9.1f}us/req  alloc={allocated:8.1f}KiB  peak={peak:6d}KiB")
+
+    legacy, fast = results.values()
+    print(f"요청당 CPU 시간: {(fast - legacy) / legacy * 100:+.1f}%")
+
+
+if __name__ == "__main__":
+    app()
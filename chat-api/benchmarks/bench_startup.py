@@ -0,0 +1,154 @@
+"""
+시작 시간 벤치마크 (import 시간, 앱 생성/lifespan 시작, 첫 요청 지연 시간)
+
+매 측정을 새 인터프리터에서 실행해 모듈 캐시 없이 측정합니다.
+예산(--max-*)을 넘으면 종료 코드 1로 끝나므로 CI에서 회귀 감지용으로 사용할 수 있습니다.
+
+    python -m benchmarks.bench_startup --runs 5
+    python -m benchmarks.bench_startup --max-cli-import-ms 500 --max-first-request-ms 200
+"""
+
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+
+import typer
+
+app = typer.Typer()
+
+# 측정 대상 모듈 (CLI info는 LangChain 없이 시작해야 함)
+IMPORT_TARGETS = ("src.agents", "src.agents.cli", "src.app.main")
+
+_IMPORT_PROBE = "import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+
+
+def _environment(**overrides: str) -> Dict[str, str]:
+    """가짜 LLM 백엔드로 네트워크 없이 측정"""
+    env = {
+        **os.environ,
+        "OPENAI_API_KEY": "sk-benchmark",
+        "LLM_BACKEND": "fake",
+        "FAKE_LLM_TTFT": "0",
+        "FAKE_LLM_TOKENS_PER_SECOND": "0",
+        "FAKE_LLM_RESPONSE_TOKENS": "8",
+        "LOG_LEVEL": "WARNING",
+    }
+    env.update(overrides)
+    return env
+
+
+def _run(args: List[str], env: Dict[str, str]) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, *args], env=env, capture_output=True, text=True, check=False)
+
+
+def _import_time(module: str) -> float:
+    """새 인터프리터에서 모듈 import 시간 (초)"""
+    result = _run(["-c", _IMPORT_PROBE.format(module=module)], _environment())
+    if result.returncode != 0:
+        raise RuntimeError(f"{module} import 실패:\n{result.stderr}")
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def _cli_info_time() -> float:
+    """API 키 없이 `cli info` 실행 시간 (초, 실패 시 예외)"""
+    env = _environment()
+    del env["OPENAI_API_KEY"]
+    started_at = time.perf_counter()
+    result = _run(["-m", "src.agents.cli", "info"], env)
+    elapsed = time.perf_counter() - started_at
+    if result.returncode != 0:
+        raise RuntimeError(f"cli info 실패 (API 키 없음):\n{result.stderr}")
+    return elapsed
+
+
+def _app_timings() -> Dict[str, float]:
+    """새 인터프리터에서 앱 시작 단계별 시간 (초)"""
+    result = _run(["-c", "from benchmarks.bench_startup import probe_app; probe_app()"], _environment())
+    if result.returncode != 0:
+        raise RuntimeError(f"앱 시작 측정 실패:\n{result.stderr}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+async def _probe_app() -> Dict[str, float]:
+    timings: Dict[str, float] = {}
+
+    started_at = time.perf_counter()
+    from src.app.main import create_app
+    timings["import"] = time.perf_counter() - started_at
+
+    started_at = time.perf_counter()
+    asgi_app = create_app()
+    timings["create_app"] = time.perf_counter() - started_at
+
+    from benchmarks.harness import _asgi_request, _lifespan
+
+    started_at = time.perf_counter()
+    async with _lifespan(asgi_app):
+        timings["startup"] = time.perf_counter() - started_at
+        for key, index in (("first_request", 0), ("second_request", 1)):
+            body = json.dumps({"message": f"startup probe {index}"}).encode("utf-8")
+            result = await _asgi_request(asgi_app, "/api/chat", body)
+            if result.status != 201:
+                raise RuntimeError(f"요청 실패: HTTP {result.status}")
+            timings[key] = result.latency
+        started_at = time.perf_counter()
+    timings["shutdown"] = time.perf_counter() - started_at
+    return timings
+
+
+def probe_app() -> None:
+    """현재 인터프리터에서 앱 시작 단계별 시간을 JSON으로 출력 (_app_timings가 새 인터프리터에서 호출)"""
+    print(json.dumps(asyncio.run(_probe_app())))
+
+
+def _ms(values: List[float]) -> str:
+    values_ms = sorted(v * 1000 for v in values)
+    return f"median={statistics.median(values_ms):8.1f}ms  min={values_ms[0]:8.1f}ms  max={values_ms[-1]:8.1f}ms"
+
+
+def _check(label: str, values: List[float], budget_ms: Optional[float], failures: List[str]) -> None:
+    median_ms = statistics.median(values) * 1000
+    if budget_ms is not None and median_ms > budget_ms:
+        failures.append(f"{label}: {median_ms:.1f}ms > {budget_ms:.1f}ms")
+
+
+@app.command()
+def main(
+    runs: int = typer.Option(5, min=1, help="측정 반복 횟수 (매번 새 인터프리터)"),
+    max_cli_import_ms: Optional[float] = typer.Option(None, help="src.agents.cli import 시간 예산 (중앙값)"),
+    max_app_startup_ms: Optional[float] = typer.Option(None, help="import + create_app + lifespan 시작 예산 (중앙값)"),
+    max_first_request_ms: Optional[float] = typer.Option(None, help="첫 요청 지연 시간 예산 (중앙값)"),
+):
+    failures: List[str] = []
+
+    print("[import]")
+    for module in IMPORT_TARGETS:
+        timings = [_import_time(module) for _ in range(runs)]
+        print(f"  {module:<24} {_ms(timings)}")
+        if module == "src.agents.cli":
+            _check("cli import", timings, max_cli_import_ms, failures)
+
+    print("[cli]")
+    print(f"  {'info (API 키 없음)':<24} {_ms([_cli_info_time() for _ in range(runs)])}")
+
+    print("[app] (fake 백엔드, 가짜 모델 생성 시간 0)")
+    app_runs = [_app_timings() for _ in range(runs)]
+    for key in ("import", "create_app", "startup", "first_request", "second_request", "shutdown"):
+        print(f"  {key:<24} {_ms([timings[key] for timings in app_runs])}")
+    total = [timings["import"] + timings["create_app"] + timings["startup"] for timings in app_runs]
+    print(f"  {'ready (합계)':<24} {_ms(total)}")
+    _check("app startup", total, max_app_startup_ms, failures)
+    _check("first request", [timings["first_request"] for timings in app_runs], max_first_request_ms, failures)
+
+    if failures:
+        print("\n예산 초과:\n  " + "\n  ".join(failures))
+        raise typer.Exit(1)
+
+
+if __name__ == "__main__":
+    app()
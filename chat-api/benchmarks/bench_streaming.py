@@ -0,0 +1,129 @@
+"""
+SSE 스트리밍 인코딩 마이크로벤치마크
+
+1. 프레임 하나를 만드는 비용
+   (이전: Pydantic StreamChunk.model_dump_json + f-string / msgspec Struct 인코딩 / SSEEncoder.frame)
+2. 토큰 속도를 재현한 동시 스트림들을 인코딩할 때의 토큰당 CPU 시간과 스트림당 프레임(쓰기) 수
+   (조각마다 전송 / 시간 coalescing / 크기 coalescing)
+
+    python -m benchmarks.bench_streaming --streams 64 --tokens 128 --tokens-per-second 50
+"""
+
+import asyncio
+import time
+from typing import AsyncGenerator, AsyncIterable, Callable
+
+import msgspec
+import typer
+from pydantic import BaseModel, Field
+
+from src.app.models import StreamChunk
+from src.app.streaming import SSEEncoder
+
+app = typer.Typer()
+
+_TOKEN = " 토큰"
+
+
+class _LegacyStreamChunk(BaseModel):
+    """이전 스트림 청크 모델 (Pydantic, 비교용)"""
+    content: str = Field(..., description="응답 내용 조각")
+    is_final: bool = Field(default=False, description="마지막 청크 여부")
+
+
+def _legacy_frame(content: str) -> bytes:
+    return f"data: {_LegacyStreamChunk(content=content, is_final=False).model_dump_json()}\n\n".encode("utf-8")
+
+
+def _struct_frame(content: str) -> bytes:
+    return b"data: " + msgspec.json.encode(StreamChunk(content=content, is_final=False)) + b"\n\n"
+
+
+def _measure_frame(fn: Callable[[str], bytes], iterations: int) -> float:
+    """프레임 하나를 만드는 평균 CPU 시간 (ns)"""
+    started_at = time.process_time()
+    for _ in range(iterations):
+        fn(_TOKEN)
+    return (time.process_time() - started_at) / iterations * 1e9
+
+
+async def _tokens(count: int, interval: float) -> AsyncGenerator[str, None]:
+    """일정한 속도로 토큰을 생성하는 가짜 업스트림"""
+    for _ in range(count):
+        await asyncio.sleep(interval)
+        yield _TOKEN
+
+
+async def _passthrough(chunks: AsyncIterable[str]) -> AsyncGenerator[str, None]:
+    async for chunk in chunks:
+        yield chunk
+
+
+async def _legacy_stream(chunks: AsyncIterable[str]) -> AsyncGenerator[bytes, None]:
+    async for chunk in chunks:
+        if chunk:
+            yield _legacy_frame(chunk)
+    yield f"data: {_LegacyStreamChunk(content='', is_final=True).model_dump_json()}\n\n".encode("utf-8")
+
+
+async def _measure_streams(
+    stream: Callable[[AsyncIterable[str]], AsyncIterable[bytes]],
+    streams: int,
+    tokens: int,
+    interval: float
+) -> tuple[float, float, float]:
+    """동시 스트림 실행 후 (토큰당 CPU us, 스트림당 프레임 수, 스트림당 바이트 수)"""
+    frames = 0
+    sent = 0
+
+    async def consume() -> None:
+        nonlocal frames, sent
+        async for frame in stream(_tokens(tokens, interval)):
+            frames += 1
+            sent += len(frame)
+
+    started_at = time.process_time()
+    await asyncio.gather(*(consume() for _ in range(streams)))
+    cpu = time.process_time() - started_at
+    return cpu / (streams * tokens) * 1e6, frames / streams, sent / streams
+
+
+@app.command()
+def main(
+    iterations: int = typer.Option(200_000, help="프레임 인코딩 측정 횟수"),
+    streams: int = typer.Option(64, help="동시 스트림 수"),
+    tokens: int = typer.Option(128, help="스트림당 토큰 수"),
+    tokens_per_second: float = typer.Option(50.0, help="스트림당 토큰 생성 속도"),
+):
+    print("프레임 인코딩")
+    for label, fn in (
+        ("Pydantic + f-string", _legacy_frame),
+        ("msgspec Struct", _struct_frame),
+        ("SSEEncoder.frame", SSEEncoder.frame),
+        ("SSEEncoder.frame (id)", lambda content: SSEEncoder.frame(content, event_id=42)),
+    ):
+        print(f"  {label:<24} {_measure_frame(fn, iterations):8.1f}ns")
+
+    interval = 1.0 / tokens_per_second
+    print(f"\n동시 스트림 {streams}개 x {tokens}토큰 @ {tokens_per_second:g} tok/s")
+    # 가짜 업스트림/이벤트 루프 비용 (인코딩 없이 토큰만 소비)
+    baseline, _, _ = asyncio.run(_measure_streams(_passthrough, streams, tokens, interval))
+    print(f"  {'인코딩 없음 (기준)':<20} cpu={baseline:7.2f}us/token")
+    for label, stream in (
+        ("이전 (조각마다)", _legacy_stream),
+        ("조각마다", SSEEncoder(event_ids=False).stream),
+        ("조각마다 + id", SSEEncoder().stream),
+        ("기본 (id + heartbeat)", SSEEncoder(heartbeat_interval=15.0).stream),
+        ("20ms coalescing", SSEEncoder(coalesce_interval=0.02).stream),
+        ("100ms coalescing", SSEEncoder(coalesce_interval=0.1).stream),
+        ("64자 coalescing", SSEEncoder(coalesce_interval=1.0, coalesce_chars=64).stream),
+    ):
+        cpu, frames, sent = asyncio.run(_measure_streams(stream, streams, tokens, interval))
+        print(
+            f"  {label:<20} cpu={cpu:7.2f}us/token (인코딩 {cpu - baseline:+6.2f})  "
+            f"frames={frames:6.1f}/stream  bytes={sent:8.0f}/stream"
+        )
+
+
+if __name__ == "__main__":
+    app()
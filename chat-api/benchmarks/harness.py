@@ -0,0 +1,432 @@
+"""
+오프라인 벤치마크 / 부하 테스트 하네스
+
+가짜 LLM 백엔드(LLM_BACKEND=fake)로 /api/chat, /api/chat/stream을 구동해
+처리량, 지연 시간 분위수(p50/p95/p99), 첫 토큰 시간(TTFT), 요청당 프레임워크 오버헤드를 측정합니다.
+결과는 JSON으로 저장해 커밋 간 비교할 수 있습니다.
+
+    # 인프로세스 (ASGI 직접 호출)
+    python -m benchmarks.harness run --mode inprocess --concurrency 1,16,64 --requests 500
+
+    # 로컬 uvicorn (별도 프로세스)
+    python -m benchmarks.harness run --mode uvicorn --concurrency 16
+
+    # 두 실행 결과 비교
+    python -m benchmarks.harness compare before.json after.json
+"""
+
+import asyncio
+import json
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+import httpx
+import typer
+from rich.console import Console
+from rich.table import Table
+
+app = typer.Typer(help="Chat API 오프라인 벤치마크")
+console = Console()
+
+RESULTS_DIR = Path(__file__).parent / "results"
+ENDPOINTS = {"chat": "/api/chat", "stream": "/api/chat/stream"}
+
+
+@dataclass
+class RequestResult:
+    """요청 하나의 측정 결과"""
+    status: int
+    latency: float
+    ttft: Optional[float] = None
+
+
+@dataclass
+class RunResult:
+    """하나의 (mode, endpoint, concurrency) 조합 측정 결과"""
+    mode: str
+    endpoint: str
+    concurrency: int
+    requests: int
+    duration: float
+    results: List[RequestResult] = field(default_factory=list)
+
+    def summary(self, generation_time: float) -> Dict[str, Any]:
+        ok = [r for r in self.results if 200 <= r.status < 300]
+        latencies = [r.latency for r in ok]
+        ttfts = [r.ttft for r in ok if r.ttft is not None]
+        return {
+            "mode": self.mode,
+            "endpoint": self.endpoint,
+            "concurrency": self.concurrency,
+            "requests": self.requests,
+            "errors": self.requests - len(ok),
+            "duration_s": round(self.duration, 4),
+            "throughput_rps": round(len(ok) / self.duration, 3) if self.duration else 0.0,
+            "latency_ms": _distribution(latencies),
+            "ttft_ms": _distribution(ttfts),
+            # 가짜 모델의 생성 시간을 뺀 나머지 = Litestar, DI, Pydantic, LangGraph 등의 오버헤드
+            "overhead_ms": _distribution([max(0.0, latency - generation_time) for latency in latencies]),
+        }
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    index = min(len(sorted_values) - 1, max(0, int(round(q * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def _distribution(values: List[float]) -> Optional[Dict[str, float]]:
+    """초 단위 값 목록을 ms 단위 분포 요약으로 변환"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return {
+        "mean": round(statistics.mean(ordered) * 1000, 3),
+        "p50": round(_percentile(ordered, 0.50) * 1000, 3),
+        "p95": round(_percentile(ordered, 0.95) * 1000, 3),
+        "p99": round(_percentile(ordered, 0.99) * 1000, 3),
+        "max": round(ordered[-1] * 1000, 3),
+    }
+
+
+def _configure_environment(ttft: float, tokens_per_second: float, response_tokens: int) -> None:
+    """가짜 LLM 백엔드 설정 (이미 지정된 환경변수는 유지)"""
+    os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+    os.environ.setdefault("LLM_BACKEND", "fake")
+    os.environ.setdefault("AGENT_MAX_CONCURRENCY", "0")
+    os.environ["FAKE_LLM_TTFT"] = str(ttft)
+    os.environ["FAKE_LLM_TOKENS_PER_SECOND"] = str(tokens_per_second)
+    os.environ["FAKE_LLM_RESPONSE_TOKENS"] = str(response_tokens)
+
+
+def _generation_time(ttft: float, tokens_per_second: float, response_tokens: int) -> float:
+    """가짜 모델이 응답 하나를 생성하는 시간 (FakeChatModel.generation_time과 동일)"""
+    interval = 1.0 / tokens_per_second if tokens_per_second > 0 else 0.0
+    return ttft + interval * max(0, response_tokens - 1)
+
+
+def _payload(index: int) -> bytes:
+    # 요청마다 메시지를 다르게 해 single-flight/캐시에 의해 합쳐지지 않도록 함
+    return json.dumps({"message": f"benchmark request {index}"}).encode("utf-8")
+
+
+def _is_first_token(chunk: bytes) -> bool:
+    return b'"is_final":false' in chunk
+
+
+async def _run_load(
+    send: Callable[[int], Awaitable[RequestResult]],
+    requests: int,
+    concurrency: int
+) -> tuple[List[RequestResult], float]:
+    """concurrency개의 워커로 requests개의 요청 실행"""
+    results: List[RequestResult] = []
+    counter = iter(range(requests))
+
+    async def worker():
+        for index in counter:
+            try:
+                results.append(await send(index))
+            except Exception as e:
+                console.print(f"[red]요청 실패: {e}[/red]")
+                results.append(RequestResult(status=0, latency=0.0))
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return results, time.perf_counter() - started_at
+
+
+# ---------------------------------------------------------------------------
+# 인프로세스 (ASGI 직접 호출)
+# ---------------------------------------------------------------------------
+
+@asynccontextmanager
+async def _lifespan(asgi_app: Any) -> AsyncIterator[None]:
+    """ASGI lifespan startup/shutdown 실행"""
+    inbox: asyncio.Queue = asyncio.Queue()
+    outbox: asyncio.Queue = asyncio.Queue()
+    task = asyncio.create_task(
+        asgi_app({"type": "lifespan", "asgi": {"version": "3.0"}, "state": {}}, inbox.get, outbox.put)
+    )
+    await inbox.put({"type": "lifespan.startup"})
+    message = await outbox.get()
+    if message["type"] != "lifespan.startup.complete":
+        raise RuntimeError(f"앱 시작 실패: {message}")
+    try:
+        yield
+    finally:
+        await inbox.put({"type": "lifespan.shutdown"})
+        await outbox.get()
+        await task
+
+
+async def _asgi_request(asgi_app: Any, path: str, body: bytes) -> RequestResult:
+    """HTTP 서버 없이 ASGI 앱에 POST 요청 전달"""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode("utf-8"),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [
+            (b"host", b"benchmark"),
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode("ascii")),
+        ],
+        "client": ("127.0.0.1", 50000),
+        "server": ("127.0.0.1", 80),
+        "state": {},
+    }
+    request_sent = False
+    disconnected = asyncio.Event()
+    status = 0
+    ttft: Optional[float] = None
+
+    async def receive() -> Dict[str, Any]:
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    started_at = time.perf_counter()
+
+    async def send(message: Dict[str, Any]) -> None:
+        nonlocal status, ttft
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body":
+            chunk = message.get("body", b"")
+            if ttft is None and _is_first_token(chunk):
+                ttft = time.perf_counter() - started_at
+            if not message.get("more_body", False):
+                # 응답 완료 후 연결 종료를 알림 (스트리밍 응답은 disconnect를 기다림)
+                disconnected.set()
+
+    try:
+        await asgi_app(scope, receive, send)
+    finally:
+        disconnected.set()
+    return RequestResult(status=status, latency=time.perf_counter() - started_at, ttft=ttft)
+
+
+async def _run_inprocess(endpoints: List[str], concurrencies: List[int], requests: int) -> List[RunResult]:
+    from src.app.main import app as asgi_app
+
+    runs = []
+    async with _lifespan(asgi_app):
+        for endpoint in endpoints:
+            for concurrency in concurrencies:
+                path = ENDPOINTS[endpoint]
+                results, duration = await _run_load(
+                    lambda index: _asgi_request(asgi_app, path, _payload(index)), requests, concurrency
+                )
+                runs.append(RunResult("inprocess", endpoint, concurrency, requests, duration, results))
+    return runs
+
+
+# ---------------------------------------------------------------------------
+# 로컬 uvicorn (별도 프로세스)
+# ---------------------------------------------------------------------------
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def _wait_until_ready(base_url: str, process: subprocess.Popen, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise RuntimeError("uvicorn 프로세스가 종료되었습니다.")
+            try:
+                await client.get(f"{base_url}/")
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.1)
+    raise RuntimeError("uvicorn 서버가 시작되지 않았습니다.")
+
+
+async def _http_request(client: httpx.AsyncClient, path: str, body: bytes) -> RequestResult:
+    started_at = time.perf_counter()
+    ttft: Optional[float] = None
+    async with client.stream("POST", path, content=body, headers={"content-type": "application/json"}) as response:
+        async for chunk in response.aiter_raw():
+            if ttft is None and _is_first_token(chunk):
+                ttft = time.perf_counter() - started_at
+    return RequestResult(status=response.status_code, latency=time.perf_counter() - started_at, ttft=ttft)
+
+
+async def _run_uvicorn(endpoints: List[str], concurrencies: List[int], requests: int) -> List[RunResult]:
+    port = _free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.app.main:app",
+         "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning", "--no-access-log"],
+        cwd=Path(__file__).parent.parent,
+        env=os.environ.copy(),
+    )
+    runs = []
+    try:
+        await _wait_until_ready(base_url, process)
+        limits = httpx.Limits(max_connections=max(concurrencies), max_keepalive_connections=max(concurrencies))
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=None) as client:
+            for endpoint in endpoints:
+                for concurrency in concurrencies:
+                    path = ENDPOINTS[endpoint]
+                    results, duration = await _run_load(
+                        lambda index: _http_request(client, path, _payload(index)), requests, concurrency
+                    )
+                    runs.append(RunResult("uvicorn", endpoint, concurrency, requests, duration, results))
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+    return runs
+
+
+# ---------------------------------------------------------------------------
+# 결과 출력 / 저장
+# ---------------------------------------------------------------------------
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except Exception:
+        return None
+
+
+def _print_summaries(summaries: List[Dict[str, Any]]) -> None:
+    table = Table(title="벤치마크 결과")
+    for column in ("mode", "endpoint", "conc", "rps", "p50", "p95", "p99", "ttft p50", "overhead p50", "errors"):
+        table.add_column(column, justify="right")
+
+    def ms(distribution: Optional[Dict[str, float]], key: str) -> str:
+        return f"{distribution[key]:.1f}" if distribution else "-"
+
+    for s in summaries:
+        table.add_row(
+            s["mode"], s["endpoint"], str(s["concurrency"]), f"{s['throughput_rps']:.1f}",
+            ms(s["latency_ms"], "p50"), ms(s["latency_ms"], "p95"), ms(s["latency_ms"], "p99"),
+            ms(s["ttft_ms"], "p50"), ms(s["overhead_ms"], "p50"), str(s["errors"]),
+        )
+    console.print(table)
+
+
+def _parse_list(value: str) -> List[str]:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+@app.command()
+def run(
+    mode: str = typer.Option("inprocess", help="inprocess, uvicorn, both"),
+    endpoints: str = typer.Option("chat,stream", help="측정할 엔드포인트 (chat, stream)"),
+    concurrency: str = typer.Option("1,16,64", help="동시 요청 수 목록 (쉼표 구분)"),
+    requests: int = typer.Option(200, help="조합별 요청 수"),
+    ttft: float = typer.Option(0.05, help="가짜 모델 첫 토큰 지연 (초)"),
+    tokens_per_second: float = typer.Option(200.0, help="가짜 모델 토큰 생성 속도"),
+    response_tokens: int = typer.Option(32, help="가짜 모델 응답 토큰 수"),
+    output: Optional[Path] = typer.Option(None, help="결과 JSON 경로 (기본값: benchmarks/results/<시각>_<커밋>.json)"),
+):
+    """가짜 LLM 백엔드로 벤치마크 실행"""
+    _configure_environment(ttft, tokens_per_second, response_tokens)
+    endpoint_list = _parse_list(endpoints)
+    concurrency_list = [int(c) for c in _parse_list(concurrency)]
+    for endpoint in endpoint_list:
+        if endpoint not in ENDPOINTS:
+            raise typer.BadParameter(f"알 수 없는 엔드포인트: {endpoint}")
+
+    runs: List[RunResult] = []
+    if mode in ("inprocess", "both"):
+        runs += asyncio.run(_run_inprocess(endpoint_list, concurrency_list, requests))
+    if mode in ("uvicorn", "both"):
+        runs += asyncio.run(_run_uvicorn(endpoint_list, concurrency_list, requests))
+
+    generation_time = _generation_time(ttft, tokens_per_second, response_tokens)
+    summaries = [r.summary(generation_time) for r in runs]
+    _print_summaries(summaries)
+
+    commit = _git_commit()
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "commit": commit,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "fake_llm": {
+                "ttft": ttft,
+                "tokens_per_second": tokens_per_second,
+                "response_tokens": response_tokens,
+                "generation_time_ms": round(generation_time * 1000, 3),
+            },
+        },
+        "results": summaries,
+    }
+
+    if output is None:
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        output = RESULTS_DIR / f"{stamp}_{commit or 'nogit'}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    console.print(f"[green]결과 저장: {output}[/green]")
+
+
+@app.command()
+def compare(
+    baseline: Path = typer.Argument(..., help="기준 결과 JSON"),
+    candidate: Path = typer.Argument(..., help="비교할 결과 JSON"),
+):
+    """두 벤치마크 결과 비교"""
+    base = json.loads(baseline.read_text(encoding="utf-8"))
+    cand = json.loads(candidate.read_text(encoding="utf-8"))
+
+    def key(s: Dict[str, Any]) -> tuple:
+        return (s["mode"], s["endpoint"], s["concurrency"])
+
+    base_by_key = {key(s): s for s in base["results"]}
+    table = Table(title=f"{base['meta'].get('commit')} → {cand['meta'].get('commit')}")
+    for column in ("mode", "endpoint", "conc", "rps", "p50 ms", "p95 ms", "overhead p50 ms"):
+        table.add_column(column, justify="right")
+
+    def delta(old: Optional[float], new: Optional[float]) -> str:
+        if old is None or new is None:
+            return "-"
+        change = (new - old) / old * 100 if old else 0.0
+        return f"{old:.1f} → {new:.1f} ({change:+.1f}%)"
+
+    def get(s: Dict[str, Any], metric: str, stat: str) -> Optional[float]:
+        return s[metric][stat] if s.get(metric) else None
+
+    for s in cand["results"]:
+        b = base_by_key.get(key(s))
+        if b is None:
+            continue
+        table.add_row(
+            s["mode"], s["endpoint"], str(s["concurrency"]),
+            delta(b["throughput_rps"], s["throughput_rps"]),
+            delta(get(b, "latency_ms", "p50"), get(s, "latency_ms", "p50")),
+            delta(get(b, "latency_ms", "p95"), get(s, "latency_ms", "p95")),
+            delta(get(b, "overhead_ms", "p50"), get(s, "overhead_ms", "p50")),
+        )
+    console.print(table)
+
+
+if __name__ == "__main__":
+    app()
@@ -1,11 +1,40 @@
-from .default import DefaultAgent
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
 from .base import BaseAgent, ChatMessage, AgentConfig, convert_legacy_history, convert_to_legacy_history
 
+if TYPE_CHECKING:
+    from .default import DefaultAgent
+    from .execution import Deadline, DeadlineExceededError, ExecutionPolicy
+    from .scheduler import QuotaExceededError
+
+# LangChain/LangGraph/OpenAI SDK를 불러오는 구현은 처음 사용할 때 import (CLI info 등 빠른 시작)
+_LAZY_ATTRIBUTES = {
+    "DefaultAgent": ".default",
+    "Deadline": ".execution",
+    "DeadlineExceededError": ".execution",
+    "ExecutionPolicy": ".execution",
+    "QuotaExceededError": ".scheduler",
+}
+
 __all__ = [
-    "BaseAgent", 
-    "DefaultAgent", 
-    "ChatMessage", 
+    "BaseAgent",
+    "DefaultAgent",
+    "ChatMessage",
     "AgentConfig",
+    "Deadline",
+    "DeadlineExceededError",
+    "ExecutionPolicy",
+    "QuotaExceededError",
     "convert_legacy_history",
     "convert_to_legacy_history"
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
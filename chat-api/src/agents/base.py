@@ -4,18 +4,25 @@ Base Agent 추상 클래스
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional, AsyncGenerator
+from typing import Annotated, List, Dict, Any, Literal, Optional, AsyncGenerator
+
+import msgspec
 from pydantic import BaseModel, Field
 
 
-class ChatMessage(BaseModel):
-    """채팅 메시지 표준 형식"""
-    role: str = Field(..., description="메시지 역할: user, assistant, system")
-    content: str = Field(..., description="메시지 내용")
-    metadata: Optional[Dict[str, Any]] = Field(default=None, description="추가 메타데이터")
+class ChatMessage(msgspec.Struct, frozen=True, kw_only=True):
+    """
+    채팅 메시지 표준 형식 (immutable)
     
-    class Config:
-        frozen = True  # immutable
+    API 요청 본문에서 바로 디코딩되어 서비스/에이전트 계층까지 복사 없이 전달됩니다.
+    msgspec Struct는 디코딩 시에만 타입을 검사하고 생성자는 검사하지 않습니다.
+    """
+    role: Annotated[
+        Literal["user", "assistant", "system"],
+        msgspec.Meta(description="메시지 역할: user, assistant, system")
+    ]
+    content: Annotated[str, msgspec.Meta(description="메시지 내용")]
+    metadata: Optional[Annotated[Dict[str, Any], msgspec.Meta(description="추가 메타데이터")]] = None
 
 
 class AgentConfig(BaseModel):
@@ -146,10 +153,7 @@ def convert_legacy_history(history: List[Dict[str, str]]) -> List[ChatMessage]:
     Returns:
         ChatMessage 리스트
     """
-    return [
-        ChatMessage(role=msg["role"], content=msg["content"])
-        for msg in history
-    ]
+    return msgspec.convert(history, List[ChatMessage])
 
 
 def convert_to_legacy_history(messages: List[ChatMessage]) -> List[Dict[str, str]]:
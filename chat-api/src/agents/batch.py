@@ -0,0 +1,241 @@
+"""
+오프라인 배치 처리
+JSONL 프롬프트 파일을 에이전트로 처리해 결과를 JSONL로 기록 (중단 후 재개 지원)
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set
+
+import msgspec
+
+from .base import BaseAgent, ChatMessage
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BatchCheckpoint:
+    """
+    배치 진행 상태
+
+    결과는 완료 순서대로 기록되므로 "이 줄 번호 미만은 모두 완료(watermark)"와
+    그 이후에 완료된 줄 번호 집합으로 진행 상태를 표현합니다.
+    output_offset은 체크포인트 시점의 출력 파일 크기로, 재개 시 그 이후에 기록된
+    (체크포인트에 반영되지 않은) 결과를 잘라내 중복 기록을 막습니다.
+    """
+    watermark: int = 0
+    done: Set[int] = field(default_factory=set)
+    output_offset: int = 0
+    succeeded: int = 0
+    failed: int = 0
+
+    @property
+    def completed(self) -> int:
+        """완료된 줄 수"""
+        return self.watermark + len(self.done)
+
+    def is_done(self, line: int) -> bool:
+        """줄 처리 완료 여부"""
+        return line < self.watermark or line in self.done
+
+    def mark_done(self, line: int) -> None:
+        """줄 처리 완료 표시"""
+        self.done.add(line)
+        while self.watermark in self.done:
+            self.done.remove(self.watermark)
+            self.watermark += 1
+
+    @classmethod
+    def load(cls, path: Path) -> "BatchCheckpoint":
+        """체크포인트 파일 로드 (없으면 빈 상태)"""
+        if not path.exists():
+            return cls()
+        data = json.loads(path.read_text(encoding="utf-8"))
+        return cls(
+            watermark=data["watermark"],
+            done=set(data["done"]),
+            output_offset=data["output_offset"],
+            succeeded=data.get("succeeded", 0),
+            failed=data.get("failed", 0),
+        )
+
+    def save(self, path: Path) -> None:
+        """체크포인트 파일 저장 (임시 파일에 쓴 뒤 교체)"""
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_text(json.dumps({
+            "watermark": self.watermark,
+            "done": sorted(self.done),
+            "output_offset": self.output_offset,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+        }), encoding="utf-8")
+        os.replace(tmp_path, path)
+
+
+@dataclass
+class BatchItem:
+    """입력 파일의 요청 한 줄"""
+    line: int
+    id: Any = None
+    message: str = ""
+    history: Optional[List[ChatMessage]] = None
+    error: Optional[str] = None
+
+
+def parse_item(line: int, raw: str) -> BatchItem:
+    """
+    JSONL 한 줄을 요청으로 변환
+
+    형식: {"id": ..., "message": "...", "history": [{"role": ..., "content": ...}], "system": "..."}
+    (id, history, system은 선택, 잘못된 줄은 error가 설정된 항목으로 반환)
+    """
+    try:
+        record = json.loads(raw)
+        if not isinstance(record, dict) or not isinstance(record.get("message"), str) or not record["message"]:
+            raise ValueError("message 필드가 필요합니다.")
+
+        history = msgspec.convert(record.get("history") or [], List[ChatMessage])
+        if record.get("system"):
+            history.insert(0, ChatMessage(role="system", content=record["system"]))
+
+        return BatchItem(line=line, id=record.get("id"), message=record["message"], history=history or None)
+    except Exception as e:
+        return BatchItem(line=line, error=f"잘못된 입력: {e}")
+
+
+def iter_items(
+    input_path: Path,
+    checkpoint: BatchCheckpoint,
+    on_skip: Optional[Callable[[], None]] = None
+) -> Iterator[BatchItem]:
+    """
+    입력 파일을 한 줄씩 읽으며 처리되지 않은 요청만 생성
+
+    빈 줄은 완료로 표시하고 on_skip을 호출합니다. (count_lines의 전체 줄 수와 진행률을 맞추기 위함)
+    """
+    with input_path.open(encoding="utf-8") as f:
+        for line, raw in enumerate(f):
+            if checkpoint.is_done(line):
+                continue
+            if not raw.strip():
+                checkpoint.mark_done(line)
+                if on_skip is not None:
+                    on_skip()
+                continue
+            yield parse_item(line, raw)
+
+
+def count_lines(path: Path) -> int:
+    """파일 전체를 메모리에 올리지 않고 줄 수 계산"""
+    lines = 0
+    last = b"\n"
+    with path.open("rb") as f:
+        while chunk := f.read(1 << 20):
+            lines += chunk.count(b"\n")
+            last = chunk[-1:]
+    return lines if last == b"\n" else lines + 1
+
+
+async def run_batch(
+    agent: BaseAgent,
+    input_path: Path,
+    output_path: Path,
+    checkpoint_path: Path,
+    concurrency: int = 8,
+    resume: bool = True,
+    on_result: Optional[Callable[[bool], None]] = None,
+    checkpoint_interval: float = 1.0,
+    on_skip: Optional[Callable[[], None]] = None
+) -> BatchCheckpoint:
+    """
+    JSONL 파일의 요청을 제한된 워커 풀로 처리하고 결과를 즉시 출력 파일에 추가
+
+    Args:
+        agent: 요청을 처리할 에이전트
+        input_path: 입력 JSONL 경로
+        output_path: 출력 JSONL 경로 (완료 순서대로 기록, "line"으로 입력 줄 번호 확인)
+        checkpoint_path: 체크포인트 파일 경로
+        concurrency: 동시에 처리할 최대 요청 수
+        resume: 체크포인트가 있으면 이어서 처리 (False면 처음부터 다시 처리)
+        on_result: 항목 하나가 끝날 때마다 성공 여부와 함께 호출되는 콜백
+        checkpoint_interval: 체크포인트 저장 최소 간격 (초)
+        on_skip: 빈 줄을 건너뛸 때마다 호출되는 콜백
+
+    Returns:
+        최종 진행 상태
+    """
+    checkpoint = BatchCheckpoint.load(checkpoint_path) if resume else BatchCheckpoint()
+
+    # 마지막 체크포인트 이후에 기록된 결과는 다시 처리하므로 잘라냄
+    mode = "r+b" if resume and output_path.exists() else "wb"
+    output = output_path.open(mode)
+    output.truncate(checkpoint.output_offset)
+    output.seek(checkpoint.output_offset)
+
+    queue: asyncio.Queue[Optional[BatchItem]] = asyncio.Queue(maxsize=concurrency * 2)
+    last_saved = time.monotonic()
+
+    def save_checkpoint() -> None:
+        nonlocal last_saved
+        output.flush()
+        checkpoint.output_offset = output.tell()
+        checkpoint.save(checkpoint_path)
+        last_saved = time.monotonic()
+
+    def write_result(item: BatchItem, result: Dict[str, Any]) -> None:
+        output.write((json.dumps({"line": item.line, "id": item.id, **result}, ensure_ascii=False) + "\n").encode("utf-8"))
+        ok = "error" not in result
+        if ok:
+            checkpoint.succeeded += 1
+        else:
+            checkpoint.failed += 1
+        checkpoint.mark_done(item.line)
+        if on_result is not None:
+            on_result(ok)
+        if time.monotonic() - last_saved >= checkpoint_interval:
+            save_checkpoint()
+
+    async def worker() -> None:
+        while (item := await queue.get()) is not None:
+            if item.error is not None:
+                write_result(item, {"error": item.error})
+                continue
+
+            started_at = time.perf_counter()
+            try:
+                # 업스트림 스케줄러 사용 시 대화형 요청보다 뒤에 처리
+                response = await agent.invoke(item.message, item.history, priority="batch")
+                write_result(item, {"response": response, "latency": round(time.perf_counter() - started_at, 4)})
+            except Exception as e:
+                logger.warning(f"{item.line}번째 줄 처리 실패: {e}")
+                write_result(item, {"error": str(e)})
+
+    workers = [asyncio.create_task(worker()) for _ in range(max(1, concurrency))]
+    try:
+        # 큐 크기만큼만 미리 읽어 입력 파일 전체를 메모리에 올리지 않음
+        for item in iter_items(input_path, checkpoint, on_skip):
+            await queue.put(item)
+        for _ in workers:
+            await queue.put(None)
+        await asyncio.gather(*workers)
+    finally:
+        for task in workers:
+            task.cancel()
+        # 워커가 모두 끝난 뒤에 저장해야 체크포인트와 출력 파일이 어긋나지 않음
+        await asyncio.gather(*workers, return_exceptions=True)
+        save_checkpoint()
+        output.close()
+
+    return checkpoint
+
+
+def default_checkpoint_path(output_path: Path) -> Path:
+    """출력 파일 옆에 두는 기본 체크포인트 경로"""
+    return output_path.with_name(output_path.name + ".checkpoint")
+
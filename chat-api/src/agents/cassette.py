@@ -0,0 +1,406 @@
+"""
+LLM 호출 녹화/재생 (cassette)
+실제 백엔드 호출의 요청, 응답, 토큰 도착 간격을 JSONL 파일에 기록하고
+네트워크 없이 같은 응답과 타이밍으로 재생하는 채팅 모델 (성능 회귀 테스트/오프라인 부하 테스트용)
+
+cassette 한 줄(JSON)의 형식:
+    {"v": 1, "key": 메시지 해시, "model": 모델명, "messages": [[type, content], ...],
+     "chunks": [토큰 조각, ...], "delays": [이전 조각(첫 조각은 호출 시작) 이후 초, ...], "usage": 토큰 사용량}
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, IO, Iterator, List, Optional, Tuple
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models import BaseChatModel
+from langchain_core.language_models.chat_models import agenerate_from_stream, generate_from_stream
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.runnables import RunnableConfig
+from pydantic import PrivateAttr
+
+logger = logging.getLogger(__name__)
+
+CASSETTE_VERSION = 1
+
+# 타이밍 기록 정밀도 (소수점 자릿수, 0.1ms)
+DELAY_PRECISION = 4
+
+# cassette에 없는 요청 처리 (any: 키 해시로 고른 녹화 응답을 재생, error: CassetteMissError)
+MISS_POLICIES = ("any", "error")
+
+
+class CassetteMissError(LookupError):
+    """재생할 녹화가 없는 요청"""
+
+
+def cassette_key(messages: List[BaseMessage]) -> str:
+    """메시지 목록(type, content)으로 결정되는 녹화 키"""
+    digest = hashlib.sha256()
+    for message in messages:
+        digest.update(message.type.encode("utf-8") + b"\x00" + str(message.content).encode("utf-8") + b"\x00")
+    return digest.hexdigest()
+
+
+@dataclass
+class Recording:
+    """녹화된 호출 하나"""
+    key: str
+    model: str
+    chunks: List[str]
+    delays: List[float]
+    usage: Optional[Dict[str, Any]] = None
+
+    @property
+    def content(self) -> str:
+        return "".join(self.chunks)
+
+    @property
+    def duration(self) -> float:
+        """원래 호출에 걸린 시간 (초)"""
+        return sum(self.delays)
+
+
+class Cassette:
+    """
+    녹화 파일을 읽어 키별로 색인한 재생 목록
+
+    같은 키가 여러 번 녹화되어 있으면 재생할 때마다 순서대로 돌아가며 사용합니다.
+    """
+
+    def __init__(self, recordings: List[Recording]):
+        self.recordings = recordings
+        self._by_key: Dict[str, List[Recording]] = {}
+        for recording in recordings:
+            self._by_key.setdefault(recording.key, []).append(recording)
+        self._cursors: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def load(cls, path: str) -> "Cassette":
+        """
+        JSONL 녹화 파일 로드
+
+        Raises:
+            FileNotFoundError: 파일이 없음
+            ValueError: 녹화가 하나도 없음
+        """
+        recordings = []
+        with open(path, encoding="utf-8") as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    data = json.loads(line)
+                    recordings.append(Recording(
+                        key=data["key"],
+                        model=data.get("model", ""),
+                        chunks=data["chunks"],
+                        delays=data["delays"],
+                        usage=data.get("usage")
+                    ))
+                except (ValueError, KeyError) as e:
+                    # 녹화 중 프로세스가 종료되어 잘린 마지막 줄 등은 건너뜀
+                    logger.warning(f"cassette 줄 무시 ({path}:{line_number}): {e}")
+        if not recordings:
+            raise ValueError(f"재생할 녹화가 없는 cassette: {path}")
+        cassette = cls(recordings)
+        logger.info(f"cassette 로드: {path} ({len(recordings)}개 녹화, {len(cassette._by_key)}개 키)")
+        return cassette
+
+    def lookup(self, key: str, on_miss: str = "any") -> Recording:
+        """
+        키에 해당하는 녹화 반환
+
+        Args:
+            key: cassette_key(messages)
+            on_miss: 녹화가 없을 때 처리 (any: 키 해시로 결정되는 임의의 녹화, error: 예외)
+
+        Raises:
+            CassetteMissError: 녹화가 없고 on_miss가 error
+        """
+        with self._lock:
+            candidates = self._by_key.get(key)
+            if candidates:
+                self.hits += 1
+                cursor = self._cursors.get(key, 0)
+                self._cursors[key] = cursor + 1
+                return candidates[cursor % len(candidates)]
+            self.misses += 1
+        if on_miss == "error":
+            raise CassetteMissError(f"cassette에 없는 요청: {key[:12]}")
+        # 같은 요청은 항상 같은 녹화로 재생 (결정적)
+        return self.recordings[int(key[:16], 16) % len(self.recordings)]
+
+    def stats(self) -> Dict[str, Any]:
+        return {"recordings": len(self.recordings), "keys": len(self._by_key), "hits": self.hits, "misses": self.misses}
+
+
+@lru_cache()
+def load_cassette(path: str) -> Cassette:
+    """프로세스 안에서 공유하는 cassette (경로별로 한 번만 로드)"""
+    return Cassette.load(path)
+
+
+class CassetteWriter:
+    """녹화를 JSONL 파일 끝에 한 줄씩 추가 (줄 단위로 flush, 여러 모델/스레드가 공유)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file: Optional[IO[str]] = None
+
+    def write(self, model: str, messages: List[BaseMessage], recording: Recording) -> None:
+        line = json.dumps({
+            "v": CASSETTE_VERSION,
+            "key": recording.key,
+            "model": model,
+            "messages": [[message.type, str(message.content)] for message in messages],
+            "chunks": recording.chunks,
+            "delays": [round(delay, DELAY_PRECISION) for delay in recording.delays],
+            "usage": recording.usage,
+        }, ensure_ascii=False, separators=(",", ":"))
+        with self._lock:
+            if self._file is None:
+                Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+_writers: Dict[str, CassetteWriter] = {}
+_writers_lock = threading.Lock()
+
+
+def get_writer(path: str) -> CassetteWriter:
+    """경로별로 공유하는 녹화 writer"""
+    with _writers_lock:
+        writer = _writers.get(path)
+        if writer is None:
+            writer = _writers[path] = CassetteWriter(path)
+        return writer
+
+
+def close_writers() -> None:
+    """열린 녹화 파일 닫기 (앱 종료 시)"""
+    with _writers_lock:
+        writers = list(_writers.values())
+        _writers.clear()
+    for writer in writers:
+        writer.close()
+
+
+# 상위 실행(그래프 노드)의 콜백을 물려받지 않는 내부 호출 config
+_ISOLATED: RunnableConfig = {"callbacks": []}
+
+
+class _Timer:
+    """조각 도착 간격 측정"""
+
+    def __init__(self):
+        self.chunks: List[str] = []
+        self.delays: List[float] = []
+        self.usage: Optional[Dict[str, Any]] = None
+        self._last = time.perf_counter()
+
+    def add(self, chunk: AIMessageChunk) -> None:
+        now = time.perf_counter()
+        self.chunks.append(chunk.content if isinstance(chunk.content, str) else "")
+        self.delays.append(now - self._last)
+        self._last = now
+        if chunk.usage_metadata:
+            self.usage = dict(chunk.usage_metadata)
+
+    def recording(self, messages: List[BaseMessage]) -> Recording:
+        return Recording(cassette_key(messages), "", self.chunks, self.delays, self.usage)
+
+
+class RecordingChatModel(BaseChatModel):
+    """
+    다른 채팅 모델을 감싸 호출마다 요청/응답/토큰 도착 간격을 cassette에 녹화
+
+    스트리밍이 아닌 호출도 내부적으로 스트리밍으로 받아 토큰 타이밍을 기록합니다.
+    완료되지 않은 호출(오류/취소)은 기록하지 않습니다.
+    토큰 콜백은 이 래퍼가 한 번만 보내도록 내부 모델 호출에는 상위 콜백을 물려주지 않습니다.
+    """
+
+    inner: BaseChatModel
+    path: str
+    model_name: str = ""
+
+    def model_post_init(self, __context: Any) -> None:
+        super().model_post_init(__context)
+        if not self.model_name:
+            self.model_name = getattr(self.inner, "model_name", "") or ""
+
+    @property
+    def _llm_type(self) -> str:
+        return f"recording-{self.inner._llm_type}"
+
+    def _record(self, messages: List[BaseMessage], timer: _Timer) -> None:
+        try:
+            get_writer(self.path).write(self.model_name, messages, timer.recording(messages))
+        except OSError as e:
+            logger.warning(f"cassette 기록 실패 ({self.path}): {e}")
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any
+    ) -> ChatResult:
+        return generate_from_stream(self._stream(messages, stop, run_manager, **kwargs))
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any
+    ) -> ChatResult:
+        return await agenerate_from_stream(self._astream(messages, stop, run_manager, **kwargs))
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any
+    ) -> Iterator[ChatGenerationChunk]:
+        timer = _Timer()
+        for chunk in self.inner.stream(messages, _ISOLATED, stop=stop, **kwargs):
+            timer.add(chunk)
+            generation = ChatGenerationChunk(message=chunk)
+            if run_manager:
+                run_manager.on_llm_new_token(timer.chunks[-1], chunk=generation)
+            yield generation
+        self._record(messages, timer)
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        timer = _Timer()
+        async for chunk in self.inner.astream(messages, _ISOLATED, stop=stop, **kwargs):
+            timer.add(chunk)
+            generation = ChatGenerationChunk(message=chunk)
+            if run_manager:
+                await run_manager.on_llm_new_token(timer.chunks[-1], chunk=generation)
+            yield generation
+        self._record(messages, timer)
+
+
+class ReplayChatModel(BaseChatModel):
+    """
+    cassette에 녹화된 응답을 원래 타이밍(time_scale배)으로 재생하는 채팅 모델
+
+    요청 메시지가 같은 녹화를 찾아 재생하고, 없으면 on_miss에 따라 처리합니다.
+    (any: 요청 키 해시로 고른 녹화를 재생해 운영과 같은 지연 시간 분포 유지, error: CassetteMissError)
+    time_scale이 0이면 기다리지 않고 바로 응답합니다.
+    """
+
+    model_name: str = "replay"
+    cassette: str
+    time_scale: float = 1.0
+    on_miss: str = "any"
+
+    _cassette: Optional[Cassette] = PrivateAttr(default=None)
+
+    def model_post_init(self, __context: Any) -> None:
+        super().model_post_init(__context)
+        if self.on_miss not in MISS_POLICIES:
+            raise ValueError(f"지원하지 않는 cassette miss 정책: {self.on_miss} ({', '.join(MISS_POLICIES)})")
+        self._cassette = load_cassette(self.cassette)
+
+    @property
+    def _llm_type(self) -> str:
+        return "replay-chat-model"
+
+    def _lookup(self, messages: List[BaseMessage]) -> Recording:
+        return self._cassette.lookup(cassette_key(messages), self.on_miss)
+
+    def _message(self, recording: Recording) -> AIMessage:
+        return AIMessage(
+            content=recording.content,
+            usage_metadata=recording.usage,
+            response_metadata={"model_name": recording.model or self.model_name},
+        )
+
+    def _chunks(self, recording: Recording) -> Iterator[Tuple[float, ChatGenerationChunk]]:
+        """(대기 시간, 청크) 목록 (마지막 청크에 사용량 포함)"""
+        last = len(recording.chunks) - 1
+        for i, (text, delay) in enumerate(zip(recording.chunks, recording.delays)):
+            usage = recording.usage if i == last else None
+            yield delay * self.time_scale, ChatGenerationChunk(message=AIMessageChunk(content=text, usage_metadata=usage))
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any
+    ) -> ChatResult:
+        recording = self._lookup(messages)
+        if self.time_scale > 0:
+            time.sleep(recording.duration * self.time_scale)
+        return ChatResult(generations=[ChatGeneration(message=self._message(recording))])
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any
+    ) -> ChatResult:
+        recording = self._lookup(messages)
+        if self.time_scale > 0:
+            await asyncio.sleep(recording.duration * self.time_scale)
+        return ChatResult(generations=[ChatGeneration(message=self._message(recording))])
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any
+    ) -> Iterator[ChatGenerationChunk]:
+        for delay, chunk in self._chunks(self._lookup(messages)):
+            if delay > 0:
+                time.sleep(delay)
+            if run_manager:
+                run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        for delay, chunk in self._chunks(self._lookup(messages)):
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if run_manager:
+                await run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
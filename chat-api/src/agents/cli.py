@@ -4,33 +4,67 @@ Typer를 사용한 에이전트 대화 인터페이스
 """
 
 import asyncio
-from typing import List, Dict
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, List, Dict, Optional
 import typer
 from rich.console import Console
+from rich.live import Live
+from rich.progress import (
+    BarColumn,
+    MofNCompleteColumn,
+    Progress,
+    ProgressColumn,
+    TextColumn,
+    TimeElapsedColumn,
+    TimeRemainingColumn,
+)
+from rich.text import Text
 from rich.prompt import Prompt
 from rich.markdown import Markdown
 from rich.panel import Panel
 from pydantic import ValidationError
 
-from .default import DefaultAgent
-from .settings import get_settings
+from .base import convert_legacy_history
+from .batch import BatchCheckpoint, count_lines, default_checkpoint_path, run_batch
+from .settings import AgentSettings, get_settings
+
+if TYPE_CHECKING:
+    from .default import DefaultAgent
 
 app = typer.Typer(help="Agent Lab CLI - 에이전트와 대화하기")
 console = Console()
-settings = get_settings()
+
+
+def _create_agent(model: Optional[str]) -> "DefaultAgent":
+    """
+    에이전트 생성 (LangChain/LangGraph는 에이전트가 필요한 명령에서만 import)
+    
+    Raises:
+        typer.Exit: 생성 실패
+    """
+    try:
+        from .default import DefaultAgent
+        return DefaultAgent(model_name=model)
+    except Exception as e:
+        console.print(f"[red]에이전트 초기화 실패: {e}[/red]")
+        raise typer.Exit(1)
 
 
 @app.command()
 def chat(
     model: str = typer.Option(None, "--model", "-m", help="사용할 OpenAI 모델 (기본값: 설정에서 로드)"),
     system_prompt: str = typer.Option(None, "--system", "-s", help="시스템 프롬프트"),
+    stream: bool = typer.Option(False, "--stream", help="토큰 단위 스트리밍 출력"),
+    verbose: bool = typer.Option(False, "--verbose", "-v", help="턴별 지연 시간(첫 토큰, 전체) 출력"),
 ):
     """기본 에이전트와 대화를 시작합니다."""
     
     # 설정 유효성 검사
     try:
         # 설정 로드 시도 (ValidationError 발생 가능)
-        api_key = settings.openai_api_key
+        settings = get_settings()
         used_model = model or settings.openai_model
     except ValidationError as e:
         console.print(f"[red]설정 오류: {e}[/red]")
@@ -48,11 +82,7 @@ def chat(
     ))
     
     # 에이전트 초기화
-    try:
-        agent = DefaultAgent(model_name=model)
-    except Exception as e:
-        console.print(f"[red]에이전트 초기화 실패: {e}[/red]")
-        raise typer.Exit(1)
+    agent = _create_agent(model)
     chat_history: List[Dict[str, str]] = []
     
     # 시스템 프롬프트 추가
@@ -61,70 +91,213 @@ def chat(
         console.print(f"[dim]시스템 프롬프트 설정: {system_prompt}[/dim]")
     
     try:
-        while True:
-            # 사용자 입력
-            user_input = Prompt.ask("\n[bold cyan]You[/bold cyan]")
-            
-            # 종료 명령어 확인
-            if user_input.lower() in ["/quit", "/exit", "quit", "exit"]:
-                console.print("[yellow]대화를 종료합니다.[/yellow]")
-                break
-            
-            if not user_input.strip():
-                continue
-            
-            # 채팅 기록에 사용자 메시지 추가
-            chat_history.append({"role": "user", "content": user_input})
-            
-            # 에이전트 응답 생성
-            with console.status("[bold green]생각 중...[/bold green]"):
-                try:
-                    response = asyncio.run(agent.invoke_legacy(user_input, chat_history[:-1]))
-                    
-                    # 응답 출력
-                    console.print("\n[bold green]Assistant[/bold green]")
-                    console.print(Markdown(response))
-                    
-                    # 채팅 기록에 응답 추가
-                    chat_history.append({"role": "assistant", "content": response})
-                    
-                except Exception as e:
-                    console.print(f"[red]오류가 발생했습니다: {e}[/red]")
-                    # 실패한 경우 사용자 메시지를 히스토리에서 제거
-                    chat_history.pop()
-    
+        # 연결 풀 재사용을 위해 전체 대화 루프를 하나의 이벤트 루프에서 실행
+        asyncio.run(_chat_loop(agent, chat_history, stream, verbose))
     except KeyboardInterrupt:
         console.print("\n[yellow]대화를 종료합니다.[/yellow]")
     except Exception as e:
         console.print(f"[red]예상치 못한 오류: {e}[/red]")
 
 
+async def _ask(prompt: str) -> str:
+    """
+    이벤트 루프를 막지 않도록 별도 스레드에서 사용자 입력 대기
+    
+    데몬 스레드를 사용하므로 Ctrl+C로 종료할 때 입력 대기 중인 스레드를 기다리지 않습니다.
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+    
+    def worker():
+        try:
+            result = Prompt.ask(prompt)
+        except BaseException as e:
+            loop.call_soon_threadsafe(future.set_exception, e)
+        else:
+            loop.call_soon_threadsafe(future.set_result, result)
+    
+    threading.Thread(target=worker, name="cli-input", daemon=True).start()
+    return await future
+
+
+async def _chat_loop(
+    agent: "DefaultAgent",
+    chat_history: List[Dict[str, str]],
+    stream: bool,
+    verbose: bool
+) -> None:
+    """대화 루프"""
+    while True:
+        # 사용자 입력
+        user_input = await _ask("\n[bold cyan]You[/bold cyan]")
+        
+        # 종료 명령어 확인
+        if user_input.lower() in ["/quit", "/exit", "quit", "exit"]:
+            console.print("[yellow]대화를 종료합니다.[/yellow]")
+            break
+        
+        if not user_input.strip():
+            continue
+        
+        # 채팅 기록에 사용자 메시지 추가
+        chat_history.append({"role": "user", "content": user_input})
+        
+        # 에이전트 응답 생성
+        started_at = time.perf_counter()
+        first_token_at: Optional[float] = None
+        try:
+            if stream:
+                response, first_token_at = await _stream_response(agent, user_input, chat_history[:-1])
+            else:
+                with console.status("[bold green]생각 중...[/bold green]"):
+                    response = await agent.invoke_legacy(user_input, chat_history[:-1])
+                
+                # 응답 출력
+                console.print("\n[bold green]Assistant[/bold green]")
+                console.print(Markdown(response))
+            
+            # 채팅 기록에 응답 추가
+            chat_history.append({"role": "assistant", "content": response})
+            
+        except Exception as e:
+            console.print(f"[red]오류가 발생했습니다: {e}[/red]")
+            # 실패한 경우 사용자 메시지를 히스토리에서 제거
+            chat_history.pop()
+            continue
+        
+        if verbose:
+            total = time.perf_counter() - started_at
+            if first_token_at is not None:
+                console.print(f"[dim]첫 토큰: {first_token_at - started_at:.2f}s · 전체: {total:.2f}s[/dim]")
+            else:
+                console.print(f"[dim]전체: {total:.2f}s[/dim]")
+
+
+async def _stream_response(
+    agent: "DefaultAgent",
+    message: str,
+    chat_history: List[Dict[str, str]]
+) -> tuple[str, Optional[float]]:
+    """
+    토큰을 받는 즉시 화면에 렌더링하며 응답 생성
+    
+    Returns:
+        (전체 응답, 첫 토큰 수신 시각)
+    """
+    history = convert_legacy_history(chat_history) if chat_history else None
+    chunks: List[str] = []
+    first_token_at: Optional[float] = None
+    
+    console.print("\n[bold green]Assistant[/bold green]")
+    with Live(Markdown(""), console=console, refresh_per_second=12, vertical_overflow="visible") as live:
+        async for chunk in agent.stream(message, history):
+            if first_token_at is None:
+                first_token_at = time.perf_counter()
+            chunks.append(chunk)
+            live.update(Markdown("".join(chunks)))
+    
+    return "".join(chunks), first_token_at
+
+
+class _ThroughputColumn(ProgressColumn):
+    """초당 처리 요청 수"""
+    
+    def render(self, task) -> Text:
+        speed = task.finished_speed or task.speed
+        return Text(f"{speed:.1f} req/s" if speed else "- req/s", style="cyan")
+
+
+@app.command()
+def batch(
+    input_path: Path = typer.Argument(..., exists=True, dir_okay=False, help="입력 JSONL (message, history, system, id)"),
+    output_path: Path = typer.Option(..., "--output", "-o", help="결과 JSONL 경로"),
+    model: str = typer.Option(None, "--model", "-m", help="사용할 OpenAI 모델 (기본값: 설정에서 로드)"),
+    concurrency: int = typer.Option(8, "--concurrency", "-c", min=1, help="동시에 처리할 최대 요청 수"),
+    checkpoint: Optional[Path] = typer.Option(None, help="체크포인트 경로 (기본값: <출력 파일>.checkpoint)"),
+    resume: bool = typer.Option(True, "--resume/--restart", help="체크포인트에서 이어서 처리 / 처음부터 다시 처리"),
+):
+    """JSONL 프롬프트 파일을 에이전트로 일괄 처리합니다."""
+    checkpoint_path = checkpoint or default_checkpoint_path(output_path)
+    agent = _create_agent(model)
+    
+    total = count_lines(input_path)
+    progress = Progress(
+        TextColumn("[bold blue]배치 처리"),
+        BarColumn(),
+        MofNCompleteColumn(),
+        _ThroughputColumn(),
+        TextColumn("[red]실패 {task.fields[failed]}"),
+        TimeElapsedColumn(),
+        TextColumn("ETA"),
+        TimeRemainingColumn(),
+        console=console
+    )
+    # 재개 시 이미 처리한 줄부터 진행률 표시
+    initial = BatchCheckpoint.load(checkpoint_path) if resume else BatchCheckpoint()
+    task_id = progress.add_task("batch", total=total, completed=initial.completed, failed=initial.failed)
+    failed = initial.failed
+    
+    def on_result(ok: bool) -> None:
+        nonlocal failed
+        failed += 0 if ok else 1
+        progress.update(task_id, advance=1, failed=failed)
+    
+    def on_skip() -> None:
+        # count_lines는 빈 줄도 세므로 건너뛴 빈 줄만큼 진행
+        progress.update(task_id, advance=1)
+    
+    try:
+        with progress:
+            result = asyncio.run(run_batch(
+                agent,
+                input_path,
+                output_path,
+                checkpoint_path,
+                concurrency=concurrency,
+                resume=resume,
+                on_result=on_result,
+                on_skip=on_skip
+            ))
+    except KeyboardInterrupt:
+        console.print(f"\n[yellow]중단되었습니다. 같은 명령으로 다시 실행하면 이어서 처리합니다. ({checkpoint_path})[/yellow]")
+        raise typer.Exit(130)
+    
+    console.print(
+        f"[green]완료: 성공 {result.succeeded}건, 실패 {result.failed}건[/green] → {output_path}"
+    )
+
+
 @app.command()
 def info():
     """에이전트 정보를 출력합니다."""
+    # API 키가 없어도 나머지 설정은 확인할 수 있도록 키만 비워 둔 채 로드
     try:
-        # 현재 설정값 표시
-        console.print(Panel(
-            f"[bold blue]Agent Lab CLI[/bold blue]\n\n"
-            f"현재 설정:\n"
-            f"• 모델: {settings.openai_model}\n"
-            f"• 온도: {settings.openai_temperature}\n"
-            f"• 타임아웃: {settings.agent_timeout}초\n"
-            f"• 최대 재시도: {settings.agent_max_retries}회\n\n"
-            f"사용 가능한 명령어:\n"
-            f"• [cyan]chat[/cyan] - 기본 에이전트와 대화\n"
-            f"• [cyan]info[/cyan] - 이 정보 표시\n\n"
-            f"환경변수 설정:\n"
-            f"• [yellow]OPENAI_API_KEY[/yellow] - OpenAI API 키 (필수)\n"
-            f"• [yellow]OPENAI_MODEL[/yellow] - 기본 모델명\n"
-            f"• [yellow]OPENAI_TEMPERATURE[/yellow] - 모델 온도 (0.0-2.0)\n"
-            f"• [yellow]AGENT_TIMEOUT[/yellow] - 응답 타임아웃 (초)",
-            border_style="green"
-        ))
-    except ValidationError as e:
-        console.print(f"[red]설정 로드 실패: {e}[/red]")
-        console.print("필수 환경변수가 설정되지 않았습니다.")
-        console.print("OPENAI_API_KEY를 설정해주세요.")
+        settings = get_settings()
+        api_key_status = "[green]설정됨[/green]"
+    except ValidationError:
+        settings = AgentSettings(openai_api_key="")
+        api_key_status = "[red]미설정[/red] (chat, batch 실행 전 OPENAI_API_KEY 설정 필요)"
+    
+    # 현재 설정값 표시
+    console.print(Panel(
+        f"[bold blue]Agent Lab CLI[/bold blue]\n\n"
+        f"현재 설정:\n"
+        f"• 모델: {settings.openai_model}\n"
+        f"• 온도: {settings.openai_temperature}\n"
+        f"• 타임아웃: {settings.agent_timeout}초\n"
+        f"• 최대 재시도: {settings.agent_max_retries}회\n"
+        f"• API 키: {api_key_status}\n\n"
+        f"사용 가능한 명령어:\n"
+        f"• [cyan]chat[/cyan] - 기본 에이전트와 대화\n"
+        f"• [cyan]batch[/cyan] - JSONL 프롬프트 파일 일괄 처리\n"
+        f"• [cyan]info[/cyan] - 이 정보 표시\n\n"
+        f"환경변수 설정:\n"
+        f"• [yellow]OPENAI_API_KEY[/yellow] - OpenAI API 키 (필수)\n"
+        f"• [yellow]OPENAI_MODEL[/yellow] - 기본 모델명\n"
+        f"• [yellow]OPENAI_TEMPERATURE[/yellow] - 모델 온도 (0.0-2.0)\n"
+        f"• [yellow]AGENT_TIMEOUT[/yellow] - 응답 타임아웃 (초)",
+        border_style="green"
+    ))
 
 
 if __name__ == "__main__":
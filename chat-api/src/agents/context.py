@@ -0,0 +1,255 @@
+"""
+컨텍스트 윈도우 관리
+토큰 수 기준으로 LLM에 보낼 대화 기록을 잘라내거나 요약
+"""
+
+import hashlib
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+
+logger = logging.getLogger(__name__)
+
+CONTEXT_STRATEGIES = ("none", "sliding_window", "last_n", "summarize")
+
+# 메시지마다 붙는 역할/구분자 토큰 근사값
+MESSAGE_OVERHEAD_TOKENS = 4
+
+SUMMARY_PROMPT = (
+    "다음 대화 내용을 이후 대화에 필요한 사실, 결정 사항, 사용자 선호를 중심으로 간결하게 요약하세요.\n"
+    "이전 요약이 있다면 새 내용과 합쳐 하나의 요약으로 작성하세요."
+)
+SUMMARY_PREFIX = "이전 대화 요약:\n"
+
+# 요약 요청 메시지를 받아 LLM 응답을 돌려주는 호출 함수 (에이전트가 deadline/재시도/스케줄러를 적용해 전달)
+Summarizer = Callable[[List[BaseMessage]], Awaitable[BaseMessage]]
+
+
+@lru_cache(maxsize=None)
+def _load_encoding(model: Optional[str]):
+    """모델에 맞는 tiktoken 인코딩 로드 (실패 시 None, 결과는 프로세스 단위로 캐시)"""
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+
+    try:
+        try:
+            return tiktoken.encoding_for_model(model or "")
+        except KeyError:
+            return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        # 인코딩 파일 다운로드 실패 등 (오프라인 환경)
+        logger.warning(f"tiktoken 인코딩 로드 실패, 문자 수 기반으로 토큰 수를 추정합니다: {e}")
+        return None
+
+
+class TokenCounter:
+    """로컬 토큰 카운터 (tiktoken, 사용할 수 없으면 문자 수 기반 추정)"""
+
+    def __init__(self, model: Optional[str] = None, chars_per_token: float = 4.0):
+        """
+        Args:
+            model: 토크나이저를 고를 모델명
+            chars_per_token: 문자 수 기반 추정 시 토큰당 문자 수
+        """
+        self._encoding = _load_encoding(model)
+        self._chars_per_token = chars_per_token
+
+    @property
+    def exact(self) -> bool:
+        """tiktoken 사용 여부"""
+        return self._encoding is not None
+
+    def count_text(self, text: str) -> int:
+        """텍스트 토큰 수"""
+        if self._encoding is not None:
+            return len(self._encoding.encode(text, disallowed_special=()))
+        return int(len(text) / self._chars_per_token) + 1
+
+    def count_message(self, message: BaseMessage) -> int:
+        """메시지 토큰 수 (역할 오버헤드 포함)"""
+        content = message.content if isinstance(message.content, str) else str(message.content)
+        return self.count_text(content) + MESSAGE_OVERHEAD_TOKENS
+
+    def count_messages(self, messages: Sequence[BaseMessage]) -> int:
+        """메시지 목록 토큰 수"""
+        return sum(self.count_message(message) for message in messages)
+
+
+@dataclass
+class ContextWindowConfig:
+    """컨텍스트 윈도우 설정"""
+    strategy: str = "sliding_window"
+    max_tokens: int = 16000
+    keep_last: int = 10
+
+    def __post_init__(self):
+        if self.strategy not in CONTEXT_STRATEGIES:
+            raise ValueError(f"지원하지 않는 컨텍스트 전략: {self.strategy}")
+
+    @classmethod
+    def from_sources(cls, settings: Any, metadata: Optional[Dict[str, Any]] = None) -> "ContextWindowConfig":
+        """
+        설정값과 AgentConfig.metadata["context"]로 생성 (metadata가 우선)
+
+        Args:
+            settings: AgentSettings
+            metadata: AgentConfig.metadata
+        """
+        overrides = (metadata or {}).get("context") or {}
+        return cls(
+            strategy=overrides.get("strategy", settings.context_strategy),
+            max_tokens=overrides.get("max_tokens", settings.context_max_tokens),
+            keep_last=overrides.get("keep_last", settings.context_keep_last),
+        )
+
+
+class ContextWindowManager:
+    """LLM에 보낼 메시지를 토큰 예산 안으로 맞추는 관리자"""
+
+    def __init__(
+        self,
+        config: ContextWindowConfig,
+        counter: TokenCounter,
+        summary_cache_size: int = 256
+    ):
+        """
+        Args:
+            config: 컨텍스트 윈도우 설정
+            counter: 토큰 카운터
+            summary_cache_size: 보관할 최대 요약 수
+        """
+        self.config = config
+        self.counter = counter
+        self._summary_cache_size = summary_cache_size
+        self._summaries: "OrderedDict[str, str]" = OrderedDict()
+
+    async def apply(
+        self,
+        messages: List[BaseMessage],
+        llm: Optional[BaseChatModel] = None,
+        invoke: Optional[Summarizer] = None
+    ) -> List[BaseMessage]:
+        """
+        전략에 따라 메시지 목록 조정
+
+        맨 앞에 연속된 시스템 메시지(고정 prefix)와 마지막(현재) 메시지는 항상 유지합니다.
+        대화 중간의 시스템 메시지는 업스트림 prompt cache가 깨지지 않도록 앞으로 옮기지 않고
+        일반 턴과 같이 제자리에서 다룹니다.
+
+        Args:
+            messages: 전체 메시지 목록
+            llm: summarize 전략에서 요약에 사용할 모델
+            invoke: 요약 호출 함수 (지정 시 llm.ainvoke 대신 사용)
+
+        Returns:
+            조정된 메시지 목록
+        """
+        strategy = self.config.strategy
+        if strategy == "none" or len(messages) <= 1:
+            return messages
+
+        pinned = 0
+        while pinned < len(messages) - 1 and isinstance(messages[pinned], SystemMessage):
+            pinned += 1
+        system, turns = messages[:pinned], messages[pinned:]
+
+        if strategy == "last_n":
+            return system + turns[-(self.config.keep_last + 1):]
+
+        if strategy == "summarize":
+            if self.counter.count_messages(messages) <= self.config.max_tokens:
+                return messages
+            if invoke is None:
+                if llm is None:
+                    raise ValueError("summarize 전략에는 요약에 사용할 모델이 필요합니다.")
+                invoke = llm.ainvoke
+            system, turns = await self._summarize(system, turns, invoke)
+
+        return system + self._fit_recent(turns, self.config.max_tokens - self.counter.count_messages(system))
+
+    def _fit_recent(self, turns: List[BaseMessage], budget: int) -> List[BaseMessage]:
+        """예산 안에 들어가는 최근 메시지만 유지 (마지막 메시지는 항상 포함)"""
+        kept: List[BaseMessage] = []
+        used = 0
+        for message in reversed(turns):
+            tokens = self.counter.count_message(message)
+            if kept and used + tokens > budget:
+                break
+            kept.append(message)
+            used += tokens
+        kept.reverse()
+        return kept
+
+    async def _summarize(
+        self,
+        system: List[BaseMessage],
+        turns: List[BaseMessage],
+        invoke: Summarizer
+    ) -> tuple[List[BaseMessage], List[BaseMessage]]:
+        """
+        오래된 턴을 요약 메시지로 대체
+
+        요약 경계를 keep_last 단위로 맞춰 같은 대화 prefix에서는 캐시된 요약을 재사용하고,
+        경계가 한 단계 늘어나면 이전 요약에 새 구간만 더해 요약합니다.
+        """
+        step = max(1, self.config.keep_last)
+        split = ((len(turns) - step) // step) * step
+        if split <= 0:
+            return system, turns
+
+        summary = await self._summary_for(turns, split, step, invoke)
+        summary_message = SystemMessage(content=SUMMARY_PREFIX + summary)
+        return system + [summary_message], turns[split:]
+
+    async def _summary_for(self, turns: List[BaseMessage], split: int, step: int, invoke: Summarizer) -> str:
+        """turns[:split] 요약 (캐시 사용)"""
+        key = self._prefix_key(turns[:split])
+        cached = self._summaries.get(key)
+        if cached is not None:
+            self._summaries.move_to_end(key)
+            return cached
+
+        previous = None
+        start = 0
+        if split - step > 0:
+            previous = self._summaries.get(self._prefix_key(turns[:split - step]))
+            if previous is not None:
+                start = split - step
+
+        summary = await self._call_summarizer(previous, turns[start:split], invoke)
+
+        self._summaries[key] = summary
+        while len(self._summaries) > self._summary_cache_size:
+            self._summaries.popitem(last=False)
+        return summary
+
+    @staticmethod
+    def _prefix_key(messages: Sequence[BaseMessage]) -> str:
+        """대화 prefix 해시"""
+        digest = hashlib.sha256()
+        for message in messages:
+            digest.update(message.type.encode("utf-8"))
+            digest.update(b"\x00")
+            digest.update(str(message.content).encode("utf-8"))
+            digest.update(b"\x00")
+        return digest.hexdigest()
+
+    @staticmethod
+    async def _call_summarizer(previous: Optional[str], messages: Sequence[BaseMessage], invoke: Summarizer) -> str:
+        """LLM으로 요약 생성"""
+        transcript = "\n".join(f"{message.type}: {message.content}" for message in messages)
+        if previous:
+            transcript = f"[이전 요약]\n{previous}\n\n[새 대화]\n{transcript}"
+
+        response = await invoke([
+            SystemMessage(content=SUMMARY_PROMPT),
+            HumanMessage(content=transcript),
+        ])
+        return response.content if isinstance(response.content, str) else str(response.content)
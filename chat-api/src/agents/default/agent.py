@@ -4,14 +4,21 @@ LangGraph를 사용한 간단한 대화형 에이전트 구현
 """
 
 from typing import Dict, Any, List, Optional, AsyncGenerator
-from langchain_openai import ChatOpenAI
-from langchain_core.messages import HumanMessage, AIMessage, BaseMessage
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+from langchain_core.runnables import RunnableConfig
 from langgraph.graph import StateGraph, END
 from langgraph.graph.message import add_messages
 from typing_extensions import TypedDict
 
 from ..settings import get_settings
 from ..base import BaseAgent, ChatMessage, AgentConfig, convert_legacy_history
+from ..context import ContextWindowConfig, ContextWindowManager, TokenCounter
+from ..execution import Deadline, ExecutionPolicy, run_with_retry, stream_with_retry
+from ..hedging import Backend, HedgingExecutor, get_hedging_executor, parse_backends
+from ..prompt import PromptAssembler, PromptConfig
+from ..scheduler import UpstreamScheduler, get_scheduler
+from .. import registry, tracing, usage
 
 
 class AgentState(TypedDict):
@@ -19,13 +26,28 @@ class AgentState(TypedDict):
     messages: List[BaseMessage]
 
 
+def _dispatch(method_name: str):
+    """
+    요청 config의 에이전트 인스턴스로 위임하는 그래프 노드 생성
+    
+    노드가 특정 인스턴스에 묶이지 않으므로 컴파일된 그래프를 모든 인스턴스가 공유할 수 있습니다.
+    """
+    async def node(state: AgentState, config: RunnableConfig) -> Dict[str, Any]:
+        agent = config["configurable"]["agent"]
+        return await getattr(agent, method_name)(state, config)
+    
+    node.__name__ = method_name
+    return node
+
+
 class DefaultAgent(BaseAgent):
     """기본 채팅 에이전트"""
     
-    def __init__(self, model_name: str = None):
+    def __init__(self, model_name: str = None, llm: Optional[BaseChatModel] = None):
         """
         Args:
             model_name: 사용할 OpenAI 모델명 (None이면 설정값 사용)
+            llm: 사용할 채팅 모델 (None이면 ChatOpenAI 생성, 테스트용 가짜 모델 주입 가능)
         """
         settings = get_settings()
         
@@ -40,14 +62,55 @@ class DefaultAgent(BaseAgent):
         )
         super().__init__(config)
         
-        # LangChain/LangGraph 설정
-        self.llm = ChatOpenAI(
-            model=self.config.model,
-            temperature=self.config.temperature,
-            api_key=settings.openai_api_key,
-            max_tokens=self.config.max_tokens
+        # 고정 prefix(시스템 프롬프트, 지침) -> 대화 기록 -> 요청별 내용 순서로 메시지 조립
+        self.prompt = PromptAssembler(PromptConfig.from_sources(settings, self.config.metadata))
+        
+        # 프롬프트 크기를 제한하는 컨텍스트 윈도우 관리자
+        self.context_manager = ContextWindowManager(
+            ContextWindowConfig.from_sources(settings, self.config.metadata),
+            TokenCounter(self.config.model)
         )
-        self.graph = self._build_graph()
+        
+        # 타임아웃/재시도 정책 (재시도는 deadline을 아는 실행 래퍼가 담당)
+        self.execution_policy = ExecutionPolicy(
+            timeout=settings.agent_timeout,
+            max_retries=settings.agent_max_retries,
+            base_delay=settings.agent_retry_base_delay,
+            max_delay=settings.agent_retry_max_delay
+        )
+        
+        # LangChain/LangGraph 설정 (LLM 클라이언트와 컴파일된 그래프는 프로세스 단위로 공유)
+        self._api_key = settings.openai_api_key
+        self._backend = settings.llm_backend
+        self._backend_options: Dict[str, Dict[str, Any]] = {
+            "fake": {
+                "ttft": settings.fake_llm_ttft,
+                "tokens_per_second": settings.fake_llm_tokens_per_second,
+                "response_tokens": settings.fake_llm_response_tokens,
+                "rpm": settings.fake_llm_rpm,
+                "tpm": settings.fake_llm_tpm,
+                "latency_jitter": settings.fake_llm_latency_jitter,
+                "slow_rate": settings.fake_llm_slow_rate,
+                "slow_factor": settings.fake_llm_slow_factor,
+                "error_rate": settings.fake_llm_error_rate
+            },
+            "replay": {
+                "cassette": settings.llm_replay_cassette,
+                "time_scale": settings.llm_replay_time_scale,
+                "on_miss": settings.llm_replay_on_miss
+            }
+        }
+        self._record_path = settings.llm_record_cassette
+        self._custom_llm = llm is not None
+        self.llm = llm or self._get_llm()
+        
+        # 모델별 rate limit 안에서 호출을 내보내는 공유 스케줄러 (비활성화 시 None)
+        self.scheduler: Optional[UpstreamScheduler] = get_scheduler()
+        
+        # 헤지 요청/페일오버 실행기와 폴백 백엔드 목록 (헤지와 폴백이 모두 꺼져 있으면 None)
+        self.hedging: Optional[HedgingExecutor] = get_hedging_executor()
+        self._fallbacks = parse_backends(settings.llm_fallback_models)
+        self.graph = registry.get_compiled_graph(self.__class__.__name__, self._build_graph)
     
     @property
     def name(self) -> str:
@@ -59,30 +122,193 @@ class DefaultAgent(BaseAgent):
         """에이전트 설명 반환"""
         return self.config.description
     
-    def _build_graph(self) -> StateGraph:
+    def _get_llm(self, model: Optional[str] = None, temperature: Optional[float] = None) -> BaseChatModel:
+        """
+        요청별 모델/온도에 맞는 LLM 클라이언트 반환
+        
+        주입된 모델을 사용하는 경우 오버라이드는 무시됩니다.
+        """
+        if self._custom_llm:
+            return self.llm
+        
+        return self._chat_model(self._backend, model or self.config.model, temperature)
+    
+    def _chat_model(self, backend: str, model: str, temperature: Optional[float]) -> BaseChatModel:
+        """백엔드/모델별로 캐시된 LLM 클라이언트 반환"""
+        return registry.get_chat_model(
+            model=model,
+            temperature=self.config.temperature if temperature is None else temperature,
+            max_tokens=self.config.max_tokens,
+            api_key=self._api_key,
+            timeout=self.execution_policy.timeout,
+            backend=backend,
+            record_path=self._record_path,
+            **self._backend_options.get(backend, {})
+        )
+    
+    def _backend_name(self, llm: BaseChatModel) -> str:
+        """지연 시간 추적에 쓰는 백엔드 이름 ("backend:model")"""
+        backend = "custom" if llm is self.llm and self._custom_llm else self._backend
+        return f"{backend}:{getattr(llm, 'model_name', self.config.model)}"
+    
+    def _fallback_backends(self, temperature: Optional[float]) -> List[Backend]:
+        """설정된 폴백 백엔드 목록 (요청 온도 적용)"""
+        backends = []
+        for backend, model in self._fallbacks:
+            backend = backend or self._backend
+            backends.append(Backend(f"{backend}:{model}", self._chat_model(backend, model, temperature)))
+        return backends
+    
+    @staticmethod
+    def _build_graph() -> StateGraph:
         """LangGraph 워크플로우 구성"""
         workflow = StateGraph(AgentState)
         
         # 노드 추가
-        workflow.add_node("chat", self._chat_node)
+        workflow.add_node("context", _dispatch("_context_node"))
+        workflow.add_node("chat", _dispatch("_chat_node"))
         
         # 진입점 설정
-        workflow.set_entry_point("chat")
+        workflow.set_entry_point("context")
+        workflow.add_edge("context", "chat")
         
         # 종료점 설정
         workflow.add_edge("chat", END)
         
         return workflow.compile()
     
-    async def _chat_node(self, state: AgentState) -> Dict[str, Any]:
+    async def _context_node(self, state: AgentState, config: RunnableConfig) -> Dict[str, Any]:
+        """컨텍스트 노드 - 토큰 예산에 맞게 대화 기록 정리 (필요 시 오래된 턴 요약)"""
+        configurable = config["configurable"]
+        llm = configurable.get("llm") or self.llm
+        
+        async def summarize(messages: List[BaseMessage]) -> BaseMessage:
+            # 요약도 본 호출과 같은 deadline/재시도/스케줄러 버킷/토큰 집계를 거침
+            # (요약 토큰은 클라이언트에 전송되지 않으므로 스트리밍 중에도 재시도)
+            with tracing.span("llm", model=getattr(llm, "model_name", self.config.model), purpose="summary") as span:
+                response = await run_with_retry(
+                    lambda: self._call_llm(llm, messages, configurable),
+                    self.execution_policy,
+                    configurable.get("deadline")
+                )
+                self._record_usage(span, response)
+            return response
+        
+        with tracing.span("context", strategy=self.context_manager.config.strategy):
+            messages = await self.context_manager.apply(state["messages"], llm, invoke=summarize)
+        return {"messages": messages}
+    
+    def _policy(self, configurable: Dict[str, Any]) -> ExecutionPolicy:
+        """노드 내부 재시도 정책 (스트리밍 중에는 이미 전송된 토큰이 중복되지 않도록 재시도 비활성화)"""
+        policy = self.execution_policy
+        if not configurable.get("retry", True):
+            policy = ExecutionPolicy(timeout=policy.timeout, max_retries=0)
+        return policy
+    
+    @staticmethod
+    def _record_usage(span: Any, response: BaseMessage) -> None:
+        """응답의 토큰 사용량을 span 속성(/metrics)과 요청별 사용량에 기록"""
+        usage_metadata = getattr(response, "usage_metadata", None)
+        if usage_metadata:
+            span.set_attribute("input_tokens", usage_metadata.get("input_tokens", 0))
+            span.set_attribute("output_tokens", usage_metadata.get("output_tokens", 0))
+            span.set_attribute("cached_tokens", usage.cached_tokens(usage_metadata))
+            usage.record(usage_metadata)
+    
+    async def _chat_node(self, state: AgentState, config: RunnableConfig) -> Dict[str, Any]:
         """채팅 노드 - LLM을 통해 응답 생성"""
         messages = state["messages"]
+        configurable = config["configurable"]
+        llm = configurable.get("llm") or self.llm
+        policy = self._policy(configurable)
+        
+        call = lambda: self._call_llm(llm, messages, configurable)  # noqa: E731
+        if self.hedging is not None:
+            # 가장 빠른 정상 백엔드부터 호출 (스트리밍은 이미 전송된 토큰과 섞이지 않도록 헤지/페일오버 없이 선택만)
+            primary = Backend(self._backend_name(llm), llm)
+            backends = [primary, *(b for b in configurable.get("fallbacks", ()) if b.name != primary.name)]
+            hedge = configurable.get("retry", True)
+            call = lambda: self.hedging.run(  # noqa: E731
+                backends,
+                lambda candidate: self._call_llm(candidate, messages, configurable),
+                hedge=hedge,
+                failover=hedge
+            )
         
-        # OpenAI API 호출
-        response = await self.llm.ainvoke(messages)
+        # OpenAI API 호출 (요청 deadline 안에서 재시도)
+        with tracing.span("llm", model=getattr(llm, "model_name", self.config.model)) as span:
+            response = await run_with_retry(call, policy, configurable.get("deadline"))
+            self._record_usage(span, response)
         
         return {"messages": [response]}
     
+    async def _call_llm(
+        self,
+        llm: BaseChatModel,
+        messages: List[BaseMessage],
+        configurable: Dict[str, Any]
+    ) -> BaseMessage:
+        """
+        LLM 호출 한 번 (스케줄러가 있으면 모델 rate limit 버킷에 여유가 생길 때까지 대기 후 호출)
+        
+        Raises:
+            QuotaExceededError: 테넌트 할당량이 요청 deadline 안에 회복되지 않음
+        """
+        if self.scheduler is None:
+            return await llm.ainvoke(messages)
+        
+        # 예상 토큰 수 = 입력 + 최대 출력 (OpenAI도 요청 시점에 max_tokens 기준으로 TPM을 차감)
+        tokens = self.context_manager.counter.count_messages(messages) + (
+            self.config.max_tokens or self.scheduler.output_tokens
+        )
+        deadline = configurable.get("deadline")
+        async with self.scheduler.permit(
+            getattr(llm, "model_name", self.config.model),
+            tokens,
+            priority=configurable.get("priority") or "standard",
+            tenant=configurable.get("tenant"),
+            timeout=deadline.remaining() if deadline is not None else None
+        ) as permit:
+            tracing.record("upstream_queue", permit.waited)
+            response = await llm.ainvoke(messages)
+            permit.settle(response)
+        return response
+    
+    def _deadline(self, kwargs: Dict[str, Any]) -> Deadline:
+        """요청 deadline 결정 (deadline > timeout > 설정값 순)"""
+        deadline = kwargs.get("deadline")
+        if deadline is not None:
+            return deadline
+        return Deadline(kwargs.get("timeout") or self.execution_policy.timeout)
+    
+    def _run_config(self, kwargs: Dict[str, Any], deadline: Deadline, **extra) -> RunnableConfig:
+        """그래프 실행 config 구성 (에이전트 인스턴스, 요청별 LLM과 폴백, deadline, 스케줄링 우선순위/테넌트 전달)"""
+        return {
+            "configurable": {
+                "agent": self,
+                "llm": self._get_llm(kwargs.get("model"), kwargs.get("temperature")),
+                "fallbacks": self._fallback_backends(kwargs.get("temperature")) if self.hedging is not None else [],
+                "deadline": deadline,
+                "priority": kwargs.get("priority"),
+                "tenant": kwargs.get("tenant"),
+                **extra
+            }
+        }
+    
+    def _build_messages(
+        self,
+        message: str,
+        chat_history: Optional[List[ChatMessage]] = None,
+        volatile: Optional[str] = None
+    ) -> List[BaseMessage]:
+        """
+        채팅 기록과 현재 메시지를 LangChain 메시지 형태로 변환
+        
+        API에서 디코딩된 ChatMessage를 그대로 받아 그래프 실행 직전에 한 번만 변환합니다.
+        (응답 캐시 적중이나 single-flight 합류 시에는 변환하지 않음)
+        """
+        return self.prompt.assemble(message, chat_history, volatile)
+    
     async def invoke(
         self, 
         message: str, 
@@ -96,25 +322,25 @@ class DefaultAgent(BaseAgent):
             message: 사용자 메시지
             chat_history: 이전 채팅 기록
             **kwargs: 추가 파라미터
+                (deadline: Deadline, timeout: 요청 타임아웃 초, model/temperature: 요청별 오버라이드,
+                volatile: 이번 요청에만 적용할 추가 지시/맥락,
+                priority: 스케줄링 우선순위 (interactive, standard, batch), tenant: 테넌트 ID)
         
         Returns:
             에이전트 응답
-        """
-        # 채팅 기록을 LangChain 메시지 형태로 변환
-        messages = []
         
-        if chat_history:
-            for msg in chat_history:
-                if msg.role == "user":
-                    messages.append(HumanMessage(content=msg.content))
-                elif msg.role == "assistant":
-                    messages.append(AIMessage(content=msg.content))
-        
-        # 현재 메시지 추가
-        messages.append(HumanMessage(content=message))
+        Raises:
+            DeadlineExceededError: 요청 deadline 초과
+        """
+        with tracing.span("history", messages=len(chat_history or [])):
+            messages = self._build_messages(message, chat_history, kwargs.get("volatile"))
         
         # 그래프 실행
-        result = await self.graph.ainvoke({"messages": messages})
+        with tracing.span("graph"):
+            result = await self.graph.ainvoke(
+                {"messages": messages},
+                config=self._run_config(kwargs, self._deadline(kwargs))
+            )
         
         # 마지막 AI 메시지 반환
         return result["messages"][-1].content
@@ -140,25 +366,39 @@ class DefaultAgent(BaseAgent):
             message: 사용자 메시지
             chat_history: 이전 채팅 기록
             **kwargs: 추가 파라미터
+                (deadline: Deadline, timeout: 요청 타임아웃 초, model/temperature: 요청별 오버라이드,
+                volatile: 이번 요청에만 적용할 추가 지시/맥락,
+                priority: 스케줄링 우선순위 (interactive, standard, batch), tenant: 테넌트 ID)
         
         Yields:
             응답 청크들
+        
+        Raises:
+            DeadlineExceededError: 요청 deadline 초과
         """
-        # 채팅 기록을 LangChain 메시지 형태로 변환
-        messages = []
-        
-        if chat_history:
-            for msg in chat_history:
-                if msg.role == "user":
-                    messages.append(HumanMessage(content=msg.content))
-                elif msg.role == "assistant":
-                    messages.append(AIMessage(content=msg.content))
-        
-        messages.append(HumanMessage(content=message))
-        
-        # 스트리밍 실행
-        async for chunk in self.graph.astream({"messages": messages}):
-            if "chat" in chunk and "messages" in chunk["chat"]:
-                last_message = chunk["chat"]["messages"][-1]
-                if hasattr(last_message, 'content'):
-                    yield last_message.content
\ No newline at end of file
+        with tracing.span("history", messages=len(chat_history or [])):
+            messages = self._build_messages(message, chat_history, kwargs.get("volatile"))
+        deadline = self._deadline(kwargs)
+        # 사용자가 토큰을 기다리는 스트림은 기본적으로 가장 높은 우선순위
+        run_config = self._run_config({"priority": "interactive", **kwargs}, deadline, retry=False)
+        
+        # 첫 토큰 이전의 일시적 오류만 재시도
+        async for content in stream_with_retry(
+            lambda: self._stream_graph(messages, run_config),
+            self.execution_policy,
+            deadline
+        ):
+            yield content
+    
+    async def _stream_graph(self, messages: List[BaseMessage], run_config: RunnableConfig) -> AsyncGenerator[str, None]:
+        """그래프를 "messages" 모드로 실행해 LLM 토큰 델타를 생성되는 즉시 전달"""
+        with tracing.span("graph", stream=True):
+            async for chunk, metadata in self.graph.astream(
+                {"messages": messages},
+                config=run_config,
+                stream_mode="messages"
+            ):
+                if metadata.get("langgraph_node") != "chat":
+                    continue
+                if isinstance(chunk.content, str) and chunk.content:
+                    yield chunk.content
\ No newline at end of file
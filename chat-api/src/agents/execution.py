@@ -0,0 +1,196 @@
+"""
+실행 정책
+요청 단위 deadline 전파, 일시적 오류 재시도 (지수 백오프 + jitter)
+"""
+
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass
+from typing import AsyncIterator, Awaitable, Callable, Optional, TypeVar
+
+import httpx
+import openai
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# 재시도할 수 있는 일시적 업스트림 오류
+TRANSIENT_ERRORS = (
+    openai.APIConnectionError,  # APITimeoutError 포함
+    openai.RateLimitError,
+    openai.InternalServerError,
+    httpx.TransportError,
+    asyncio.TimeoutError,
+    ConnectionError,
+)
+
+
+class DeadlineExceededError(TimeoutError):
+    """요청 deadline 초과"""
+    pass
+
+
+class Deadline:
+    """요청 전체에 적용되는 절대 마감 시각"""
+
+    def __init__(self, timeout: float):
+        """
+        Args:
+            timeout: 지금부터 마감까지의 시간 (초)
+        """
+        self.timeout = timeout
+        self.expires_at = time.monotonic() + timeout
+
+    def remaining(self) -> float:
+        """남은 시간 (초, 음수 없음)"""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        """마감 여부"""
+        return self.remaining() <= 0
+
+    def __repr__(self) -> str:
+        return f"<Deadline(remaining={self.remaining():.3f}s)>"
+
+
+@dataclass
+class ExecutionPolicy:
+    """업스트림 호출 실행 정책"""
+    timeout: float = 60.0
+    max_retries: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 8.0
+
+    def backoff(self, attempt: int) -> float:
+        """
+        재시도 대기 시간 (full jitter 지수 백오프)
+
+        Args:
+            attempt: 0부터 시작하는 재시도 횟수
+        """
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """재시도할 수 있는 일시적 오류인지 확인"""
+    return isinstance(error, TRANSIENT_ERRORS)
+
+
+async def _wait_before_retry(
+    error: BaseException,
+    attempt: int,
+    policy: ExecutionPolicy,
+    deadline: Deadline
+) -> None:
+    """
+    재시도 전 백오프 대기
+
+    Raises:
+        재시도 불가 시 원래 예외
+    """
+    if not is_transient_error(error) or attempt >= policy.max_retries:
+        raise error
+
+    delay = policy.backoff(attempt)
+    if delay >= deadline.remaining():
+        raise error
+
+    logger.warning(f"일시적 오류로 재시도 ({attempt + 1}/{policy.max_retries}, {delay:.2f}초 후): {error}")
+    await asyncio.sleep(delay)
+
+
+async def run_with_retry(
+    fn: Callable[[], Awaitable[T]],
+    policy: ExecutionPolicy,
+    deadline: Optional[Deadline] = None
+) -> T:
+    """
+    deadline 안에서 일시적 오류를 재시도하며 호출 실행
+
+    Args:
+        fn: 매 시도마다 새 awaitable을 만드는 함수
+        policy: 실행 정책
+        deadline: 요청 deadline (None이면 policy.timeout으로 생성)
+
+    Returns:
+        호출 결과
+
+    Raises:
+        DeadlineExceededError: deadline 초과
+    """
+    deadline = deadline or Deadline(policy.timeout)
+    attempt = 0
+
+    while True:
+        if deadline.expired:
+            raise DeadlineExceededError(f"요청 시간 초과 ({deadline.timeout}초)")
+        try:
+            async with asyncio.timeout(deadline.remaining()):
+                return await fn()
+        except TimeoutError as e:
+            if deadline.expired:
+                raise DeadlineExceededError(f"요청 시간 초과 ({deadline.timeout}초)") from e
+            await _wait_before_retry(e, attempt, policy, deadline)
+        except Exception as e:
+            await _wait_before_retry(e, attempt, policy, deadline)
+        attempt += 1
+
+
+async def stream_with_retry(
+    fn: Callable[[], AsyncIterator[T]],
+    policy: ExecutionPolicy,
+    deadline: Optional[Deadline] = None
+) -> AsyncIterator[T]:
+    """
+    deadline 안에서 스트림 실행
+
+    첫 청크를 보내기 전의 일시적 오류만 재시도하며, 청크를 한 번이라도 보낸 뒤에는
+    중복 출력을 막기 위해 재시도하지 않습니다.
+
+    Args:
+        fn: 매 시도마다 새 스트림을 만드는 함수
+        policy: 실행 정책
+        deadline: 요청 deadline (None이면 policy.timeout으로 생성)
+
+    Yields:
+        스트림 항목
+
+    Raises:
+        DeadlineExceededError: deadline 초과
+    """
+    deadline = deadline or Deadline(policy.timeout)
+    attempt = 0
+
+    while True:
+        if deadline.expired:
+            raise DeadlineExceededError(f"요청 시간 초과 ({deadline.timeout}초)")
+
+        stream = fn()
+        emitted = False
+        try:
+            while True:
+                try:
+                    # 타임아웃은 다음 항목 대기에만 적용 (yield 중에는 소비자 코드가 실행됨)
+                    async with asyncio.timeout(deadline.remaining()):
+                        item = await anext(stream)
+                except StopAsyncIteration:
+                    return
+                emitted = True
+                yield item
+        except TimeoutError as e:
+            if deadline.expired:
+                raise DeadlineExceededError(f"요청 시간 초과 ({deadline.timeout}초)") from e
+            if emitted:
+                raise
+            await _wait_before_retry(e, attempt, policy, deadline)
+        except Exception as e:
+            if emitted:
+                raise
+            await _wait_before_retry(e, attempt, policy, deadline)
+        finally:
+            await stream.aclose()
+        attempt += 1
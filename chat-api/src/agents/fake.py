@@ -0,0 +1,281 @@
+"""
+가짜 채팅 모델
+API 키와 네트워크 없이 지연 시간과 토큰 속도를 재현하는 결정적 LLM 백엔드 (벤치마크/테스트용)
+"""
+
+import asyncio
+import hashlib
+import math
+import random
+import time
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+
+import httpx
+import openai
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.messages.ai import InputTokenDetails, UsageMetadata
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from pydantic import PrivateAttr
+
+from .scheduler import TokenBucket
+
+# 응답 토큰을 만드는 고정 어휘
+_VOCABULARY = (
+    "agent", "graph", "stream", "token", "model", "cache", "latency", "request",
+    "response", "context", "message", "history", "server", "client", "batch", "queue",
+)
+
+# 업스트림 prompt cache 흉내 (OpenAI: 1024토큰 이상인 prefix를 128토큰 단위로 캐시)
+PROMPT_CACHE_MIN_TOKENS = 1024
+PROMPT_CACHE_INCREMENT = 128
+PROMPT_CACHE_MAX_ENTRIES = 10000
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    결정적 가짜 채팅 모델
+
+    첫 토큰은 ttft초 후, 이후 토큰은 tokens_per_second 속도로 생성됩니다.
+    같은 입력에는 항상 같은 응답을 돌려줍니다.
+    이전 호출과 메시지 단위로 같은 prefix는 업스트림 prompt cache처럼 cache_read 토큰으로 보고합니다.
+    rpm/tpm을 설정하면 OpenAI처럼 한도를 넘는 호출을 429(RateLimitError)로 거절하고
+    응답 헤더(response_metadata["headers"])에 x-ratelimit-* 값을 담습니다.
+    latency_jitter/slow_rate/error_rate로 호출마다 다른 지연 시간 분포와 오류를 주입할 수 있습니다.
+    (응답 내용은 그대로 결정적)
+    """
+
+    model_name: str = "fake"
+    ttft: float = 0.2
+    tokens_per_second: float = 50.0
+    response_tokens: int = 64
+    rpm: int = 0
+    tpm: int = 0
+    latency_jitter: float = 0.0
+    slow_rate: float = 0.0
+    slow_factor: float = 10.0
+    error_rate: float = 0.0
+
+    _prefix_cache: "OrderedDict[str, None]" = PrivateAttr(default_factory=OrderedDict)
+    _request_bucket: Optional[TokenBucket] = PrivateAttr(default=None)
+    _token_bucket: Optional[TokenBucket] = PrivateAttr(default=None)
+
+    def model_post_init(self, __context: Any) -> None:
+        super().model_post_init(__context)
+        self._request_bucket = TokenBucket(self.rpm)
+        self._token_bucket = TokenBucket(self.tpm)
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat-model"
+
+    @property
+    def generation_time(self) -> float:
+        """응답 하나를 생성하는 데 걸리는 시간 (초, 지연 시간 분포를 주입하면 배율을 곱하기 전 기준값)"""
+        return self.ttft + self._token_interval * max(0, self.response_tokens - 1)
+
+    @property
+    def _token_interval(self) -> float:
+        return 1.0 / self.tokens_per_second if self.tokens_per_second > 0 else 0.0
+
+    def _latency_scale(self) -> float:
+        """
+        이번 호출의 지연 시간 배율 (로그정규 jitter, slow_rate 확률로 slow_factor배)
+
+        Raises:
+            openai.InternalServerError: error_rate 확률로 주입되는 업스트림 오류
+        """
+        if self.error_rate and random.random() < self.error_rate:
+            response = httpx.Response(500, request=httpx.Request("POST", "https://fake.invalid/v1/chat/completions"))
+            raise openai.InternalServerError(
+                f"Injected upstream error for {self.model_name} (fake)", response=response, body=None
+            )
+        scale = 1.0
+        if self.latency_jitter:
+            # 중앙값이 1이 되도록 mu=0
+            scale = math.exp(random.gauss(0.0, self.latency_jitter))
+        if self.slow_rate and random.random() < self.slow_rate:
+            scale *= self.slow_factor
+        return scale
+
+    def _tokens(self, messages: List[BaseMessage]) -> List[str]:
+        """입력 해시로 결정되는 응답 토큰 목록"""
+        seed = hashlib.sha256(str(messages[-1].content if messages else "").encode("utf-8")).digest()
+        tokens = []
+        for i in range(self.response_tokens):
+            word = _VOCABULARY[seed[i % len(seed)] % len(_VOCABULARY)]
+            tokens.append(word if i == 0 else f" {word}")
+        return tokens
+
+    @staticmethod
+    def _input_tokens(messages: List[BaseMessage]) -> int:
+        """근사 입력 토큰 수 (문자 4개당 1토큰)"""
+        return sum(len(str(message.content)) for message in messages) // 4 + 1
+
+    def _usage(self, messages: List[BaseMessage]) -> UsageMetadata:
+        """근사 토큰 사용량"""
+        input_tokens = self._input_tokens(messages)
+        return UsageMetadata(
+            input_tokens=input_tokens,
+            output_tokens=self.response_tokens,
+            total_tokens=input_tokens + self.response_tokens,
+            input_token_details=InputTokenDetails(cache_read=self._cached_tokens(messages)),
+        )
+
+    def _cached_tokens(self, messages: List[BaseMessage]) -> int:
+        """이전 호출과 같은 가장 긴 메시지 prefix의 토큰 수 (이번 호출의 prefix도 캐시에 등록)"""
+        digest = hashlib.sha256()
+        chars = cached_chars = 0
+        for message in messages:
+            digest.update(message.type.encode("utf-8") + b"\x00" + str(message.content).encode("utf-8") + b"\x00")
+            chars += len(str(message.content))
+            key = digest.hexdigest()
+            if key in self._prefix_cache:
+                self._prefix_cache.move_to_end(key)
+                cached_chars = chars
+            else:
+                self._prefix_cache[key] = None
+        while len(self._prefix_cache) > PROMPT_CACHE_MAX_ENTRIES:
+            self._prefix_cache.popitem(last=False)
+
+        cached = cached_chars // 4
+        if cached < PROMPT_CACHE_MIN_TOKENS:
+            return 0
+        return cached - cached % PROMPT_CACHE_INCREMENT
+
+    def _admit(self, messages: List[BaseMessage]) -> Dict[str, str]:
+        """
+        가짜 업스트림 rate limit 적용 (입력 토큰 + 최대 출력 토큰을 호출 시점에 차감)
+
+        Returns:
+            x-ratelimit-* 응답 헤더 (한도 미설정 시 빈 dict)
+
+        Raises:
+            openai.RateLimitError: 한도 초과
+        """
+        if not self.rpm and not self.tpm:
+            return {}
+
+        tokens = self._input_tokens(messages) + self.response_tokens
+        headers = {}
+        retry_after = 0.0
+        for kind, bucket, amount in (
+            ("requests", self._request_bucket, 1),
+            ("tokens", self._token_bucket, tokens),
+        ):
+            if bucket.unlimited:
+                continue
+            retry_after = max(retry_after, bucket.wait_time(amount))
+            headers[f"x-ratelimit-limit-{kind}"] = str(int(bucket.capacity))
+
+        if retry_after > 0:
+            headers.update(self._remaining_headers())
+            headers["retry-after-ms"] = str(max(1, int(retry_after * 1000)))
+            response = httpx.Response(
+                429, headers=headers, request=httpx.Request("POST", "https://fake.invalid/v1/chat/completions")
+            )
+            raise openai.RateLimitError(
+                f"Rate limit reached for {self.model_name} (fake)", response=response, body=None
+            )
+
+        self._request_bucket.take(1)
+        self._token_bucket.take(tokens)
+        headers.update(self._remaining_headers())
+        return headers
+
+    def _remaining_headers(self) -> Dict[str, str]:
+        headers = {}
+        for kind, bucket in (("requests", self._request_bucket), ("tokens", self._token_bucket)):
+            if bucket.unlimited:
+                continue
+            available = max(0.0, bucket.available())
+            headers[f"x-ratelimit-remaining-{kind}"] = str(int(available))
+            headers[f"x-ratelimit-reset-{kind}"] = f"{(bucket.capacity - available) / bucket.rate:.3f}s"
+        return headers
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any
+    ) -> ChatResult:
+        headers = self._admit(messages)
+        time.sleep(self.generation_time * self._latency_scale())
+        message = AIMessage(
+            content="".join(self._tokens(messages)),
+            usage_metadata=self._usage(messages),
+            response_metadata=self._response_metadata(headers),
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any
+    ) -> ChatResult:
+        headers = self._admit(messages)
+        await asyncio.sleep(self.generation_time * self._latency_scale())
+        message = AIMessage(
+            content="".join(self._tokens(messages)),
+            usage_metadata=self._usage(messages),
+            response_metadata=self._response_metadata(headers),
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any
+    ) -> Iterator[ChatGenerationChunk]:
+        headers = self._admit(messages)
+        scale = self._latency_scale()
+        tokens = self._tokens(messages)
+        for i, token in enumerate(tokens):
+            time.sleep((self.ttft if i == 0 else self._token_interval) * scale)
+            chunk = self._chunk(token, messages if i == len(tokens) - 1 else None, headers if i == 0 else None)
+            if run_manager:
+                run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        headers = self._admit(messages)
+        scale = self._latency_scale()
+        tokens = self._tokens(messages)
+        for i, token in enumerate(tokens):
+            await asyncio.sleep((self.ttft if i == 0 else self._token_interval) * scale)
+            chunk = self._chunk(token, messages if i == len(tokens) - 1 else None, headers if i == 0 else None)
+            if run_manager:
+                await run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+
+    def _response_metadata(self, headers: Dict[str, str]) -> Dict[str, Any]:
+        metadata: Dict[str, Any] = {"model_name": self.model_name}
+        if headers:
+            metadata["headers"] = headers
+        return metadata
+
+    def _chunk(
+        self,
+        token: str,
+        messages: Optional[List[BaseMessage]],
+        headers: Optional[Dict[str, str]] = None
+    ) -> ChatGenerationChunk:
+        """스트림 청크 생성 (첫 청크에 응답 헤더, 마지막 청크에 사용량 포함)"""
+        usage = self._usage(messages) if messages is not None else None
+        return ChatGenerationChunk(
+            message=AIMessageChunk(content=token, usage_metadata=usage),
+            generation_info={"headers": headers} if headers else None
+        )
@@ -0,0 +1,329 @@
+"""
+헤징/페일오버 실행
+백엔드(모델/공급자)별 지연 시간을 EWMA로 추적해 가장 빠른 정상 백엔드부터 호출하고,
+응답이 지연 시간 백분위 임계값을 넘으면 같은 요청을 한 번 더 보내(헤지) 먼저 끝난 응답을 사용
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Sequence, Tuple, TypeVar
+
+from .execution import DeadlineExceededError, is_transient_error
+from .scheduler import QuotaExceededError
+from .settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# 지연 시간 EWMA 가중치 (최근 값의 비중)
+EWMA_ALPHA = 0.2
+
+# 백분위 계산에 사용하는 최근 성공 지연 시간 수와 최소 표본 수
+LATENCY_WINDOW = 200
+MIN_SAMPLES = 20
+
+# 헤지 비율 제한에 사용하는 최근 호출 수
+HEDGE_WINDOW = 1000
+
+# 폴백 백엔드가 요청한 모델보다 이 비율 이상 빨라야 먼저 호출 (비슷한 지연 시간에서 모델이 오가지 않도록)
+SWITCH_MARGIN = 0.1
+
+# 다른 백엔드로 넘겨도 결과가 같은 오류 (테넌트 할당량과 요청 deadline은 백엔드와 무관)
+NO_FAILOVER_ERRORS = (QuotaExceededError, DeadlineExceededError)
+
+
+def is_backend_failure(error: BaseException) -> bool:
+    """
+    백엔드 장애로 볼 오류인지 확인 (연결/타임아웃/429/5xx)
+
+    잘못된 요청(400, 컨텍스트 길이 초과 등)은 어느 백엔드로 보내도 실패하므로
+    백엔드 통계에 기록하지 않고 페일오버 없이 그대로 전달합니다.
+    """
+    return is_transient_error(error) and not isinstance(error, NO_FAILOVER_ERRORS)
+
+
+@dataclass
+class Backend:
+    """호출 대상 하나 (name은 "backend:model" 형식, 지연 시간 추적 키)"""
+    name: str
+    llm: Any
+
+
+class BackendStats:
+    """백엔드 하나의 지연 시간/오류 추적"""
+
+    def __init__(self):
+        self.ewma: Optional[float] = None
+        self.latencies: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self.calls = 0
+        self.errors = 0
+        self.consecutive_failures = 0
+        self.unhealthy_until = 0.0
+
+    @property
+    def healthy(self) -> bool:
+        """연속 실패로 격리된 상태가 아닌지 여부"""
+        return time.monotonic() >= self.unhealthy_until
+
+    def _update_ewma(self, latency: float) -> None:
+        self.ewma = latency if self.ewma is None else EWMA_ALPHA * latency + (1 - EWMA_ALPHA) * self.ewma
+
+    def record_success(self, latency: float) -> None:
+        self.calls += 1
+        self.consecutive_failures = 0
+        self.latencies.append(latency)
+        self._update_ewma(latency)
+
+    def record_failure(self, threshold: int, cooldown: float) -> None:
+        self.calls += 1
+        self.errors += 1
+        self.consecutive_failures += 1
+        if threshold > 0 and self.consecutive_failures >= threshold:
+            self.unhealthy_until = time.monotonic() + cooldown
+
+    def record_cancelled(self, elapsed: float) -> None:
+        """헤지 경쟁에서 져서 취소된 호출 (최소한 elapsed만큼 걸린다는 정보만 반영)"""
+        if self.ewma is None or elapsed > self.ewma:
+            self._update_ewma(elapsed)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """최근 성공 지연 시간의 q 백분위 (표본이 부족하면 None)"""
+        if len(self.latencies) < MIN_SAMPLES:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "ewma": round(self.ewma, 4) if self.ewma is not None else None,
+            "calls": self.calls,
+            "errors": self.errors,
+            "healthy": self.healthy,
+        }
+
+
+class HedgingExecutor:
+    """
+    백엔드 목록에 대한 헤지/페일오버 실행기 (지연 시간 통계는 프로세스 안에서 공유)
+
+    1. 정상 백엔드를 EWMA 지연 시간 순으로 정렬 (격리된 백엔드는 맨 뒤, 통계 없는 백엔드는 먼저 시도해 표본 수집)
+    2. 첫 백엔드 호출이 헤지 임계값(최근 지연 시간의 percentile 백분위)을 넘으면 다음 백엔드로 같은 요청을 한 번 더 보냄
+       (다음 백엔드가 없으면 같은 백엔드로), 먼저 성공한 응답을 사용하고 나머지는 취소
+    3. 호출이 백엔드 장애(연결/타임아웃/429/5xx)로 끝나면 진행 중인 호출이 없을 때 다음 백엔드로 넘김 (페일오버)
+       잘못된 요청(4xx) 등 그 밖의 오류는 진행 중인 호출을 취소하고 그대로 전달
+    """
+
+    def __init__(
+        self,
+        hedge: bool = True,
+        percentile: float = 0.95,
+        default_delay: float = 3.0,
+        min_delay: float = 0.5,
+        max_hedge_ratio: float = 0.1,
+        failure_threshold: int = 3,
+        cooldown: float = 30.0
+    ):
+        """
+        Args:
+            hedge: 헤지 요청 사용 여부 (False면 순서 선택과 페일오버만)
+            percentile: 헤지 임계값으로 쓸 지연 시간 백분위 (0~1)
+            default_delay: 표본이 부족할 때 헤지 임계값 (초)
+            min_delay: 헤지 임계값 하한 (초)
+            max_hedge_ratio: 최근 호출 중 헤지를 보낼 수 있는 최대 비율 (업스트림 전체가 느릴 때 부하 폭증 방지)
+            failure_threshold: 백엔드를 격리할 연속 실패 수 (0이면 격리하지 않음)
+            cooldown: 격리 시간 (초)
+        """
+        self.hedge = hedge
+        self.percentile = percentile
+        self.default_delay = default_delay
+        self.min_delay = min_delay
+        self.max_hedge_ratio = max_hedge_ratio
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._stats: Dict[str, BackendStats] = {}
+        self._hedge_window: Deque[bool] = deque(maxlen=HEDGE_WINDOW)
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.failovers = 0
+
+    def backend_stats(self, name: str) -> BackendStats:
+        """백엔드 통계 (없으면 생성)"""
+        stats = self._stats.get(name)
+        if stats is None:
+            stats = self._stats[name] = BackendStats()
+        return stats
+
+    def rank(self, backends: Sequence[Backend]) -> List[Backend]:
+        """호출 순서 (정상 백엔드를 EWMA 오름차순으로, 같으면 설정 순서 유지, 첫 항목은 SWITCH_MARGIN만큼 우대)"""
+        def key(item):
+            index, backend = item
+            stats = self.backend_stats(backend.name)
+            ewma = stats.ewma if stats.ewma is not None else 0.0
+            return (not stats.healthy, ewma * (1 + SWITCH_MARGIN) if index else ewma)
+        return [backend for _, backend in sorted(enumerate(backends), key=key)]
+
+    def hedge_delay(self, backend: Backend) -> float:
+        """backend 호출이 이 시간(초) 안에 끝나지 않으면 헤지"""
+        delay = self.backend_stats(backend.name).percentile(self.percentile)
+        return max(self.min_delay, self.default_delay if delay is None else delay)
+
+    def _hedge_allowed(self) -> bool:
+        if not self._hedge_window:
+            return True
+        return sum(self._hedge_window) / len(self._hedge_window) < self.max_hedge_ratio
+
+    async def _timed(self, backend: Backend, call: Callable[[Any], Awaitable[T]]) -> T:
+        """호출 시간/결과를 백엔드 통계에 기록 (백엔드 장애가 아닌 오류는 기록하지 않음)"""
+        stats = self.backend_stats(backend.name)
+        started_at = time.monotonic()
+        try:
+            result = await call(backend.llm)
+        except asyncio.CancelledError:
+            stats.record_cancelled(time.monotonic() - started_at)
+            raise
+        except Exception as e:
+            if not is_backend_failure(e):
+                raise
+            stats.record_failure(self.failure_threshold, self.cooldown)
+            if not stats.healthy:
+                logger.warning(f"백엔드 격리 ({self.cooldown:.0f}초): {backend.name} (연속 실패 {stats.consecutive_failures}회)")
+            raise
+        stats.record_success(time.monotonic() - started_at)
+        return result
+
+    async def run(
+        self,
+        backends: Sequence[Backend],
+        call: Callable[[Any], Awaitable[T]],
+        hedge: bool = True,
+        failover: bool = True
+    ) -> T:
+        """
+        백엔드 목록에 대해 헤지/페일오버하며 호출 실행
+
+        Args:
+            backends: 호출 대상 목록 (첫 항목이 요청한 모델)
+            call: LLM 클라이언트를 받아 호출하는 함수 (시도마다 새 awaitable 생성)
+            hedge: 이번 호출에 헤지 허용 여부 (토큰을 바로 내보내는 스트리밍은 False)
+            failover: 오류 시 다음 백엔드로 넘길지 여부
+
+        Returns:
+            먼저 성공한 호출 결과
+
+        Raises:
+            백엔드 장애가 아닌 오류는 바로, 모든 시도가 실패하면 첫 번째 오류
+        """
+        remaining = self.rank(backends)
+        pending: Dict[asyncio.Task, Backend] = {}
+        errors: List[BaseException] = []
+        hedge_task: Optional[asyncio.Task] = None
+        hedge_pending = hedge and self.hedge and self._hedge_allowed()
+
+        def launch(backend: Backend) -> asyncio.Task:
+            task = asyncio.create_task(self._timed(backend, call))
+            pending[task] = backend
+            return task
+
+        primary = remaining.pop(0)
+        launch(primary)
+        started_at = time.monotonic()
+        try:
+            while True:
+                timeout = None
+                if hedge_pending:
+                    timeout = max(0.0, self.hedge_delay(primary) - (time.monotonic() - started_at))
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+
+                if not done:
+                    # 임계값 초과: 다음 백엔드(없으면 같은 백엔드)로 같은 요청을 한 번 더 보냄
+                    hedge_pending = False
+                    target = remaining.pop(0) if remaining else primary
+                    self.hedges += 1
+                    logger.debug(f"헤지 요청: {primary.name} -> {target.name} ({time.monotonic() - started_at:.2f}초 경과)")
+                    hedge_task = launch(target)
+                    continue
+
+                winner = None
+                for task in done:
+                    pending.pop(task)
+                    if task.exception() is None:
+                        winner = winner or task
+                    else:
+                        errors.append(task.exception())
+                if winner is not None:
+                    if winner is hedge_task:
+                        self.hedge_wins += 1
+                    return winner.result()
+
+                for error in errors:
+                    if not is_backend_failure(error):
+                        raise error
+                if pending:
+                    continue
+                if not (failover and remaining):
+                    raise errors[0]
+
+                # 진행 중인 호출이 모두 실패: 다음 백엔드로 페일오버 (이후에는 헤지하지 않음)
+                hedge_pending = False
+                target = remaining.pop(0)
+                self.failovers += 1
+                logger.warning(f"페일오버: {target.name} (이전 오류: {type(errors[-1]).__name__}: {errors[-1]})")
+                launch(target)
+        finally:
+            self._hedge_window.append(hedge_task is not None)
+            for task in pending:
+                task.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        """헤지/페일오버 통계와 백엔드별 지연 시간 (GET /health 노출용)"""
+        return {
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "failovers": self.failovers,
+            "backends": {name: stats.to_dict() for name, stats in self._stats.items()},
+        }
+
+
+def parse_backends(spec: str) -> List[Tuple[str, str]]:
+    """
+    폴백 백엔드 목록 파싱
+
+    Args:
+        spec: 쉼표로 구분한 "model" 또는 "backend:model" 목록 (예: "gpt-4o,fake:fake-fallback")
+
+    Returns:
+        (backend, model) 목록 (backend를 생략하면 빈 문자열, 기본 백엔드 사용)
+
+    Raises:
+        ValueError: 형식 오류
+    """
+    backends = []
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        backend, _, model = item.rpartition(":")
+        if not model:
+            raise ValueError(f"폴백 백엔드 형식 오류 (backend:model): {item}")
+        backends.append((backend.strip(), model.strip()))
+    return backends
+
+
+@lru_cache()
+def get_hedging_executor() -> Optional[HedgingExecutor]:
+    """설정 기반 프로세스 단위 헤지/페일오버 실행기 (헤지와 폴백이 모두 꺼져 있으면 None)"""
+    settings = get_settings()
+    if not settings.llm_hedge_enabled and not settings.llm_fallback_models:
+        return None
+
+    return HedgingExecutor(
+        hedge=settings.llm_hedge_enabled,
+        percentile=settings.llm_hedge_percentile,
+        default_delay=settings.llm_hedge_default_delay,
+        min_delay=settings.llm_hedge_min_delay,
+        max_hedge_ratio=settings.llm_hedge_max_ratio,
+        failure_threshold=settings.llm_backend_failure_threshold,
+        cooldown=settings.llm_backend_cooldown
+    )
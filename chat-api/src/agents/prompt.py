@@ -0,0 +1,101 @@
+"""
+프롬프트 구성
+업스트림 prompt caching이 적중하도록 고정 prefix -> 대화 기록 -> 요청별 내용 순서로 메시지를 조립
+"""
+
+import hashlib
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
+
+from .base import ChatMessage
+
+_MESSAGE_TYPES = {"user": HumanMessage, "assistant": AIMessage, "system": SystemMessage}
+
+
+@dataclass
+class PromptConfig:
+    """프롬프트 고정 prefix 설정"""
+    system_prompt: str = ""
+    instructions: List[str] = field(default_factory=list)
+
+    @classmethod
+    def from_sources(cls, settings: Any, metadata: Optional[Dict[str, Any]] = None) -> "PromptConfig":
+        """
+        설정값과 AgentConfig.metadata["prompt"]로 생성 (metadata가 우선)
+
+        Args:
+            settings: AgentSettings
+            metadata: AgentConfig.metadata
+        """
+        overrides = (metadata or {}).get("prompt") or {}
+        instructions = overrides.get("instructions")
+        if instructions is None:
+            instructions = [settings.agent_instructions] if settings.agent_instructions else []
+        return cls(
+            system_prompt=overrides.get("system_prompt", settings.agent_system_prompt),
+            instructions=list(instructions),
+        )
+
+
+class PromptAssembler:
+    """
+    LLM에 보낼 메시지 조립
+
+    OpenAI는 요청 앞부분이 이전 요청과 바이트 단위로 같은 구간(prefix)을 캐시하므로
+    변하지 않는 내용을 앞에, 자주 바뀌는 내용을 뒤에 둡니다.
+
+        [시스템 프롬프트 + 고정 지침]  에이전트 생성 시 한 번 만든 메시지를 모든 요청이 공유
+        [대화 기록]                   클라이언트가 보낸 순서 그대로 (system 메시지 포함, 재정렬하지 않음)
+        [요청별 내용]                 volatile(검색 결과, 현재 시각 등)과 현재 사용자 메시지
+    """
+
+    def __init__(self, config: PromptConfig):
+        """
+        Args:
+            config: 프롬프트 고정 prefix 설정
+        """
+        self.config = config
+        parts = [part for part in (config.system_prompt, *config.instructions) if part]
+        # 문자열을 가공하지 않고 그대로 이어 붙여 설정이 같으면 항상 같은 바이트가 되도록 함
+        content = "\n\n".join(parts)
+        self._prefix: List[BaseMessage] = [SystemMessage(content=content)] if parts else []
+        # 응답 캐시/single-flight 키에 넣는 prefix 식별자 (prefix가 다르면 같은 질문이라도 다른 요청)
+        self.prefix_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()[:16] if parts else ""
+
+    @property
+    def prefix(self) -> List[BaseMessage]:
+        """고정 prefix 메시지 (없으면 빈 목록)"""
+        return list(self._prefix)
+
+    def assemble(
+        self,
+        message: str,
+        chat_history: Optional[Sequence[ChatMessage]] = None,
+        volatile: Optional[str] = None
+    ) -> List[BaseMessage]:
+        """
+        고정 prefix, 대화 기록, 요청별 내용 순서로 메시지 목록 생성
+
+        Args:
+            message: 현재 사용자 메시지
+            chat_history: 이전 채팅 기록
+            volatile: 이번 요청에만 적용할 추가 지시/맥락 (현재 메시지 바로 앞에 system 메시지로 추가)
+
+        Returns:
+            LangChain 메시지 목록
+        """
+        messages = list(self._prefix)
+
+        if chat_history:
+            for msg in chat_history:
+                message_type = _MESSAGE_TYPES.get(msg.role)
+                if message_type is not None:
+                    messages.append(message_type(content=msg.content))
+
+        if volatile:
+            messages.append(SystemMessage(content=volatile))
+        messages.append(HumanMessage(content=message))
+
+        return messages
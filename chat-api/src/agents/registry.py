@@ -0,0 +1,220 @@
+"""
+에이전트 리소스 레지스트리
+컴파일된 그래프와 LLM 클라이언트를 프로세스 단위로 캐시하고 HTTP 연결 풀을 공유
+"""
+
+import asyncio
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+import httpx
+from langchain_core.language_models import BaseChatModel
+from langchain_openai import ChatOpenAI
+
+from .cassette import ReplayChatModel, RecordingChatModel, close_writers, load_cassette
+from .fake import FakeChatModel
+
+logger = logging.getLogger(__name__)
+
+# 공유 HTTP 연결 풀 한도
+HTTP_MAX_CONNECTIONS = 100
+HTTP_MAX_KEEPALIVE_CONNECTIONS = 20
+
+# 캐시할 LLM 클라이언트 수 (요청별 model/temperature 조합이 늘어나도 가장 오래 쓰지 않은 것부터 제거)
+CHAT_MODEL_CACHE_SIZE = 64
+# 캐시 키와 호출에 쓰는 온도 단위 (0.7과 0.700001이 서로 다른 클라이언트를 만들지 않도록)
+TEMPERATURE_PRECISION = 2
+
+_lock = threading.Lock()
+_graphs: Dict[Hashable, Any] = {}
+_chat_models: "OrderedDict[Tuple[Any, ...], BaseChatModel]" = OrderedDict()
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """모든 LLM 클라이언트가 공유하는 비동기 HTTP 클라이언트"""
+    global _http_client
+    with _lock:
+        if _http_client is None or _http_client.is_closed:
+            _http_client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS
+                )
+            )
+        return _http_client
+
+
+def get_compiled_graph(topology: Hashable, builder: Callable[[], Any]) -> Any:
+    """
+    토폴로지별로 한 번만 컴파일한 그래프 반환
+
+    Args:
+        topology: 그래프 구조를 식별하는 키
+        builder: 그래프를 구성하고 컴파일하는 함수
+
+    Returns:
+        컴파일된 그래프
+    """
+    graph = _graphs.get(topology)
+    if graph is not None:
+        return graph
+
+    with _lock:
+        graph = _graphs.get(topology)
+        if graph is None:
+            graph = _graphs[topology] = builder()
+            logger.debug(f"그래프 컴파일: {topology}")
+    return graph
+
+
+def get_chat_model(
+    model: str,
+    temperature: Optional[float],
+    max_tokens: Optional[int],
+    api_key: str,
+    timeout: Optional[float] = None,
+    backend: str = "openai",
+    record_path: Optional[str] = None,
+    **backend_options: Any
+) -> BaseChatModel:
+    """
+    (backend, model, temperature, max_tokens, key)별로 캐시된 채팅 모델 반환
+
+    재시도는 에이전트 실행 래퍼가 담당하므로 SDK 내부 재시도는 끕니다.
+    온도는 소수점 TEMPERATURE_PRECISION자리로 반올림하고, 캐시는 최근에 쓴 CHAT_MODEL_CACHE_SIZE개만 유지합니다.
+
+    Args:
+        model: 모델명
+        temperature: 모델 온도
+        max_tokens: 최대 토큰 수
+        api_key: OpenAI API 키
+        timeout: 호출 타임아웃 (초)
+        backend: LLM 백엔드 (openai, fake, replay)
+        record_path: 호출을 녹화할 cassette 파일 (None이면 녹화하지 않음)
+        **backend_options: 백엔드별 추가 옵션 (fake: ttft, tokens_per_second, response_tokens, rpm, tpm,
+            latency_jitter, slow_rate, slow_factor, error_rate / replay: cassette, time_scale, on_miss)
+
+    Returns:
+        채팅 모델 (openai 백엔드는 공유 HTTP 연결 풀 사용, record_path가 있으면 RecordingChatModel로 감쌈)
+
+    Raises:
+        ValueError: 지원하지 않는 백엔드
+    """
+    if temperature is not None:
+        temperature = round(temperature, TEMPERATURE_PRECISION)
+    key = (
+        backend, model, temperature, max_tokens, api_key, timeout, record_path,
+        tuple(sorted(backend_options.items()))
+    )
+    with _lock:
+        chat_model = _chat_models.get(key)
+        if chat_model is not None:
+            _chat_models.move_to_end(key)
+            return chat_model
+
+    if backend == "openai":
+        http_client = get_http_client()
+        factory = lambda: ChatOpenAI(  # noqa: E731
+            model=model,
+            temperature=temperature,
+            api_key=api_key,
+            max_tokens=max_tokens,
+            timeout=timeout,
+            max_retries=0,
+            stream_usage=True,
+            include_response_headers=True,  # 스케줄러가 x-ratelimit-* 헤더로 버킷 보정
+            http_async_client=http_client
+        )
+    elif backend == "fake":
+        factory = lambda: FakeChatModel(model_name=model, **backend_options)  # noqa: E731
+    elif backend == "replay":
+        if not backend_options.get("cassette"):
+            raise ValueError("replay 백엔드에는 재생할 cassette 파일(LLM_REPLAY_CASSETTE)이 필요합니다")
+        factory = lambda: ReplayChatModel(model_name=model, **backend_options)  # noqa: E731
+    else:
+        raise ValueError(f"지원하지 않는 LLM 백엔드: {backend}")
+
+    if record_path:
+        create = factory
+        factory = lambda: RecordingChatModel(inner=create(), path=record_path)  # noqa: E731
+
+    with _lock:
+        chat_model = _chat_models.get(key)
+        if chat_model is None:
+            chat_model = _chat_models[key] = factory()
+            while len(_chat_models) > CHAT_MODEL_CACHE_SIZE:
+                evicted, _ = _chat_models.popitem(last=False)
+                logger.debug(f"LLM 클라이언트 캐시 제거: {evicted[:3]}")
+        else:
+            _chat_models.move_to_end(key)
+    return chat_model
+
+
+async def warm_up_connections(connections: int = 1, timeout: float = 5.0) -> int:
+    """
+    캐시된 OpenAI 클라이언트의 업스트림마다 공유 연결 풀에 연결을 미리 열어 둠
+
+    첫 요청이 TCP/TLS 핸드셰이크 비용을 치르지 않도록 앱 시작 시 호출합니다.
+    과금되지 않는 GET /models 요청을 동시에 connections개 보내고 연결은 keep-alive 상태로 남깁니다.
+    (fake 백엔드 등 OpenAI 클라이언트가 아닌 모델은 건너뜀)
+
+    Args:
+        connections: 업스트림별로 열어 둘 연결 수
+        timeout: 요청 타임아웃 (초)
+
+    Returns:
+        성공한 요청 수 (실패는 경고만 남기고 무시)
+    """
+    targets = {}
+    for chat_model in list(_chat_models.values()):
+        chat_model = getattr(chat_model, "inner", chat_model)  # 녹화 래퍼
+        if isinstance(chat_model, ChatOpenAI):
+            client = chat_model.root_async_client
+            targets[str(client.base_url)] = client.api_key
+    if not targets or connections <= 0:
+        return 0
+
+    http_client = get_http_client()
+
+    async def touch(base_url: str, api_key: str) -> bool:
+        try:
+            response = await http_client.get(
+                base_url.rstrip("/") + "/models",
+                headers={"Authorization": f"Bearer {api_key}"},
+                timeout=timeout
+            )
+        except httpx.HTTPError as e:
+            logger.warning(f"업스트림 연결 준비 실패 ({base_url}): {e}")
+            return False
+        if response.status_code >= 400:
+            # 연결은 열렸으므로 풀에는 남지만 키/권한 문제는 미리 알림
+            logger.warning(f"업스트림 연결 준비 중 오류 응답 ({base_url}): HTTP {response.status_code}")
+        return True
+
+    results = await asyncio.gather(*(
+        touch(base_url, api_key) for base_url, api_key in targets.items() for _ in range(connections)
+    ))
+    logger.info(f"업스트림 연결 준비: {sum(results)}/{len(results)}개 ({', '.join(targets)})")
+    return sum(results)
+
+
+async def aclose() -> None:
+    """공유 HTTP 연결 풀과 녹화 파일을 닫고 캐시된 클라이언트 정리"""
+    global _http_client
+    with _lock:
+        client, _http_client = _http_client, None
+        _chat_models.clear()
+    close_writers()
+    load_cassette.cache_clear()
+    if client is not None and not client.is_closed:
+        await client.aclose()
+
+
+def clear() -> None:
+    """캐시된 그래프와 LLM 클라이언트 제거 (연결 풀은 유지)"""
+    with _lock:
+        _graphs.clear()
+        _chat_models.clear()
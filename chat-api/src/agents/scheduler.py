@@ -0,0 +1,601 @@
+"""
+업스트림 호출 스케줄러
+모델별 RPM/TPM 토큰 버킷 안에서 LLM 호출을 내보내고, 한도에 걸려 대기하는 호출은
+우선순위(interactive > standard > batch) -> 테넌트 라운드로빈 순서로 처리
+"""
+
+import asyncio
+import logging
+import math
+import re
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, AsyncIterator, Deque, Dict, Mapping, Optional, Tuple
+
+from .settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+# 우선순위 (앞쪽이 먼저 처리됨)
+PRIORITIES = ("interactive", "standard", "batch")
+
+# 테넌트를 지정하지 않은 요청이 공유하는 테넌트
+DEFAULT_TENANT = "default"
+
+# 할당량 상태를 보관할 최대 테넌트 수 (대기 중이 아닌 오래된 테넌트부터 제거)
+MAX_TENANTS = 10000
+
+# 재시도 대기 시간 형식 (OpenAI 헤더의 "1s", "6m0s", "20ms", "1h2m3.5s")
+_DURATION = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+class QuotaExceededError(Exception):
+    """테넌트 할당량이 요청 deadline 안에 회복되지 않음"""
+
+    def __init__(self, message: str, tenant: str, retry_after: int):
+        """
+        Args:
+            message: 에러 메시지
+            tenant: 할당량을 초과한 테넌트
+            retry_after: 재시도까지 권장 대기 시간 (초)
+        """
+        super().__init__(message)
+        self.tenant = tenant
+        self.retry_after = retry_after
+
+
+def parse_duration(value: Optional[str]) -> Optional[float]:
+    """
+    rate limit 헤더의 시간 값을 초로 변환
+
+    Args:
+        value: "1s", "6m0s", "20ms" 형식 또는 초 단위 숫자
+
+    Returns:
+        초 (해석할 수 없으면 None)
+    """
+    if not value:
+        return None
+    matches = _DURATION.findall(value)
+    if matches:
+        return sum(float(number) * _DURATION_UNITS[unit] for number, unit in matches)
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def _parse_int(value: Optional[str]) -> Optional[int]:
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+class TokenBucket:
+    """분당 한도를 연속적으로 채우는 토큰 버킷 (capacity 0이면 무제한)"""
+
+    def __init__(self, capacity: float = 0, period: float = 60.0):
+        """
+        Args:
+            capacity: period 동안 허용하는 양 (요청 수 또는 토큰 수)
+            period: 버킷이 빈 상태에서 가득 찰 때까지 걸리는 시간 (초)
+        """
+        self.period = period
+        self.capacity = float(capacity)
+        self.tokens = float(capacity)
+        self.paused_until = 0.0
+        self._updated_at = time.monotonic()
+
+    @property
+    def unlimited(self) -> bool:
+        """한도 미설정 여부 (응답 헤더로 한도를 알게 되면 제한 시작)"""
+        return self.capacity <= 0
+
+    @property
+    def rate(self) -> float:
+        """초당 충전량"""
+        return self.capacity / self.period
+
+    def _refill(self, now: float) -> None:
+        if now > self._updated_at:
+            self.tokens = min(self.capacity, self.tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+
+    def available(self, now: Optional[float] = None) -> float:
+        """현재 남은 양 (무제한이면 inf)"""
+        if self.unlimited:
+            return math.inf
+        self._refill(time.monotonic() if now is None else now)
+        return self.tokens
+
+    def wait_time(self, amount: float, now: Optional[float] = None) -> float:
+        """
+        amount만큼 꺼낼 수 있을 때까지 기다려야 하는 시간 (초)
+
+        한 번에 capacity보다 많이 요청하면 버킷이 가득 찼을 때 허용합니다.
+        """
+        now = time.monotonic() if now is None else now
+        wait = max(0.0, self.paused_until - now)
+        if self.unlimited:
+            return wait
+        self._refill(now)
+        shortage = min(amount, self.capacity) - self.tokens
+        if shortage > 0:
+            wait = max(wait, shortage / self.rate)
+        return wait
+
+    def take(self, amount: float, now: Optional[float] = None) -> None:
+        """amount만큼 사용 (실제 사용량 보정 시 음수까지 내려갈 수 있음)"""
+        if self.unlimited:
+            return
+        self._refill(time.monotonic() if now is None else now)
+        self.tokens -= amount
+
+    def give(self, amount: float) -> None:
+        """예상보다 덜 사용한 만큼 반환"""
+        if not self.unlimited:
+            self.tokens = min(self.capacity, self.tokens + amount)
+
+    def sync(self, limit: Optional[int], remaining: Optional[int]) -> None:
+        """
+        업스트림 응답 헤더의 한도/잔량으로 보정
+
+        다른 프로세스와 한도를 공유할 수 있으므로 서버가 알려준 잔량이 더 적을 때만 낮춥니다.
+        (x-ratelimit-reset-*는 버킷이 가득 찰 때까지의 시간이므로 쓰지 않고 연속 충전으로 계산)
+
+        Args:
+            limit: 분당 한도 (x-ratelimit-limit-*)
+            remaining: 남은 양 (x-ratelimit-remaining-*)
+        """
+        now = time.monotonic()
+        if limit:
+            if self.unlimited:
+                self.tokens = float(limit)
+                self._updated_at = now
+            else:
+                self._refill(now)
+            self.capacity = float(limit)
+            self.tokens = min(self.tokens, self.capacity)
+        if remaining is not None and not self.unlimited:
+            self.tokens = min(self.tokens, float(remaining))
+
+    def pause(self, seconds: float) -> None:
+        """업스트림이 거절한 경우(429) 지정 시간 동안 꺼내지 못하게 함 (무제한 버킷도 적용)"""
+        now = time.monotonic()
+        self.paused_until = max(self.paused_until, now + seconds)
+        if not self.unlimited:
+            self._refill(now)
+            self.tokens = min(self.tokens, 0.0)
+
+
+@dataclass
+class _Limits:
+    """요청 수/토큰 수 버킷 한 쌍 (모델 또는 테넌트)"""
+    requests: TokenBucket
+    tokens: TokenBucket
+
+    def wait_time(self, tokens: int, now: float) -> float:
+        return max(self.requests.wait_time(1, now), self.tokens.wait_time(tokens, now))
+
+    def take(self, tokens: int, now: float) -> None:
+        self.requests.take(1, now)
+        self.tokens.take(tokens, now)
+
+    def adjust(self, estimated: int, actual: int) -> None:
+        """예상 토큰 수와 실제 사용량의 차이 보정"""
+        if actual < estimated:
+            self.tokens.give(estimated - actual)
+        elif actual > estimated:
+            self.tokens.take(actual - estimated)
+
+
+@dataclass(eq=False)
+class _Waiter:
+    """버킷이 찰 때까지 대기 중인 호출"""
+    model: str
+    tenant: str
+    priority: str
+    tokens: int
+    future: asyncio.Future
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+class Permit:
+    """스케줄러가 내보낸 호출 하나 (응답을 받으면 settle()로 실제 사용량과 헤더 반영)"""
+
+    def __init__(self, scheduler: "UpstreamScheduler", model: str, tenant: str, tokens: int, waited: float):
+        self._scheduler = scheduler
+        self.model = model
+        self.tenant = tenant
+        self.tokens = tokens
+        self.waited = waited
+        self._settled = False
+
+    def settle(self, response: Any) -> None:
+        """
+        응답 메시지의 사용량(usage_metadata)과 rate limit 헤더(response_metadata["headers"])로 버킷 보정
+
+        Args:
+            response: LLM 응답 메시지
+        """
+        if self._settled:
+            return
+        self._settled = True
+        usage_metadata = getattr(response, "usage_metadata", None) or {}
+        headers = (getattr(response, "response_metadata", None) or {}).get("headers")
+        actual = usage_metadata.get("total_tokens")
+        self._scheduler._settle(self, actual, headers)
+
+    def fail(self, error: BaseException) -> None:
+        """호출 실패 반영 (429면 응답 헤더의 재시도 시간 동안 해당 모델 호출을 멈춤)"""
+        if self._settled:
+            return
+        self._settled = True
+        self._scheduler._fail(self, error)
+
+
+class UpstreamScheduler:
+    """
+    모델별 rate limit 버킷과 우선순위/테넌트 대기열을 가진 업스트림 호출 스케줄러
+
+    버킷에 여유가 있으면 호출은 대기 없이 바로 나갑니다. 한도에 걸리면 대기열에 들어가
+    높은 우선순위부터, 같은 우선순위 안에서는 테넌트별로 번갈아 처리됩니다.
+    모델 한도는 설정값으로 시작하고(0이면 무제한) 응답 헤더(x-ratelimit-*)로 계속 보정합니다.
+    """
+
+    def __init__(
+        self,
+        rpm: int = 0,
+        tpm: int = 0,
+        model_limits: Optional[Mapping[str, Tuple[int, int]]] = None,
+        tenant_rpm: int = 0,
+        tenant_tpm: int = 0,
+        output_tokens: int = 256
+    ):
+        """
+        Args:
+            rpm: 모델별 기본 분당 요청 수 한도 (0이면 응답 헤더로 알게 될 때까지 무제한)
+            tpm: 모델별 기본 분당 토큰 수 한도 (0이면 응답 헤더로 알게 될 때까지 무제한)
+            model_limits: 모델별 (rpm, tpm) 한도
+            tenant_rpm: 테넌트별 분당 요청 수 할당량 (0이면 무제한)
+            tenant_tpm: 테넌트별 분당 토큰 수 할당량 (0이면 무제한)
+            output_tokens: max_tokens가 없을 때 응답 토큰 수 추정치
+        """
+        self.rpm = rpm
+        self.tpm = tpm
+        self.model_limits = dict(model_limits or {})
+        self.tenant_rpm = tenant_rpm
+        self.tenant_tpm = tenant_tpm
+        self.output_tokens = output_tokens
+        self._models: Dict[str, _Limits] = {}
+        self._tenants: "OrderedDict[str, _Limits]" = OrderedDict()
+        # 우선순위별 테넌트 대기열 (OrderedDict 순서가 라운드로빈 순서)
+        self._queues: Dict[str, "OrderedDict[str, Deque[_Waiter]]"] = {
+            priority: OrderedDict() for priority in PRIORITIES
+        }
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._granted = 0
+        self._rate_limited = 0
+        self._rejected = 0
+
+    def _model(self, model: str) -> _Limits:
+        limits = self._models.get(model)
+        if limits is None:
+            rpm, tpm = self.model_limits.get(model, (self.rpm, self.tpm))
+            limits = self._models[model] = _Limits(TokenBucket(rpm), TokenBucket(tpm))
+        return limits
+
+    def _tenant(self, tenant: str) -> _Limits:
+        limits = self._tenants.get(tenant)
+        if limits is None:
+            limits = self._tenants[tenant] = _Limits(TokenBucket(self.tenant_rpm), TokenBucket(self.tenant_tpm))
+            self._evict_tenants()
+        else:
+            self._tenants.move_to_end(tenant)
+        return limits
+
+    def _evict_tenants(self) -> None:
+        if len(self._tenants) <= MAX_TENANTS:
+            return
+        waiting = {tenant for queues in self._queues.values() for tenant in queues}
+        for tenant in list(self._tenants):
+            if len(self._tenants) <= MAX_TENANTS:
+                break
+            if tenant not in waiting:
+                del self._tenants[tenant]
+
+    @property
+    def queued(self) -> int:
+        """대기 중인 호출 수"""
+        return sum(len(queue) for queues in self._queues.values() for queue in queues.values())
+
+    @asynccontextmanager
+    async def permit(
+        self,
+        model: str,
+        tokens: int,
+        priority: str = "standard",
+        tenant: Optional[str] = None,
+        timeout: Optional[float] = None
+    ) -> AsyncIterator[Permit]:
+        """
+        버킷에 여유가 생길 때까지 기다린 뒤 호출 허가
+
+        사용 예:
+            async with scheduler.permit(model, tokens, "interactive", tenant) as permit:
+                response = await llm.ainvoke(messages)
+                permit.settle(response)
+
+        블록에서 예외가 나면 permit.fail()로 반영합니다.
+
+        Args:
+            model: 호출할 모델명
+            tokens: 예상 토큰 수 (입력 + 최대 출력)
+            priority: 우선순위 (interactive, standard, batch)
+            tenant: 테넌트 ID 또는 API 키 (None이면 공용 테넌트)
+            timeout: 남은 요청 시간 (초, 테넌트 할당량이 이 안에 회복되지 않으면 바로 거절)
+
+        Yields:
+            Permit
+
+        Raises:
+            QuotaExceededError: 테넌트 할당량 초과
+            ValueError: 알 수 없는 우선순위
+        """
+        permit = await self.acquire(model, tokens, priority, tenant, timeout)
+        try:
+            yield permit
+        except BaseException as e:
+            permit.fail(e)
+            raise
+
+    async def acquire(
+        self,
+        model: str,
+        tokens: int,
+        priority: str = "standard",
+        tenant: Optional[str] = None,
+        timeout: Optional[float] = None
+    ) -> Permit:
+        """
+        호출 허가 획득 (permit() 참고)
+
+        Raises:
+            QuotaExceededError: 테넌트 할당량 초과
+            ValueError: 알 수 없는 우선순위
+        """
+        if priority not in self._queues:
+            raise ValueError(f"알 수 없는 우선순위: {priority}")
+        tenant = tenant or DEFAULT_TENANT
+        now = time.monotonic()
+
+        quota_wait = self._tenant(tenant).wait_time(tokens, now)
+        if timeout is not None and quota_wait > timeout:
+            self._rejected += 1
+            raise QuotaExceededError(
+                f"테넌트 할당량 초과: {tenant} ({quota_wait:.1f}초 후 재시도)",
+                tenant=tenant,
+                retry_after=max(1, math.ceil(quota_wait))
+            )
+
+        waiter = _Waiter(model, tenant, priority, tokens, asyncio.get_running_loop().create_future(), now)
+
+        # 대기 중인 호출이 없고 버킷에 여유가 있으면 바로 허가
+        if not self.queued and self._wait_time(waiter, now) == 0:
+            self._grant(waiter, now)
+            return Permit(self, model, tenant, tokens, 0.0)
+
+        self._queues[priority].setdefault(tenant, deque()).append(waiter)
+        self._dispatch()
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # 허가와 취소가 겹친 경우 사용하지 않은 몫 반환
+                self._model(model).adjust(tokens, 0)
+                self._tenant(tenant).adjust(tokens, 0)
+            else:
+                self._remove(waiter)
+            self._dispatch()
+            raise
+        return Permit(self, model, tenant, tokens, time.monotonic() - waiter.enqueued_at)
+
+    def _wait_time(self, waiter: _Waiter, now: float) -> float:
+        return max(
+            self._model(waiter.model).wait_time(waiter.tokens, now),
+            self._tenant(waiter.tenant).wait_time(waiter.tokens, now)
+        )
+
+    def _grant(self, waiter: _Waiter, now: float) -> None:
+        self._model(waiter.model).take(waiter.tokens, now)
+        self._tenant(waiter.tenant).take(waiter.tokens, now)
+        self._granted += 1
+        if not waiter.future.done():
+            waiter.future.set_result(None)
+
+    def _remove(self, waiter: _Waiter) -> None:
+        tenants = self._queues[waiter.priority]
+        queue = tenants.get(waiter.tenant)
+        if queue is None:
+            return
+        try:
+            queue.remove(waiter)
+        except ValueError:
+            pass
+        if not queue:
+            del tenants[waiter.tenant]
+
+    def _dispatch(self) -> None:
+        """
+        대기열에서 지금 내보낼 수 있는 호출을 모두 허가하고, 남은 호출은 가장 빨리 가능한 시각에 다시 확인
+
+        모델 한도 때문에 기다리는 호출이 있으면 그보다 뒤(낮은 우선순위, 같은 우선순위의 다음 차례)의
+        같은 모델 호출은 허가하지 않습니다. 테넌트 할당량 때문에 기다리는 호출은 다른 테넌트를 막지 않습니다.
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        now = time.monotonic()
+        blocked_models = set()
+        next_check = math.inf
+
+        for priority in PRIORITIES:
+            tenants = self._queues[priority]
+            progressed = True
+            while progressed and tenants:
+                progressed = False
+                for tenant in list(tenants):
+                    queue = tenants[tenant]
+                    waiter = queue[0]
+                    if waiter.future.done():
+                        # 대기 중 취소됨
+                        queue.popleft()
+                    else:
+                        if waiter.model in blocked_models:
+                            continue
+                        model_wait = self._model(waiter.model).wait_time(waiter.tokens, now)
+                        wait = max(model_wait, self._tenant(tenant).wait_time(waiter.tokens, now))
+                        if wait > 0:
+                            next_check = min(next_check, wait)
+                            if model_wait > 0:
+                                blocked_models.add(waiter.model)
+                            continue
+                        queue.popleft()
+                        self._grant(waiter, now)
+                        progressed = True
+                    # 처리한 테넌트는 라운드로빈 순서의 맨 뒤로
+                    if queue:
+                        tenants.move_to_end(tenant)
+                    else:
+                        del tenants[tenant]
+
+        if next_check < math.inf:
+            self._timer = asyncio.get_running_loop().call_later(next_check, self._dispatch)
+
+    def _settle(self, permit: Permit, actual: Optional[int], headers: Optional[Mapping[str, str]]) -> None:
+        if actual is not None:
+            self._model(permit.model).adjust(permit.tokens, actual)
+            self._tenant(permit.tenant).adjust(permit.tokens, actual)
+        if headers:
+            self.update_from_headers(permit.model, headers)
+        if self.queued:
+            self._dispatch()
+
+    def _fail(self, permit: Permit, error: BaseException) -> None:
+        response = getattr(error, "response", None)
+        if getattr(error, "status_code", None) != 429 or response is None:
+            return
+
+        self._rate_limited += 1
+        headers = {key.lower(): value for key, value in response.headers.items()}
+        self.update_from_headers(permit.model, headers)
+        retry_after_ms = _parse_int(headers.get("retry-after-ms"))
+        retry_after = (
+            (retry_after_ms / 1000 if retry_after_ms else None)
+            or parse_duration(headers.get("retry-after"))
+            or 1.0
+        )
+        limits = self._model(permit.model)
+        limits.requests.pause(retry_after)
+        logger.warning(f"업스트림 rate limit (429): {permit.model}, {retry_after:.2f}초 동안 호출 중지")
+        if self.queued:
+            self._dispatch()
+
+    def update_from_headers(self, model: str, headers: Mapping[str, str]) -> None:
+        """
+        OpenAI rate limit 응답 헤더로 모델 버킷 보정
+
+        Args:
+            model: 응답한 모델명
+            headers: 응답 헤더 (x-ratelimit-limit/remaining-requests, -tokens)
+        """
+        headers = {key.lower(): value for key, value in headers.items()}
+        limits = self._model(model)
+        for kind, bucket in (("requests", limits.requests), ("tokens", limits.tokens)):
+            bucket.sync(
+                _parse_int(headers.get(f"x-ratelimit-limit-{kind}")),
+                _parse_int(headers.get(f"x-ratelimit-remaining-{kind}"))
+            )
+
+    def queue_depths(self) -> Dict[str, int]:
+        """우선순위별 대기 중인 호출 수"""
+        return {
+            priority: sum(len(queue) for queue in tenants.values())
+            for priority, tenants in self._queues.items()
+        }
+
+    def buckets(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """모델별 버킷 상태 (무제한 버킷은 제외)"""
+        now = time.monotonic()
+        buckets = {}
+        for model, limits in self._models.items():
+            state = {
+                kind: {"capacity": bucket.capacity, "available": round(bucket.available(now), 1)}
+                for kind, bucket in (("requests", limits.requests), ("tokens", limits.tokens))
+                if not bucket.unlimited
+            }
+            if state:
+                buckets[model] = state
+        return buckets
+
+    def stats(self) -> Dict[str, Any]:
+        """현재 상태 요약"""
+        return {
+            "queued": self.queue_depths(),
+            "waiting_tenants": len({tenant for tenants in self._queues.values() for tenant in tenants}),
+            "granted": self._granted,
+            "rate_limited": self._rate_limited,
+            "quota_rejected": self._rejected,
+            "buckets": self.buckets(),
+            "tenant_quota": {"rpm": self.tenant_rpm, "tpm": self.tenant_tpm},
+        }
+
+
+def parse_model_limits(value: str) -> Dict[str, Tuple[int, int]]:
+    """
+    모델별 한도 설정 해석
+
+    Args:
+        value: "gpt-4o=500/30000,gpt-4o-mini=5000/200000" 형식 (모델=RPM/TPM, 쉼표 구분)
+
+    Raises:
+        ValueError: 형식 오류
+    """
+    limits = {}
+    for item in value.split(","):
+        if not item.strip():
+            continue
+        try:
+            model, pair = item.split("=", 1)
+            rpm, tpm = pair.split("/", 1)
+            limits[model.strip()] = (int(rpm), int(tpm))
+        except ValueError:
+            raise ValueError(f"모델별 한도 형식 오류 (모델=RPM/TPM): {item.strip()}") from None
+    return limits
+
+
+@lru_cache()
+def get_scheduler() -> Optional[UpstreamScheduler]:
+    """프로세스에서 공유하는 업스트림 스케줄러 (비활성화 시 None)"""
+    settings = get_settings()
+    if not settings.llm_scheduler_enabled:
+        return None
+
+    logger.info(
+        f"업스트림 스케줄러 활성화: 모델 기본 {settings.llm_scheduler_rpm} RPM / {settings.llm_scheduler_tpm} TPM "
+        f"(0이면 응답 헤더로 결정), 테넌트 {settings.llm_scheduler_tenant_rpm} RPM / {settings.llm_scheduler_tenant_tpm} TPM"
+    )
+    return UpstreamScheduler(
+        rpm=settings.llm_scheduler_rpm,
+        tpm=settings.llm_scheduler_tpm,
+        model_limits=parse_model_limits(settings.llm_scheduler_model_limits),
+        tenant_rpm=settings.llm_scheduler_tenant_rpm,
+        tenant_tpm=settings.llm_scheduler_tenant_tpm,
+        output_tokens=settings.llm_scheduler_output_tokens
+    )
@@ -17,9 +17,134 @@ class AgentSettings(BaseSettings):
     openai_temperature: float = 0.7
     openai_max_tokens: Optional[int] = None
     
+    # LLM 백엔드 (fake: API 키/네트워크 없이 벤치마크용 가짜 모델 사용, replay: 녹화한 cassette 재생)
+    llm_backend: str = "openai"  # openai, fake, replay
+    fake_llm_ttft: float = 0.2
+    fake_llm_tokens_per_second: float = 50.0
+    fake_llm_response_tokens: int = 64
+    fake_llm_rpm: int = 0  # 가짜 업스트림 rate limit (0이면 무제한, 초과 시 429와 x-ratelimit-* 헤더 흉내)
+    fake_llm_tpm: int = 0
+    fake_llm_latency_jitter: float = 0.0  # 생성 시간에 곱하는 로그정규 분포의 sigma (0이면 고정 지연)
+    fake_llm_slow_rate: float = 0.0  # 생성 시간이 slow_factor배로 늘어나는 호출 비율 (꼬리 지연 흉내)
+    fake_llm_slow_factor: float = 10.0
+    fake_llm_error_rate: float = 0.0  # 500(InternalServerError)으로 실패하는 호출 비율
+    
+    # LLM 호출 녹화/재생 (cassette: 요청/응답/토큰 도착 간격을 담은 JSONL)
+    llm_record_cassette: Optional[str] = None  # 설정 시 모든 백엔드 호출을 이 파일에 추가 기록
+    llm_replay_cassette: Optional[str] = None  # LLM_BACKEND=replay가 재생할 파일
+    llm_replay_time_scale: float = 1.0  # 녹화된 타이밍에 곱할 배율 (0이면 기다리지 않음)
+    llm_replay_on_miss: str = "any"  # any: 요청 해시로 고른 녹화 재생, error: 오류
+    
+    # 앱 시작 시 업스트림 연결 준비 (첫 요청의 TCP/TLS 핸드셰이크 제거, 0이면 비활성)
+    llm_warmup_connections: int = 2
+    llm_warmup_timeout: float = 5.0
+    
     # 에이전트 설정
     agent_timeout: int = 60
     agent_max_retries: int = 3
+    agent_retry_base_delay: float = 0.5
+    agent_retry_max_delay: float = 8.0
+    
+    # 프롬프트 고정 prefix (AgentConfig.metadata["prompt"]로 덮어쓰기 가능)
+    # 모든 요청의 맨 앞에 그대로 붙으므로 시각/요청 ID 같은 바뀌는 값을 넣으면 업스트림 prompt cache가 적중하지 않음
+    agent_system_prompt: str = ""
+    agent_instructions: str = ""  # 시스템 프롬프트 뒤에 붙는 고정 지침
+    
+    # 컨텍스트 윈도우 설정 (AgentConfig.metadata["context"]로 덮어쓰기 가능)
+    context_strategy: str = "none"  # none (opt-in), sliding_window, last_n, summarize
+    context_max_tokens: int = 16000
+    context_keep_last: int = 10
+    
+    # 동시 실행 제한 (admission control)
+    agent_max_concurrency: int = 16  # 0이면 제한 없음
+    agent_max_queue: int = 64
+    agent_queue_timeout: float = 30.0
+    agent_retry_after: int = 5
+    
+    # 업스트림 rate limit 스케줄러 (모델별 RPM/TPM 버킷, 우선순위/테넌트별 대기열)
+    llm_scheduler_enabled: bool = False
+    llm_scheduler_rpm: int = 0  # 모델별 기본 한도, 0이면 응답 헤더(x-ratelimit-*)로 알게 될 때까지 무제한
+    llm_scheduler_tpm: int = 0
+    llm_scheduler_model_limits: str = ""  # 모델별 한도 "gpt-4o=500/30000,gpt-4o-mini=5000/200000" (모델=RPM/TPM)
+    llm_scheduler_tenant_rpm: int = 0  # 테넌트(X-Tenant-ID)별 할당량, 0이면 무제한
+    llm_scheduler_tenant_tpm: int = 0
+    llm_scheduler_output_tokens: int = 256  # max_tokens 미설정 시 응답 토큰 수 추정치
+    
+    # 헤지 요청/페일오버 (백엔드별 지연 시간 EWMA로 가장 빠른 정상 백엔드 선택)
+    llm_fallback_models: str = ""  # 쉼표 구분 "model" 또는 "backend:model" (예: "gpt-4o,fake:fake-fallback")
+    llm_hedge_enabled: bool = False  # 스트리밍이 아닌 호출이 임계값을 넘으면 같은 요청을 한 번 더 보냄
+    llm_hedge_percentile: float = 0.95  # 헤지 임계값 = 백엔드별 최근 지연 시간의 이 백분위
+    llm_hedge_default_delay: float = 3.0  # 표본이 부족할 때 헤지 임계값 (초)
+    llm_hedge_min_delay: float = 0.5  # 헤지 임계값 하한 (초)
+    llm_hedge_max_ratio: float = 0.1  # 최근 호출 중 헤지 비율 상한
+    llm_backend_failure_threshold: int = 3  # 연속 실패 시 백엔드 격리, 0이면 격리하지 않음
+    llm_backend_cooldown: float = 30.0  # 격리 시간 (초)
+    
+    # 요청별 모델 라우팅 (짧은 요청은 빠른 모델, 길거나 복잡한 요청은 큰 모델)
+    router_enabled: bool = False
+    router_fast_model: str = "gpt-4o-mini"
+    router_strong_model: str = "gpt-4o"
+    router_length_threshold: int = 2000  # 이전 기록 포함 문자 수
+    router_complex_markers: str = "```"  # 쉼표 구분, 포함 시 큰 모델 사용
+    router_allowed_models: str = ""  # 쉼표 구분, 등록된 에이전트 모델 외에 요청의 model로 허용할 모델
+    
+    # 대화 저장소 설정 (conversation_id 모드)
+    conversation_store: str = "memory"  # memory, sqlite
+    conversation_store_max_size: int = 1000
+    conversation_store_ttl: int = 0  # 마지막 사용 후 보관 시간 (초, 0이면 만료 없음)
+    conversation_store_path: str = "conversations.db"
+    
+    # 응답 캐시 설정 (opt-in)
+    response_cache_enabled: bool = False
+    response_cache_backend: str = "memory"  # memory, sqlite
+    response_cache_ttl: int = 3600
+    response_cache_max_size: int = 1024
+    response_cache_key_mode: str = "exact"  # exact, normalized
+    response_cache_path: str = "response_cache.db"
+    
+    # 의미(임베딩 유사도) 캐시 설정 (opt-in, numpy 필요, 대화 기록 없는 단일 턴 요청에만 적용)
+    semantic_cache_enabled: bool = False
+    semantic_cache_embedder: str = ""  # openai (활성화 시 필수), hash (fake/replay 백엔드 테스트 전용)
+    semantic_cache_embedding_model: str = "text-embedding-3-small"
+    semantic_cache_dim: int = 512
+    semantic_cache_threshold: float = 0.9
+    semantic_cache_max_size: int = 10000
+    semantic_cache_ttl: int = 3600
+    semantic_cache_path: Optional[str] = None  # 벡터 mmap 파일 (.npy, None이면 메모리에만 보관)
+    
+    # 배치 API (/api/chat/batch)
+    batch_max_size: int = 100
+    batch_max_concurrency: int = 8
+    
+    # 비동기 작업 API (/api/jobs, 작업 결과를 저장소에 보관하고 폴링/SSE로 조회)
+    job_workers: int = 0  # 동시에 실행할 작업 수, 0이면 작업 API 비활성화 (opt-in)
+    job_max_queue: int = 1000
+    job_store: str = "memory"  # memory, sqlite (sqlite는 재시작 후 완료되지 않은 작업을 다시 실행)
+    job_store_path: str = "jobs.db"
+    job_store_max_size: int = 10000
+    job_result_ttl: int = 3600  # 완료된 작업 보관 시간 (초)
+    job_timeout: float = 600.0  # 작업 하나의 타임아웃 (초)
+    job_lease_timeout: float = 60.0  # 이 시간 동안 갱신되지 않은 running 작업은 다른 워커가 다시 실행 (초)
+    
+    # SSE 스트리밍 (/api/chat/stream)
+    stream_coalesce_interval: float = 0.0  # 초, 0이면 이미 도착한 조각만 합침
+    stream_coalesce_chars: int = 0  # 버퍼가 이 문자 수 이상이면 즉시 전송, 0이면 제한 없음
+    stream_heartbeat_interval: float = 0.0  # 초, 0이면 비활성 (coalescing/heartbeat 사용 시 스트림마다 업스트림 태스크 추가)
+    stream_event_ids: bool = True
+
+    # 스트림 이어받기 (Last-Event-ID, 생성은 HTTP 연결과 분리되어 백그라운드에서 진행)
+    stream_resume_enabled: bool = False  # 활성화 시 끊어진 스트림도 grace_period 동안 LLM 호출이 계속됨
+    stream_resume_buffer_size: int = 1024  # 스트림별 보관 조각 수
+    stream_resume_ttl: float = 60.0  # 스트림 종료 후 보관 시간 (초)
+    stream_resume_grace_period: float = 10.0  # 연결된 클라이언트가 없을 때 업스트림 취소까지 유예 시간 (초)
+    stream_resume_max_streams: int = 1000
+
+    # 동일 요청 coalescing (single-flight)
+    single_flight_enabled: bool = True
+    
+    # 관측성 설정 (/metrics, 단계별 span)
+    metrics_enabled: bool = True
+    tracing_enabled: bool = False  # OpenTelemetry span 생성 (opentelemetry-api 필요)
     
     # 로깅 설정
     log_level: str = "INFO"
@@ -0,0 +1,139 @@
+"""
+요청 처리 단계별 타이밍 span
+
+기본값은 no-op이며, configure()로 관찰자(메트릭 수집)나 OpenTelemetry tracer를 연결하면 활성화됩니다.
+비활성 상태의 span()은 공유 no-op 객체를 반환하므로 추가 비용이 거의 없습니다.
+"""
+
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# (단계 이름, 소요 시간(초), 속성) -> None
+SpanObserver = Callable[[str, float, Dict[str, Any]], None]
+
+_observers: List[SpanObserver] = []
+_tracer: Any = None
+_enabled = False
+
+
+class Span:
+    """no-op span (비활성 상태에서 공유)"""
+
+    __slots__ = ()
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """span 속성 설정"""
+
+    def __enter__(self) -> "Span":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        return None
+
+
+_NOOP_SPAN = Span()
+
+
+class _RecordingSpan(Span):
+    """소요 시간을 측정해 관찰자에게 전달하고, tracer가 있으면 OpenTelemetry span도 생성"""
+
+    __slots__ = ("name", "attributes", "_started_at", "_otel_context", "_otel_span")
+
+    def __init__(self, name: str, attributes: Dict[str, Any]):
+        self.name = name
+        self.attributes = attributes
+        self._otel_context = None
+        self._otel_span = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+        if self._otel_span is not None:
+            self._otel_span.set_attribute(key, value)
+
+    def __enter__(self) -> "_RecordingSpan":
+        if _tracer is not None:
+            self._otel_context = _tracer.start_as_current_span(self.name, attributes=self.attributes)
+            self._otel_span = self._otel_context.__enter__()
+        self._started_at = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        duration = time.perf_counter() - self._started_at
+        if exc_type is not None:
+            self.attributes["error"] = exc_type.__name__
+        if self._otel_context is not None:
+            self._otel_context.__exit__(exc_type, exc, tb)
+        _notify(self.name, duration, self.attributes)
+
+
+def _notify(name: str, duration: float, attributes: Dict[str, Any]) -> None:
+    for observer in _observers:
+        try:
+            observer(name, duration, attributes)
+        except Exception as e:
+            logger.warning(f"span 관찰자 오류 ({name}): {e}")
+
+
+def configure(observer: Optional[SpanObserver] = None, opentelemetry: bool = False) -> None:
+    """
+    span 수집 설정 (기존 설정은 초기화)
+
+    Args:
+        observer: 종료된 span을 전달받을 함수 (예: 단계별 지연 시간 히스토그램 기록)
+        opentelemetry: OpenTelemetry tracer 사용 여부 (opentelemetry-api가 없으면 경고 후 무시)
+    """
+    global _tracer, _enabled
+    _observers.clear()
+    if observer is not None:
+        _observers.append(observer)
+
+    _tracer = None
+    if opentelemetry:
+        try:
+            from opentelemetry import trace
+            _tracer = trace.get_tracer("chat-api")
+        except ImportError:
+            logger.warning("opentelemetry-api가 설치되지 않아 OpenTelemetry span을 생성하지 않습니다.")
+
+    _enabled = bool(_observers) or _tracer is not None
+
+
+def enabled() -> bool:
+    """span 수집 활성화 여부"""
+    return _enabled
+
+
+def span(name: str, **attributes: Any) -> Span:
+    """
+    처리 단계 span
+
+        with tracing.span("llm", model=model) as s:
+            response = await llm.ainvoke(messages)
+            s.set_attribute("output_tokens", ...)
+
+    Args:
+        name: 단계 이름
+        **attributes: span 속성
+
+    Returns:
+        컨텍스트 매니저 (비활성 상태면 공유 no-op span)
+    """
+    if not _enabled:
+        return _NOOP_SPAN
+    return _RecordingSpan(name, attributes)
+
+
+def record(name: str, duration: float, **attributes: Any) -> None:
+    """
+    span 밖에서 측정한 단계 소요 시간을 관찰자에게 전달 (예: 프레임워크가 처리하는 요청 디코딩)
+
+    Args:
+        name: 단계 이름
+        duration: 소요 시간 (초)
+        **attributes: 속성
+    """
+    if _enabled:
+        _notify(name, duration, attributes)
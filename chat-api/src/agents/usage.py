@@ -0,0 +1,70 @@
+"""
+토큰 사용량 수집
+그래프 안에서 이루어진 LLM 호출의 토큰 사용량(업스트림 prompt cache 적중 토큰 포함)을 요청 단위로 모음
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterator, Mapping, Optional
+
+
+@dataclass
+class TokenUsage:
+    """요청 하나의 누적 토큰 사용량"""
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cached_tokens: int = 0  # input_tokens 중 업스트림 prompt cache에서 읽은 토큰
+    calls: int = 0
+
+    @property
+    def cache_hit_rate(self) -> float:
+        """입력 토큰 중 캐시 적중 비율"""
+        return self.cached_tokens / self.input_tokens if self.input_tokens else 0.0
+
+    def add(self, usage_metadata: Mapping[str, Any]) -> None:
+        """LangChain usage_metadata 누적"""
+        self.input_tokens += usage_metadata.get("input_tokens", 0)
+        self.output_tokens += usage_metadata.get("output_tokens", 0)
+        self.cached_tokens += cached_tokens(usage_metadata)
+        self.calls += 1
+
+    def to_dict(self) -> Dict[str, int]:
+        """응답 메타데이터용 dict"""
+        return asdict(self)
+
+
+_current: ContextVar[Optional[TokenUsage]] = ContextVar("token_usage", default=None)
+
+
+def cached_tokens(usage_metadata: Mapping[str, Any]) -> int:
+    """usage_metadata에서 prompt cache 적중 토큰 수 추출 (OpenAI: prompt_tokens_details.cached_tokens)"""
+    details = usage_metadata.get("input_token_details") or {}
+    return details.get("cache_read", 0) or 0
+
+
+@contextmanager
+def track_usage() -> Iterator[TokenUsage]:
+    """
+    블록 안에서 실행된 LLM 호출의 토큰 사용량 수집
+
+    사용 예:
+        with usage.track_usage() as tracked:
+            response = await agent.invoke(message)
+        tracked.cached_tokens
+
+    블록 안에서 만든 태스크(LangGraph 노드 등)도 같은 TokenUsage에 기록합니다.
+    """
+    tracked = TokenUsage()
+    token = _current.set(tracked)
+    try:
+        yield tracked
+    finally:
+        _current.reset(token)
+
+
+def record(usage_metadata: Optional[Mapping[str, Any]]) -> None:
+    """현재 수집 중인 TokenUsage에 사용량 추가 (수집 중이 아니면 무시)"""
+    tracked = _current.get()
+    if tracked is not None and usage_metadata:
+        tracked.add(usage_metadata)
@@ -3,100 +3,207 @@ Chat Controller
 Litestar Controller를 사용한 채팅 API
 """
 
+import asyncio
 import logging
-from litestar import Controller, post, get
+from contextlib import aclosing
+from typing import AsyncIterator, Dict, Optional
+
+import msgspec
+from litestar import Controller, Request, post, get
+from litestar.params import Parameter
 from litestar.response import Stream
 from litestar.exceptions import HTTPException
-from litestar.status_codes import HTTP_500_INTERNAL_SERVER_ERROR, HTTP_400_BAD_REQUEST
+from litestar.status_codes import (
+    HTTP_200_OK,
+    HTTP_500_INTERNAL_SERVER_ERROR,
+    HTTP_400_BAD_REQUEST,
+    HTTP_404_NOT_FOUND,
+    HTTP_410_GONE,
+    HTTP_504_GATEWAY_TIMEOUT,
+)
 
-from ..models import ChatRequest, ChatResponse, HealthResponse, StreamChunk
-from ..services.chat_service import ChatService, ChatRequest as ServiceChatRequest
-from ...agents import ChatMessage
+from .. import telemetry
+from ..disconnect import cancel_on_disconnect
+from ..models import (
+    BatchChatRequest,
+    BatchChatResponse,
+    BatchItemResult,
+    ChatRequest,
+    ChatResponse,
+    HealthResponse,
+)
+from ..services.chat_service import (
+    BatchResult,
+    ChatService,
+    ChatRequest as ServiceChatRequest,
+    ChatResponse as ServiceChatResponse,
+)
+from ..services.concurrency import OverloadedError
+from ..services.stream_registry import StreamExpiredError, StreamNotFoundError, StreamRegistry
+from ..streaming import SSEEncoder
+from ...agents import DeadlineExceededError
 
 logger = logging.getLogger(__name__)
 
+# 업스트림 할당량/공정 스케줄링 단위를 지정하는 요청 헤더 (없으면 공용 테넌트)
+# 클라이언트가 보낸 값을 그대로 믿으므로, 외부에 노출할 때는 인증을 마친 신뢰할 수 있는 게이트웨이가
+# 클라이언트의 헤더를 지우고 자격 증명에서 얻은 테넌트로 다시 설정해야 합니다.
+TENANT_HEADER = "X-Tenant-ID"
+
 
 class ChatController(Controller):
     """채팅 컨트롤러"""
     
     path = "/api"
     tags = ["Chat"]
+    before_request = telemetry.mark_stage
     
-    @post("/chat", summary="채팅 메시지 전송")
-    async def chat(self, data: ChatRequest, chat_service: ChatService) -> ChatResponse:
-        """채팅 메시지 처리"""
-        try:
-            # API 모델을 서비스 모델로 변환
-            chat_history = None
-            if data.history:
-                chat_history = [
-                    ChatMessage(role=msg.role.value, content=msg.content)
-                    for msg in data.history
-                ]
-            
-            service_request = ServiceChatRequest(
-                message=data.message,
-                history=chat_history
-            )
-            
-            # 서비스 호출
-            service_response = await chat_service.send_message(service_request)
-            
-            # 서비스 모델을 API 모델로 변환
-            return ChatResponse(
-                message=service_response.message,
-                model=service_response.model,
-                metadata={
-                    "agent": service_response.agent_name,
-                    "version": service_response.agent_version
-                }
-            )
-            
-        except ValueError as e:
-            logger.error(f"채팅 요청 처리 실패: {e}")
-            raise HTTPException(
-                status_code=HTTP_400_BAD_REQUEST,
-                detail=str(e)
-            )
-        except Exception as e:
-            logger.error(f"예상치 못한 오류: {e}", exc_info=True)
-            raise HTTPException(
-                status_code=HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="내부 서버 오류가 발생했습니다."
-            )
+    @staticmethod
+    def _overloaded(error: OverloadedError) -> HTTPException:
+        """과부하 오류를 429/503 응답으로 변환"""
+        logger.warning(f"요청 거절 (과부하): {error}")
+        return HTTPException(
+            status_code=error.status_code,
+            detail=str(error),
+            headers={"Retry-After": str(error.retry_after)}
+        )
     
-    @post("/chat/stream", summary="스트리밍 채팅")
-    async def stream_chat(self, data: ChatRequest, chat_service: ChatService) -> Stream:
-        """스트리밍 채팅 처리"""
-        # API 모델을 서비스 모델로 변환
-        chat_history = None
-        if data.history:
-            chat_history = [
-                ChatMessage(role=msg.role.value, content=msg.content)
-                for msg in data.history
-            ]
-        
-        service_request = ServiceChatRequest(
+    @staticmethod
+    def _to_service_request(data: ChatRequest, tenant: Optional[str] = None) -> ServiceChatRequest:
+        """API 요청 모델을 서비스 요청 모델로 변환 (대화 기록은 디코딩된 ChatMessage를 그대로 전달)"""
+        return ServiceChatRequest(
             message=data.message,
-            history=chat_history
+            history=data.history or None,
+            conversation_id=data.conversation_id,
+            model=data.model,
+            temperature=data.temperature,
+            agent=data.agent,
+            tenant=tenant
+        )
+    
+    @staticmethod
+    def _to_api_response(service_response: ServiceChatResponse) -> ChatResponse:
+        """서비스 응답 모델을 API 응답 모델로 변환"""
+        return ChatResponse(
+            message=service_response.message,
+            model=service_response.model,
+            metadata={
+                "agent": service_response.agent_name,
+                "version": service_response.agent_version,
+                "conversation_id": service_response.conversation_id,
+                "cached": service_response.cached,
+                "route": service_response.route,
+                "route_reason": service_response.route_reason,
+                "usage": service_response.usage.to_dict() if service_response.usage is not None else None
+            }
         )
+    
+    @staticmethod
+    def _to_batch_item(result: BatchResult) -> BatchItemResult:
+        """배치 항목 결과 변환 (오류는 단건 API와 같은 상태 코드로 매핑)"""
+        if result.ok:
+            return BatchItemResult(
+                index=result.index,
+                status_code=HTTP_200_OK,
+                response=ChatController._to_api_response(result.response)
+            )
+        
+        error = result.error
+        if isinstance(error, OverloadedError):
+            status_code, detail = error.status_code, str(error)
+        elif isinstance(error, DeadlineExceededError):
+            status_code, detail = HTTP_504_GATEWAY_TIMEOUT, str(error)
+        elif isinstance(error, ValueError):
+            status_code, detail = HTTP_400_BAD_REQUEST, str(error)
+        else:
+            logger.error(f"배치 항목 처리 중 예상치 못한 오류: {error}")
+            status_code, detail = HTTP_500_INTERNAL_SERVER_ERROR, "내부 서버 오류가 발생했습니다."
+        return BatchItemResult(index=result.index, status_code=status_code, error=detail)
+    
+    @staticmethod
+    def _to_service_batch(data: BatchChatRequest, chat_service: ChatService, tenant: Optional[str] = None) -> list:
+        """
+        배치 요청 변환 및 크기 확인
+        
+        Raises:
+            HTTPException: 빈 배치 또는 최대 크기 초과 (400)
+        """
+        requests = [ChatController._to_service_request(item, tenant) for item in data.requests]
+        try:
+            chat_service.check_batch(requests)
+        except ValueError as e:
+            raise HTTPException(status_code=HTTP_400_BAD_REQUEST, detail=str(e))
+        return requests
+    
+    @post("/chat", summary="채팅 메시지 전송")
+    async def chat(
+        self,
+        request: Request,
+        data: ChatRequest,
+        chat_service: ChatService,
+        tenant: Optional[str] = Parameter(header=TENANT_HEADER, required=False)
+    ) -> ChatResponse:
+        """채팅 메시지 처리 (클라이언트 연결이 끊어지면 LLM 호출까지 취소)"""
+        telemetry.end_stage("decode")
+        async with cancel_on_disconnect(request, "/api/chat"):
+            try:
+                # API 모델을 서비스 모델로 변환
+                service_request = self._to_service_request(data, tenant)
+                
+                # 서비스 호출
+                service_response = await chat_service.send_message(service_request)
+                
+                # 서비스 모델을 API 모델로 변환
+                response = self._to_api_response(service_response)
+                telemetry.end_stage("handler")
+                return response
+                
+            except OverloadedError as e:
+                raise self._overloaded(e)
+            except DeadlineExceededError as e:
+                logger.error(f"채팅 요청 시간 초과: {e}")
+                raise HTTPException(
+                    status_code=HTTP_504_GATEWAY_TIMEOUT,
+                    detail=str(e)
+                )
+            except ValueError as e:
+                logger.error(f"채팅 요청 처리 실패: {e}")
+                raise HTTPException(
+                    status_code=HTTP_400_BAD_REQUEST,
+                    detail=str(e)
+                )
+            except Exception as e:
+                logger.error(f"예상치 못한 오류: {e}", exc_info=True)
+                raise HTTPException(
+                    status_code=HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail="내부 서버 오류가 발생했습니다."
+                )
+    
+    @staticmethod
+    def _sse_response(
+        chunks: AsyncIterator[str],
+        sse_encoder: SSEEncoder,
+        path: str,
+        start_id: int = 0,
+        headers: Optional[Dict[str, str]] = None
+    ) -> Stream:
+        """조각 스트림을 SSE 응답으로 변환 (스트림 중 오류는 마지막 프레임으로 전달)"""
         
         async def generate_stream():
             """스트림 생성기"""
             try:
-                async for chunk in chat_service.stream_message(service_request):
-                    if chunk:
-                        chunk_data = StreamChunk(content=chunk, is_final=False)
-                        yield f"data: {chunk_data.model_dump_json()}\n\n"
-                
-                # 마지막 청크
-                final_chunk = StreamChunk(content="", is_final=True)
-                yield f"data: {final_chunk.model_dump_json()}\n\n"
+                async for frame in sse_encoder.stream(chunks, start_id):
+                    yield frame
                 
+            except asyncio.CancelledError:
+                # 연결 종료 시 Litestar가 스트림을 취소하면 업스트림까지 취소가 전파됨
+                # (이어받기 모드에서는 유예 시간 동안 생성이 계속됨)
+                telemetry.CLIENT_DISCONNECTS.inc(path=path)
+                raise
             except Exception as e:
                 logger.error(f"스트림 생성 중 오류: {e}", exc_info=True)
-                error_chunk = StreamChunk(content=f"Error: {str(e)}", is_final=True)
-                yield f"data: {error_chunk.model_dump_json()}\n\n"
+                telemetry.ERRORS.inc(path=path)
+                yield sse_encoder.frame(f"Error: {str(e)}", is_final=True)
         
         return Stream(
             generate_stream(),
@@ -104,10 +211,139 @@ class ChatController(Controller):
             headers={
                 "Cache-Control": "no-cache",
                 "Connection": "keep-alive",
-                "Access-Control-Allow-Origin": "*"
+                "Access-Control-Allow-Origin": "*",
+                **(headers or {})
             }
         )
     
+    @post("/chat/stream", summary="스트리밍 채팅")
+    async def stream_chat(
+        self,
+        data: ChatRequest,
+        chat_service: ChatService,
+        sse_encoder: SSEEncoder,
+        stream_registry: Optional[StreamRegistry],
+        tenant: Optional[str] = Parameter(header=TENANT_HEADER, required=False)
+    ) -> Stream:
+        """
+        스트리밍 채팅 처리 (프레임 형식과 coalescing/heartbeat는 SSEEncoder 설정을 따름)
+        
+        스트림 이어받기가 활성화되어 있으면 생성은 백그라운드에서 진행되고,
+        연결이 끊어진 클라이언트는 X-Stream-ID 헤더의 ID로 GET /api/chat/stream/{stream_id}에 다시 연결합니다.
+        """
+        telemetry.end_stage("decode")
+        
+        # 대기열이 가득 찬 경우 스트림을 열기 전에 거절
+        try:
+            chat_service.check_capacity()
+        except OverloadedError as e:
+            raise self._overloaded(e)
+        
+        # API 모델을 서비스 모델로 변환
+        service_request = self._to_service_request(data, tenant)
+        try:
+            chat_service.check_request(service_request)
+        except ValueError as e:
+            raise HTTPException(status_code=HTTP_400_BAD_REQUEST, detail=str(e))
+        chunks = chat_service.stream_message(service_request)
+        
+        headers = {}
+        if stream_registry is not None:
+            try:
+                stream = stream_registry.start(chunks)
+            except OverloadedError as e:
+                await chunks.aclose()
+                raise self._overloaded(e)
+            chunks = stream.subscribe()
+            headers["X-Stream-ID"] = stream.id
+        
+        telemetry.end_stage("handler")
+        return self._sse_response(chunks, sse_encoder, "/api/chat/stream", headers=headers)
+    
+    @get("/chat/stream/{stream_id:str}", summary="끊어진 스트림 이어받기")
+    async def resume_stream(
+        self,
+        stream_id: str,
+        sse_encoder: SSEEncoder,
+        stream_registry: Optional[StreamRegistry],
+        last_event_id: int = Parameter(header="Last-Event-ID", default=0, ge=0)
+    ) -> Stream:
+        """
+        Last-Event-ID 이후의 조각을 재생한 뒤 진행 중인 생성에 이어서 연결
+        
+        Raises:
+            HTTPException: 스트림 없음/이어받기 비활성화 (404), 재생할 조각이 버퍼에서 밀려났거나 취소된 스트림 (410)
+        """
+        if stream_registry is None:
+            raise HTTPException(status_code=HTTP_404_NOT_FOUND, detail="스트림 이어받기가 비활성화되어 있습니다.")
+        
+        try:
+            stream = stream_registry.get(stream_id)
+            stream.check(last_event_id)
+        except StreamNotFoundError as e:
+            raise HTTPException(status_code=HTTP_404_NOT_FOUND, detail=str(e))
+        except StreamExpiredError as e:
+            raise HTTPException(status_code=HTTP_410_GONE, detail=str(e))
+        
+        logger.info(f"스트림 이어받기: {stream_id} (Last-Event-ID {last_event_id})")
+        return self._sse_response(
+            stream.subscribe(last_event_id),
+            sse_encoder,
+            "/api/chat/stream/{stream_id}",
+            start_id=last_event_id,
+            headers={"X-Stream-ID": stream.id}
+        )
+    
+    @post("/chat/batch", summary="배치 채팅")
+    async def chat_batch(
+        self,
+        request: Request,
+        data: BatchChatRequest,
+        chat_service: ChatService,
+        tenant: Optional[str] = Parameter(header=TENANT_HEADER, required=False)
+    ) -> BatchChatResponse:
+        """여러 채팅 요청을 한 번에 처리 (항목별 오류는 해당 항목 결과에만 기록)"""
+        telemetry.end_stage("decode")
+        requests = self._to_service_batch(data, chat_service, tenant)
+        
+        async with cancel_on_disconnect(request, "/api/chat/batch"):
+            results = await chat_service.send_batch(requests, data.max_concurrency)
+        
+        items = [self._to_batch_item(result) for result in results]
+        failed = sum(1 for item in items if item.error is not None)
+        response = BatchChatResponse(results=items, succeeded=len(items) - failed, failed=failed)
+        telemetry.end_stage("handler")
+        return response
+    
+    @post("/chat/batch/stream", summary="배치 채팅 (NDJSON 스트리밍)")
+    async def stream_chat_batch(
+        self,
+        data: BatchChatRequest,
+        chat_service: ChatService,
+        tenant: Optional[str] = Parameter(header=TENANT_HEADER, required=False)
+    ) -> Stream:
+        """여러 채팅 요청을 처리하고 완료되는 순서대로 결과를 한 줄씩 전송"""
+        telemetry.end_stage("decode")
+        requests = self._to_service_batch(data, chat_service, tenant)
+        
+        async def generate_lines():
+            """NDJSON 라인 생성기"""
+            try:
+                async with aclosing(chat_service.stream_batch(requests, data.max_concurrency)) as results:
+                    async for result in results:
+                        yield msgspec.json.encode(self._to_batch_item(result)) + b"\n"
+            except asyncio.CancelledError:
+                # 남은 항목은 stream_batch 종료 시 취소되고 정리가 끝날 때까지 기다림
+                telemetry.CLIENT_DISCONNECTS.inc(path="/api/chat/batch/stream")
+                raise
+        
+        telemetry.end_stage("handler")
+        return Stream(
+            generate_lines(),
+            media_type="application/x-ndjson",
+            headers={"Cache-Control": "no-cache"}
+        )
+    
     @get("/health", summary="서비스 상태 확인", tags=["Health"])
     async def health_check(self, chat_service: ChatService) -> HealthResponse:
         """헬스 체크"""
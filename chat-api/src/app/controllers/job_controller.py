@@ -0,0 +1,140 @@
+"""
+Job Controller
+오래 걸리는 생성을 비동기 작업으로 등록하고 폴링/SSE로 결과를 조회하는 API
+"""
+
+import asyncio
+import logging
+from typing import Optional
+
+import msgspec
+from litestar import Controller, Response, delete, get, post
+from litestar.params import Parameter
+from litestar.response import Stream
+from litestar.exceptions import HTTPException
+from litestar.status_codes import HTTP_200_OK, HTTP_202_ACCEPTED, HTTP_404_NOT_FOUND
+
+from .. import telemetry
+from ..models import ChatRequest, JobResponse
+from ..services.concurrency import OverloadedError
+from ..services.job_manager import JobManager
+from ..services.job_store import Job
+from .chat_controller import TENANT_HEADER, ChatController
+
+logger = logging.getLogger(__name__)
+
+
+class JobController(Controller):
+    """비동기 작업 컨트롤러"""
+
+    path = "/api"
+    tags = ["Jobs"]
+    before_request = telemetry.mark_stage
+
+    @staticmethod
+    def _require(job_manager: Optional[JobManager]) -> JobManager:
+        """
+        Raises:
+            HTTPException: 작업 API 비활성화 (404)
+        """
+        if job_manager is None:
+            raise HTTPException(status_code=HTTP_404_NOT_FOUND, detail="작업 API가 비활성화되어 있습니다.")
+        return job_manager
+
+    @staticmethod
+    def _not_found(job_id: str) -> HTTPException:
+        return HTTPException(status_code=HTTP_404_NOT_FOUND, detail=f"작업을 찾을 수 없습니다: {job_id}")
+
+    @staticmethod
+    def _to_api_response(job: Job) -> JobResponse:
+        """작업을 API 응답 모델로 변환 (성공한 작업은 단건 API와 같은 채팅 응답 포함)"""
+        result = JobManager.decode_result(job)
+        return JobResponse(
+            id=job.id,
+            status=job.status,
+            created_at=job.created_at,
+            finished_at=job.finished_at,
+            attempts=job.attempts,
+            response=ChatController._to_api_response(result) if result is not None else None,
+            status_code=job.status_code,
+            error=job.error
+        )
+
+    @post("/jobs", summary="비동기 작업 등록", status_code=HTTP_202_ACCEPTED)
+    async def create_job(
+        self,
+        data: ChatRequest,
+        job_manager: Optional[JobManager],
+        tenant: Optional[str] = Parameter(header=TENANT_HEADER, required=False)
+    ) -> Response[JobResponse]:
+        """채팅 요청을 작업으로 등록하고 바로 작업 ID 반환 (워커가 순서대로 실행)"""
+        telemetry.end_stage("decode")
+        job_manager = self._require(job_manager)
+
+        try:
+            job = await job_manager.submit(ChatController._to_service_request(data, tenant))
+        except OverloadedError as e:
+            raise ChatController._overloaded(e)
+
+        telemetry.end_stage("handler")
+        return Response(
+            self._to_api_response(job),
+            status_code=HTTP_202_ACCEPTED,
+            headers={"Location": f"/api/jobs/{job.id}"}
+        )
+
+    @get("/jobs/{job_id:str}", summary="작업 상태/결과 조회")
+    async def get_job(self, job_id: str, job_manager: Optional[JobManager]) -> JobResponse:
+        """
+        작업 조회 (완료된 작업은 JOB_RESULT_TTL 동안 보관)
+
+        Raises:
+            HTTPException: 작업 없음/작업 API 비활성화 (404)
+        """
+        job = await self._require(job_manager).get(job_id)
+        if job is None:
+            raise self._not_found(job_id)
+        return self._to_api_response(job)
+
+    @delete("/jobs/{job_id:str}", summary="작업 취소", status_code=HTTP_200_OK)
+    async def cancel_job(self, job_id: str, job_manager: Optional[JobManager]) -> JobResponse:
+        """
+        대기 중이거나 실행 중인 작업 취소 (이미 완료된 작업은 그대로 반환)
+
+        Raises:
+            HTTPException: 작업 없음/작업 API 비활성화 (404)
+        """
+        job = await self._require(job_manager).cancel(job_id)
+        if job is None:
+            raise self._not_found(job_id)
+        logger.info(f"작업 취소 요청: {job_id} ({job.status})")
+        return self._to_api_response(job)
+
+    @get("/jobs/{job_id:str}/events", summary="작업 상태 변경 구독 (SSE)")
+    async def job_events(self, job_id: str, job_manager: Optional[JobManager]) -> Stream:
+        """
+        상태가 바뀔 때마다 "event: <status>" 프레임으로 작업 전체를 전송하고, 완료 상태를 보내면 스트림 종료
+
+        Raises:
+            HTTPException: 작업 없음/작업 API 비활성화 (404)
+        """
+        job_manager = self._require(job_manager)
+        if await job_manager.get(job_id) is None:
+            raise self._not_found(job_id)
+
+        async def generate_events():
+            """SSE 프레임 생성기"""
+            try:
+                async for job in job_manager.watch(job_id):
+                    data = msgspec.json.encode(self._to_api_response(job))
+                    yield b"event: %s\ndata: %s\n\n" % (job.status.encode(), data)
+            except asyncio.CancelledError:
+                # 구독만 끊기고 작업은 계속 실행됨
+                telemetry.CLIENT_DISCONNECTS.inc(path="/api/jobs/{job_id}/events")
+                raise
+
+        return Stream(
+            generate_events(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "Connection": "keep-alive", "Access-Control-Allow-Origin": "*"}
+        )
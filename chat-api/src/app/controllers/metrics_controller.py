@@ -0,0 +1,23 @@
+"""
+Metrics Controller
+Prometheus 텍스트 형식 메트릭 엔드포인트
+"""
+
+from litestar import Controller, Response, get
+
+from ..metrics import REGISTRY
+
+# Litestar가 text/* 응답에 charset=utf-8을 붙이므로 여기서는 생략
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4"
+
+
+class MetricsController(Controller):
+    """메트릭 컨트롤러"""
+    
+    path = "/metrics"
+    tags = ["Metrics"]
+    
+    @get("/", summary="Prometheus 메트릭", include_in_schema=False)
+    async def metrics(self) -> Response[str]:
+        """등록된 메트릭을 Prometheus 텍스트 형식으로 반환"""
+        return Response(REGISTRY.render(), media_type=PROMETHEUS_CONTENT_TYPE)
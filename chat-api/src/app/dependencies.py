@@ -3,33 +3,408 @@ Dependency Injection 설정
 Litestar DI를 사용한 의존성 주입 구성
 """
 
+import inspect
 import logging
+from functools import lru_cache
+from typing import Any, Dict, Optional
+from litestar import Litestar
 from litestar.di import Provide
+from litestar.types import Empty
 
-from ..agents import DefaultAgent
+from ..agents import DefaultAgent, registry
+from ..agents.hedging import HedgingExecutor, get_hedging_executor
+from ..agents.scheduler import UpstreamScheduler, get_scheduler
+from ..agents.settings import get_settings
+from . import telemetry
+from .metrics import REGISTRY
+from .services.agent_router import AgentRouter, RoutingRule
 from .services.chat_service import ChatService
+from .services.concurrency import ConcurrencyLimiter
+from .services.job_manager import JobManager
+from .services.job_store import InMemoryJobStore, JobStore, SQLiteJobStore
+from .services.conversation_store import (
+    ConversationStore,
+    InMemoryConversationStore,
+    SQLiteConversationStore,
+)
+from .services.response_cache import (
+    CacheBackend,
+    InMemoryCacheBackend,
+    ResponseCache,
+    SQLiteCacheBackend,
+)
+from .services.semantic_cache import (
+    HashEmbedder,
+    OpenAIEmbedder,
+    SemanticCache,
+    VectorIndex,
+    numpy_available,
+)
+from .services.single_flight import SingleFlight
+from .services.stream_registry import StreamRegistry
+from .streaming import SSEEncoder
 
 logger = logging.getLogger(__name__)
 
 
-def get_default_agent() -> DefaultAgent:
+def get_default_agent(model_name: Optional[str] = None) -> DefaultAgent:
     """DefaultAgent 팩토리 함수"""
     try:
-        agent = DefaultAgent()
-        logger.info(f"DefaultAgent 생성: {agent.name} v{agent.version}")
+        agent = DefaultAgent(model_name=model_name)
+        logger.info(f"DefaultAgent 생성: {agent.name} v{agent.version} ({agent.config.model})")
         return agent
     except Exception as e:
         logger.error(f"DefaultAgent 생성 실패: {e}")
         raise
 
 
-def get_chat_service(agent: DefaultAgent) -> ChatService:
+@lru_cache()
+def get_agent_router() -> AgentRouter:
+    """
+    AgentRouter 팩토리 함수
+    
+    프로세스 단위로 한 번만 생성하며, 앱 시작 시 호출해 모든 에이전트를 미리 생성합니다.
+    에이전트들은 LLM 클라이언트와 HTTP 연결 풀을 공유합니다.
+    """
+    settings = get_settings()
+    allowed_models = [model.strip() for model in settings.router_allowed_models.split(",") if model.strip()]
+    router = AgentRouter(default="default", allowed_models=allowed_models)
+    router.register("default", get_default_agent())
+    
+    if settings.router_enabled:
+        router.register("fast", get_default_agent(settings.router_fast_model))
+        router.register("strong", get_default_agent(settings.router_strong_model))
+        
+        markers = [marker.strip() for marker in settings.router_complex_markers.split(",") if marker.strip()]
+        if markers:
+            router.add_rule(RoutingRule(name="complex", agent="strong", markers=markers))
+        router.add_rule(RoutingRule(name="long", agent="strong", min_chars=settings.router_length_threshold + 1))
+        router.add_rule(RoutingRule(name="short", agent="fast", max_chars=settings.router_length_threshold))
+    
+    return router
+
+
+async def warm_up() -> None:
+    """
+    앱 시작 시 에이전트 레지스트리 생성과 업스트림 연결 준비
+    
+    그래프 컴파일, LLM 클라이언트 생성, 토크나이저 로드, TCP/TLS 핸드셰이크를 첫 요청 전에 끝냅니다.
+    """
+    settings = get_settings()
+    get_agent_router()
+    get_semantic_cache()  # 임베더 설정 오류는 첫 요청이 아니라 시작 시 드러나도록 함
+    if settings.llm_warmup_connections > 0:
+        await registry.warm_up_connections(settings.llm_warmup_connections, settings.llm_warmup_timeout)
+
+
+async def shut_down(app: Optional[Litestar] = None) -> None:
+    """
+    앱 종료 시 앱/프로세스 단위 리소스 정리
+    
+    앱이 만든 응답 캐시와 대화 저장소(SQLite 연결)를 닫고 의미 캐시를 저장한 뒤 공유 HTTP 연결 풀을 닫습니다.
+    같은 프로세스에서 새로 만든 앱이 닫힌 연결 풀을 쓰지 않도록 프로세스 단위 캐시도 비웁니다.
+    """
+    if app is not None:
+        await close_dependencies(app, ("response_cache", "conversation_store"))
+    close_semantic_cache()
+    get_semantic_cache.cache_clear()
+    get_agent_router.cache_clear()
+    get_scheduler.cache_clear()
+    get_hedging_executor.cache_clear()
+    await registry.aclose()
+
+
+async def close_dependencies(app: Litestar, names: tuple) -> None:
+    """앱이 생성한 의존성 값의 close() 호출 (생성된 적이 없거나 None이면 건너뜀)"""
+    for name in names:
+        provide = app.dependencies.get(name)
+        if provide is None or provide.value is Empty or provide.value is None:
+            continue
+        try:
+            await provide.value.close()
+        except Exception as e:
+            logger.warning(f"{name} 정리 실패: {e}")
+
+
+def get_conversation_store() -> ConversationStore:
+    """ConversationStore 팩토리 함수"""
+    settings = get_settings()
+    
+    if settings.conversation_store == "memory":
+        return InMemoryConversationStore(
+            max_conversations=settings.conversation_store_max_size,
+            ttl=settings.conversation_store_ttl
+        )
+    if settings.conversation_store == "sqlite":
+        return SQLiteConversationStore(
+            path=settings.conversation_store_path,
+            max_conversations=settings.conversation_store_max_size,
+            ttl=settings.conversation_store_ttl
+        )
+    
+    raise ValueError(f"지원하지 않는 대화 저장소: {settings.conversation_store}")
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """ResponseCache 팩토리 함수 (비활성화 시 None)"""
+    settings = get_settings()
+    if not settings.response_cache_enabled:
+        return None
+    
+    backend: CacheBackend
+    if settings.response_cache_backend == "memory":
+        backend = InMemoryCacheBackend(max_size=settings.response_cache_max_size)
+    elif settings.response_cache_backend == "sqlite":
+        backend = SQLiteCacheBackend(
+            path=settings.response_cache_path,
+            max_size=settings.response_cache_max_size
+        )
+    else:
+        raise ValueError(f"지원하지 않는 응답 캐시 저장소: {settings.response_cache_backend}")
+    
+    logger.info(f"응답 캐시 활성화: {settings.response_cache_backend} (TTL {settings.response_cache_ttl}초)")
+    return ResponseCache(
+        backend,
+        ttl=settings.response_cache_ttl,
+        key_mode=settings.response_cache_key_mode
+    )
+
+
+@lru_cache()
+def get_semantic_cache() -> Optional[SemanticCache]:
+    """
+    SemanticCache 팩토리 함수 (비활성화 또는 numpy 미설치 시 None)
+    
+    벡터 인덱스를 종료 시 파일에 저장할 수 있도록 프로세스 단위로 한 번만 생성합니다.
+    
+    Raises:
+        ValueError: 임베더 미지정, 지원하지 않는 임베더, 테스트용 백엔드가 아닌데 hash 임베더 사용
+    """
+    settings = get_settings()
+    if not settings.semantic_cache_enabled:
+        return None
+    if not numpy_available():
+        logger.warning("numpy가 설치되어 있지 않아 의미 캐시를 비활성화합니다. (pip install numpy)")
+        return None
+    
+    if not settings.semantic_cache_embedder:
+        raise ValueError("의미 캐시를 사용하려면 SEMANTIC_CACHE_EMBEDDER를 지정해야 합니다. (openai)")
+    if settings.semantic_cache_embedder == "hash" and settings.llm_backend == "openai":
+        # 단어 순서를 보지 않아 "100 USD를 EUR로"와 "100 EUR를 USD로"를 같은 질문으로 봄
+        raise ValueError("hash 임베더는 테스트용 LLM 백엔드(fake, replay)에서만 사용할 수 있습니다.")
+    
+    if settings.semantic_cache_embedder == "hash":
+        embedder = HashEmbedder(dim=settings.semantic_cache_dim)
+    elif settings.semantic_cache_embedder == "openai":
+        embedder = OpenAIEmbedder(model=settings.semantic_cache_embedding_model, dim=settings.semantic_cache_dim)
+    else:
+        raise ValueError(f"지원하지 않는 임베더: {settings.semantic_cache_embedder}")
+    
+    index = VectorIndex(
+        dim=settings.semantic_cache_dim,
+        max_size=settings.semantic_cache_max_size,
+        path=settings.semantic_cache_path
+    )
+    logger.info(
+        f"의미 캐시 활성화: {settings.semantic_cache_embedder} "
+        f"(유사도 {settings.semantic_cache_threshold} 이상, TTL {settings.semantic_cache_ttl}초)"
+    )
+    return SemanticCache(
+        embedder,
+        index,
+        threshold=settings.semantic_cache_threshold,
+        ttl=settings.semantic_cache_ttl
+    )
+
+
+def close_semantic_cache() -> None:
+    """앱 종료 시 의미 캐시 인덱스 저장 (생성된 적이 없으면 아무것도 하지 않음)"""
+    if get_semantic_cache.cache_info().currsize == 0:
+        return
+    cache = get_semantic_cache()
+    if cache is not None:
+        cache.close()
+
+
+def get_concurrency_limiter() -> Optional[ConcurrencyLimiter]:
+    """ConcurrencyLimiter 팩토리 함수 (동시 실행 제한이 0이면 None)"""
+    settings = get_settings()
+    if settings.agent_max_concurrency <= 0:
+        return None
+    
+    limiter = ConcurrencyLimiter(
+        max_concurrent=settings.agent_max_concurrency,
+        max_queue=settings.agent_max_queue,
+        queue_timeout=settings.agent_queue_timeout,
+        retry_after=settings.agent_retry_after
+    )
+    
+    # 대기 시간/대기열 길이 히스토그램을 /metrics에 노출 (앱을 다시 만들면 새 리미터의 히스토그램으로 교체)
+    REGISTRY.register(limiter.wait_time, replace=True)
+    REGISTRY.register(limiter.queue_depth, replace=True)
+    return limiter
+
+
+def get_upstream_scheduler() -> Optional[UpstreamScheduler]:
+    """
+    에이전트들이 공유하는 업스트림 스케줄러 (비활성화 시 None)
+    
+    대기열/버킷 상태를 /metrics 게이지로 노출합니다.
+    """
+    scheduler = get_scheduler()
+    if scheduler is not None:
+        telemetry.register_scheduler(scheduler)
+    return scheduler
+
+
+def get_hedging() -> Optional[HedgingExecutor]:
+    """
+    에이전트들이 공유하는 헤지/페일오버 실행기 (헤지와 폴백이 모두 꺼져 있으면 None)
+    
+    헤지/페일오버 횟수와 백엔드별 지연 시간을 /metrics에 노출합니다.
+    """
+    hedging = get_hedging_executor()
+    if hedging is not None:
+        telemetry.register_hedging(hedging)
+    return hedging
+
+
+def provide_default_agent(agent_router: AgentRouter) -> DefaultAgent:
+    """라우터의 기본 에이전트 제공"""
+    return agent_router.default_agent
+
+
+def get_chat_service(
+    default_agent: DefaultAgent,
+    agent_router: AgentRouter,
+    conversation_store: ConversationStore,
+    response_cache: Optional[ResponseCache],
+    semantic_cache: Optional[SemanticCache],
+    concurrency_limiter: Optional[ConcurrencyLimiter],
+    upstream_scheduler: Optional[UpstreamScheduler],
+    hedging: Optional[HedgingExecutor]
+) -> ChatService:
     """ChatService 팩토리 함수"""
-    return ChatService(agent)
+    settings = get_settings()
+    return ChatService(
+        default_agent,
+        conversation_store=conversation_store,
+        response_cache=response_cache,
+        semantic_cache=semantic_cache,
+        single_flight=SingleFlight() if settings.single_flight_enabled else None,
+        limiter=concurrency_limiter,
+        scheduler=upstream_scheduler,
+        hedging=hedging,
+        router=agent_router,
+        batch_max_size=settings.batch_max_size,
+        batch_max_concurrency=settings.batch_max_concurrency
+    )
+
+
+def get_job_store() -> Optional[JobStore]:
+    """JobStore 팩토리 함수 (작업 API 비활성화 시 None)"""
+    settings = get_settings()
+    if settings.job_workers <= 0:
+        return None
+    
+    if settings.job_store == "memory":
+        return InMemoryJobStore(max_jobs=settings.job_store_max_size)
+    if settings.job_store == "sqlite":
+        return SQLiteJobStore(path=settings.job_store_path)
+    
+    raise ValueError(f"지원하지 않는 작업 저장소: {settings.job_store}")
+
+
+def get_job_manager(chat_service: ChatService, job_store: Optional[JobStore]) -> Optional[JobManager]:
+    """
+    JobManager 팩토리 함수 (작업 API 비활성화 시 None)
+    
+    워커는 lifespan에서 start_job_manager()로 시작합니다. 대기열 길이와 상태별 작업 수를 /metrics에 노출합니다.
+    """
+    if job_store is None:
+        return None
+    
+    settings = get_settings()
+    manager = JobManager(
+        chat_service,
+        job_store,
+        workers=settings.job_workers,
+        max_queue=settings.job_max_queue,
+        result_ttl=settings.job_result_ttl,
+        timeout=settings.job_timeout,
+        lease_timeout=settings.job_lease_timeout,
+        retry_after=settings.agent_retry_after
+    )
+    telemetry.register_jobs(manager)
+    return manager
+
+
+async def resolve_dependency(app: Litestar, name: str) -> Any:
+    """
+    요청 밖(lifespan)에서 앱의 의존성 값 생성
+    
+    Provide(use_cache=True)가 값을 보관하므로 이후 요청 핸들러도 같은 인스턴스를 주입받습니다.
+    """
+    provide = app.dependencies[name]
+    kwargs = {
+        parameter: await resolve_dependency(app, parameter)
+        for parameter in inspect.signature(provide.dependency).parameters
+    }
+    return await provide(**kwargs)
+
+
+async def start_job_manager(app: Litestar) -> Optional[JobManager]:
+    """작업 워커 시작 (SQLite 저장소면 이전 프로세스가 완료하지 못한 작업부터 다시 실행)"""
+    manager = await resolve_dependency(app, "job_manager")
+    if manager is not None:
+        await manager.start()
+    return manager
+
+
+def get_sse_encoder() -> SSEEncoder:
+    """SSEEncoder 팩토리 함수"""
+    settings = get_settings()
+    return SSEEncoder(
+        coalesce_interval=settings.stream_coalesce_interval,
+        coalesce_chars=settings.stream_coalesce_chars,
+        heartbeat_interval=settings.stream_heartbeat_interval,
+        event_ids=settings.stream_event_ids
+    )
+
+
+def get_stream_registry() -> Optional[StreamRegistry]:
+    """StreamRegistry 팩토리 함수 (스트림 이어받기 비활성화 시 None)"""
+    settings = get_settings()
+    if not settings.stream_resume_enabled:
+        return None
+    
+    return StreamRegistry(
+        buffer_size=settings.stream_resume_buffer_size,
+        ttl=settings.stream_resume_ttl,
+        grace_period=settings.stream_resume_grace_period,
+        max_streams=settings.stream_resume_max_streams,
+        retry_after=settings.agent_retry_after
+    )
 
 
-# 의존성 주입 설정
-dependencies = {
-    "default_agent": Provide(get_default_agent, scope="singleton"),
-    "chat_service": Provide(get_chat_service, scope="singleton")
-}
\ No newline at end of file
+def get_dependencies() -> Dict[str, Provide]:
+    """
+    의존성 주입 설정
+    
+    Provide(use_cache=True)는 생성한 값을 Provide 객체에 보관하므로 앱마다 새로 만듭니다.
+    """
+    return {
+        "agent_router": Provide(get_agent_router, use_cache=True, sync_to_thread=False),
+        "default_agent": Provide(provide_default_agent, use_cache=True, sync_to_thread=False),
+        "conversation_store": Provide(get_conversation_store, use_cache=True, sync_to_thread=False),
+        "response_cache": Provide(get_response_cache, use_cache=True, sync_to_thread=False),
+        "semantic_cache": Provide(get_semantic_cache, use_cache=True, sync_to_thread=False),
+        "concurrency_limiter": Provide(get_concurrency_limiter, use_cache=True, sync_to_thread=False),
+        "upstream_scheduler": Provide(get_upstream_scheduler, use_cache=True, sync_to_thread=False),
+        "hedging": Provide(get_hedging, use_cache=True, sync_to_thread=False),
+        "chat_service": Provide(get_chat_service, use_cache=True, sync_to_thread=False),
+        "job_store": Provide(get_job_store, use_cache=True, sync_to_thread=False),
+        "job_manager": Provide(get_job_manager, use_cache=True, sync_to_thread=False),
+        "sse_encoder": Provide(get_sse_encoder, use_cache=True, sync_to_thread=False),
+        "stream_registry": Provide(get_stream_registry, use_cache=True, sync_to_thread=False)
+    }
@@ -0,0 +1,80 @@
+"""
+Client Disconnect
+응답 완료 전에 클라이언트 연결이 끊어지면 처리 중인 핸들러(와 그 아래의 LLM 호출)를 취소
+"""
+
+import asyncio
+import logging
+from typing import Optional
+
+from litestar import Request
+from litestar.exceptions import HTTPException
+
+from . import telemetry
+
+logger = logging.getLogger(__name__)
+
+# nginx 관례: 클라이언트가 응답을 기다리지 않고 연결을 닫은 요청
+HTTP_499_CLIENT_CLOSED_REQUEST = 499
+
+
+class DisconnectGuard:
+    """
+    http.disconnect를 감시하다가 연결이 끊어지면 현재 태스크를 취소하는 async 컨텍스트 매니저
+
+    핸들러를 별도 태스크로 옮기지 않고 현재 태스크를 취소하므로 (asyncio.timeout과 같은 방식)
+    요청마다 감시 태스크 하나만 추가됩니다. 요청 본문을 모두 읽은 뒤에 사용해야 합니다.
+    """
+
+    def __init__(self, request: Request, path: str):
+        """
+        Args:
+            request: 요청 (본문은 이미 읽은 상태)
+            path: 메트릭 라벨용 경로
+        """
+        self._request = request
+        self._path = path
+        self._task: Optional[asyncio.Task] = None
+        self._watcher: Optional[asyncio.Task] = None
+        self.disconnected = False
+
+    async def __aenter__(self) -> "DisconnectGuard":
+        self._task = asyncio.current_task()
+        self._watcher = asyncio.create_task(self._watch())
+        return self
+
+    async def _watch(self) -> None:
+        while (await self._request.receive())["type"] != "http.disconnect":
+            pass
+        self.disconnected = True
+        self._task.cancel()
+
+    async def __aexit__(self, exc_type, exc, tb) -> bool:
+        self._watcher.cancel()
+        if not self.disconnected:
+            return False
+
+        # 서버 종료 등 다른 곳에서 요청한 취소는 그대로 전달
+        if self._task.uncancel() > 0:
+            return False
+
+        telemetry.CLIENT_DISCONNECTS.inc(path=self._path)
+        logger.info(f"클라이언트 연결 종료로 요청 취소: {self._path}")
+        raise HTTPException(
+            status_code=HTTP_499_CLIENT_CLOSED_REQUEST,
+            detail="클라이언트 연결이 끊어져 요청을 취소했습니다."
+        )
+
+
+def cancel_on_disconnect(request: Request, path: str) -> DisconnectGuard:
+    """
+    클라이언트 연결이 끊어지면 블록 안의 작업을 취소
+
+    사용 예:
+        async with cancel_on_disconnect(request, "/api/chat"):
+            response = await chat_service.send_message(service_request)
+
+    Raises:
+        HTTPException: 연결 종료로 취소됨 (499, 메트릭 기록용이며 클라이언트에는 전달되지 않음)
+    """
+    return DisconnectGuard(request, path)
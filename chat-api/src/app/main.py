@@ -1,8 +1,19 @@
+"""
+Chat API 애플리케이션
+create_app() 팩토리와 lifespan으로 에이전트 준비/정리를 관리
+"""
+
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict
+
 from litestar import Litestar, get
-from typing import Dict
 
+from ..agents.settings import get_settings
 from .controllers.chat_controller import ChatController
-from .dependencies import dependencies
+from .controllers.job_controller import JobController
+from .controllers.metrics_controller import MetricsController
+from .dependencies import get_dependencies, shut_down, start_job_manager, warm_up
+from .telemetry import configure_telemetry, metrics_middleware
 
 
 @get("/")
@@ -10,7 +21,44 @@ async def health_check() -> Dict[str, str]:
     return {"status": "healthy", "service": "chat-api"}
 
 
-app = Litestar(
-    route_handlers=[health_check, ChatController],
-    dependencies=dependencies
-)
\ No newline at end of file
+@asynccontextmanager
+async def lifespan(app: Litestar) -> AsyncIterator[None]:
+    """시작 시 에이전트 생성, 업스트림 연결 준비와 작업 워커 시작, 종료 시 워커/저장소/연결 풀과 캐시 정리"""
+    await warm_up()
+    job_manager = await start_job_manager(app)
+    try:
+        yield
+    finally:
+        if job_manager is not None:
+            await job_manager.stop()
+        await shut_down(app)
+
+
+def create_app() -> Litestar:
+    """
+    Litestar 앱 생성
+
+    uvicorn --factory src.app.main:create_app 으로 실행하면 워커마다 이 함수로 앱을 만듭니다.
+    """
+    settings = get_settings()
+    configure_telemetry(settings.metrics_enabled, settings.tracing_enabled)
+
+    return Litestar(
+        route_handlers=[
+            health_check,
+            ChatController,
+            JobController,
+            *([MetricsController] if settings.metrics_enabled else [])
+        ],
+        dependencies=get_dependencies(),
+        middleware=[metrics_middleware] if settings.metrics_enabled else [],
+        lifespan=[lifespan]
+    )
+
+
+def __getattr__(name: str) -> Any:
+    # uvicorn src.app.main:app 호환 (처음 참조할 때 한 번만 생성)
+    if name == "app":
+        app = globals()["app"] = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
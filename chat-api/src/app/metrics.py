@@ -0,0 +1,322 @@
+"""
+Metrics
+서비스 내부 지표 수집용 경량 메트릭 (Prometheus 텍스트 형식 출력 지원)
+"""
+
+import bisect
+import math
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+# 지연 시간(초) 측정용 기본 버킷
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _label_values(labelnames: Sequence[str], labels: Dict[str, Any]) -> LabelValues:
+    """라벨 이름 순서대로 라벨 값 튜플 생성"""
+    if len(labels) != len(labelnames):
+        raise ValueError(f"라벨이 일치하지 않습니다: {sorted(labels)} != {list(labelnames)}")
+    return tuple(str(labels[name]) for name in labelnames)
+
+
+def _escape(value: str) -> str:
+    """라벨 값 이스케이프 (역슬래시, 줄바꿈, 큰따옴표)"""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labelnames: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    """Prometheus 라벨 문자열 ({name="value",...})"""
+    pairs = list(zip(labelnames, values))
+    if extra is not None:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Counter:
+    """단조 증가 카운터 (collect를 주면 출력할 때마다 다른 컴포넌트의 누적 값을 읽음)"""
+
+    type = "counter"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        labelnames: Sequence[str] = (),
+        collect: Optional[Callable[[], Iterable[Tuple[Dict[str, Any], float]]]] = None
+    ):
+        """
+        Args:
+            name: 메트릭 이름
+            description: 메트릭 설명
+            labelnames: 라벨 이름 목록
+            collect: (라벨 dict, 누적 값) 목록을 돌려주는 함수
+        """
+        self.name = name
+        self.description = description
+        self.labelnames: Tuple[str, ...] = tuple(labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self._collect = collect
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        """값 증가"""
+        key = _label_values(self.labelnames, labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: Any) -> float:
+        """현재 값"""
+        return self._current().get(_label_values(self.labelnames, labels), 0.0)
+
+    def _current(self) -> Dict[LabelValues, float]:
+        values = dict(self._values)
+        if self._collect is not None:
+            for labels, value in self._collect():
+                values[_label_values(self.labelnames, labels)] = value
+        return values
+
+    def render(self) -> Iterable[str]:
+        """Prometheus 텍스트 형식 샘플"""
+        for values, value in sorted(self._current().items()):
+            yield f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(value)}"
+
+
+class Gauge:
+    """현재 값을 나타내는 게이지 (collect를 주면 출력할 때마다 값을 새로 읽음)"""
+
+    type = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        labelnames: Sequence[str] = (),
+        collect: Optional[Callable[[], Iterable[Tuple[Dict[str, Any], float]]]] = None
+    ):
+        """
+        Args:
+            name: 메트릭 이름
+            description: 메트릭 설명
+            labelnames: 라벨 이름 목록
+            collect: (라벨 dict, 값) 목록을 돌려주는 함수 (다른 컴포넌트의 상태를 노출할 때 사용)
+        """
+        self.name = name
+        self.description = description
+        self.labelnames: Tuple[str, ...] = tuple(labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self._collect = collect
+
+    def set(self, value: float, **labels: Any) -> None:
+        """값 설정"""
+        self._values[_label_values(self.labelnames, labels)] = value
+
+    def value(self, **labels: Any) -> float:
+        """현재 값"""
+        return self._current().get(_label_values(self.labelnames, labels), 0.0)
+
+    def _current(self) -> Dict[LabelValues, float]:
+        values = dict(self._values)
+        if self._collect is not None:
+            for labels, value in self._collect():
+                values[_label_values(self.labelnames, labels)] = value
+        return values
+
+    def render(self) -> Iterable[str]:
+        """Prometheus 텍스트 형식 샘플"""
+        for values, value in sorted(self._current().items()):
+            yield f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(value)}"
+
+
+class _HistogramSeries:
+    """라벨 조합 하나의 히스토그램 상태"""
+
+    __slots__ = ("counts", "count", "sum")
+
+    def __init__(self, size: int):
+        self.counts = [0] * size
+        self.count = 0
+        self.sum = 0.0
+
+
+class Histogram:
+    """누적 버킷 방식의 히스토그램"""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+        labelnames: Sequence[str] = ()
+    ):
+        """
+        Args:
+            name: 메트릭 이름
+            description: 메트릭 설명
+            buckets: 버킷 상한값 목록 (오름차순)
+            labelnames: 라벨 이름 목록
+        """
+        self.name = name
+        self.description = description
+        self.buckets: List[float] = sorted(buckets)
+        self.labelnames: Tuple[str, ...] = tuple(labelnames)
+        self._series: Dict[LabelValues, _HistogramSeries] = {}
+
+    def _get_series(self, key: LabelValues) -> _HistogramSeries:
+        series = self._series.get(key)
+        if series is None:
+            # 마지막 칸은 +Inf
+            series = self._series[key] = _HistogramSeries(len(self.buckets) + 1)
+        return series
+
+    def observe(self, value: float, **labels: Any) -> None:
+        """값 기록"""
+        series = self._get_series(_label_values(self.labelnames, labels))
+        series.counts[bisect.bisect_left(self.buckets, value)] += 1
+        series.count += 1
+        series.sum += value
+
+    @property
+    def count(self) -> int:
+        """라벨 없는 시계열의 관측 수"""
+        series = self._series.get(())
+        return series.count if series else 0
+
+    @property
+    def sum(self) -> float:
+        """라벨 없는 시계열의 관측값 합"""
+        series = self._series.get(())
+        return series.sum if series else 0.0
+
+    def cumulative_counts(self, **labels: Any) -> List[int]:
+        """버킷별 누적 개수 (마지막 값은 +Inf 버킷 = 전체 개수)"""
+        series = self._series.get(_label_values(self.labelnames, labels))
+        counts = []
+        total = 0
+        for count in series.counts if series else [0] * (len(self.buckets) + 1):
+            total += count
+            counts.append(total)
+        return counts
+
+    def snapshot(self) -> Dict[str, Any]:
+        """현재 상태 요약 (라벨 없는 시계열)"""
+        cumulative = self.cumulative_counts()
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "buckets": {
+                **{str(bound): cumulative[i] for i, bound in enumerate(self.buckets)},
+                "+Inf": cumulative[-1],
+            },
+        }
+
+    def render(self) -> Iterable[str]:
+        """Prometheus 텍스트 형식 샘플"""
+        for values, series in sorted(self._series.items()):
+            total = 0
+            for bound, count in zip([*self.buckets, math.inf], series.counts):
+                total += count
+                labels = _format_labels(self.labelnames, values, ("le", _format_value(bound)))
+                yield f"{self.name}_bucket{labels} {total}"
+            labels = _format_labels(self.labelnames, values)
+            yield f"{self.name}_sum{labels} {_format_value(series.sum)}"
+            yield f"{self.name}_count{labels} {series.count}"
+
+
+Metric = Union[Counter, Gauge, Histogram]
+
+
+class MetricsRegistry:
+    """메트릭 레지스트리 (이름별로 하나의 메트릭 보관)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric, replace: bool = False) -> Metric:
+        """
+        메트릭 등록
+
+        Args:
+            metric: 등록할 메트릭
+            replace: 같은 이름의 메트릭을 교체할지 여부
+                (앱/컴포넌트가 다시 만들어질 때 새 인스턴스의 상태를 노출하는 용도)
+
+        Raises:
+            ValueError: replace 없이 같은 이름의 다른 메트릭이 이미 등록됨
+        """
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None and existing is not metric and not replace:
+                raise ValueError(f"이미 등록된 메트릭 이름: {metric.name}")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(
+        self,
+        name: str,
+        description: str,
+        labelnames: Sequence[str] = (),
+        collect: Optional[Callable[[], Iterable[Tuple[Dict[str, Any], float]]]] = None,
+        replace: bool = False
+    ) -> Counter:
+        """카운터 생성 후 등록"""
+        return self.register(Counter(name, description, labelnames, collect), replace)
+
+    def gauge(
+        self,
+        name: str,
+        description: str,
+        labelnames: Sequence[str] = (),
+        collect: Optional[Callable[[], Iterable[Tuple[Dict[str, Any], float]]]] = None,
+        replace: bool = False
+    ) -> Gauge:
+        """게이지 생성 후 등록"""
+        return self.register(Gauge(name, description, labelnames, collect), replace)
+
+    def histogram(
+        self,
+        name: str,
+        description: str,
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+        labelnames: Sequence[str] = (),
+        replace: bool = False
+    ) -> Histogram:
+        """히스토그램 생성 후 등록"""
+        return self.register(Histogram(name, description, buckets, labelnames), replace)
+
+    def get(self, name: str) -> Optional[Metric]:
+        """이름으로 메트릭 조회"""
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """
+        등록된 모든 메트릭을 Prometheus 텍스트 형식(0.0.4)으로 출력
+
+        Returns:
+            /metrics 응답 본문
+        """
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+
+        lines: List[str] = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.description}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# 프로세스 기본 레지스트리
+REGISTRY = MetricsRegistry()
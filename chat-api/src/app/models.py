@@ -1,49 +1,95 @@
 """
 API 모델 정의
-Pydantic 모델을 사용한 요청/응답 스키마
+채팅 경로의 요청/응답은 msgspec Struct (본문에서 바로 디코딩/인코딩, 메시지 복사 없음),
+그 외 응답은 Pydantic 모델을 사용한 스키마
 """
 
-from typing import List, Dict, Any, Optional
+from typing import Annotated, List, Dict, Any, Optional
+
+import msgspec
 from pydantic import BaseModel, Field
-from enum import Enum
 
+from ..agents import ChatMessage
 
-class MessageRole(str, Enum):
-    """메시지 역할"""
-    USER = "user"
-    ASSISTANT = "assistant"
-    SYSTEM = "system"
 
+class ChatRequest(msgspec.Struct, kw_only=True):
+    """채팅 요청"""
+    message: Annotated[str, msgspec.Meta(min_length=1, description="사용자 메시지")]
+    history: Optional[
+        Annotated[List[ChatMessage], msgspec.Meta(description="이전 대화 기록 (stateless 모드)")]
+    ] = None
+    conversation_id: Optional[
+        Annotated[str, msgspec.Meta(
+            min_length=1,
+            max_length=128,
+            description="서버에 저장된 대화 ID (지정 시 history 없이 새 메시지만 전송)"
+        )]
+    ] = None
+    agent: Optional[
+        Annotated[str, msgspec.Meta(description="사용할 에이전트 이름 (None이면 라우팅 규칙에 따라 선택)")]
+    ] = None
+    model: Optional[
+        Annotated[str, msgspec.Meta(
+            description="사용할 모델 (등록된 에이전트 모델이면 해당 에이전트로, ROUTER_ALLOWED_MODELS에 있으면 "
+            "기본 에이전트의 모델 오버라이드, 그 외는 400)"
+        )]
+    ] = None
+    temperature: Optional[
+        Annotated[float, msgspec.Meta(ge=0.0, le=2.0, description="요청별 모델 온도 오버라이드")]
+    ] = None
 
-class ChatMessageRequest(BaseModel):
-    """채팅 메시지 요청"""
-    role: MessageRole = Field(..., description="메시지 역할")
-    content: str = Field(..., description="메시지 내용")
 
+class ChatResponse(msgspec.Struct, kw_only=True):
+    """채팅 응답"""
+    message: Annotated[str, msgspec.Meta(description="에이전트 응답")]
+    model: Annotated[str, msgspec.Meta(description="사용된 모델명")]
+    metadata: Optional[Annotated[Dict[str, Any], msgspec.Meta(description="추가 메타데이터")]] = None
 
-class ChatRequest(BaseModel):
-    """채팅 요청"""
-    message: str = Field(..., description="사용자 메시지", min_length=1)
-    history: Optional[List[ChatMessageRequest]] = Field(
-        default=None, 
-        description="이전 대화 기록"
-    )
 
+class BatchChatRequest(msgspec.Struct, kw_only=True):
+    """배치 채팅 요청"""
+    requests: Annotated[List[ChatRequest], msgspec.Meta(min_length=1, description="처리할 채팅 요청 목록")]
+    max_concurrency: Optional[
+        Annotated[int, msgspec.Meta(
+            ge=1,
+            description="동시에 처리할 최대 요청 수 (None이면 서버 설정값, 서버 설정값을 넘을 수 없음)"
+        )]
+    ] = None
 
-class ChatResponse(BaseModel):
-    """채팅 응답"""
-    message: str = Field(..., description="에이전트 응답")
-    model: str = Field(..., description="사용된 모델명")
-    metadata: Optional[Dict[str, Any]] = Field(
-        default=None,
-        description="추가 메타데이터"
-    )
+
+class BatchItemResult(msgspec.Struct, kw_only=True):
+    """배치 항목 결과"""
+    index: Annotated[int, msgspec.Meta(description="요청 목록에서의 위치")]
+    status_code: Annotated[int, msgspec.Meta(description="항목별 HTTP 상태 코드")]
+    response: Optional[Annotated[ChatResponse, msgspec.Meta(description="성공 시 채팅 응답")]] = None
+    error: Optional[Annotated[str, msgspec.Meta(description="실패 시 오류 메시지")]] = None
+
+
+class BatchChatResponse(msgspec.Struct, kw_only=True):
+    """배치 채팅 응답"""
+    results: Annotated[List[BatchItemResult], msgspec.Meta(description="요청 순서대로 정렬된 결과")]
+    succeeded: Annotated[int, msgspec.Meta(description="성공한 요청 수")]
+    failed: Annotated[int, msgspec.Meta(description="실패한 요청 수")]
 
 
-class StreamChunk(BaseModel):
+class JobResponse(msgspec.Struct, kw_only=True):
+    """비동기 작업 상태"""
+    id: Annotated[str, msgspec.Meta(description="작업 ID")]
+    status: Annotated[str, msgspec.Meta(description="queued, running, succeeded, failed, cancelled")]
+    created_at: Annotated[float, msgspec.Meta(description="등록 시각 (Unix time)")]
+    finished_at: Optional[Annotated[float, msgspec.Meta(description="완료 시각 (Unix time)")]] = None
+    attempts: Annotated[int, msgspec.Meta(description="실행 시작 횟수 (재시작 후 다시 실행되면 증가)")] = 0
+    response: Optional[Annotated[ChatResponse, msgspec.Meta(description="성공 시 채팅 응답")]] = None
+    status_code: Optional[
+        Annotated[int, msgspec.Meta(description="실패 시 단건 API와 같은 HTTP 상태 코드")]
+    ] = None
+    error: Optional[Annotated[str, msgspec.Meta(description="실패 시 오류 메시지")]] = None
+
+
+class StreamChunk(msgspec.Struct, kw_only=True):
     """스트림 청크"""
-    content: str = Field(..., description="응답 내용 조각")
-    is_final: bool = Field(default=False, description="마지막 청크 여부")
+    content: Annotated[str, msgspec.Meta(description="응답 내용 조각")]
+    is_final: Annotated[bool, msgspec.Meta(description="마지막 청크 여부")] = False
 
 
 class HealthResponse(BaseModel):
@@ -64,4 +110,4 @@ class ErrorResponse(BaseModel):
     details: Optional[Dict[str, Any]] = Field(
         default=None,
         description="에러 상세 정보"
-    )
\ No newline at end of file
+    )
@@ -0,0 +1,146 @@
+"""
+Agent Router
+이름/모델로 등록된 에이전트 레지스트리와 요청별 라우팅 규칙
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from ...agents import BaseAgent, ChatMessage
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RoutingRule:
+    """
+    요청 특성으로 에이전트를 고르는 규칙
+
+    조건을 모두 만족하면 매칭되며, 지정하지 않은 조건은 검사하지 않습니다.
+    """
+    name: str
+    agent: str
+    min_chars: Optional[int] = None
+    max_chars: Optional[int] = None
+    markers: Optional[List[str]] = None
+
+    def matches(self, message: str, history: Optional[List[ChatMessage]]) -> bool:
+        """규칙 매칭 여부 (길이는 이전 기록을 포함한 전체 문자 수 기준)"""
+        size = len(message) + sum(len(msg.content) for msg in history or [])
+        if self.min_chars is not None and size < self.min_chars:
+            return False
+        if self.max_chars is not None and size > self.max_chars:
+            return False
+        if self.markers is not None and not any(marker in message for marker in self.markers):
+            return False
+        return True
+
+
+@dataclass
+class Route:
+    """라우팅 결과"""
+    name: str
+    agent: BaseAgent
+    model: Optional[str]
+    reason: str
+
+
+class AgentRouter:
+    """에이전트 레지스트리 + 라우터"""
+
+    def __init__(self, default: str = "default", allowed_models: Optional[Iterable[str]] = None):
+        """
+        Args:
+            default: 기본 에이전트 이름
+            allowed_models: 등록된 에이전트 모델 외에 요청에서 오버라이드로 지정할 수 있는 모델
+        """
+        self._default = default
+        self._allowed_models: Set[str] = set(allowed_models or ())
+        self._agents: Dict[str, BaseAgent] = {}
+        self._rules: List[RoutingRule] = []
+
+    @property
+    def default_agent(self) -> BaseAgent:
+        """기본 에이전트"""
+        return self._agents[self._default]
+
+    @property
+    def models(self) -> Set[str]:
+        """요청에서 지정할 수 있는 모델 (등록된 에이전트 모델 + 허용 목록)"""
+        return {agent.config.model for agent in self._agents.values()} | self._allowed_models
+
+    @property
+    def agents(self) -> Dict[str, BaseAgent]:
+        """등록된 에이전트 목록"""
+        return dict(self._agents)
+
+    def register(self, name: str, agent: BaseAgent) -> None:
+        """에이전트 등록"""
+        self._agents[name] = agent
+        logger.info(f"에이전트 등록: {name} ({agent.name}, {agent.config.model})")
+
+    def add_rule(self, rule: RoutingRule) -> None:
+        """
+        라우팅 규칙 추가 (등록 순서대로 검사)
+
+        Raises:
+            ValueError: 등록되지 않은 에이전트를 가리키는 규칙
+        """
+        if rule.agent not in self._agents:
+            raise ValueError(f"등록되지 않은 에이전트: {rule.agent}")
+        self._rules.append(rule)
+
+    def resolve(
+        self,
+        message: str,
+        history: Optional[List[ChatMessage]] = None,
+        agent: Optional[str] = None,
+        model: Optional[str] = None
+    ) -> Route:
+        """
+        요청을 처리할 에이전트 결정
+
+        우선순위: 요청의 agent 이름 > 요청의 model > 라우팅 규칙 > 기본 에이전트
+
+        Args:
+            message: 사용자 메시지
+            history: 이전 채팅 기록
+            agent: 요청에서 지정한 에이전트 이름
+            model: 요청에서 지정한 모델명
+
+        Returns:
+            라우팅 결과 (허용 목록에만 있는 모델은 기본 에이전트에 모델 오버라이드로 전달)
+
+        Raises:
+            ValueError: 등록되지 않은 에이전트 이름 또는 허용되지 않은 모델
+        """
+        if model is not None and model not in self.models:
+            # 임의의 모델명이 LLM 클라이언트 캐시와 메트릭 레이블로 퍼지지 않도록 거절
+            raise ValueError(f"허용되지 않은 모델: {model}")
+
+        if agent is not None:
+            if agent not in self._agents:
+                raise ValueError(f"등록되지 않은 에이전트: {agent}")
+            return Route(agent, self._agents[agent], model, "requested_agent")
+
+        if model is not None:
+            for name, registered in self._agents.items():
+                if registered.config.model == model:
+                    return Route(name, registered, None, "requested_model")
+            return Route(self._default, self.default_agent, model, "requested_model")
+
+        for rule in self._rules:
+            if rule.matches(message, history):
+                return Route(rule.agent, self._agents[rule.agent], None, f"rule:{rule.name}")
+
+        return Route(self._default, self.default_agent, None, "default")
+
+    def describe(self) -> Dict[str, Any]:
+        """등록된 에이전트와 규칙 요약"""
+        return {
+            "default": self._default,
+            "agents": {name: agent.config.model for name, agent in self._agents.items()},
+            "allowed_models": sorted(self._allowed_models),
+            "rules": [rule.name for rule in self._rules],
+        }
@@ -3,20 +3,43 @@ Chat Application Service
 채팅 관련 비즈니스 로직 처리
 """
 
+import asyncio
 import logging
-from typing import List, Optional, AsyncGenerator
-from dataclasses import dataclass
+import re
+from contextlib import aclosing, nullcontext
+from typing import Any, List, Optional, AsyncGenerator, Tuple
+from dataclasses import dataclass, replace
 
-from ...agents import BaseAgent, ChatMessage
+from ...agents import BaseAgent, ChatMessage, DeadlineExceededError, QuotaExceededError, tracing, usage
+from ...agents.hedging import HedgingExecutor
+from ...agents.scheduler import UpstreamScheduler
+from ...agents.usage import TokenUsage
+from .. import telemetry
+from .agent_router import AgentRouter, Route
+from .concurrency import ConcurrencyLimiter, OverloadedError, TenantQuotaExceededError
+from .conversation_store import ConversationStore
+from .response_cache import ResponseCache, build_cache_key
+from .semantic_cache import SemanticCache
+from .single_flight import SingleFlight
 
 logger = logging.getLogger(__name__)
 
+# 캐시된 응답을 스트림으로 재생할 때 사용하는 단어 단위 분할 패턴
+_REPLAY_CHUNK = re.compile(r"\S+\s*|\s+")
+
 
 @dataclass
 class ChatRequest:
     """채팅 요청 도메인 모델"""
     message: str
     history: Optional[List[ChatMessage]] = None
+    conversation_id: Optional[str] = None
+    model: Optional[str] = None
+    temperature: Optional[float] = None
+    agent: Optional[str] = None
+    tenant: Optional[str] = None  # 업스트림 할당량/공정 스케줄링 단위 (None이면 공용 테넌트)
+    priority: Optional[str] = None  # 업스트림 스케줄링 우선순위 (None이면 스트림 interactive, 그 외 standard)
+    timeout: Optional[float] = None  # 요청 타임아웃 초 (None이면 AGENT_TIMEOUT)
 
 
 @dataclass 
@@ -26,19 +49,246 @@ class ChatResponse:
     model: str
     agent_name: str
     agent_version: str
+    conversation_id: Optional[str] = None
+    cached: bool = False
+    route: Optional[str] = None
+    route_reason: Optional[str] = None
+    usage: Optional[TokenUsage] = None  # 이 요청이 직접 호출한 LLM의 토큰 사용량 (캐시 적중/합류 시 None)
+
+
+@dataclass
+class BatchResult:
+    """배치 항목 하나의 처리 결과 (response와 error 중 하나만 설정)"""
+    index: int
+    response: Optional[ChatResponse] = None
+    error: Optional[Exception] = None
+    
+    @property
+    def ok(self) -> bool:
+        """성공 여부"""
+        return self.error is None
 
 
 class ChatService:
     """채팅 애플리케이션 서비스"""
     
-    def __init__(self, agent: BaseAgent):
+    def __init__(
+        self,
+        agent: BaseAgent,
+        conversation_store: Optional[ConversationStore] = None,
+        response_cache: Optional[ResponseCache] = None,
+        semantic_cache: Optional[SemanticCache] = None,
+        single_flight: Optional[SingleFlight] = None,
+        limiter: Optional[ConcurrencyLimiter] = None,
+        scheduler: Optional[UpstreamScheduler] = None,
+        hedging: Optional[HedgingExecutor] = None,
+        router: Optional[AgentRouter] = None,
+        batch_max_size: int = 100,
+        batch_max_concurrency: int = 8
+    ):
         """
         Args:
             agent: 주입받을 에이전트 인스턴스
+            conversation_store: conversation_id 모드에서 사용할 대화 저장소
+            response_cache: 응답 캐시 (None이면 캐시 미사용)
+            semantic_cache: 의미 캐시 (None이면 미사용, 단일 턴 send_message에만 적용)
+            single_flight: 동일 요청 coalescing 레이어 (None이면 미사용)
+            limiter: 업스트림 호출 동시 실행 수 제한 (None이면 무제한)
+            scheduler: 에이전트들이 공유하는 업스트림 rate limit 스케줄러 (상태 조회용, None이면 미사용)
+            hedging: 에이전트들이 공유하는 헤지/페일오버 실행기 (상태 조회용, None이면 미사용)
+            router: 요청별 에이전트 라우터 (None이면 항상 agent 사용)
+            batch_max_size: 배치 요청 하나에 포함할 수 있는 최대 요청 수
+            batch_max_concurrency: 배치 안에서 동시에 처리할 최대 요청 수
         """
         self._agent = agent
+        self._conversation_store = conversation_store
+        self._response_cache = response_cache
+        self._semantic_cache = semantic_cache
+        self._single_flight = single_flight
+        self._limiter = limiter
+        self._scheduler = scheduler
+        self._hedging = hedging
+        self._router = router
+        self._batch_max_size = batch_max_size
+        self._batch_max_concurrency = batch_max_concurrency
         logger.info(f"ChatService 초기화: {agent.name} v{agent.version}")
     
+    async def _resolve_history(self, request: ChatRequest) -> Optional[List[ChatMessage]]:
+        """
+        요청의 대화 기록 결정
+        
+        conversation_id가 있으면 저장소의 기록을, 없으면 요청에 포함된 기록을 사용합니다.
+        
+        Raises:
+            ValueError: 저장소 미설정 또는 history와 conversation_id 동시 지정
+        """
+        if request.conversation_id is None:
+            return request.history
+        
+        if self._conversation_store is None:
+            raise ValueError("대화 저장소가 설정되지 않아 conversation_id를 사용할 수 없습니다.")
+        if request.history:
+            raise ValueError("conversation_id 사용 시 history를 함께 보낼 수 없습니다.")
+        
+        return await self._conversation_store.get_history(request.conversation_id, request.tenant)
+    
+    async def _save_turn(self, request: ChatRequest, response_message: str) -> None:
+        """conversation_id 모드일 때 이번 턴의 메시지를 저장소에 추가"""
+        if request.conversation_id is None or self._conversation_store is None:
+            return
+        
+        await self._conversation_store.append(
+            request.conversation_id,
+            [
+                ChatMessage(role="user", content=request.message),
+                ChatMessage(role="assistant", content=response_message)
+            ],
+            tenant=request.tenant
+        )
+    
+    def _resolve_route(self, request: ChatRequest, history: Optional[List[ChatMessage]]) -> Route:
+        """
+        요청을 처리할 에이전트 결정
+        
+        Raises:
+            ValueError: 등록되지 않은 에이전트
+        """
+        if self._router is None:
+            if request.agent is not None:
+                raise ValueError(f"등록되지 않은 에이전트: {request.agent}")
+            return Route("default", self._agent, request.model, "default")
+        
+        return self._router.resolve(
+            request.message, history, agent=request.agent, model=request.model
+        )
+    
+    def _request_key(
+        self,
+        request: ChatRequest,
+        route: Route,
+        history: Optional[List[ChatMessage]]
+    ) -> Optional[str]:
+        """
+        응답 캐시와 single-flight에서 공유하는 요청 키 생성 (둘 다 미사용 시 None)
+        """
+        model, temperature, max_tokens = self._effective_params(request, route)
+        prefix = self._prompt_prefix(route)
+        if self._response_cache is not None:
+            return self._response_cache.make_key(
+                model, temperature, max_tokens, request.message, history, prefix=prefix
+            )
+        if self._single_flight is not None:
+            return build_cache_key(
+                model, temperature, max_tokens, request.message, history, prefix=prefix
+            )
+        return None
+    
+    @staticmethod
+    def _flight_key(request: ChatRequest, request_key: Optional[str]) -> Optional[str]:
+        """
+        single-flight 합류 키 (요청 키 + 테넌트 + 우선순위)
+        
+        합류한 요청은 호출을 시작한 요청의 permit으로 처리되므로, 다른 테넌트의 할당량이나
+        더 높은 우선순위를 빌려 쓰지 않도록 같은 테넌트/우선순위끼리만 합류합니다.
+        """
+        if request_key is None:
+            return None
+        return f"{request_key}:{request.tenant or ''}:{request.priority or ''}"
+    
+    @staticmethod
+    def _prompt_prefix(route: Route) -> str:
+        """에이전트 고정 prefix(AGENT_SYSTEM_PROMPT, AGENT_INSTRUCTIONS, metadata["prompt"]) 식별자"""
+        prompt = getattr(route.agent, "prompt", None)
+        return prompt.prefix_hash if prompt is not None else ""
+    
+    @staticmethod
+    def _effective_params(request: ChatRequest, route: Route) -> tuple:
+        """요청별 오버라이드를 반영한 (model, temperature, max_tokens)"""
+        config = route.agent.config
+        return (
+            route.model or config.model,
+            config.temperature if request.temperature is None else request.temperature,
+            config.max_tokens
+        )
+    
+    def _semantic_namespace(
+        self,
+        request: ChatRequest,
+        route: Route,
+        history: Optional[List[ChatMessage]]
+    ) -> Optional[str]:
+        """
+        의미 캐시 네임스페이스 (에이전트, 고정 prefix, 생성 파라미터 조합, 대화 맥락이 있는 요청은 None)
+        
+        앞선 대화에 따라 같은 질문의 답이 달라지므로 대화 기록이 없는 단일 턴 요청에만 적용합니다.
+        """
+        if history or request.conversation_id is not None:
+            return None
+        model, temperature, max_tokens = self._effective_params(request, route)
+        return f"{route.name}:{self._prompt_prefix(route)}:{model}:{temperature}:{max_tokens}"
+    
+    @staticmethod
+    def _agent_overrides(request: ChatRequest, route: Route) -> dict:
+        """에이전트 호출 시 전달할 요청별 모델 오버라이드와 스케줄링 정보"""
+        overrides = {}
+        if route.model is not None:
+            overrides["model"] = route.model
+        if request.temperature is not None:
+            overrides["temperature"] = request.temperature
+        if request.tenant is not None:
+            overrides["tenant"] = request.tenant
+        if request.priority is not None:
+            overrides["priority"] = request.priority
+        if request.timeout is not None:
+            overrides["timeout"] = request.timeout
+        return overrides
+    
+    @staticmethod
+    def _build_response(
+        request: ChatRequest,
+        route: Route,
+        message: str,
+        cached: bool = False,
+        usage: Optional[TokenUsage] = None
+    ) -> ChatResponse:
+        """도메인 응답 모델 생성"""
+        return ChatResponse(
+            message=message,
+            model=route.model or route.agent.config.model,
+            agent_name=route.agent.name,
+            agent_version=route.agent.version,
+            conversation_id=request.conversation_id,
+            cached=cached,
+            route=route.name,
+            route_reason=route.reason,
+            usage=usage
+        )
+    
+    def _upstream_slot(self):
+        """업스트림 호출 실행 슬롯 (리미터 미설정 시 제한 없음)"""
+        if self._limiter is None:
+            return nullcontext()
+        return self._limiter.slot()
+    
+    def check_capacity(self) -> None:
+        """
+        스트림 시작 전 과부하 여부 확인
+        
+        Raises:
+            QueueFullError: 대기열 초과
+        """
+        if self._limiter is not None:
+            self._limiter.check_capacity()
+    
+    def check_request(self, request: ChatRequest) -> None:
+        """
+        스트림 시작 전 에이전트/모델 지정 확인 (대화 기록이 필요한 라우팅 규칙은 검사하지 않음)
+        
+        Raises:
+            ValueError: 등록되지 않은 에이전트 또는 허용되지 않은 모델
+        """
+        self._resolve_route(request, None)
+    
     async def send_message(self, request: ChatRequest) -> ChatResponse:
         """
         메시지 전송 및 응답 생성
@@ -51,24 +301,167 @@ class ChatService:
             
         Raises:
             ValueError: 처리 실패
+            OverloadedError: 동시 실행 제한 또는 테넌트 할당량 초과
+            DeadlineExceededError: 요청 deadline 초과
         """
+        with tracing.span("service"):
+            history = await self._resolve_history(request)
+            route = self._resolve_route(request, history)
+            request_key = self._request_key(request, route, history)
+        
+            if self._response_cache is not None:
+                cached_message = await self._response_cache.get(request_key)
+                telemetry.CACHE_LOOKUPS.inc(result="miss" if cached_message is None else "hit")
+                if cached_message is not None:
+                    await self._save_turn(request, cached_message)
+                    return self._build_response(request, route, cached_message, cached=True)
+            
+            semantic_entry = None
+            if self._semantic_cache is not None:
+                namespace = self._semantic_namespace(request, route, history)
+                if namespace is None:
+                    telemetry.SEMANTIC_CACHE_LOOKUPS.inc(result="bypass")
+                else:
+                    # 미스일 때 업스트림 응답을 같은 벡터로 저장하도록 보관
+                    semantic_entry = (namespace, await self._semantic_cache.embed(request.message))
+                    cached_message = self._semantic_cache.get(*semantic_entry)
+                    telemetry.SEMANTIC_CACHE_LOOKUPS.inc(result="miss" if cached_message is None else "hit")
+                    if cached_message is not None:
+                        return self._build_response(request, route, cached_message, cached=True)
+        
+            try:
+                # 업스트림 호출 태스크는 이 컨텍스트를 복사해 시작하므로 호출을 시작한 요청에만 사용량이 기록됨
+                with usage.track_usage() as tracked:
+                    if self._single_flight is not None:
+                        # 동일한 요청이 진행 중이면 같은 업스트림 호출 결과를 공유
+                        response_message = await self._single_flight.do(
+                            self._flight_key(request, request_key),
+                            lambda: self._invoke_upstream(request, route, history, request_key, semantic_entry)
+                        )
+                    else:
+                        response_message = await self._invoke_upstream(
+                            request, route, history, request_key, semantic_entry
+                        )
+            
+                await self._save_turn(request, response_message)
+            
+                return self._build_response(
+                    request, route, response_message, usage=tracked if tracked.calls else None
+                )
+            
+            except (OverloadedError, DeadlineExceededError):
+                raise
+            except QuotaExceededError as e:
+                raise TenantQuotaExceededError(str(e), retry_after=e.retry_after) from e
+            except Exception as e:
+                logger.error(f"메시지 처리 중 오류: {e}", exc_info=True)
+                raise ValueError(f"메시지 처리 실패: {str(e)}")
+    
+    async def _invoke_upstream(
+        self,
+        request: ChatRequest,
+        route: Route,
+        history: Optional[List[ChatMessage]],
+        request_key: Optional[str],
+        semantic_entry: Optional[Tuple[str, Any]] = None
+    ) -> str:
+        """에이전트 호출 후 응답 캐시(와 의미 캐시)에 저장"""
         try:
-            # 에이전트 호출
-            response_message = await self._agent.invoke(
-                message=request.message,
-                chat_history=request.history
-            )
+            async with self._upstream_slot():
+                response_message = await route.agent.invoke(
+                    message=request.message,
+                    chat_history=history,
+                    **self._agent_overrides(request, route)
+                )
+        except asyncio.CancelledError:
+            telemetry.UPSTREAM_CANCELLED.inc(mode="invoke")
+            raise
+        
+        if self._response_cache is not None:
+            await self._response_cache.set(request_key, response_message)
+        if semantic_entry is not None:
+            self._semantic_cache.set(*semantic_entry, response_message)
+        return response_message
+    
+    def check_batch(self, requests: List[ChatRequest]) -> None:
+        """
+        배치 크기 확인
+        
+        Raises:
+            ValueError: 빈 배치 또는 최대 크기 초과
+        """
+        if not requests:
+            raise ValueError("배치에 요청이 없습니다.")
+        if len(requests) > self._batch_max_size:
+            raise ValueError(f"배치 크기 초과: {len(requests)} > {self._batch_max_size}")
+    
+    async def send_batch(
+        self,
+        requests: List[ChatRequest],
+        max_concurrency: Optional[int] = None
+    ) -> List[BatchResult]:
+        """
+        여러 요청을 동시 실행 수를 제한해 처리하고 요청 순서대로 결과 반환
+        
+        항목별 오류는 해당 항목의 결과에만 기록되며 다른 항목에 영향을 주지 않습니다.
+        우선순위를 지정하지 않은 항목은 batch 우선순위로 업스트림 스케줄러에 들어갑니다.
+        
+        Args:
+            requests: 채팅 요청 목록
+            max_concurrency: 배치 안에서 동시에 처리할 최대 요청 수 (서버 설정값을 넘을 수 없음)
             
-            return ChatResponse(
-                message=response_message,
-                model=self._agent.config.model,
-                agent_name=self._agent.name,
-                agent_version=self._agent.version
-            )
+        Returns:
+            요청 순서와 같은 순서의 결과 목록
             
-        except Exception as e:
-            logger.error(f"메시지 처리 중 오류: {e}", exc_info=True)
-            raise ValueError(f"메시지 처리 실패: {str(e)}")
+        Raises:
+            ValueError: 빈 배치 또는 최대 크기 초과
+        """
+        self.check_batch(requests)
+        results: List[Optional[BatchResult]] = [None] * len(requests)
+        async with aclosing(self.stream_batch(requests, max_concurrency)) as batch:
+            async for result in batch:
+                results[result.index] = result
+        return results
+    
+    async def stream_batch(
+        self,
+        requests: List[ChatRequest],
+        max_concurrency: Optional[int] = None
+    ) -> AsyncGenerator[BatchResult, None]:
+        """
+        여러 요청을 동시 실행 수를 제한해 처리하고 완료되는 순서대로 결과 전달
+        
+        소비자가 중간에 멈추면(클라이언트 연결 종료 등) 남은 요청은 취소됩니다.
+        배치 크기는 호출 전에 check_batch()로 확인합니다.
+        
+        Args:
+            requests: 채팅 요청 목록
+            max_concurrency: 배치 안에서 동시에 처리할 최대 요청 수 (서버 설정값을 넘을 수 없음)
+            
+        Yields:
+            완료된 항목의 결과 (index로 원래 순서 확인)
+        """
+        limit = min(max_concurrency or self._batch_max_concurrency, self._batch_max_concurrency)
+        semaphore = asyncio.Semaphore(max(1, limit))
+        
+        async def run(index: int, request: ChatRequest) -> BatchResult:
+            if request.priority is None:
+                request = replace(request, priority="batch")
+            async with semaphore:
+                try:
+                    return BatchResult(index, response=await self.send_message(request))
+                except Exception as e:
+                    return BatchResult(index, error=e)
+        
+        tasks = [asyncio.create_task(run(index, request)) for index, request in enumerate(requests)]
+        try:
+            for completed in asyncio.as_completed(tasks):
+                yield await completed
+        finally:
+            for task in tasks:
+                task.cancel()
+            # 취소된 항목의 업스트림 호출과 스케줄러 permit 정리가 끝날 때까지 대기
+            await asyncio.gather(*tasks, return_exceptions=True)
     
     async def stream_message(self, request: ChatRequest) -> AsyncGenerator[str, None]:
         """
@@ -83,18 +476,75 @@ class ChatService:
         Raises:
             ValueError: 처리 실패
         """
+        history = await self._resolve_history(request)
+        route = self._resolve_route(request, history)
+        request_key = self._request_key(request, route, history)
+        
+        if self._response_cache is not None:
+            cached_message = await self._response_cache.get(request_key)
+            telemetry.CACHE_LOOKUPS.inc(result="miss" if cached_message is None else "hit")
+            if cached_message is not None:
+                # 캐시된 응답을 청크 단위로 재생
+                for chunk in _REPLAY_CHUNK.findall(cached_message):
+                    yield chunk
+                await self._save_turn(request, cached_message)
+                return
+        
+        chunks: List[str] = []
+        
         try:
-            async for chunk in self._agent.stream(
-                message=request.message,
-                chat_history=request.history
-            ):
-                if chunk:
+            if self._single_flight is not None:
+                # 동일한 스트림이 진행 중이면 합류 (놓친 청크부터 전달받음)
+                upstream = self._single_flight.stream(
+                    self._flight_key(request, request_key), lambda: self._stream_upstream(request, route, history, request_key)
+                )
+            else:
+                upstream = self._stream_upstream(request, route, history, request_key)
+            
+            async with aclosing(upstream):
+                async for chunk in upstream:
+                    chunks.append(chunk)
                     yield chunk
+            
+            await self._save_turn(request, "".join(chunks))
                     
+        except (OverloadedError, DeadlineExceededError):
+            raise
+        except QuotaExceededError as e:
+            raise TenantQuotaExceededError(str(e), retry_after=e.retry_after) from e
         except Exception as e:
             logger.error(f"스트림 처리 중 오류: {e}", exc_info=True)
             raise ValueError(f"스트림 처리 실패: {str(e)}")
     
+    async def _stream_upstream(
+        self,
+        request: ChatRequest,
+        route: Route,
+        history: Optional[List[ChatMessage]],
+        request_key: Optional[str]
+    ) -> AsyncGenerator[str, None]:
+        """에이전트 스트림을 전달하고 완료되면 응답 캐시에 저장"""
+        chunks: List[str] = []
+        
+        # 업스트림 스트림이 진행되는 동안에만 실행 슬롯 점유
+        # (취소/종료 시 에이전트 스트림을 닫아 OpenAI HTTP 스트림까지 닫힘)
+        try:
+            async with self._upstream_slot(), aclosing(route.agent.stream(
+                message=request.message,
+                chat_history=history,
+                **self._agent_overrides(request, route)
+            )) as agent_stream:
+                async for chunk in agent_stream:
+                    if chunk:
+                        chunks.append(chunk)
+                        yield chunk
+        except (asyncio.CancelledError, GeneratorExit):
+            telemetry.UPSTREAM_CANCELLED.inc(mode="stream")
+            raise
+        
+        if self._response_cache is not None:
+            await self._response_cache.set(request_key, "".join(chunks))
+    
     async def health_check(self) -> dict:
         """
         서비스 상태 확인
@@ -103,14 +553,28 @@ class ChatService:
             상태 정보
         """
         try:
-            agent_health = await self._agent.health_check()
+            details = await self._agent.health_check()
+            if self._response_cache is not None:
+                details = {**details, "response_cache": self._response_cache.stats()}
+            if self._semantic_cache is not None:
+                details = {**details, "semantic_cache": self._semantic_cache.stats()}
+            if self._single_flight is not None:
+                details = {**details, "single_flight": self._single_flight.stats()}
+            if self._limiter is not None:
+                details = {**details, "concurrency": self._limiter.stats()}
+            if self._scheduler is not None:
+                details = {**details, "upstream_scheduler": self._scheduler.stats()}
+            if self._hedging is not None:
+                details = {**details, "hedging": self._hedging.stats()}
+            if self._router is not None:
+                details = {**details, "routing": self._router.describe()}
             
             return {
                 "status": "healthy",
                 "model": self._agent.config.model,
                 "agent": self._agent.name,
                 "version": self._agent.version,
-                "details": agent_health
+                "details": details
             }
             
         except Exception as e:
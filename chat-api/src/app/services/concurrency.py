@@ -0,0 +1,156 @@
+"""
+Concurrency Limiter
+업스트림 LLM 호출의 동시 실행 수 제한, 대기열 관리 및 부하 차단 (admission control)
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict
+
+from ..metrics import Histogram
+
+logger = logging.getLogger(__name__)
+
+# 대기열 길이 측정용 버킷
+QUEUE_DEPTH_BUCKETS = (0, 1, 2, 4, 8, 16, 32, 64, 128, 256)
+
+
+class OverloadedError(Exception):
+    """서버 과부하로 요청을 처리할 수 없음"""
+
+    status_code = 503
+
+    def __init__(self, message: str, retry_after: int):
+        """
+        Args:
+            message: 에러 메시지
+            retry_after: 재시도까지 권장 대기 시간 (초)
+        """
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class QueueFullError(OverloadedError):
+    """대기열이 가득 참 (즉시 거절)"""
+
+    status_code = 429
+
+
+class QueueTimeoutError(OverloadedError):
+    """대기열에서 제한 시간 내에 실행 슬롯을 얻지 못함"""
+
+    status_code = 503
+
+
+class TenantQuotaExceededError(OverloadedError):
+    """테넌트의 업스트림 호출 할당량(분당 요청/토큰 수) 초과"""
+
+    status_code = 429
+
+
+class ConcurrencyLimiter:
+    """동시 실행 수와 대기열 길이를 제한하는 리미터"""
+
+    def __init__(
+        self,
+        max_concurrent: int,
+        max_queue: int,
+        queue_timeout: float,
+        retry_after: int = 1
+    ):
+        """
+        Args:
+            max_concurrent: 최대 동시 실행 수
+            max_queue: 최대 대기 요청 수 (초과 시 즉시 거절)
+            queue_timeout: 대기열 최대 대기 시간 (초)
+            retry_after: 거절 시 Retry-After 헤더 값 (초)
+        """
+        self._max_concurrent = max_concurrent
+        self._max_queue = max_queue
+        self._queue_timeout = queue_timeout
+        self._retry_after = retry_after
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+
+        self.active = 0
+        self.waiting = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.wait_time = Histogram("chat_queue_wait_seconds", "실행 슬롯 대기 시간")
+        self.queue_depth = Histogram("chat_queue_depth", "요청 도착 시점의 대기열 길이", QUEUE_DEPTH_BUCKETS)
+
+    def check_capacity(self) -> None:
+        """
+        대기열이 가득 찼으면 즉시 거절 (스트림 시작 전 fail-fast 용도)
+
+        Raises:
+            QueueFullError: 대기열 초과
+        """
+        if self._semaphore.locked() and self.waiting >= self._max_queue:
+            self.rejected += 1
+            raise QueueFullError(
+                "요청이 너무 많습니다. 잠시 후 다시 시도해주세요.",
+                retry_after=self._retry_after
+            )
+
+    async def acquire(self) -> None:
+        """
+        실행 슬롯 획득
+
+        Raises:
+            QueueFullError: 대기열 초과
+            QueueTimeoutError: 대기 시간 초과
+        """
+        self.queue_depth.observe(self.waiting)
+
+        if not self._semaphore.locked():
+            await self._semaphore.acquire()
+            self.wait_time.observe(0.0)
+            self.active += 1
+            return
+
+        self.check_capacity()
+
+        self.waiting += 1
+        started_at = time.monotonic()
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=self._queue_timeout)
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            raise QueueTimeoutError(
+                "서버가 혼잡하여 요청을 처리하지 못했습니다. 잠시 후 다시 시도해주세요.",
+                retry_after=self._retry_after
+            )
+        finally:
+            self.waiting -= 1
+            self.wait_time.observe(time.monotonic() - started_at)
+
+        self.active += 1
+
+    def release(self) -> None:
+        """실행 슬롯 반환"""
+        self.active -= 1
+        self._semaphore.release()
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """실행 슬롯을 점유하는 컨텍스트"""
+        await self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def stats(self) -> Dict[str, Any]:
+        """리미터 상태"""
+        return {
+            "max_concurrent": self._max_concurrent,
+            "max_queue": self._max_queue,
+            "active": self.active,
+            "waiting": self.waiting,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "wait_time_seconds": self.wait_time.snapshot(),
+            "queue_depth": self.queue_depth.snapshot(),
+        }
@@ -0,0 +1,277 @@
+"""
+Conversation Store
+서버 측 대화 기록 저장소 (conversation_id 모드)
+
+conversation_id는 클라이언트가 정하는 값이므로 대화는 (tenant, conversation_id) 쌍으로 구분합니다.
+"""
+
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from ...agents import ChatMessage
+
+logger = logging.getLogger(__name__)
+
+
+def _tenant_key(tenant: Optional[str]) -> str:
+    """tenant 미지정 요청은 빈 문자열 테넌트로 묶음"""
+    return tenant or ""
+
+
+class ConversationStore(ABC):
+    """대화 기록 저장소 인터페이스"""
+
+    @abstractmethod
+    async def get_history(self, conversation_id: str, tenant: Optional[str] = None) -> List[ChatMessage]:
+        """
+        대화 기록 조회
+
+        Args:
+            conversation_id: 대화 ID
+            tenant: 대화를 소유한 테넌트 (없으면 공용 테넌트)
+
+        Returns:
+            저장된 메시지 목록 (없거나 만료되었으면 빈 리스트)
+        """
+        pass
+
+    @abstractmethod
+    async def append(
+        self,
+        conversation_id: str,
+        messages: List[ChatMessage],
+        tenant: Optional[str] = None
+    ) -> None:
+        """
+        대화 기록에 메시지 추가
+
+        Args:
+            conversation_id: 대화 ID
+            messages: 추가할 메시지 목록
+            tenant: 대화를 소유한 테넌트 (없으면 공용 테넌트)
+        """
+        pass
+
+    async def close(self) -> None:
+        """저장소 리소스 정리"""
+        pass
+
+
+class InMemoryConversationStore(ConversationStore):
+    """LRU 방식의 인메모리 대화 저장소"""
+
+    def __init__(self, max_conversations: int = 1000, ttl: float = 0):
+        """
+        Args:
+            max_conversations: 보관할 최대 대화 수 (초과 시 가장 오래 사용되지 않은 대화 제거)
+            ttl: 마지막 사용 후 대화를 보관할 시간 (초, 0이면 만료 없음)
+        """
+        self._max_conversations = max_conversations
+        self._ttl = ttl
+        # (tenant, conversation_id) -> (마지막 사용 시각, 메시지 목록), 오래 사용되지 않은 순서
+        self._conversations: "OrderedDict[Tuple[str, str], Tuple[float, List[ChatMessage]]]" = OrderedDict()
+
+    def _evict_expired(self, now: float) -> None:
+        if self._ttl <= 0:
+            return
+        while self._conversations:
+            key, (used_at, _) = next(iter(self._conversations.items()))
+            if now - used_at < self._ttl:
+                break
+            del self._conversations[key]
+            logger.debug(f"대화 기록 제거 (TTL): {key}")
+
+    async def get_history(self, conversation_id: str, tenant: Optional[str] = None) -> List[ChatMessage]:
+        now = time.monotonic()
+        self._evict_expired(now)
+
+        key = (_tenant_key(tenant), conversation_id)
+        entry = self._conversations.get(key)
+        if entry is None:
+            return []
+        self._conversations[key] = (now, entry[1])
+        self._conversations.move_to_end(key)
+        return list(entry[1])
+
+    async def append(
+        self,
+        conversation_id: str,
+        messages: List[ChatMessage],
+        tenant: Optional[str] = None
+    ) -> None:
+        now = time.monotonic()
+        self._evict_expired(now)
+
+        key = (_tenant_key(tenant), conversation_id)
+        entry = self._conversations.get(key)
+        history = entry[1] if entry is not None else []
+        history.extend(messages)
+        self._conversations[key] = (now, history)
+        self._conversations.move_to_end(key)
+
+        while len(self._conversations) > self._max_conversations:
+            evicted_key, _ = self._conversations.popitem(last=False)
+            logger.debug(f"대화 기록 제거 (LRU): {evicted_key}")
+
+    def __len__(self) -> int:
+        return len(self._conversations)
+
+
+class SQLiteConversationStore(ConversationStore):
+    """SQLite 기반의 영구 대화 저장소 (LRU + TTL)"""
+
+    def __init__(self, path: str = "conversations.db", max_conversations: int = 1000, ttl: float = 0):
+        """
+        Args:
+            path: SQLite 데이터베이스 파일 경로
+            max_conversations: 보관할 최대 대화 수 (초과 시 가장 오래 사용되지 않은 대화 제거)
+            ttl: 마지막 사용 후 대화를 보관할 시간 (초, 0이면 만료 없음)
+        """
+        self._path = path
+        self._max_conversations = max_conversations
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS conversations (
+                    tenant TEXT NOT NULL,
+                    conversation_id TEXT NOT NULL,
+                    accessed_at REAL NOT NULL,
+                    PRIMARY KEY (tenant, conversation_id)
+                )
+                """
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_conversations_accessed "
+                "ON conversations (accessed_at)"
+            )
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS conversation_messages (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    tenant TEXT NOT NULL DEFAULT '',
+                    conversation_id TEXT NOT NULL,
+                    role TEXT NOT NULL,
+                    content TEXT NOT NULL
+                )
+                """
+            )
+            self._migrate()
+            self._conn.execute("DROP INDEX IF EXISTS idx_conversation_messages_cid")
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_conversation_messages_key "
+                "ON conversation_messages (tenant, conversation_id, id)"
+            )
+            self._conn.commit()
+
+    def _migrate(self) -> None:
+        """tenant 컬럼이 없던 이전 스키마의 기록을 공용 테넌트 대화로 옮김"""
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(conversation_messages)")}
+        if "tenant" in columns:
+            return
+        self._conn.execute(
+            "ALTER TABLE conversation_messages ADD COLUMN tenant TEXT NOT NULL DEFAULT ''"
+        )
+        self._conn.execute(
+            "INSERT OR IGNORE INTO conversations (tenant, conversation_id, accessed_at) "
+            "SELECT DISTINCT '', conversation_id, ? FROM conversation_messages",
+            (time.time(),)
+        )
+        logger.info("대화 저장소 스키마 마이그레이션: 기존 기록을 공용 테넌트로 이동")
+
+    def _evict(self, now: float) -> None:
+        """만료되었거나 최대 대화 수를 넘은 대화를 메시지와 함께 제거 (lock 보유 상태에서 호출)"""
+        evicted = []
+        if self._ttl > 0:
+            evicted += self._conn.execute(
+                "SELECT tenant, conversation_id FROM conversations WHERE accessed_at <= ?",
+                (now - self._ttl,)
+            ).fetchall()
+        evicted += self._conn.execute(
+            "SELECT tenant, conversation_id FROM conversations "
+            "ORDER BY accessed_at DESC LIMIT -1 OFFSET ?",
+            (self._max_conversations,)
+        ).fetchall()
+        if not evicted:
+            return
+
+        self._conn.executemany(
+            "DELETE FROM conversations WHERE tenant = ? AND conversation_id = ?", evicted
+        )
+        self._conn.executemany(
+            "DELETE FROM conversation_messages WHERE tenant = ? AND conversation_id = ?", evicted
+        )
+        logger.debug(f"대화 기록 제거: {len(evicted)}건")
+
+    def _get_history_sync(self, conversation_id: str, tenant: str) -> List[ChatMessage]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT accessed_at FROM conversations WHERE tenant = ? AND conversation_id = ?",
+                (tenant, conversation_id)
+            ).fetchone()
+            if row is None:
+                return []
+
+            if self._ttl > 0 and row[0] <= now - self._ttl:
+                self._evict(now)
+                self._conn.commit()
+                return []
+
+            self._conn.execute(
+                "UPDATE conversations SET accessed_at = ? WHERE tenant = ? AND conversation_id = ?",
+                (now, tenant, conversation_id)
+            )
+            rows = self._conn.execute(
+                "SELECT role, content FROM conversation_messages "
+                "WHERE tenant = ? AND conversation_id = ? ORDER BY id",
+                (tenant, conversation_id)
+            ).fetchall()
+            self._conn.commit()
+        return [ChatMessage(role=role, content=content) for role, content in rows]
+
+    def _append_sync(self, conversation_id: str, messages: List[ChatMessage], tenant: str) -> None:
+        now = time.time()
+        with self._lock:
+            # 만료된 대화에 이어 쓰지 않도록 먼저 정리
+            self._evict(now)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO conversations (tenant, conversation_id, accessed_at) "
+                "VALUES (?, ?, ?)",
+                (tenant, conversation_id, now)
+            )
+            self._conn.executemany(
+                "INSERT INTO conversation_messages (tenant, conversation_id, role, content) "
+                "VALUES (?, ?, ?, ?)",
+                [(tenant, conversation_id, msg.role, msg.content) for msg in messages]
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def size(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM conversations").fetchone()[0]
+
+    async def get_history(self, conversation_id: str, tenant: Optional[str] = None) -> List[ChatMessage]:
+        return await asyncio.to_thread(self._get_history_sync, conversation_id, _tenant_key(tenant))
+
+    async def append(
+        self,
+        conversation_id: str,
+        messages: List[ChatMessage],
+        tenant: Optional[str] = None
+    ) -> None:
+        await asyncio.to_thread(self._append_sync, conversation_id, messages, _tenant_key(tenant))
+
+    async def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,328 @@
+"""
+Job Manager
+비동기 작업(/api/jobs)을 제한된 수의 asyncio 워커로 실행하고 결과를 작업 저장소에 보관
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from dataclasses import replace
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple
+
+import msgspec
+
+from ...agents import DeadlineExceededError
+from .chat_service import ChatRequest, ChatResponse, ChatService
+from .concurrency import OverloadedError, QueueFullError
+from .job_store import CANCELLED, FAILED, SUCCEEDED, Job, JobStore
+
+logger = logging.getLogger(__name__)
+
+# 과부하(동시 실행 제한/할당량 초과)로 거절된 작업을 Retry-After만큼 기다려 다시 시도하는 횟수
+OVERLOAD_RETRIES = 3
+
+
+def error_status(error: Exception) -> Tuple[int, str]:
+    """실패한 작업의 (HTTP 상태 코드, 오류 메시지) - 단건 API와 같은 매핑"""
+    if isinstance(error, OverloadedError):
+        return error.status_code, str(error)
+    if isinstance(error, DeadlineExceededError):
+        return 504, str(error)
+    if isinstance(error, ValueError):
+        return 400, str(error)
+    return 500, "내부 서버 오류가 발생했습니다."
+
+
+class JobManager:
+    """
+    작업 대기열과 워커 풀
+
+    작업은 저장소에 먼저 기록한 뒤 프로세스 안의 대기열에 넣고, 워커가 저장소에서 claim한 작업만 실행합니다.
+    실행 중인 작업의 lease를 주기적으로 갱신하므로, 같은 SQLite 파일을 쓰는 다른 프로세스가 종료되면
+    lease가 끊긴 작업을 가져와 다시 실행하고, 재시작한 프로세스는 완료되지 않은 작업을 이어서 실행합니다.
+    """
+
+    def __init__(
+        self,
+        chat_service: ChatService,
+        store: JobStore,
+        workers: int = 4,
+        max_queue: int = 1000,
+        result_ttl: float = 3600.0,
+        timeout: Optional[float] = None,
+        lease_timeout: float = 60.0,
+        retry_after: int = 5
+    ):
+        """
+        Args:
+            chat_service: 작업을 처리할 채팅 서비스
+            store: 작업 저장소
+            workers: 동시에 실행할 최대 작업 수
+            max_queue: 대기 중인 작업 수 한도 (초과 시 QueueFullError)
+            result_ttl: 완료된 작업 보관 시간 (초)
+            timeout: 작업 하나의 타임아웃 (초, None이면 AGENT_TIMEOUT)
+            lease_timeout: 이 시간 동안 lease가 갱신되지 않은 running 작업은 중단된 것으로 보고 다시 실행 (초)
+            retry_after: 대기열이 가득 찼을 때 권장 재시도 대기 시간 (초)
+        """
+        self.owner = uuid.uuid4().hex
+        self._chat_service = chat_service
+        self._store = store
+        self._workers = workers
+        self._max_queue = max_queue
+        self._result_ttl = result_ttl
+        self._timeout = timeout
+        self._lease_timeout = lease_timeout
+        self._retry_after = retry_after
+        self._queue: "asyncio.Queue[str]" = asyncio.Queue()
+        self._queued: Set[str] = set()
+        self._running: Dict[str, asyncio.Task] = {}
+        self._tasks: List[asyncio.Task] = []
+        self._changed = asyncio.Event()
+        self.counts: Dict[str, int] = {"submitted": 0, SUCCEEDED: 0, FAILED: 0, CANCELLED: 0, "recovered": 0}
+
+    @property
+    def queue_depth(self) -> int:
+        """실행을 기다리는 작업 수"""
+        return len(self._queued)
+
+    @property
+    def running(self) -> int:
+        """이 프로세스에서 실행 중인 작업 수"""
+        return len(self._running)
+
+    async def start(self) -> None:
+        """완료되지 않은 작업을 다시 대기열에 넣고 워커와 lease 갱신 태스크 시작"""
+        recovered = await self._enqueue_pending()
+        if recovered:
+            logger.info(f"완료되지 않은 작업 {recovered}개를 다시 실행합니다.")
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self._workers)]
+        self._tasks.append(asyncio.create_task(self._maintain()))
+        logger.info(f"작업 워커 시작: {self._workers}개 (owner {self.owner})")
+
+    async def stop(self) -> None:
+        """
+        워커 종료 후 저장소 정리
+
+        실행 중이던 작업은 queued로 되돌려 다음에 시작하는 프로세스가 다시 실행합니다.
+        """
+        interrupted = list(self._running)
+        tasks = [*self._tasks, *self._running.values()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks = []
+        try:
+            await self._store.release(interrupted, self.owner)
+        finally:
+            await self._store.close()
+        if interrupted:
+            logger.info(f"실행 중이던 작업 {len(interrupted)}개를 대기열로 되돌림")
+
+    async def submit(self, request: ChatRequest) -> Job:
+        """
+        작업 등록 (실행은 워커가 순서대로 진행)
+
+        Args:
+            request: 채팅 요청
+
+        Returns:
+            queued 상태의 작업
+
+        Raises:
+            QueueFullError: 대기 중인 작업 수 한도 초과
+        """
+        if len(self._queued) >= self._max_queue:
+            raise QueueFullError(
+                f"작업 대기열이 가득 찼습니다. ({self._max_queue}개)", retry_after=self._retry_after
+            )
+
+        now = time.time()
+        job = Job(
+            id=uuid.uuid4().hex,
+            request=msgspec.json.encode(request).decode(),
+            created_at=now,
+            updated_at=now
+        )
+        await self._store.create(job)
+        self._enqueue(job.id)
+        self.counts["submitted"] += 1
+        return job
+
+    async def get(self, job_id: str) -> Optional[Job]:
+        """작업 조회 (없거나 보관 기간이 지났으면 None)"""
+        return await self._store.get(job_id)
+
+    async def cancel(self, job_id: str) -> Optional[Job]:
+        """
+        작업 취소 (이미 완료된 작업은 그대로)
+
+        대기 중인 작업은 실행되지 않고, 이 프로세스에서 실행 중인 작업은 LLM 호출까지 바로 취소됩니다.
+        다른 프로세스가 실행 중인 작업은 그 프로세스가 다음 lease 갱신 때 취소합니다.
+
+        Returns:
+            취소 후 작업 (없으면 None)
+        """
+        job = await self._store.get(job_id)
+        if job is None or job.finished:
+            return job
+        job = await self._store.cancel(job_id, time.time() + self._result_ttl)
+        if job is None or job.status != CANCELLED:
+            return job
+
+        self.counts[CANCELLED] += 1
+        self._queued.discard(job_id)
+        task = self._running.get(job_id)
+        if task is not None:
+            task.cancel()
+        self._notify()
+        return job
+
+    @staticmethod
+    def decode_result(job: Job) -> Optional[ChatResponse]:
+        """성공한 작업의 채팅 응답 (그 외 None)"""
+        if job.result is None:
+            return None
+        return msgspec.json.decode(job.result, type=ChatResponse)
+
+    async def watch(self, job_id: str, poll_interval: float = 1.0) -> AsyncIterator[Job]:
+        """
+        작업 상태가 바뀔 때마다 작업 전달 (완료 상태를 전달하면 종료)
+
+        이 프로세스의 변경은 바로 알리고, 다른 프로세스가 실행하는 작업은 poll_interval마다 저장소를 확인합니다.
+
+        Yields:
+            현재 상태의 작업 (첫 번째는 호출 시점의 상태, 작업이 사라지면 종료)
+        """
+        last_status = None
+        while True:
+            changed = self._changed
+            job = await self._store.get(job_id)
+            if job is None:
+                return
+            if job.status != last_status:
+                last_status = job.status
+                yield job
+            if job.finished:
+                return
+            try:
+                await asyncio.wait_for(changed.wait(), poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def stats(self) -> Dict[str, int]:
+        """대기열/실행 상태와 누적 작업 수"""
+        return {
+            "workers": self._workers,
+            "queue_depth": self.queue_depth,
+            "running": self.running,
+            **self.counts
+        }
+
+    def _notify(self) -> None:
+        """watch() 중인 구독자에게 상태 변경 알림"""
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    def _enqueue(self, job_id: str) -> bool:
+        if job_id in self._queued or job_id in self._running:
+            return False
+        self._queued.add(job_id)
+        self._queue.put_nowait(job_id)
+        return True
+
+    async def _enqueue_pending(self) -> int:
+        """lease가 끊긴 작업을 되돌리고 대기열에 없는 queued 작업 추가"""
+        jobs = await self._store.recover(time.time() - self._lease_timeout)
+        added = sum(1 for job in jobs if self._enqueue(job.id))
+        self.counts["recovered"] += added
+        return added
+
+    async def _worker(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            if job_id not in self._queued:
+                continue  # 대기 중에 취소됨
+            self._queued.discard(job_id)
+            try:
+                await self._run(job_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"작업 실행 중 오류: {job_id}: {e}", exc_info=True)
+
+    async def _run(self, job_id: str) -> None:
+        """작업을 claim해서 실행하고 결과 저장 (다른 워커가 가져갔거나 취소된 작업은 건너뜀)"""
+        job = await self._store.claim(job_id, self.owner)
+        if job is None:
+            return
+        self._notify()
+
+        task = asyncio.create_task(self._execute(job))
+        self._running[job_id] = task
+        try:
+            # 워커가 종료되어도(stop) 작업 태스크는 stop()이 따로 취소
+            await asyncio.wait((task,))
+        finally:
+            self._running.pop(job_id, None)
+
+        if task.cancelled():
+            # cancel() 또는 lease 갱신에서 중단 (저장소 상태는 이미 cancelled이거나 다른 프로세스가 가져감)
+            logger.info(f"작업 중단: {job_id}")
+        elif await self._store.finish(task.result(), self.owner):
+            self.counts[task.result().status] += 1
+        else:
+            logger.info(f"작업 결과를 저장하지 않음 (실행 중에 취소됨): {job_id}")
+        self._notify()
+
+    async def _execute(self, job: Job) -> Job:
+        """
+        채팅 서비스 호출 후 결과/오류를 채운 작업 반환 (취소 외의 예외는 작업 실패로 기록)
+
+        저장된 요청을 해석할 수 없으면 400으로 실패 처리합니다. (예외로 빠져나가면 작업이 running으로 남아
+        lease 만료 후 계속 다시 실행됨)
+        """
+        attempt = 0
+        while True:
+            try:
+                request = msgspec.json.decode(job.request, type=ChatRequest)
+                # 작업은 배치와 같은 우선순위로 업스트림 스케줄러에 들어감
+                request = replace(request, priority=request.priority or "batch", timeout=self._timeout)
+                response = await self._chat_service.send_message(request)
+                result = {"status": SUCCEEDED, "result": msgspec.json.encode(response).decode()}
+                break
+            except OverloadedError as e:
+                if attempt < OVERLOAD_RETRIES:
+                    attempt += 1
+                    logger.warning(f"작업 재시도 대기 ({attempt}/{OVERLOAD_RETRIES}, {e.retry_after}초): {job.id}: {e}")
+                    await asyncio.sleep(e.retry_after)
+                    continue
+                status_code, detail = error_status(e)
+            except Exception as e:
+                status_code, detail = error_status(e)
+                if status_code == 500:
+                    logger.error(f"작업 처리 중 예상치 못한 오류: {job.id}: {e}", exc_info=True)
+            result = {"status": FAILED, "error": detail, "status_code": status_code}
+            break
+
+        now = time.time()
+        return replace(job, **result, updated_at=now, finished_at=now, expires_at=now + self._result_ttl)
+
+    async def _maintain(self) -> None:
+        """lease 갱신, 다른 곳에서 취소된 작업 중단, 중단된 작업 회수, 보관 기간이 지난 작업 삭제"""
+        interval = max(1.0, self._lease_timeout / 3)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                if self._running:
+                    alive = await self._store.heartbeat(list(self._running), self.owner)
+                    for job_id, task in list(self._running.items()):
+                        if job_id not in alive:
+                            logger.info(f"다른 곳에서 취소된 작업 중단: {job_id}")
+                            task.cancel()
+                await self._enqueue_pending()
+                purged = await self._store.purge_expired()
+                if purged:
+                    logger.debug(f"보관 기간이 지난 작업 {purged}개 삭제")
+            except Exception as e:
+                logger.warning(f"작업 저장소 관리 중 오류: {e}")
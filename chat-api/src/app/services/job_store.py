@@ -0,0 +1,446 @@
+"""
+Job Store
+비동기 작업(/api/jobs)의 요청, 상태, 결과를 보관하는 저장소 (완료된 작업은 TTL 후 제거)
+"""
+
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from typing import Iterable, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# 작업 상태 (queued -> running -> succeeded/failed/cancelled, 취소는 어느 단계에서든 가능)
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED_STATUSES = frozenset((SUCCEEDED, FAILED, CANCELLED))
+
+
+@dataclass
+class Job:
+    """비동기 작업 하나 (요청/결과는 JSON 문자열로 보관)"""
+    id: str
+    request: str
+    status: str = QUEUED
+    result: Optional[str] = None
+    error: Optional[str] = None
+    status_code: Optional[int] = None  # 실패 시 단건 API와 같은 HTTP 상태 코드
+    owner: Optional[str] = None  # 실행 중인 워커 풀 ID
+    attempts: int = 0
+    created_at: float = 0.0
+    updated_at: float = 0.0  # 실행 중에는 워커 풀이 주기적으로 갱신 (lease)
+    finished_at: Optional[float] = None
+    expires_at: Optional[float] = None
+
+    @property
+    def finished(self) -> bool:
+        """완료(성공/실패/취소) 여부"""
+        return self.status in FINISHED_STATUSES
+
+
+class JobStore(ABC):
+    """작업 저장소 인터페이스"""
+
+    @abstractmethod
+    async def create(self, job: Job) -> None:
+        """
+        새 작업 저장
+
+        Args:
+            job: 저장할 작업 (queued 상태)
+        """
+        pass
+
+    @abstractmethod
+    async def get(self, job_id: str) -> Optional[Job]:
+        """
+        작업 조회
+
+        Args:
+            job_id: 작업 ID
+
+        Returns:
+            작업 (없거나 보관 기간이 지났으면 None)
+        """
+        pass
+
+    @abstractmethod
+    async def finish(self, job: Job, owner: str) -> bool:
+        """
+        실행을 마친 작업의 결과 저장 (owner가 아직 running 상태로 가지고 있을 때만)
+
+        Args:
+            job: 결과/오류와 완료 상태를 채운 작업
+            owner: 워커 풀 ID
+
+        Returns:
+            저장 여부 (그 사이 취소되었으면 False)
+        """
+        pass
+
+    @abstractmethod
+    async def cancel(self, job_id: str, expires_at: float) -> Optional[Job]:
+        """
+        완료되지 않은 작업을 cancelled로 변경 (실행 중인 워커는 다음 lease 갱신 때 알게 됨)
+
+        Args:
+            job_id: 작업 ID
+            expires_at: 취소된 작업을 보관할 시각
+
+        Returns:
+            변경 후 작업 (없으면 None, 이미 완료된 작업은 그대로 반환)
+        """
+        pass
+
+    @abstractmethod
+    async def claim(self, job_id: str, owner: str) -> Optional[Job]:
+        """
+        queued 상태인 작업을 running으로 바꾸고 실행 권한 획득 (여러 워커 풀 중 하나만 성공)
+
+        Args:
+            job_id: 작업 ID
+            owner: 워커 풀 ID
+
+        Returns:
+            획득한 작업 (이미 다른 워커가 가져갔거나 취소되었으면 None)
+        """
+        pass
+
+    @abstractmethod
+    async def heartbeat(self, job_ids: Iterable[str], owner: str) -> Set[str]:
+        """
+        실행 중인 작업의 lease 갱신
+
+        Args:
+            job_ids: owner가 실행 중인 작업 ID 목록
+            owner: 워커 풀 ID
+
+        Returns:
+            아직 owner가 running 상태로 가지고 있는 작업 ID (빠진 작업은 다른 곳에서 취소됨)
+        """
+        pass
+
+    @abstractmethod
+    async def release(self, job_ids: Iterable[str], owner: str) -> None:
+        """
+        종료하는 워커 풀이 실행 중이던 작업을 queued로 되돌림 (다음 시작 시 lease 만료를 기다리지 않고 다시 실행)
+
+        Args:
+            job_ids: owner가 실행 중이던 작업 ID 목록
+            owner: 워커 풀 ID
+        """
+        pass
+
+    @abstractmethod
+    async def recover(self, stale_before: float) -> List[Job]:
+        """
+        재시작 후 다시 실행할 작업 조회
+
+        lease가 stale_before 이전에 끊긴 running 작업(종료된 프로세스가 실행 중이던 작업)은 queued로 되돌립니다.
+
+        Args:
+            stale_before: 이 시각 이전에 갱신이 멈춘 running 작업을 되돌림
+
+        Returns:
+            queued 상태인 작업 목록 (생성 순)
+        """
+        pass
+
+    @abstractmethod
+    async def purge_expired(self) -> int:
+        """
+        보관 기간이 지난 완료 작업 삭제
+
+        Returns:
+            삭제한 작업 수
+        """
+        pass
+
+    async def close(self) -> None:
+        """저장소 리소스 정리"""
+        pass
+
+
+class InMemoryJobStore(JobStore):
+    """인메모리 작업 저장소 (프로세스가 종료되면 작업도 사라짐)"""
+
+    def __init__(self, max_jobs: int = 10000):
+        """
+        Args:
+            max_jobs: 보관할 최대 작업 수 (초과 시 가장 오래된 완료 작업부터 제거)
+        """
+        self._max_jobs = max_jobs
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+
+    async def create(self, job: Job) -> None:
+        self._jobs[job.id] = replace(job)
+        self._evict()
+
+    async def get(self, job_id: str) -> Optional[Job]:
+        job = self._jobs.get(job_id)
+        if job is None or _expired(job, time.time()):
+            return None
+        return replace(job)
+
+    async def finish(self, job: Job, owner: str) -> bool:
+        current = self._jobs.get(job.id)
+        if current is None or current.status != RUNNING or current.owner != owner:
+            return False
+        self._jobs[job.id] = replace(job)
+        return True
+
+    async def cancel(self, job_id: str, expires_at: float) -> Optional[Job]:
+        job = self._jobs.get(job_id)
+        if job is None or _expired(job, time.time()):
+            return None
+        if not job.finished:
+            now = time.time()
+            job.status, job.updated_at, job.finished_at, job.expires_at = CANCELLED, now, now, expires_at
+        return replace(job)
+
+    async def claim(self, job_id: str, owner: str) -> Optional[Job]:
+        job = self._jobs.get(job_id)
+        if job is None or job.status != QUEUED:
+            return None
+        job.status, job.owner, job.updated_at = RUNNING, owner, time.time()
+        job.attempts += 1
+        return replace(job)
+
+    async def heartbeat(self, job_ids: Iterable[str], owner: str) -> Set[str]:
+        now = time.time()
+        alive = set()
+        for job_id in job_ids:
+            job = self._jobs.get(job_id)
+            if job is not None and job.status == RUNNING and job.owner == owner:
+                job.updated_at = now
+                alive.add(job_id)
+        return alive
+
+    async def release(self, job_ids: Iterable[str], owner: str) -> None:
+        for job_id in job_ids:
+            job = self._jobs.get(job_id)
+            if job is not None and job.status == RUNNING and job.owner == owner:
+                job.status, job.owner = QUEUED, None
+
+    async def recover(self, stale_before: float) -> List[Job]:
+        for job in self._jobs.values():
+            if job.status == RUNNING and job.updated_at < stale_before:
+                job.status, job.owner = QUEUED, None
+        return [replace(job) for job in self._jobs.values() if job.status == QUEUED]
+
+    async def purge_expired(self) -> int:
+        now = time.time()
+        expired = [job_id for job_id, job in self._jobs.items() if _expired(job, now)]
+        for job_id in expired:
+            del self._jobs[job_id]
+        return len(expired)
+
+    def _evict(self) -> None:
+        if len(self._jobs) <= self._max_jobs:
+            return
+        for job_id in [job_id for job_id, job in self._jobs.items() if job.finished]:
+            del self._jobs[job_id]
+            logger.debug(f"작업 제거 (보관 한도 초과): {job_id}")
+            if len(self._jobs) <= self._max_jobs:
+                break
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+
+class SQLiteJobStore(JobStore):
+    """
+    SQLite 기반 영구 작업 저장소
+
+    프로세스가 재시작되어도 작업이 남아 있어 완료되지 않은 작업을 다시 실행할 수 있고,
+    같은 파일을 쓰는 여러 워커 프로세스가 claim으로 작업을 나눠 가집니다.
+    """
+
+    _COLUMNS = (
+        "id, request, status, result, error, status_code, owner, attempts, "
+        "created_at, updated_at, finished_at, expires_at"
+    )
+
+    def __init__(self, path: str = "jobs.db"):
+        """
+        Args:
+            path: SQLite 데이터베이스 파일 경로
+        """
+        self._path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA busy_timeout=5000")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    request TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    result TEXT,
+                    error TEXT,
+                    status_code INTEGER,
+                    owner TEXT,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    finished_at REAL,
+                    expires_at REAL
+                )
+                """
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, created_at)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_expires_at ON jobs (expires_at)")
+            self._conn.commit()
+
+    @staticmethod
+    def _row(job: Job) -> tuple:
+        return (
+            job.id, job.request, job.status, job.result, job.error, job.status_code, job.owner, job.attempts,
+            job.created_at, job.updated_at, job.finished_at, job.expires_at
+        )
+
+    def _create_sync(self, job: Job) -> None:
+        with self._lock:
+            self._conn.execute(
+                f"INSERT INTO jobs ({self._COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", self._row(job)
+            )
+            self._conn.commit()
+
+    def _get_sync(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            row = self._conn.execute(f"SELECT {self._COLUMNS} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = Job(*row)
+        return None if _expired(job, time.time()) else job
+
+    def _finish_sync(self, job: Job, owner: str) -> bool:
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, status_code = ?, "
+                "updated_at = ?, finished_at = ?, expires_at = ? WHERE id = ? AND status = ? AND owner = ?",
+                (
+                    job.status, job.result, job.error, job.status_code,
+                    job.updated_at, job.finished_at, job.expires_at, job.id, RUNNING, owner
+                )
+            )
+            self._conn.commit()
+        return cursor.rowcount > 0
+
+    def _cancel_sync(self, job_id: str, expires_at: float) -> Optional[Job]:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, updated_at = ?, finished_at = ?, expires_at = ? "
+                "WHERE id = ? AND status IN (?, ?)",
+                (CANCELLED, now, now, expires_at, job_id, QUEUED, RUNNING)
+            )
+            self._conn.commit()
+        return self._get_sync(job_id)
+
+    def _claim_sync(self, job_id: str, owner: str) -> Optional[Job]:
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = ?, owner = ?, attempts = attempts + 1, updated_at = ? "
+                "WHERE id = ? AND status = ?",
+                (RUNNING, owner, time.time(), job_id, QUEUED)
+            )
+            self._conn.commit()
+            if cursor.rowcount == 0:
+                return None
+            row = self._conn.execute(f"SELECT {self._COLUMNS} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return Job(*row)
+
+    def _heartbeat_sync(self, job_ids: List[str], owner: str) -> Set[str]:
+        if not job_ids:
+            return set()
+        placeholders = ", ".join("?" * len(job_ids))
+        with self._lock:
+            self._conn.execute(
+                f"UPDATE jobs SET updated_at = ? WHERE owner = ? AND status = ? AND id IN ({placeholders})",
+                (time.time(), owner, RUNNING, *job_ids)
+            )
+            rows = self._conn.execute(
+                f"SELECT id FROM jobs WHERE owner = ? AND status = ? AND id IN ({placeholders})",
+                (owner, RUNNING, *job_ids)
+            ).fetchall()
+            self._conn.commit()
+        return {row[0] for row in rows}
+
+    def _release_sync(self, job_ids: List[str], owner: str) -> None:
+        if not job_ids:
+            return
+        placeholders = ", ".join("?" * len(job_ids))
+        with self._lock:
+            self._conn.execute(
+                f"UPDATE jobs SET status = ?, owner = NULL WHERE owner = ? AND status = ? AND id IN ({placeholders})",
+                (QUEUED, owner, RUNNING, *job_ids)
+            )
+            self._conn.commit()
+
+    def _recover_sync(self, stale_before: float) -> List[Job]:
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = ?, owner = NULL WHERE status = ? AND updated_at < ?",
+                (QUEUED, RUNNING, stale_before)
+            )
+            if cursor.rowcount:
+                logger.info(f"중단된 작업 {cursor.rowcount}개를 다시 대기열로")
+            rows = self._conn.execute(
+                f"SELECT {self._COLUMNS} FROM jobs WHERE status = ? ORDER BY created_at", (QUEUED,)
+            ).fetchall()
+            self._conn.commit()
+        return [Job(*row) for row in rows]
+
+    def _purge_expired_sync(self) -> int:
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM jobs WHERE expires_at IS NOT NULL AND expires_at <= ?", (time.time(),)
+            )
+            self._conn.commit()
+        return cursor.rowcount
+
+    async def create(self, job: Job) -> None:
+        await asyncio.to_thread(self._create_sync, job)
+
+    async def get(self, job_id: str) -> Optional[Job]:
+        return await asyncio.to_thread(self._get_sync, job_id)
+
+    async def finish(self, job: Job, owner: str) -> bool:
+        return await asyncio.to_thread(self._finish_sync, job, owner)
+
+    async def cancel(self, job_id: str, expires_at: float) -> Optional[Job]:
+        return await asyncio.to_thread(self._cancel_sync, job_id, expires_at)
+
+    async def claim(self, job_id: str, owner: str) -> Optional[Job]:
+        return await asyncio.to_thread(self._claim_sync, job_id, owner)
+
+    async def heartbeat(self, job_ids: Iterable[str], owner: str) -> Set[str]:
+        return await asyncio.to_thread(self._heartbeat_sync, list(job_ids), owner)
+
+    async def release(self, job_ids: Iterable[str], owner: str) -> None:
+        await asyncio.to_thread(self._release_sync, list(job_ids), owner)
+
+    async def recover(self, stale_before: float) -> List[Job]:
+        return await asyncio.to_thread(self._recover_sync, stale_before)
+
+    async def purge_expired(self) -> int:
+        return await asyncio.to_thread(self._purge_expired_sync)
+
+    async def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def _expired(job: Job, now: float) -> bool:
+    return job.expires_at is not None and job.expires_at <= now
@@ -0,0 +1,317 @@
+"""
+Response Cache
+동일한 요청에 대한 에이전트 응답 캐시 (TTL + LRU)
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from ...agents import ChatMessage
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_prompt(text: str) -> str:
+    """
+    캐시 키용 프롬프트 정규화
+
+    유니코드 정규화(NFKC), 대소문자 통일, 연속 공백 축약 후 앞뒤 공백을 제거합니다.
+    """
+    text = unicodedata.normalize("NFKC", text).casefold()
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def build_cache_key(
+    model: Optional[str],
+    temperature: Optional[float],
+    max_tokens: Optional[int],
+    message: str,
+    history: Optional[List[ChatMessage]] = None,
+    normalize: bool = False,
+    prefix: str = ""
+) -> str:
+    """
+    요청 내용으로 캐시 키 생성
+
+    Args:
+        model: 모델명
+        temperature: 모델 온도
+        max_tokens: 최대 토큰 수
+        message: 사용자 메시지
+        history: 이전 채팅 기록 (system 메시지 위치까지 LLM에 보내는 순서 그대로 반영)
+        normalize: True면 정규화된 프롬프트로 키 생성
+        prefix: 에이전트 고정 prefix(시스템 프롬프트, 지침) 식별자 (PromptAssembler.prefix_hash)
+
+    Returns:
+        SHA-256 해시 문자열
+    """
+    prepare = normalize_prompt if normalize else (lambda text: text)
+    history = history or []
+
+    payload = {
+        "model": model,
+        "temperature": temperature,
+        "max_tokens": max_tokens,
+        "prefix": prefix,
+        "history": [[msg.role, prepare(msg.content)] for msg in history],
+        "message": prepare(message),
+    }
+    encoded = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class CacheBackend(ABC):
+    """응답 캐시 저장소 인터페이스"""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[str]:
+        """
+        캐시 조회
+
+        Args:
+            key: 캐시 키
+
+        Returns:
+            저장된 응답 (없거나 만료되면 None)
+        """
+        pass
+
+    @abstractmethod
+    async def set(self, key: str, value: str, ttl: float) -> None:
+        """
+        캐시 저장
+
+        Args:
+            key: 캐시 키
+            value: 응답 내용
+            ttl: 유효 시간 (초)
+        """
+        pass
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """캐시 비우기"""
+        pass
+
+    @abstractmethod
+    def size(self) -> int:
+        """저장된 항목 수"""
+        pass
+
+    async def close(self) -> None:
+        """저장소 리소스 정리"""
+        pass
+
+
+class InMemoryCacheBackend(CacheBackend):
+    """LRU 방식의 인메모리 캐시"""
+
+    def __init__(self, max_size: int = 1024):
+        """
+        Args:
+            max_size: 최대 항목 수 (초과 시 가장 오래 사용되지 않은 항목 제거)
+        """
+        self._max_size = max_size
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: str, ttl: float) -> None:
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+
+    async def clear(self) -> None:
+        self._entries.clear()
+
+    def size(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """SQLite 기반의 로컬 영구 캐시"""
+
+    def __init__(self, path: str = "response_cache.db", max_size: int = 1024):
+        """
+        Args:
+            path: SQLite 데이터베이스 파일 경로
+            max_size: 최대 항목 수 (초과 시 가장 오래 사용되지 않은 항목 제거)
+        """
+        self._max_size = max_size
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS response_cache (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    expires_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_response_cache_accessed "
+                "ON response_cache (accessed_at)"
+            )
+            self._conn.commit()
+
+    def _get_sync(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM response_cache WHERE key = ?",
+                (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            value, expires_at = row
+            if expires_at <= now:
+                self._conn.execute("DELETE FROM response_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+
+            self._conn.execute(
+                "UPDATE response_cache SET accessed_at = ? WHERE key = ?",
+                (now, key)
+            )
+            self._conn.commit()
+            return value
+
+    def _set_sync(self, key: str, value: str, ttl: float) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO response_cache (key, value, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, value, now + ttl, now)
+            )
+            self._conn.execute("DELETE FROM response_cache WHERE expires_at <= ?", (now,))
+            self._conn.execute(
+                "DELETE FROM response_cache WHERE key IN ("
+                "SELECT key FROM response_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self._max_size,)
+            )
+            self._conn.commit()
+
+    def _clear_sync(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM response_cache")
+            self._conn.commit()
+
+    async def get(self, key: str) -> Optional[str]:
+        return await asyncio.to_thread(self._get_sync, key)
+
+    async def set(self, key: str, value: str, ttl: float) -> None:
+        await asyncio.to_thread(self._set_sync, key, value, ttl)
+
+    async def clear(self) -> None:
+        await asyncio.to_thread(self._clear_sync)
+
+    def size(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM response_cache").fetchone()[0]
+
+    async def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class ResponseCache:
+    """에이전트 응답 캐시"""
+
+    def __init__(self, backend: CacheBackend, ttl: float = 3600, key_mode: str = "exact"):
+        """
+        Args:
+            backend: 캐시 저장소
+            ttl: 캐시 유효 시간 (초)
+            key_mode: 캐시 키 생성 방식 (exact: 원문 그대로, normalized: 정규화된 프롬프트)
+
+        Raises:
+            ValueError: 지원하지 않는 키 생성 방식
+        """
+        if key_mode not in ("exact", "normalized"):
+            raise ValueError(f"지원하지 않는 캐시 키 방식: {key_mode}")
+
+        self._backend = backend
+        self._ttl = ttl
+        self._normalize = key_mode == "normalized"
+        self.hits = 0
+        self.misses = 0
+
+    def make_key(
+        self,
+        model: Optional[str],
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        message: str,
+        history: Optional[List[ChatMessage]] = None,
+        prefix: str = ""
+    ) -> str:
+        """설정된 키 방식으로 캐시 키 생성"""
+        return build_cache_key(
+            model, temperature, max_tokens, message, history, normalize=self._normalize, prefix=prefix
+        )
+
+    async def get(self, key: str) -> Optional[str]:
+        """캐시 조회 (hit/miss 집계)"""
+        try:
+            value = await self._backend.get(key)
+        except Exception as e:
+            logger.warning(f"응답 캐시 조회 실패: {e}")
+            value = None
+
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def set(self, key: str, value: str) -> None:
+        """캐시 저장 (저장소 오류는 요청 실패로 이어지지 않음)"""
+        try:
+            await self._backend.set(key, value, self._ttl)
+        except Exception as e:
+            logger.warning(f"응답 캐시 저장 실패: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 통계"""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "size": self._backend.size(),
+        }
+
+    async def close(self) -> None:
+        """캐시 저장소 정리"""
+        await self._backend.close()
@@ -0,0 +1,327 @@
+"""
+Semantic Cache
+표현만 다른 비슷한 질문에 캐시된 응답을 재사용하는 임베딩 유사도 기반 응답 캐시 (numpy 필요)
+"""
+
+import json
+import logging
+import os
+import re
+import time
+import zlib
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .response_cache import normalize_prompt
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+logger = logging.getLogger(__name__)
+
+_WORD = re.compile(r"\w+")
+
+
+def numpy_available() -> bool:
+    """numpy 설치 여부"""
+    return np is not None
+
+
+class Embedder(ABC):
+    """텍스트 임베딩 인터페이스 (L2 정규화된 float32 벡터 반환)"""
+
+    dim: int
+
+    @abstractmethod
+    async def embed(self, text: str) -> "np.ndarray":
+        """
+        텍스트 임베딩
+
+        Args:
+            text: 정규화된 프롬프트
+
+        Returns:
+            (dim,) 크기의 L2 정규화된 벡터
+        """
+        pass
+
+
+class HashEmbedder(Embedder):
+    """
+    단어와 단어 안의 문자 3-gram을 해시해 고정 차원 벡터로 만드는 로컬 임베더
+
+    모델이나 네트워크 없이 결정적으로 동작하므로 테스트와 오프라인 환경에 적합합니다.
+    의미가 아니라 표면 형태의 유사도를 측정하므로 어미/조사/문장부호/단어 한두 개 정도만 다른 질문을 잡아냅니다.
+    단어 순서를 보지 않아 "100 USD를 EUR로"와 "100 EUR를 USD로"의 유사도가 1.0이므로 운영 환경에서는 쓰지 않습니다.
+    """
+
+    def __init__(self, dim: int = 512):
+        """
+        Args:
+            dim: 벡터 차원
+        """
+        self.dim = dim
+
+    async def embed(self, text: str) -> "np.ndarray":
+        words = _WORD.findall(text)
+        features = list(words)
+        for word in words:
+            # 단어 경계를 포함해 접두/접미 형태가 구분되도록 함
+            padded = f" {word} "
+            features.extend(padded[i:i + 3] for i in range(len(padded) - 2))
+
+        vector = np.zeros(self.dim, dtype=np.float32)
+        if not features:
+            return vector
+
+        hashes = np.fromiter((zlib.crc32(feature.encode("utf-8")) for feature in features), dtype=np.uint32)
+        # 상위 비트로 부호를 정해 해시 충돌이 한쪽으로 쌓이지 않도록 함
+        signs = np.where(hashes & 0x80000000, -1.0, 1.0).astype(np.float32)
+        np.add.at(vector, hashes % self.dim, signs)
+
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+
+class OpenAIEmbedder(Embedder):
+    """OpenAI 임베딩 API 사용"""
+
+    def __init__(self, model: str = "text-embedding-3-small", dim: int = 512):
+        """
+        Args:
+            model: 임베딩 모델명
+            dim: 벡터 차원 (text-embedding-3 계열은 차원 축소 지원)
+        """
+        from langchain_openai import OpenAIEmbeddings
+
+        self.dim = dim
+        self._embeddings = OpenAIEmbeddings(model=model, dimensions=dim)
+
+    async def embed(self, text: str) -> "np.ndarray":
+        vector = np.asarray(await self._embeddings.aembed_query(text), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+
+class VectorIndex:
+    """
+    numpy 행렬 기반 최근접 이웃 인덱스 (네임스페이스, TTL, LRU 제거)
+
+    max_size개 슬롯에 벡터를 보관하고 조회 시 전체 슬롯과 내적(코사인 유사도)을 한 번에 계산합니다.
+    path를 지정하면 벡터는 mmap 파일(.npy)에, 나머지 항목 정보는 옆의 .meta.json에 보관합니다.
+    """
+
+    def __init__(self, dim: int, max_size: int = 10000, path: Optional[str] = None):
+        """
+        Args:
+            dim: 벡터 차원
+            max_size: 최대 항목 수 (초과 시 가장 오래 사용되지 않은 항목 교체)
+            path: 벡터 mmap 파일 경로 (None이면 메모리에만 보관)
+        """
+        self.dim = dim
+        self.max_size = max_size
+        self._path = Path(path) if path else None
+
+        self._namespace_ids: Dict[str, int] = {}
+        self._namespaces = np.full(max_size, -1, dtype=np.int32)  # -1: 빈 슬롯
+        self._expires_at = np.zeros(max_size, dtype=np.float64)
+        self._accessed_at = np.zeros(max_size, dtype=np.float64)
+        self._responses: List[Optional[str]] = [None] * max_size
+
+        if self._path is None:
+            self._vectors = np.zeros((max_size, dim), dtype=np.float32)
+        else:
+            self._vectors = self._open_vectors(self._path)
+            self._load_meta()
+
+    def _open_vectors(self, path: Path) -> "np.ndarray":
+        """벡터 mmap 파일 열기 (형태가 다르면 새로 생성)"""
+        if path.exists():
+            vectors = np.load(path, mmap_mode="r+")
+            if vectors.shape == (self.max_size, self.dim) and vectors.dtype == np.float32:
+                return vectors
+            logger.warning(f"의미 캐시 파일 형태가 설정과 달라 새로 만듭니다: {path} {vectors.shape}")
+            del vectors
+            # 새 파일과 맞지 않는 항목 정보도 함께 버림
+            self._meta_path.unlink(missing_ok=True)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return np.lib.format.open_memmap(path, mode="w+", dtype=np.float32, shape=(self.max_size, self.dim))
+
+    @property
+    def _meta_path(self) -> Path:
+        return self._path.with_name(self._path.name + ".meta.json")
+
+    def _load_meta(self) -> None:
+        """항목 정보 로드 (만료된 항목은 빈 슬롯으로 둠)"""
+        if not self._meta_path.exists():
+            return
+        meta = json.loads(self._meta_path.read_text(encoding="utf-8"))
+        self._namespace_ids = {name: i for i, name in enumerate(meta["namespaces"])}
+        now = time.time()
+        for slot, namespace, expires_at, accessed_at, response in meta["entries"]:
+            if slot < self.max_size and expires_at > now:
+                self._namespaces[slot] = namespace
+                self._expires_at[slot] = expires_at
+                self._accessed_at[slot] = accessed_at
+                self._responses[slot] = response
+        logger.info(f"의미 캐시 로드: {self.size()}개 항목 ({self._path})")
+
+    def save(self) -> None:
+        """mmap 벡터를 디스크에 반영하고 항목 정보 저장 (임시 파일에 쓴 뒤 교체)"""
+        if self._path is None:
+            return
+        self._vectors.flush()
+        slots = np.flatnonzero(self._namespaces >= 0)
+        meta = {
+            "namespaces": list(self._namespace_ids),
+            "entries": [
+                [int(slot), int(self._namespaces[slot]), float(self._expires_at[slot]),
+                 float(self._accessed_at[slot]), self._responses[slot]]
+                for slot in slots
+            ],
+        }
+        tmp_path = self._meta_path.with_name(self._meta_path.name + ".tmp")
+        tmp_path.write_text(json.dumps(meta, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_path, self._meta_path)
+
+    def search(self, namespace: str, vector: "np.ndarray", threshold: float) -> Optional[Tuple[str, float]]:
+        """
+        같은 네임스페이스에서 유사도가 threshold 이상인 가장 가까운 항목 조회
+
+        Args:
+            namespace: 네임스페이스
+            vector: L2 정규화된 조회 벡터
+            threshold: 최소 코사인 유사도
+
+        Returns:
+            (응답, 유사도) 또는 None
+        """
+        namespace_id = self._namespace_ids.get(namespace)
+        if namespace_id is None:
+            return None
+
+        now = time.time()
+        scores = self._vectors @ vector
+        candidates = (self._namespaces == namespace_id) & (self._expires_at > now)
+        scores[~candidates] = -np.inf
+
+        slot = int(np.argmax(scores))
+        score = float(scores[slot])
+        if score < threshold:
+            return None
+
+        self._accessed_at[slot] = now
+        return self._responses[slot], score
+
+    def add(self, namespace: str, vector: "np.ndarray", response: str, ttl: float) -> None:
+        """
+        항목 추가 (빈 슬롯 또는 만료된 슬롯이 없으면 가장 오래 사용되지 않은 슬롯 교체)
+
+        Args:
+            namespace: 네임스페이스
+            vector: L2 정규화된 벡터
+            response: 캐시할 응답
+            ttl: 유효 시간 (초)
+        """
+        now = time.time()
+        namespace_id = self._namespace_ids.setdefault(namespace, len(self._namespace_ids))
+
+        free = np.flatnonzero((self._namespaces < 0) | (self._expires_at <= now))
+        slot = int(free[0]) if len(free) else int(np.argmin(self._accessed_at))
+
+        self._vectors[slot] = vector
+        self._namespaces[slot] = namespace_id
+        self._expires_at[slot] = now + ttl
+        self._accessed_at[slot] = now
+        self._responses[slot] = response
+
+    def clear(self) -> None:
+        """모든 항목 제거"""
+        self._namespaces[:] = -1
+        self._responses = [None] * self.max_size
+
+    def size(self) -> int:
+        """유효한 항목 수"""
+        return int(np.count_nonzero((self._namespaces >= 0) & (self._expires_at > time.time())))
+
+
+class SemanticCache:
+    """
+    임베딩 유사도 기반 응답 캐시
+
+    프롬프트를 정규화해 임베딩한 뒤 같은 네임스페이스(에이전트, 모델, 파라미터 조합)에서
+    유사도가 threshold 이상인 이전 요청의 응답을 반환합니다.
+    대화 맥락에 따라 답이 달라지므로 대화 기록이 없는 단일 턴 요청에만 사용해야 합니다.
+    """
+
+    def __init__(self, embedder: Embedder, index: VectorIndex, threshold: float = 0.9, ttl: float = 3600):
+        """
+        Args:
+            embedder: 프롬프트 임베더
+            index: 벡터 인덱스 (embedder와 같은 차원)
+            threshold: 캐시 적중으로 볼 최소 코사인 유사도
+            ttl: 캐시 유효 시간 (초)
+
+        Raises:
+            ValueError: 임베더와 인덱스의 차원이 다름
+        """
+        if embedder.dim != index.dim:
+            raise ValueError(f"임베더 차원({embedder.dim})과 인덱스 차원({index.dim})이 다릅니다.")
+
+        self._embedder = embedder
+        self._index = index
+        self._threshold = threshold
+        self._ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    async def embed(self, message: str) -> Optional["np.ndarray"]:
+        """조회/저장에 공통으로 쓰는 프롬프트 벡터 (임베딩 실패 시 None)"""
+        try:
+            return await self._embedder.embed(normalize_prompt(message))
+        except Exception as e:
+            logger.warning(f"의미 캐시 임베딩 실패: {e}")
+            return None
+
+    def get(self, namespace: str, vector: Optional["np.ndarray"]) -> Optional[str]:
+        """
+        유사한 이전 요청의 응답 조회 (hit/miss 집계)
+
+        Args:
+            namespace: 네임스페이스
+            vector: embed()로 만든 프롬프트 벡터
+
+        Returns:
+            캐시된 응답 (없으면 None)
+        """
+        result = self._index.search(namespace, vector, self._threshold) if vector is not None else None
+        if result is None:
+            self.misses += 1
+            return None
+
+        response, score = result
+        self.hits += 1
+        logger.debug(f"의미 캐시 적중: {namespace} (유사도 {score:.3f})")
+        return response
+
+    def set(self, namespace: str, vector: Optional["np.ndarray"], response: str) -> None:
+        """응답 저장 (임베딩에 실패한 요청은 저장하지 않음)"""
+        if vector is not None:
+            self._index.add(namespace, vector, response, self._ttl)
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 통계"""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "size": self._index.size(),
+        }
+
+    def close(self) -> None:
+        """인덱스 저장 (mmap 파일 사용 시)"""
+        self._index.save()
@@ -0,0 +1,172 @@
+"""
+Single Flight
+동일한 요청이 동시에 들어오면 하나의 업스트림 호출을 공유 (request coalescing)
+"""
+
+import asyncio
+import logging
+from contextlib import aclosing
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class StreamBroadcast:
+    """하나의 업스트림 스트림을 여러 구독자에게 전달"""
+
+    def __init__(self, source: AsyncIterator[str]):
+        """
+        Args:
+            source: 업스트림 청크 스트림 (생성 즉시 백그라운드에서 소비 시작)
+        """
+        self._chunks: List[str] = []
+        self._done = False
+        self._cancelled = False
+        self._subscribers = 0
+        self._error: Optional[BaseException] = None
+        self._changed = asyncio.Condition()
+        self._task = asyncio.create_task(self._pump(source))
+
+    @property
+    def done(self) -> bool:
+        """업스트림 스트림 종료 여부 (취소 중인 스트림 포함, 새 구독자가 합류하지 않도록)"""
+        return self._done or self._cancelled
+
+    def add_done_callback(self, callback: Callable[[], Any]) -> None:
+        """업스트림 스트림 종료 시 호출할 콜백 등록"""
+        self._task.add_done_callback(lambda _: callback())
+
+    async def _pump(self, source: AsyncIterator[str]) -> None:
+        """업스트림 청크를 버퍼에 쌓고 구독자에게 알림"""
+        try:
+            async for chunk in source:
+                async with self._changed:
+                    self._chunks.append(chunk)
+                    self._changed.notify_all()
+        except BaseException as e:
+            self._error = e
+        finally:
+            async with self._changed:
+                self._done = True
+                self._changed.notify_all()
+
+    async def subscribe(self) -> AsyncIterator[str]:
+        """
+        처음부터 스트림 구독 (늦게 합류한 구독자도 놓친 청크를 먼저 받음)
+
+        Yields:
+            응답 청크들
+
+        Raises:
+            업스트림 스트림에서 발생한 예외
+        """
+        index = 0
+        self._subscribers += 1
+        try:
+            while True:
+                async with self._changed:
+                    while index >= len(self._chunks) and not self._done:
+                        await self._changed.wait()
+                    pending = self._chunks[index:]
+                    finished = self._done
+
+                for chunk in pending:
+                    yield chunk
+                index += len(pending)
+
+                if finished and index >= len(self._chunks):
+                    if self._error is not None:
+                        raise self._error
+                    return
+        finally:
+            # 마지막 구독자가 떠나면 아무도 받지 않는 업스트림 스트림 취소
+            self._subscribers -= 1
+            if self._subscribers == 0 and not self._done:
+                self._cancelled = True
+                self._task.cancel()
+
+
+class SingleFlight:
+    """키별로 진행 중인 업스트림 호출을 공유하는 coalescing 레이어"""
+
+    def __init__(self):
+        self._calls: Dict[str, "asyncio.Task[Any]"] = {}
+        self._waiters: Dict["asyncio.Task[Any]", int] = {}
+        self._streams: Dict[str, StreamBroadcast] = {}
+        self.upstream_calls = 0
+        self.saved_calls = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        같은 키의 호출이 진행 중이면 그 결과를 공유하고, 없으면 새로 실행
+
+        Args:
+            key: 요청 키
+            fn: 업스트림 호출 함수
+
+        Returns:
+            업스트림 호출 결과
+        """
+        task = self._calls.get(key)
+        if task is not None:
+            self.saved_calls += 1
+        else:
+            self.upstream_calls += 1
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda _: self._forget(self._calls, key, task))
+
+        # 한 요청이 취소되어도 공유 중인 다른 요청에는 영향을 주지 않도록 shield하고,
+        # 기다리는 요청이 모두 취소되면 업스트림 호출도 취소
+        self._waiters[task] = self._waiters.get(task, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        finally:
+            self._waiters[task] -= 1
+            if self._waiters[task] == 0:
+                del self._waiters[task]
+                if not task.done():
+                    self._forget(self._calls, key, task)
+                    task.cancel()
+                    # 취소된 업스트림 호출의 정리(permit 반환 등)가 끝날 때까지 대기
+                    await asyncio.gather(task, return_exceptions=True)
+
+    async def stream(self, key: str, fn: Callable[[], AsyncIterator[str]]) -> AsyncIterator[str]:
+        """
+        같은 키의 스트림이 진행 중이면 합류하고, 없으면 새 스트림 시작
+
+        Args:
+            key: 요청 키
+            fn: 업스트림 스트림 생성 함수
+
+        Yields:
+            응답 청크들
+        """
+        broadcast = self._streams.get(key)
+        if broadcast is not None and not broadcast.done:
+            self.saved_calls += 1
+        else:
+            self.upstream_calls += 1
+            broadcast = StreamBroadcast(fn())
+            self._streams[key] = broadcast
+            broadcast.add_done_callback(lambda: self._forget(self._streams, key, broadcast))
+
+        async with aclosing(broadcast.subscribe()) as chunks:
+            async for chunk in chunks:
+                yield chunk
+
+    @staticmethod
+    def _forget(registry: Dict[str, Any], key: str, value: Any) -> None:
+        """완료된 호출을 레지스트리에서 제거 (같은 키로 새로 시작된 호출은 유지)"""
+        if registry.get(key) is value:
+            del registry[key]
+
+    def stats(self) -> Dict[str, int]:
+        """coalescing 통계"""
+        return {
+            "in_flight": len(self._calls) + len(self._streams),
+            "upstream_calls": self.upstream_calls,
+            "saved_calls": self.saved_calls,
+        }
@@ -0,0 +1,259 @@
+"""
+Stream Registry
+스트리밍 생성을 HTTP 연결과 분리해 끊어진 클라이언트가 Last-Event-ID로 이어받을 수 있게 하는 레지스트리
+"""
+
+import asyncio
+import logging
+import uuid
+from collections import OrderedDict, deque
+from itertools import islice
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Optional
+
+from .concurrency import OverloadedError
+
+logger = logging.getLogger(__name__)
+
+
+class StreamNotFoundError(Exception):
+    """존재하지 않거나 보관 기간이 지난 스트림"""
+
+
+class StreamExpiredError(Exception):
+    """요청한 위치의 조각이 이미 버퍼에서 밀려났거나 업스트림이 취소되어 이어받을 수 없음"""
+
+
+class ResumableStream:
+    """
+    백그라운드에서 업스트림을 소비하며 최근 조각을 링 버퍼에 보관하는 스트림
+
+    조각 순번은 1부터 시작하며 SSE 이벤트 id와 같습니다.
+    구독자가 하나도 없는 상태가 grace_period 동안 이어지면 업스트림을 취소합니다.
+    """
+
+    def __init__(self, stream_id: str, source: AsyncIterator[str], buffer_size: int, grace_period: float):
+        """
+        Args:
+            stream_id: 스트림 ID
+            source: 업스트림 조각 스트림 (생성 즉시 백그라운드에서 소비 시작)
+            buffer_size: 링 버퍼에 보관할 최대 조각 수
+            grace_period: 구독자가 없을 때 업스트림을 취소하기까지의 유예 시간 (초)
+        """
+        self.id = stream_id
+        self._buffer: Deque[str] = deque(maxlen=buffer_size)
+        self._last_id = 0
+        self._done = False
+        self._cancelled = False
+        self._error: Optional[Exception] = None
+        self._changed = asyncio.Event()
+        self._subscribers = 0
+        self._grace_period = grace_period
+        self._grace_timer: Optional[asyncio.TimerHandle] = None
+        self._task = asyncio.create_task(self._pump(source))
+        # 첫 구독자가 붙기 전에 클라이언트가 끊어진 경우도 유예 시간 후 취소
+        self._schedule_cancel()
+
+    @property
+    def done(self) -> bool:
+        """업스트림 스트림 종료 여부"""
+        return self._done
+
+    @property
+    def last_id(self) -> int:
+        """지금까지 생성된 마지막 조각 순번"""
+        return self._last_id
+
+    @property
+    def first_id(self) -> int:
+        """버퍼에 남아 있는 가장 오래된 조각 순번"""
+        return self._last_id - len(self._buffer) + 1
+
+    @property
+    def subscribers(self) -> int:
+        """현재 연결된 구독자 수"""
+        return self._subscribers
+
+    def add_done_callback(self, callback: Callable[[], Any]) -> None:
+        """업스트림 스트림 종료 시 호출할 콜백 등록"""
+        self._task.add_done_callback(lambda _: callback())
+
+    def cancel(self) -> None:
+        """업스트림 취소"""
+        self._task.cancel()
+
+    async def _pump(self, source: AsyncIterator[str]) -> None:
+        """업스트림 조각을 링 버퍼에 쌓고 구독자를 깨움"""
+        try:
+            async for chunk in source:
+                if not chunk:
+                    continue
+                self._buffer.append(chunk)
+                self._last_id += 1
+                self._notify()
+        except asyncio.CancelledError:
+            logger.info(f"스트림 취소: {self.id} ({self._last_id}개 조각 생성)")
+            self._cancelled = True
+        except Exception as e:
+            self._error = e
+        finally:
+            self._done = True
+            self._notify()
+            if self._grace_timer is not None:
+                self._grace_timer.cancel()
+                self._grace_timer = None
+
+    def _notify(self) -> None:
+        # 대기 중인 구독자는 이전 이벤트를 기다리므로 새 이벤트로 교체 (조각마다 락을 잡지 않음)
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    def _schedule_cancel(self) -> None:
+        if self._done or self._grace_timer is not None:
+            return
+        self._grace_timer = asyncio.get_running_loop().call_later(self._grace_period, self._abandon)
+
+    def _abandon(self) -> None:
+        self._grace_timer = None
+        if self._subscribers == 0 and not self._done:
+            logger.info(f"구독자가 없어 스트림 업스트림 취소: {self.id}")
+            self.cancel()
+
+    def check(self, after: int) -> None:
+        """
+        after 다음 조각부터 재생 가능한지 확인
+
+        Raises:
+            StreamExpiredError: 요청한 조각이 이미 버퍼에서 밀려났거나 업스트림이 취소됨
+        """
+        if self._cancelled:
+            raise StreamExpiredError(f"스트림 {self.id}는 취소되어 이어받을 수 없습니다.")
+        if after + 1 < self.first_id:
+            raise StreamExpiredError(
+                f"스트림 {self.id}의 {after + 1}번 조각은 더 이상 보관되어 있지 않습니다. (보관 범위: {self.first_id}~)"
+            )
+
+    async def subscribe(self, after: int = 0) -> AsyncIterator[str]:
+        """
+        after 다음 조각부터 재생한 뒤 실시간 조각을 이어서 전달
+
+        Args:
+            after: 이미 받은 마지막 조각 순번 (Last-Event-ID, 처음부터면 0)
+
+        Yields:
+            응답 조각들
+
+        Raises:
+            StreamExpiredError: 재생 중 필요한 조각이 버퍼에서 밀려났거나 업스트림이 취소됨
+            업스트림 스트림에서 발생한 예외
+        """
+        self._subscribers += 1
+        if self._grace_timer is not None:
+            self._grace_timer.cancel()
+            self._grace_timer = None
+        try:
+            position = after
+            while True:
+                if position < self._last_id:
+                    self.check(position)
+                    pending = list(islice(self._buffer, position + 1 - self.first_id, None))
+                    position = self._last_id
+                    for chunk in pending:
+                        yield chunk
+                    continue
+                if self._done:
+                    self.check(position)
+                    if self._error is not None:
+                        raise self._error
+                    return
+                await self._changed.wait()
+        finally:
+            self._subscribers -= 1
+            if self._subscribers == 0:
+                self._schedule_cancel()
+
+
+class StreamRegistry:
+    """진행 중이거나 최근 종료된 스트림 보관소 (종료 후 TTL 동안 이어받기 가능)"""
+
+    def __init__(
+        self,
+        buffer_size: int = 1024,
+        ttl: float = 60.0,
+        grace_period: float = 10.0,
+        max_streams: int = 1000,
+        retry_after: int = 5
+    ):
+        """
+        Args:
+            buffer_size: 스트림별 링 버퍼 크기 (조각 수)
+            ttl: 스트림 종료 후 보관 시간 (초)
+            grace_period: 구독자가 없을 때 업스트림을 취소하기까지의 유예 시간 (초)
+            max_streams: 최대 보관 스트림 수 (초과 시 오래된 종료 스트림부터 제거하고, 모두 진행 중이면 새 스트림 거절)
+            retry_after: 새 스트림을 거절할 때 권장 재시도 대기 시간 (초)
+        """
+        self._streams: "OrderedDict[str, ResumableStream]" = OrderedDict()
+        self._buffer_size = buffer_size
+        self._ttl = ttl
+        self._grace_period = grace_period
+        self._max_streams = max_streams
+        self._retry_after = retry_after
+
+    def start(self, source: AsyncIterator[str]) -> ResumableStream:
+        """
+        업스트림 스트림을 백그라운드에서 시작하고 등록
+
+        Args:
+            source: 업스트림 조각 스트림
+
+        Returns:
+            등록된 스트림
+
+        Raises:
+            OverloadedError: 진행 중인 스트림만으로 최대 보관 수에 도달 (503)
+        """
+        self._evict()
+        if len(self._streams) >= self._max_streams:
+            raise OverloadedError(
+                f"진행 중인 스트림이 너무 많습니다. ({self._max_streams}개)", retry_after=self._retry_after
+            )
+        stream = ResumableStream(uuid.uuid4().hex, source, self._buffer_size, self._grace_period)
+        self._streams[stream.id] = stream
+        stream.add_done_callback(lambda: self._expire_later(stream))
+        return stream
+
+    def get(self, stream_id: str) -> ResumableStream:
+        """
+        스트림 조회
+
+        Raises:
+            StreamNotFoundError: 존재하지 않거나 보관 기간이 지난 스트림
+        """
+        stream = self._streams.get(stream_id)
+        if stream is None:
+            raise StreamNotFoundError(f"스트림을 찾을 수 없습니다: {stream_id}")
+        return stream
+
+    def _expire_later(self, stream: ResumableStream) -> None:
+        asyncio.get_running_loop().call_later(self._ttl, self._forget, stream)
+
+    def _forget(self, stream: ResumableStream) -> None:
+        if self._streams.get(stream.id) is stream:
+            del self._streams[stream.id]
+
+    def _evict(self) -> None:
+        """최대 보관 수를 넘으면 오래된 종료 스트림부터 제거 (진행 중인 스트림은 유지)"""
+        if len(self._streams) < self._max_streams:
+            return
+        for stream_id in [stream_id for stream_id, stream in self._streams.items() if stream.done]:
+            del self._streams[stream_id]
+            if len(self._streams) < self._max_streams:
+                return
+
+    def stats(self) -> Dict[str, int]:
+        """스트림 보관 통계"""
+        active = sum(1 for stream in self._streams.values() if not stream.done)
+        return {
+            "streams": len(self._streams),
+            "active": active,
+            "attached": sum(stream.subscribers for stream in self._streams.values()),
+        }
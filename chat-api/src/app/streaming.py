@@ -0,0 +1,202 @@
+"""
+SSE 스트리밍 인코더
+토큰 조각을 Server-Sent Events 프레임으로 변환 (프레임 접두/접미사 미리 계산, 조각 coalescing, id, heartbeat)
+"""
+
+import asyncio
+from contextlib import aclosing
+from typing import AsyncGenerator, AsyncIterable, List, Optional
+
+import msgspec
+
+# 프레임 본문은 StreamChunk({"content": ..., "is_final": ...})와 같은 JSON
+_CONTENT_PREFIX = b'data: {"content":'
+_PARTIAL_SUFFIX = b',"is_final":false}\n\n'
+_FINAL_SUFFIX = b',"is_final":true}\n\n'
+
+# "id: N\ndata: {"content":" 접두사 (정수 포매팅 비용이 프레임 인코딩보다 커서 미리 계산)
+_ID_PREFIXES = [b'id: %d\n' % event_id + _CONTENT_PREFIX for event_id in range(2048)]
+
+# 주석 프레임 (클라이언트는 무시, 프록시의 유휴 연결 종료 방지)
+HEARTBEAT = b": keep-alive\n\n"
+
+# JSON 문자열 이스케이프는 msgspec 인코더(C 구현)에 맡김
+_encode_str = msgspec.json.Encoder().encode
+
+
+def _prefix(event_id: Optional[int]) -> bytes:
+    if event_id is None:
+        return _CONTENT_PREFIX
+    if event_id < len(_ID_PREFIXES):
+        return _ID_PREFIXES[event_id]
+    return b'id: %d\n' % event_id + _CONTENT_PREFIX
+
+
+class SSEEncoder:
+    """
+    토큰 스트림을 SSE 프레임으로 변환하는 인코더
+
+    프로세스 단위로 하나를 만들어 공유하며, 스트림별 상태(이벤트 id, 버퍼)는 stream() 안에만 둡니다.
+
+    coalescing:
+        - coalesce_interval > 0: 첫 조각이 버퍼에 들어온 뒤 최대 coalesce_interval초 동안 모아 한 프레임으로 전송
+        - coalesce_interval == 0: 기다리지 않고 이전 프레임 전송 중에 도착한 조각만 합쳐 전송
+        - coalesce_chars > 0: 버퍼가 이 문자 수 이상이면 즉시 전송
+    """
+
+    def __init__(
+        self,
+        coalesce_interval: float = 0.0,
+        coalesce_chars: int = 0,
+        heartbeat_interval: float = 0.0,
+        event_ids: bool = True
+    ):
+        """
+        Args:
+            coalesce_interval: 조각을 모으는 최대 시간 (초, 0이면 대기하지 않음)
+            coalesce_chars: 즉시 전송할 버퍼 크기 (문자 수, 0이면 제한 없음)
+            heartbeat_interval: 전송할 프레임이 없을 때 heartbeat 간격 (초, 0이면 비활성)
+            event_ids: 프레임마다 "id:" 필드 추가 (프레임에 담긴 마지막 조각의 순번, 첫 조각이 1)
+        """
+        self.coalesce_interval = coalesce_interval
+        self.coalesce_chars = coalesce_chars
+        self.heartbeat_interval = heartbeat_interval
+        self.event_ids = event_ids
+
+    @property
+    def buffered(self) -> bool:
+        """조각을 버퍼링하거나 heartbeat를 보내는지 여부 (아니면 조각마다 바로 프레임 전송)"""
+        return self.coalesce_interval > 0 or self.coalesce_chars > 0 or self.heartbeat_interval > 0
+
+    @staticmethod
+    def frame(content: str, is_final: bool = False, event_id: Optional[int] = None) -> bytes:
+        """
+        단일 SSE 프레임 생성
+
+        Args:
+            content: 응답 내용 조각
+            is_final: 마지막 프레임 여부
+            event_id: "id:" 필드 값 (None이면 생략)
+
+        Returns:
+            "id: N\\ndata: {...}\\n\\n" 형식의 바이트
+        """
+        return _prefix(event_id) + _encode_str(content) + (_FINAL_SUFFIX if is_final else _PARTIAL_SUFFIX)
+
+    async def stream(self, chunks: AsyncIterable[str], start_id: int = 0) -> AsyncGenerator[bytes, None]:
+        """
+        토큰 조각 스트림을 SSE 프레임 스트림으로 변환 (마지막에 is_final 프레임 포함)
+
+        Args:
+            chunks: 응답 내용 조각 스트림 (빈 조각은 무시)
+            start_id: 이미 전달된 마지막 조각의 순번 (이어받기 시 Last-Event-ID, 다음 조각이 start_id + 1)
+
+        Yields:
+            SSE 프레임 바이트
+
+        Raises:
+            Exception: 업스트림 오류 (버퍼에 남은 조각을 먼저 전송한 뒤 그대로 전달)
+        """
+        if not self.buffered:
+            event_id = start_id
+            async for chunk in chunks:
+                if chunk:
+                    event_id += 1
+                    yield self.frame(chunk, event_id=event_id if self.event_ids else None)
+            yield self.frame("", is_final=True, event_id=event_id + 1 if self.event_ids else None)
+            return
+
+        # 중간에 닫히면 내부 제너레이터도 바로 닫아 업스트림을 중단
+        async with aclosing(self._stream_buffered(chunks, start_id)) as frames:
+            async for frame in frames:
+                yield frame
+
+    async def _stream_buffered(self, chunks: AsyncIterable[str], start_id: int) -> AsyncGenerator[bytes, None]:
+        """
+        coalescing/heartbeat 경로
+
+        업스트림은 별도 태스크가 읽어 버퍼에 쌓고, 전송할 때가 되었을 때(크기 도달, coalescing 타이머,
+        heartbeat, 종료)만 이벤트로 이 제너레이터를 깨웁니다. 조각마다가 아니라 프레임마다 깨어나므로
+        한 프레임에 합쳐지는 조각이 많을수록 CPU를 아낍니다.
+        """
+        loop = asyncio.get_running_loop()
+        wakeup = asyncio.Event()
+        buffer: List[str] = []
+        buffered_chars = 0
+        flush_timer: Optional[asyncio.TimerHandle] = None
+        heartbeat_timer: Optional[asyncio.TimerHandle] = None
+        heartbeat_due = False
+        last_sent = loop.time()
+        done = False
+        error: Optional[Exception] = None
+
+        async def pump() -> None:
+            nonlocal buffered_chars, flush_timer, done, error
+            try:
+                async for chunk in chunks:
+                    if not chunk:
+                        continue
+                    buffer.append(chunk)
+                    buffered_chars += len(chunk)
+                    if self.coalesce_chars > 0 and buffered_chars >= self.coalesce_chars:
+                        wakeup.set()
+                    elif len(buffer) == 1:
+                        if self.coalesce_interval > 0:
+                            flush_timer = loop.call_later(self.coalesce_interval, wakeup.set)
+                        else:
+                            wakeup.set()
+            except Exception as e:
+                error = e
+            finally:
+                done = True
+                wakeup.set()
+
+        def check_heartbeat() -> None:
+            # 프레임마다 타이머를 다시 걸지 않고, 마지막 전송 시각을 보고 다음 확인 시각을 정함
+            nonlocal heartbeat_timer, heartbeat_due
+            now = loop.time()
+            due_at = last_sent + self.heartbeat_interval
+            if now >= due_at:
+                heartbeat_due = True
+                wakeup.set()
+                due_at = now + self.heartbeat_interval
+            heartbeat_timer = loop.call_at(due_at, check_heartbeat)
+
+        producer = asyncio.create_task(pump())
+        if self.heartbeat_interval > 0:
+            heartbeat_timer = loop.call_later(self.heartbeat_interval, check_heartbeat)
+        event_id = start_id
+        try:
+            while True:
+                await wakeup.wait()
+                wakeup.clear()
+
+                if buffer:
+                    if flush_timer is not None:
+                        flush_timer.cancel()
+                        flush_timer = None
+                    event_id += len(buffer)
+                    content = buffer[0] if len(buffer) == 1 else "".join(buffer)
+                    buffer.clear()
+                    buffered_chars = 0
+                    heartbeat_due = False
+                    last_sent = loop.time()
+                    yield self.frame(content, event_id=event_id if self.event_ids else None)
+                elif heartbeat_due and not done:
+                    heartbeat_due = False
+                    last_sent = loop.time()
+                    yield HEARTBEAT
+
+                if done and not buffer:
+                    break
+
+            if error is not None:
+                raise error
+            yield self.frame("", is_final=True, event_id=event_id + 1 if self.event_ids else None)
+        finally:
+            # 클라이언트 연결 종료 등으로 중간에 닫히면 업스트림도 중단
+            producer.cancel()
+            for timer in (flush_timer, heartbeat_timer):
+                if timer is not None:
+                    timer.cancel()
+            await asyncio.gather(producer, return_exceptions=True)
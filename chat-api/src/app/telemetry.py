@@ -0,0 +1,229 @@
+"""
+Telemetry
+요청/오류/토큰/캐시 카운터, 지연 시간/TTFT 히스토그램, 업스트림 스케줄러/헤지/작업 대기열 메트릭과 단계별 span 수집 설정
+"""
+
+import logging
+import time
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Optional, Tuple
+
+from litestar import Request
+from litestar.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..agents import tracing
+from ..agents.hedging import HedgingExecutor
+from ..agents.scheduler import UpstreamScheduler
+from .metrics import REGISTRY
+
+if TYPE_CHECKING:
+    # chat_service가 이 모듈을 가져오므로 타입 힌트용으로만 참조
+    from .services.job_manager import JobManager
+
+logger = logging.getLogger(__name__)
+
+# 단계별 지연 시간은 대부분 ms 단위이므로 더 촘촘한 버킷 사용
+STAGE_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+REQUESTS = REGISTRY.counter("chat_requests_total", "처리한 HTTP 요청 수", ("path", "status"))
+ERRORS = REGISTRY.counter("chat_errors_total", "5xx 응답 또는 처리 중 예외 수", ("path",))
+TOKENS = REGISTRY.counter(
+    "llm_tokens_total", "LLM 토큰 사용량 (cached_input: input 중 업스트림 prompt cache 적중분)", ("model", "direction")
+)
+CACHE_LOOKUPS = REGISTRY.counter("response_cache_lookups_total", "응답 캐시 조회 결과", ("result",))
+SEMANTIC_CACHE_LOOKUPS = REGISTRY.counter(
+    "semantic_cache_lookups_total", "의미 캐시 조회 결과 (bypass: 대화 기록이 있어 미적용)", ("result",)
+)
+CLIENT_DISCONNECTS = REGISTRY.counter(
+    "chat_client_disconnects_total", "응답 완료 전에 클라이언트 연결이 끊어진 요청 수", ("path",)
+)
+UPSTREAM_CANCELLED = REGISTRY.counter("llm_calls_cancelled_total", "완료 전에 취소된 LLM 호출 수", ("mode",))
+REQUEST_LATENCY = REGISTRY.histogram("chat_request_duration_seconds", "요청 전체 처리 시간", labelnames=("path",))
+TTFT = REGISTRY.histogram("chat_time_to_first_token_seconds", "스트리밍 응답의 첫 토큰까지 걸린 시간", labelnames=("path",))
+STAGE_LATENCY = REGISTRY.histogram(
+    "chat_stage_duration_seconds", "요청 처리 단계별 소요 시간", STAGE_BUCKETS, labelnames=("stage",)
+)
+LLM_LATENCY = REGISTRY.histogram(
+    "llm_call_duration_seconds", "LLM 호출 시간 (prompt_cache: 업스트림 prompt cache 적중 여부)",
+    labelnames=("model", "prompt_cache")
+)
+
+_enabled = False
+
+# 현재 단계의 시작 시각 (요청 디코딩 -> 핸들러 -> 응답 직렬화 구간 측정용)
+_stage_started_at: ContextVar[Optional[float]] = ContextVar("stage_started_at", default=None)
+
+
+def _observe_span(name: str, duration: float, attributes: Dict[str, Any]) -> None:
+    """종료된 span을 단계별 히스토그램과 토큰 카운터에 기록"""
+    STAGE_LATENCY.observe(duration, stage=name)
+    if "input_tokens" in attributes:
+        model = attributes.get("model", "unknown")
+        TOKENS.inc(attributes["input_tokens"], model=model, direction="input")
+        TOKENS.inc(attributes.get("output_tokens", 0), model=model, direction="output")
+        cached_tokens = attributes.get("cached_tokens", 0)
+        TOKENS.inc(cached_tokens, model=model, direction="cached_input")
+        LLM_LATENCY.observe(duration, model=model, prompt_cache="hit" if cached_tokens else "miss")
+
+
+def register_scheduler(scheduler: UpstreamScheduler) -> None:
+    """
+    업스트림 스케줄러의 대기열/버킷 상태를 /metrics 게이지로 노출 (출력할 때마다 현재 상태를 읽음)
+
+    register_* 함수는 새 인스턴스가 만들어질 때마다 호출되므로 이전 인스턴스의 게이지를 교체합니다.
+
+    대기 시간은 "upstream_queue" 단계로 chat_stage_duration_seconds에 기록됩니다.
+    """
+    def queue_depth() -> Iterable[Tuple[Dict[str, Any], float]]:
+        for priority, depth in scheduler.queue_depths().items():
+            yield {"priority": priority}, depth
+
+    def bucket(field: str) -> Any:
+        def collect() -> Iterable[Tuple[Dict[str, Any], float]]:
+            for model, limits in scheduler.buckets().items():
+                for limit, state in limits.items():
+                    yield {"model": model, "limit": limit}, state[field]
+        return collect
+
+    REGISTRY.gauge(
+        "llm_scheduler_queue_depth", "rate limit 버킷을 기다리는 LLM 호출 수", ("priority",), queue_depth, replace=True
+    )
+    REGISTRY.gauge(
+        "llm_rate_limit_available", "모델별 rate limit 버킷 잔량 (requests: 요청 수, tokens: 토큰 수)",
+        ("model", "limit"), bucket("available"), replace=True
+    )
+    REGISTRY.gauge(
+        "llm_rate_limit_capacity", "모델별 분당 한도 (설정값 또는 x-ratelimit-limit-* 헤더)",
+        ("model", "limit"), bucket("capacity"), replace=True
+    )
+
+
+def register_hedging(hedging: HedgingExecutor) -> None:
+    """헤지/페일오버 횟수와 백엔드별 지연 시간 EWMA/상태를 /metrics에 노출 (출력할 때마다 현재 상태를 읽음)"""
+    def hedges() -> Iterable[Tuple[Dict[str, Any], float]]:
+        yield {"outcome": "won"}, hedging.hedge_wins
+        yield {"outcome": "lost"}, hedging.hedges - hedging.hedge_wins
+
+    def backend(field: str) -> Any:
+        def collect() -> Iterable[Tuple[Dict[str, Any], float]]:
+            for name, stats in hedging.stats()["backends"].items():
+                if stats[field] is not None:
+                    yield {"backend": name}, float(stats[field])
+        return collect
+
+    REGISTRY.counter(
+        "llm_hedged_requests_total", "지연 임계값을 넘어 추가로 보낸 헤지 요청 수 (won: 헤지 응답이 먼저 도착)",
+        ("outcome",), hedges, replace=True
+    )
+    REGISTRY.counter(
+        "llm_failovers_total", "오류로 다음 백엔드에 넘긴 호출 수", (), lambda: [({}, hedging.failovers)], replace=True
+    )
+    REGISTRY.gauge(
+        "llm_backend_latency_ewma_seconds", "백엔드별 LLM 호출 지연 시간 EWMA", ("backend",), backend("ewma"), replace=True
+    )
+    REGISTRY.gauge(
+        "llm_backend_healthy", "백엔드 상태 (0: 연속 실패로 격리 중)", ("backend",), backend("healthy"), replace=True
+    )
+
+
+def register_jobs(manager: "JobManager") -> None:
+    """비동기 작업 대기열 길이/실행 중인 작업 수와 상태별 작업 수를 /metrics에 노출 (출력할 때마다 현재 상태를 읽음)"""
+    def jobs() -> Iterable[Tuple[Dict[str, Any], float]]:
+        for status, count in manager.counts.items():
+            yield {"status": status}, count
+
+    REGISTRY.gauge("chat_jobs_queue_depth", "실행을 기다리는 비동기 작업 수", (), lambda: [({}, manager.queue_depth)], replace=True)
+    REGISTRY.gauge("chat_jobs_running", "이 프로세스에서 실행 중인 비동기 작업 수", (), lambda: [({}, manager.running)], replace=True)
+    REGISTRY.counter(
+        "chat_jobs_total", "비동기 작업 수 (submitted: 등록, recovered: 재시작/다른 워커에서 회수, 그 외 완료 상태)",
+        ("status",), jobs, replace=True
+    )
+
+
+def configure_telemetry(metrics_enabled: bool, tracing_enabled: bool = False) -> None:
+    """
+    메트릭/트레이싱 설정
+
+    Args:
+        metrics_enabled: 메트릭 수집 여부 (비활성 시 단계별 span도 no-op)
+        tracing_enabled: OpenTelemetry span 생성 여부
+    """
+    global _enabled
+    _enabled = metrics_enabled
+    tracing.configure(
+        observer=_observe_span if metrics_enabled else None,
+        opentelemetry=tracing_enabled
+    )
+    logger.debug(f"텔레메트리 설정: metrics={metrics_enabled}, tracing={tracing_enabled}")
+
+
+async def mark_stage(request: Request) -> None:
+    """before_request 훅 - 요청 디코딩/검증 구간 측정 시작"""
+    if _enabled:
+        _stage_started_at.set(time.perf_counter())
+
+
+def end_stage(name: str) -> None:
+    """
+    이전 표시 시점부터 지금까지를 name 단계로 기록하고 다음 단계 측정 시작
+
+    핸들러 시작 시 end_stage("decode"), 반환 직전 end_stage("handler")를 호출하면
+    응답 시작 시점에 미들웨어가 나머지를 "serialize" 단계로 기록합니다.
+    """
+    if not _enabled:
+        return
+    started_at = _stage_started_at.get()
+    now = time.perf_counter()
+    if started_at is not None:
+        tracing.record(name, now - started_at)
+    _stage_started_at.set(now)
+
+
+def metrics_middleware(app: ASGIApp) -> ASGIApp:
+    """요청 수, 상태 코드, 전체 처리 시간, 스트리밍 첫 토큰 시간을 기록하는 ASGI 미들웨어"""
+
+    async def middleware(scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not _enabled:
+            await app(scope, receive, send)
+            return
+
+        started_at = time.perf_counter()
+        _stage_started_at.set(None)
+        status = 500
+        streaming = False
+        first_body = True
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status, streaming, first_body
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                streaming = any(
+                    name == b"content-type" and value.startswith(b"text/event-stream")
+                    for name, value in message.get("headers", [])
+                )
+                handler_done_at = _stage_started_at.get()
+                if handler_done_at is not None:
+                    tracing.record("serialize", time.perf_counter() - handler_done_at)
+            elif (
+                message["type"] == "http.response.body" and streaming and first_body
+                and message.get("body") and not message["body"].startswith(b":")  # heartbeat 주석 프레임 제외
+            ):
+                first_body = False
+                TTFT.observe(time.perf_counter() - started_at, path=_path(scope))
+            await send(message)
+
+        try:
+            await app(scope, receive, send_wrapper)
+        finally:
+            path = _path(scope)
+            REQUESTS.inc(path=path, status=status)
+            if status >= 500:
+                ERRORS.inc(path=path)
+            REQUEST_LATENCY.observe(time.perf_counter() - started_at, path=path)
+
+    return middleware
+
+
+def _path(scope: Scope) -> str:
+    """라벨용 경로 (라우팅된 경로 템플릿, 없으면 unmatched)"""
+    return scope.get("path_template") or "unmatched"
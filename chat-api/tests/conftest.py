@@ -0,0 +1,40 @@
+"""
+테스트 공통 설정
+API 키와 네트워크 없이 가짜 LLM 백엔드로 실행
+"""
+
+import os
+
+import pytest
+
+os.environ["OPENAI_API_KEY"] = "sk-test"
+os.environ["LLM_BACKEND"] = "fake"
+os.environ["LLM_WARMUP_CONNECTIONS"] = "0"
+
+from src.agents import registry  # noqa: E402
+from src.agents.hedging import get_hedging_executor  # noqa: E402
+from src.agents.scheduler import get_scheduler  # noqa: E402
+from src.agents.settings import get_settings  # noqa: E402
+from src.app.dependencies import get_agent_router, get_semantic_cache  # noqa: E402
+
+
+def _clear_caches() -> None:
+    get_settings.cache_clear()
+    get_scheduler.cache_clear()
+    get_hedging_executor.cache_clear()
+    get_agent_router.cache_clear()
+    get_semantic_cache.cache_clear()
+    registry.clear()
+
+
+@pytest.fixture
+def configure(monkeypatch):
+    """환경변수를 바꾸고 설정/프로세스 단위 캐시를 비움 (테스트가 끝나면 원래대로)"""
+    def apply(**env: str) -> None:
+        for name, value in env.items():
+            monkeypatch.setenv(name.upper(), str(value))
+        _clear_caches()
+
+    yield apply
+    monkeypatch.undo()
+    _clear_caches()
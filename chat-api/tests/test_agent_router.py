@@ -0,0 +1,50 @@
+"""AgentRouter 모델 허용 목록 테스트"""
+
+import asyncio
+
+import pytest
+from litestar.testing import AsyncTestClient
+
+from src.agents import DefaultAgent
+from src.agents.fake import FakeChatModel
+from src.app.main import create_app
+from src.app.services.agent_router import AgentRouter
+
+
+def _router() -> AgentRouter:
+    router = AgentRouter(allowed_models=["gpt-4o"])
+    router.register("default", DefaultAgent(model_name="gpt-4o-mini", llm=FakeChatModel()))
+    return router
+
+
+def test_registered_and_allowed_models_are_routed():
+    router = _router()
+    assert router.resolve("hi", model="gpt-4o-mini").model is None
+    assert router.resolve("hi", model="gpt-4o").model == "gpt-4o"
+    assert router.resolve("hi", agent="default", model="gpt-4o").model == "gpt-4o"
+
+
+def test_unknown_model_is_rejected():
+    router = _router()
+    with pytest.raises(ValueError):
+        router.resolve("hi", model="gpt-unknown")
+    with pytest.raises(ValueError):
+        router.resolve("hi", agent="default", model="gpt-unknown")
+
+
+def test_unknown_model_returns_400(configure):
+    configure(router_allowed_models="fake-allowed")
+
+    async def run():
+        async with AsyncTestClient(app=create_app()) as client:
+            return (
+                await client.post("/api/chat", json={"message": "hi", "model": "gpt-unknown"}),
+                await client.post("/api/chat/stream", json={"message": "hi", "model": "gpt-unknown"}),
+                await client.post("/api/chat", json={"message": "hi", "model": "fake-allowed"}),
+            )
+
+    rejected, rejected_stream, allowed = asyncio.run(run())
+    assert rejected.status_code == 400
+    assert rejected_stream.status_code == 400
+    assert allowed.status_code == 201
+    assert allowed.json()["model"] == "fake-allowed"
@@ -0,0 +1,35 @@
+"""앱 lifespan 리소스 정리 테스트"""
+
+import asyncio
+import sqlite3
+
+import pytest
+from litestar.testing import AsyncTestClient
+
+from src.app.main import create_app
+
+
+def test_shutdown_closes_sqlite_stores(configure, tmp_path):
+    configure(
+        conversation_store="sqlite",
+        conversation_store_path=tmp_path / "conversations.db",
+        response_cache_enabled="true",
+        response_cache_backend="sqlite",
+        response_cache_path=tmp_path / "cache.db",
+        fake_llm_ttft=0,
+        fake_llm_tokens_per_second=0,
+    )
+    app = create_app()
+
+    async def run():
+        async with AsyncTestClient(app=app) as client:
+            response = await client.post("/api/chat", json={"message": "hi", "conversation_id": "c1"})
+            assert response.status_code == 201
+
+    asyncio.run(run())
+
+    store = app.dependencies["conversation_store"].value
+    cache = app.dependencies["response_cache"].value
+    for connection in (store._conn, cache._backend._conn):
+        with pytest.raises(sqlite3.ProgrammingError):
+            connection.execute("SELECT 1")
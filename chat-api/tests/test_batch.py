@@ -0,0 +1,132 @@
+"""배치 처리 테스트 (오프라인 CLI 배치, 배치 API)"""
+
+import asyncio
+import json
+
+from litestar.testing import AsyncTestClient
+
+from src.agents import DefaultAgent
+from src.agents.batch import BatchCheckpoint, count_lines, run_batch
+from src.agents.fake import FakeChatModel
+from src.app import telemetry
+from src.app.main import create_app
+from tests.test_disconnect import _call_and_disconnect, _track_cancellations
+
+# 항목 하나는 허용되지 않은 모델로 보내 400 결과를 만듦
+BATCH = {"requests": [{"message": "a"}, {"message": "b", "model": "not-allowed"}, {"message": "c"}]}
+
+
+def _agent(ttft: float = 0) -> DefaultAgent:
+    return DefaultAgent(llm=FakeChatModel(ttft=ttft, tokens_per_second=0, response_tokens=2))
+
+
+def _write_input(path, lines):
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def test_blank_lines_advance_progress(tmp_path):
+    input_path = tmp_path / "input.jsonl"
+    _write_input(input_path, [json.dumps({"message": "a"}), "", json.dumps({"message": "b"}), "  "])
+    results, skipped = [], []
+
+    checkpoint = asyncio.run(run_batch(
+        _agent(), input_path, tmp_path / "out.jsonl", tmp_path / "out.checkpoint",
+        on_result=results.append, on_skip=lambda: skipped.append(1)
+    ))
+
+    assert results == [True, True]
+    assert len(results) + len(skipped) == count_lines(input_path) == checkpoint.completed == 4
+
+
+def test_cancelled_batch_resumes_without_duplicates(tmp_path):
+    input_path = tmp_path / "input.jsonl"
+    output_path = tmp_path / "out.jsonl"
+    checkpoint_path = tmp_path / "out.checkpoint"
+    _write_input(input_path, [json.dumps({"id": i, "message": f"m{i}"}) for i in range(20)])
+
+    async def interrupted():
+        task = asyncio.create_task(run_batch(
+            _agent(ttft=0.05), input_path, output_path, checkpoint_path,
+            concurrency=4, checkpoint_interval=0
+        ))
+        await asyncio.sleep(0.12)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    asyncio.run(interrupted())
+    saved = BatchCheckpoint.load(checkpoint_path)
+    assert 0 < saved.completed < 20
+    # 중단 시점의 체크포인트는 출력 파일에 기록된 결과와 일치
+    assert output_path.stat().st_size == saved.output_offset
+    assert len(output_path.read_text(encoding="utf-8").splitlines()) == saved.completed
+
+    checkpoint = asyncio.run(run_batch(_agent(), input_path, output_path, checkpoint_path))
+    lines = sorted(json.loads(row)["line"] for row in output_path.read_text(encoding="utf-8").splitlines())
+    assert lines == list(range(20))
+    assert checkpoint.succeeded == 20
+
+
+def test_batch_endpoint_returns_results_in_request_order(configure):
+    configure(fake_llm_ttft=0, fake_llm_tokens_per_second=0)
+
+    async def run():
+        async with AsyncTestClient(app=create_app()) as client:
+            return await client.post("/api/chat/batch", json=BATCH)
+
+    response = asyncio.run(run())
+    body = response.json()
+
+    assert response.status_code == 201
+    assert [item["index"] for item in body["results"]] == [0, 1, 2]
+    assert [item["status_code"] for item in body["results"]] == [200, 400, 200]
+    assert body["results"][0]["response"]["message"]
+    assert body["results"][0]["error"] is None
+    assert body["results"][1]["response"] is None
+    assert "not-allowed" in body["results"][1]["error"]
+    assert (body["succeeded"], body["failed"]) == (2, 1)
+
+
+def test_batch_stream_endpoint_sends_one_ndjson_line_per_item(configure):
+    configure(fake_llm_ttft=0, fake_llm_tokens_per_second=0)
+
+    async def run():
+        async with AsyncTestClient(app=create_app()) as client:
+            return await client.post("/api/chat/batch/stream", json=BATCH)
+
+    response = asyncio.run(run())
+    lines = [json.loads(line) for line in response.text.splitlines()]
+
+    assert response.status_code == 201
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert sorted(line["index"] for line in lines) == [0, 1, 2]
+    assert {line["index"]: line["status_code"] for line in lines} == {0: 200, 1: 400, 2: 200}
+
+
+def test_batch_stream_disconnect_cancels_and_awaits_remaining_items(configure, monkeypatch):
+    configure(fake_llm_ttft=30, batch_max_concurrency=2)
+    cancelled = _track_cancellations(monkeypatch)
+    disconnects = telemetry.CLIENT_DISCONNECTS.value(path="/api/chat/batch/stream")
+    body = {"requests": [{"message": "bad", "model": "not-allowed"}] + [{"message": f"m{i}"} for i in range(4)]}
+
+    async def run():
+        disconnected_at, sent = await _call_and_disconnect(create_app(), "/api/chat/batch/stream", body, 0.3)
+        # 응답이 끝났을 때 취소된 항목의 태스크가 모두 정리되어 있어야 함
+        leftover = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        return sent, leftover
+
+    sent, leftover = asyncio.run(run())
+    lines = [
+        json.loads(line)
+        for message in sent[1:]
+        for line in message.get("body", b"").decode().splitlines()
+    ]
+
+    assert sent[0]["status"] == 201
+    assert [(line["index"], line["status_code"]) for line in lines] == [(0, 400)]
+    # 동시 실행 수(2)만큼 시작된 업스트림 호출이 모두 취소되고 나머지는 시작 전에 취소됨
+    assert len(cancelled) == 2
+    assert leftover == []
+    assert telemetry.CLIENT_DISCONNECTS.value(path="/api/chat/batch/stream") == disconnects + 1
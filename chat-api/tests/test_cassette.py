@@ -0,0 +1,104 @@
+"""LLM 호출 녹화/재생(cassette) 테스트"""
+
+import asyncio
+import json
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+from src.agents import ChatMessage, DefaultAgent, registry
+from src.agents.cassette import CassetteMissError, ReplayChatModel, cassette_key, load_cassette
+
+HISTORY = [ChatMessage(role="user", content="first"), ChatMessage(role="assistant", content="second")]
+
+
+def _record(configure, path):
+    """가짜 모델 호출(invoke 1회, stream 1회)을 녹화하고 응답 반환"""
+    configure(
+        llm_backend="fake", llm_record_cassette=path,
+        fake_llm_ttft=0.01, fake_llm_tokens_per_second=0, fake_llm_response_tokens=6
+    )
+
+    async def run():
+        agent = DefaultAgent()
+        invoked = await agent.invoke("hello", HISTORY, temperature=0.2)
+        streamed = [chunk async for chunk in agent.stream("stream me")]
+        await registry.aclose()
+        return invoked, streamed
+
+    return asyncio.run(run())
+
+
+def _replay(configure, path, on_miss="error"):
+    configure(
+        llm_backend="replay", llm_record_cassette="", llm_replay_cassette=path,
+        llm_replay_time_scale=0, llm_replay_on_miss=on_miss
+    )
+    return DefaultAgent()
+
+
+def test_recorded_calls_replay_with_the_same_content(configure, tmp_path):
+    path = str(tmp_path / "cassette.jsonl")
+    invoked, streamed = _record(configure, path)
+
+    lines = [json.loads(line) for line in open(path, encoding="utf-8")]
+    assert len(lines) == 2
+    assert [line["messages"][-1] for line in lines] == [["human", "hello"], ["human", "stream me"]]
+    assert all(len(line["chunks"]) == len(line["delays"]) == 6 for line in lines)
+    assert lines[0]["delays"][0] >= 0.01
+    assert lines[0]["usage"]["output_tokens"] == 6
+
+    agent = _replay(configure, path)
+
+    async def run():
+        # 녹화 키에는 온도가 들어가지 않으므로 다른 온도로 요청해도 같은 녹화를 재생
+        replayed = await agent.invoke("hello", HISTORY, temperature=0.9)
+        replayed_stream = [chunk async for chunk in agent.stream("stream me")]
+        return replayed, replayed_stream
+
+    replayed, replayed_stream = asyncio.run(run())
+    assert isinstance(agent.llm, ReplayChatModel)
+    assert load_cassette(path).stats() == {"recordings": 2, "keys": 2, "hits": 2, "misses": 0}
+    assert replayed == invoked
+    assert "".join(replayed_stream) == "".join(streamed)
+
+
+def test_unknown_prompt_misses_the_cassette(configure, tmp_path):
+    path = str(tmp_path / "cassette.jsonl")
+    invoked, _ = _record(configure, path)
+
+    with pytest.raises(CassetteMissError):
+        asyncio.run(_replay(configure, path).invoke("never recorded"))
+
+    # any: 요청 키로 고른 녹화를 결정적으로 재생
+    agent = _replay(configure, path, on_miss="any")
+    first = asyncio.run(agent.invoke("never recorded"))
+    assert first == asyncio.run(agent.invoke("never recorded"))
+
+
+def test_reordered_history_is_a_different_recording(configure, tmp_path):
+    path = str(tmp_path / "cassette.jsonl")
+    _record(configure, path)
+    agent = _replay(configure, path)
+
+    with pytest.raises(CassetteMissError):
+        asyncio.run(agent.invoke("hello", list(reversed(HISTORY))))
+
+
+def test_cassette_key_depends_only_on_message_types_and_order():
+    system, user, assistant = SystemMessage("rules"), HumanMessage("hi"), AIMessage("hello")
+
+    assert cassette_key([system, user]) == cassette_key([SystemMessage("rules"), HumanMessage("hi")])
+    assert cassette_key([system, user, assistant]) != cassette_key([system, assistant, user])
+    # 내용이 같아도 역할이 다르면 다른 키
+    assert cassette_key([HumanMessage("hi")]) != cassette_key([AIMessage("hi")])
+    # 경계가 다른 메시지 분할은 섞이지 않음
+    assert cassette_key([HumanMessage("ab"), HumanMessage("c")]) != cassette_key([HumanMessage("a"), HumanMessage("bc")])
+
+
+def test_replay_model_rejects_unknown_miss_policy(tmp_path):
+    path = tmp_path / "cassette.jsonl"
+    path.write_text(json.dumps({"key": "k", "chunks": ["x"], "delays": [0]}) + "\n", encoding="utf-8")
+
+    with pytest.raises(ValueError, match="miss"):
+        ReplayChatModel(cassette=str(path), on_miss="ignore")
@@ -0,0 +1,98 @@
+"""부하 차단(admission control) 테스트: 대기열 초과, 대기 시간 초과, 테넌트 할당량"""
+
+import asyncio
+
+from litestar.testing import AsyncTestClient
+
+from src.app.dependencies import resolve_dependency
+from src.app.main import create_app
+from src.app.metrics import REGISTRY
+
+
+def _configure_fake(configure, **settings):
+    configure(llm_backend="fake", fake_llm_ttft=0, fake_llm_tokens_per_second=0, agent_retry_after=7, **settings)
+
+
+async def _post_while_slot_held(app, path="/api/chat"):
+    """유일한 실행 슬롯을 점유한 상태에서 요청 전송"""
+    async with AsyncTestClient(app=app) as client:
+        limiter = await resolve_dependency(app, "concurrency_limiter")
+        async with limiter.slot():
+            response = await client.post(path, json={"message": "hi"})
+        return response, limiter
+
+
+def test_full_queue_is_rejected_with_429(configure):
+    _configure_fake(configure, agent_max_concurrency=1, agent_max_queue=0)
+    app = create_app()
+
+    response, limiter = asyncio.run(_post_while_slot_held(app))
+
+    assert response.status_code == 429
+    assert response.headers["retry-after"] == "7"
+    assert limiter.stats()["rejected"] == 1
+
+
+def test_full_queue_rejects_stream_before_it_opens(configure):
+    _configure_fake(configure, agent_max_concurrency=1, agent_max_queue=0)
+    app = create_app()
+
+    response, _ = asyncio.run(_post_while_slot_held(app, "/api/chat/stream"))
+
+    assert response.status_code == 429
+    assert response.headers["retry-after"] == "7"
+
+
+def test_queue_timeout_is_rejected_with_503(configure):
+    _configure_fake(configure, agent_max_concurrency=1, agent_max_queue=1, agent_queue_timeout=0.05)
+    app = create_app()
+
+    response, limiter = asyncio.run(_post_while_slot_held(app))
+
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "7"
+    stats = limiter.stats()
+    assert stats["timed_out"] == 1
+    assert stats["waiting"] == 0
+    assert stats["queue_depth"]["count"] == 2
+
+
+def test_limiter_histograms_are_exported_with_chat_prefix(configure):
+    _configure_fake(configure, agent_max_concurrency=1)
+    app = create_app()
+
+    async def run():
+        async with AsyncTestClient(app=app) as client:
+            await resolve_dependency(app, "concurrency_limiter")
+            return await client.get("/metrics")
+
+    response = asyncio.run(run())
+    assert REGISTRY.get("chat_queue_wait_seconds") is not None
+    assert REGISTRY.get("chat_queue_depth") is not None
+    assert "# TYPE chat_queue_wait_seconds histogram" in response.text
+    assert "# TYPE chat_queue_depth histogram" in response.text
+
+
+def test_tenant_quota_is_enforced_per_tenant(configure):
+    _configure_fake(
+        configure,
+        agent_timeout=10,
+        llm_scheduler_enabled=True,
+        llm_scheduler_tenant_rpm=1
+    )
+    app = create_app()
+
+    async def run():
+        async with AsyncTestClient(app=app) as client:
+            async def chat(tenant):
+                return await client.post("/api/chat", json={"message": "hi"}, headers={"X-Tenant-ID": tenant})
+
+            return await chat("a"), await chat("a"), await chat("b")
+
+    first, exceeded, other = asyncio.run(run())
+
+    assert first.status_code == 201
+    assert exceeded.status_code == 429
+    # 분당 1회 할당량은 약 60초 뒤에 회복
+    assert 50 <= int(exceeded.headers["retry-after"]) <= 60
+    assert other.status_code == 201
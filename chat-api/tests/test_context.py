@@ -0,0 +1,50 @@
+"""컨텍스트 윈도우 요약 호출 테스트"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src.agents import ChatMessage, DeadlineExceededError, DefaultAgent, scheduler, usage
+from src.agents.execution import Deadline
+from src.agents.fake import FakeChatModel
+
+SUMMARIZE = dict(context_strategy="summarize", context_max_tokens=60, context_keep_last=2)
+
+
+def _history(turns: int = 8):
+    return [
+        ChatMessage(role="user" if i % 2 == 0 else "assistant", content=f"turn {i} " + "detail " * 20)
+        for i in range(turns)
+    ]
+
+
+def test_summary_call_respects_request_deadline(configure):
+    configure(**SUMMARIZE)
+    agent = DefaultAgent(llm=FakeChatModel(ttft=30, response_tokens=1))
+
+    started_at = time.perf_counter()
+    with pytest.raises(DeadlineExceededError):
+        asyncio.run(agent.invoke("next question", _history(), deadline=Deadline(0.2)))
+    assert time.perf_counter() - started_at < 1.0
+
+
+def test_summary_call_is_scheduled_and_metered(configure, monkeypatch):
+    # 버킷이 테스트 도중 다시 차지 않도록 스케줄러 시계를 고정
+    monkeypatch.setattr(scheduler, "time", SimpleNamespace(monotonic=lambda: 1000.0))
+    configure(**SUMMARIZE, llm_scheduler_enabled="true", llm_scheduler_rpm=600)
+    agent = DefaultAgent(llm=FakeChatModel(ttft=0, tokens_per_second=0, response_tokens=4))
+
+    async def run():
+        with usage.track_usage() as tracked:
+            await agent.invoke("next question", _history())
+        return tracked
+
+    tracked = asyncio.run(run())
+
+    # 요약 호출 + 본 호출 모두 스케줄러 permit을 받고 요청별 사용량에 집계
+    assert agent.scheduler.stats()["granted"] == 2
+    assert tracked.calls == 2
+    requests = agent.scheduler.buckets()["fake"]["requests"]
+    assert requests["capacity"] - requests["available"] == 2
@@ -0,0 +1,190 @@
+"""대화 저장소 테스트 (memory, sqlite)"""
+
+import asyncio
+import sqlite3
+
+import pytest
+from litestar.testing import AsyncTestClient
+
+from src.agents import ChatMessage
+from src.app.main import create_app
+from src.app.services import conversation_store
+from src.app.services.conversation_store import InMemoryConversationStore, SQLiteConversationStore
+
+
+class FakeClock:
+    """monotonic/time을 함께 제어하는 가짜 시계"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(conversation_store, "time", fake)
+    return fake
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def make_store(request, tmp_path):
+    stores = []
+
+    def make(**kwargs):
+        if request.param == "memory":
+            store = InMemoryConversationStore(**kwargs)
+        else:
+            store = SQLiteConversationStore(path=str(tmp_path / "conversations.db"), **kwargs)
+        stores.append(store)
+        return store
+
+    yield make
+    for store in stores:
+        asyncio.run(store.close())
+
+
+def _turn(text: str):
+    return [ChatMessage(role="user", content=text), ChatMessage(role="assistant", content=f"re: {text}")]
+
+
+def _contents(messages):
+    return [message.content for message in messages]
+
+
+def test_appends_keep_order(make_store, clock):
+    store = make_store()
+
+    async def run():
+        await store.append("c1", _turn("a"))
+        await store.append("c1", _turn("b"))
+        return await store.get_history("c1")
+
+    assert _contents(asyncio.run(run())) == ["a", "re: a", "b", "re: b"]
+
+
+def test_same_conversation_id_is_isolated_per_tenant(make_store, clock):
+    store = make_store()
+
+    async def run():
+        await store.append("c1", _turn("from-a"), tenant="a")
+        await store.append("c1", _turn("from-b"), tenant="b")
+        return (
+            await store.get_history("c1", tenant="a"),
+            await store.get_history("c1", tenant="b"),
+            await store.get_history("c1"),
+        )
+
+    history_a, history_b, untenanted = asyncio.run(run())
+    assert _contents(history_a) == ["from-a", "re: from-a"]
+    assert _contents(history_b) == ["from-b", "re: from-b"]
+    assert untenanted == []
+
+
+def test_evicts_least_recently_used_conversation(make_store, clock):
+    store = make_store(max_conversations=2)
+
+    async def run():
+        await store.append("c1", _turn("1"))
+        clock.now += 1
+        await store.append("c2", _turn("2"))
+        clock.now += 1
+        await store.get_history("c1")  # c1을 최근 사용으로 갱신
+        clock.now += 1
+        await store.append("c3", _turn("3"))
+        return [await store.get_history(cid) for cid in ("c1", "c2", "c3")]
+
+    c1, c2, c3 = asyncio.run(run())
+    assert _contents(c1) == ["1", "re: 1"]
+    assert c2 == []
+    assert _contents(c3) == ["3", "re: 3"]
+
+
+def test_expires_conversations_after_ttl(make_store, clock):
+    store = make_store(ttl=60)
+
+    async def run():
+        await store.append("old", _turn("old"))
+        clock.now += 30
+        await store.append("fresh", _turn("fresh"))
+        clock.now += 40
+        old = await store.get_history("old")
+        fresh = await store.get_history("fresh")
+        # 만료된 대화에 이어 쓰면 새 대화로 시작
+        await store.append("old", _turn("again"))
+        return old, fresh, await store.get_history("old")
+
+    old, fresh, restarted = asyncio.run(run())
+    assert old == []
+    assert _contents(fresh) == ["fresh", "re: fresh"]
+    assert _contents(restarted) == ["again", "re: again"]
+
+
+def test_sqlite_store_survives_reopen(tmp_path, clock):
+    path = str(tmp_path / "conversations.db")
+
+    async def run():
+        first = SQLiteConversationStore(path=path)
+        await first.append("c1", _turn("kept"), tenant="a")
+        await first.close()
+
+        second = SQLiteConversationStore(path=path)
+        try:
+            return await second.get_history("c1", tenant="a"), second.size()
+        finally:
+            await second.close()
+
+    history, size = asyncio.run(run())
+    assert _contents(history) == ["kept", "re: kept"]
+    assert size == 1
+
+
+def test_sqlite_store_migrates_rows_without_tenant(tmp_path, clock):
+    path = str(tmp_path / "legacy.db")
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE conversation_messages ("
+        "id INTEGER PRIMARY KEY AUTOINCREMENT, conversation_id TEXT NOT NULL, "
+        "role TEXT NOT NULL, content TEXT NOT NULL)"
+    )
+    conn.execute("INSERT INTO conversation_messages (conversation_id, role, content) VALUES ('c1', 'user', 'legacy')")
+    conn.commit()
+    conn.close()
+
+    async def run():
+        store = SQLiteConversationStore(path=path)
+        try:
+            return await store.get_history("c1"), await store.get_history("c1", tenant="a")
+        finally:
+            await store.close()
+
+    untenanted, other_tenant = asyncio.run(run())
+    assert _contents(untenanted) == ["legacy"]
+    assert other_tenant == []
+
+
+def test_conversation_endpoint_scopes_history_by_tenant_header(configure):
+    configure(llm_backend="fake", fake_llm_ttft=0, fake_llm_tokens_per_second=0)
+    app = create_app()
+
+    async def run():
+        async with AsyncTestClient(app=app) as client:
+            for tenant in ("a", "a", "b"):
+                response = await client.post(
+                    "/api/chat",
+                    json={"message": f"hi from {tenant}", "conversation_id": "shared"},
+                    headers={"X-Tenant-ID": tenant}
+                )
+                assert response.status_code == 201
+
+            store = app.dependencies["conversation_store"].value
+            return await store.get_history("shared", "a"), await store.get_history("shared", "b")
+
+    history_a, history_b = asyncio.run(run())
+    assert [m.content for m in history_a if m.role == "user"] == ["hi from a", "hi from a"]
+    assert [m.content for m in history_b if m.role == "user"] == ["hi from b"]
@@ -0,0 +1,40 @@
+"""DefaultAgent.stream 토큰 스트리밍 테스트"""
+
+import asyncio
+import time
+
+from src.agents import DefaultAgent
+from src.agents.fake import FakeChatModel
+
+
+def test_first_chunk_arrives_before_model_finishes():
+    llm = FakeChatModel(ttft=0.05, tokens_per_second=20, response_tokens=20)
+    agent = DefaultAgent(llm=llm)
+
+    async def run():
+        started_at = time.perf_counter()
+        first_chunk_at = None
+        chunks = []
+        async for chunk in agent.stream("hello"):
+            if first_chunk_at is None:
+                first_chunk_at = time.perf_counter() - started_at
+            chunks.append(chunk)
+        return first_chunk_at, time.perf_counter() - started_at, chunks
+
+    first_chunk_at, total, chunks = asyncio.run(run())
+
+    # 토큰 델타가 생성되는 즉시 전달되어 첫 조각은 전체 생성 시간(약 1초)보다 훨씬 먼저 도착
+    assert len(chunks) == llm.response_tokens
+    assert first_chunk_at < llm.generation_time / 2
+    assert total >= llm.generation_time * 0.9
+
+
+def test_stream_matches_invoke():
+    agent = DefaultAgent(llm=FakeChatModel(ttft=0.0, tokens_per_second=0, response_tokens=8))
+
+    async def run():
+        streamed = "".join([chunk async for chunk in agent.stream("same prompt")])
+        return streamed, await agent.invoke("same prompt")
+
+    streamed, invoked = asyncio.run(run())
+    assert streamed == invoked
@@ -0,0 +1,109 @@
+"""클라이언트 연결 종료 시 업스트림 취소 테스트"""
+
+import asyncio
+import json
+import time
+
+from src.agents.fake import FakeChatModel
+from src.app import telemetry
+from src.app.main import create_app
+
+# 연결 종료 후 업스트림 호출이 취소되어야 하는 시간 (초)
+CANCEL_BOUND = 1.0
+
+
+def _track_cancellations(monkeypatch):
+    """가짜 모델 호출이 취소된 시각을 기록"""
+    cancelled = []
+    generate, stream = FakeChatModel._agenerate, FakeChatModel._astream
+
+    async def _agenerate(self, *args, **kwargs):
+        try:
+            return await generate(self, *args, **kwargs)
+        except asyncio.CancelledError:
+            cancelled.append(time.perf_counter())
+            raise
+
+    async def _astream(self, *args, **kwargs):
+        try:
+            async for chunk in stream(self, *args, **kwargs):
+                yield chunk
+        except (asyncio.CancelledError, GeneratorExit):
+            cancelled.append(time.perf_counter())
+            raise
+
+    monkeypatch.setattr(FakeChatModel, "_agenerate", _agenerate)
+    monkeypatch.setattr(FakeChatModel, "_astream", _astream)
+    return cancelled
+
+
+async def _call_and_disconnect(app, path: str, body: dict, disconnect_after: float):
+    """요청 본문을 보낸 뒤 disconnect_after초 후 연결을 끊고, 연결을 끊은 시각과 응답 메시지 반환"""
+    payload = json.dumps(body).encode()
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(payload)).encode())],
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 80),
+    }
+    sent = []
+    body_sent = False
+    disconnected_at = None
+
+    async def receive():
+        nonlocal body_sent, disconnected_at
+        if not body_sent:
+            body_sent = True
+            return {"type": "http.request", "body": payload, "more_body": False}
+        await asyncio.sleep(disconnect_after)
+        disconnected_at = time.perf_counter()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    await asyncio.wait_for(app(scope, receive, send), disconnect_after + 5)
+    return disconnected_at, sent
+
+
+def test_chat_disconnect_cancels_upstream_call(configure, monkeypatch):
+    configure(fake_llm_ttft=30)
+    cancelled = _track_cancellations(monkeypatch)
+    requests_499 = telemetry.REQUESTS.value(path="/api/chat", status=499)
+    disconnects = telemetry.CLIENT_DISCONNECTS.value(path="/api/chat")
+    upstream_cancelled = telemetry.UPSTREAM_CANCELLED.value(mode="invoke")
+
+    disconnected_at, sent = asyncio.run(_call_and_disconnect(create_app(), "/api/chat", {"message": "hi"}, 0.3))
+
+    assert len(cancelled) == 1
+    assert cancelled[0] - disconnected_at < CANCEL_BOUND
+    assert sent[0]["status"] == 499
+    assert telemetry.REQUESTS.value(path="/api/chat", status=499) == requests_499 + 1
+    assert telemetry.CLIENT_DISCONNECTS.value(path="/api/chat") == disconnects + 1
+    assert telemetry.UPSTREAM_CANCELLED.value(mode="invoke") == upstream_cancelled + 1
+
+
+def test_stream_disconnect_cancels_upstream_call(configure, monkeypatch):
+    configure(fake_llm_ttft=0, fake_llm_tokens_per_second=5, fake_llm_response_tokens=100)
+    cancelled = _track_cancellations(monkeypatch)
+    disconnects = telemetry.CLIENT_DISCONNECTS.value(path="/api/chat/stream")
+    upstream_cancelled = telemetry.UPSTREAM_CANCELLED.value(mode="stream")
+
+    disconnected_at, sent = asyncio.run(
+        _call_and_disconnect(create_app(), "/api/chat/stream", {"message": "hi"}, 0.5)
+    )
+
+    assert len(cancelled) == 1
+    assert cancelled[0] - disconnected_at < CANCEL_BOUND
+    assert sent[0]["status"] == 201
+    assert not any(message.get("body", b"").find(b'"is_final":true') >= 0 for message in sent[1:])
+    assert telemetry.CLIENT_DISCONNECTS.value(path="/api/chat/stream") == disconnects + 1
+    assert telemetry.UPSTREAM_CANCELLED.value(mode="stream") == upstream_cancelled + 1
@@ -0,0 +1,147 @@
+"""요청 deadline과 재시도 정책 테스트"""
+
+import asyncio
+import time
+
+import httpx
+import openai
+import pytest
+from litestar.testing import AsyncTestClient
+
+from src.agents import DeadlineExceededError, DefaultAgent
+from src.agents.execution import Deadline, ExecutionPolicy, run_with_retry, stream_with_retry
+from src.agents.fake import FakeChatModel
+from src.app.main import create_app
+
+FAST = ExecutionPolicy(timeout=5, max_retries=3, base_delay=0.001, max_delay=0.01)
+
+
+def _server_error() -> openai.InternalServerError:
+    response = httpx.Response(500, request=httpx.Request("POST", "https://fake.invalid/v1/chat/completions"))
+    return openai.InternalServerError("injected", response=response, body=None)
+
+
+class FlakyChatModel(FakeChatModel):
+    """처음 fail_first번은 실패하고, 스트림은 fail_after_tokens개를 보낸 뒤 실패하는 가짜 모델"""
+    fail_first: int = 0
+    fail_after_tokens: int = -1
+    calls: int = 0
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        self.calls += 1
+        if self.calls <= self.fail_first:
+            raise _server_error()
+        return await super()._agenerate(messages, stop, run_manager, **kwargs)
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        self.calls += 1
+        if self.calls <= self.fail_first:
+            raise _server_error()
+        sent = 0
+        async for chunk in super()._astream(messages, stop, run_manager, **kwargs):
+            if sent == self.fail_after_tokens:
+                raise _server_error()
+            sent += 1
+            yield chunk
+
+
+def _agent(llm: FakeChatModel) -> DefaultAgent:
+    agent = DefaultAgent(llm=llm)
+    agent.execution_policy = FAST
+    return agent
+
+
+def test_run_with_retry_retries_transient_errors_then_succeeds():
+    attempts = 0
+
+    async def fn():
+        nonlocal attempts
+        attempts += 1
+        if attempts < 3:
+            raise _server_error()
+        return "ok"
+
+    assert asyncio.run(run_with_retry(fn, FAST)) == "ok"
+    assert attempts == 3
+
+
+def test_run_with_retry_does_not_retry_client_errors():
+    attempts = 0
+
+    async def fn():
+        nonlocal attempts
+        attempts += 1
+        raise ValueError("bad request")
+
+    with pytest.raises(ValueError):
+        asyncio.run(run_with_retry(fn, FAST))
+    assert attempts == 1
+
+
+def test_agent_invoke_retries_failing_model():
+    llm = FlakyChatModel(ttft=0, tokens_per_second=0, response_tokens=4, fail_first=2)
+    response = asyncio.run(_agent(llm).invoke("hello"))
+    assert response
+    assert llm.calls == 3
+
+
+def test_hanging_model_raises_deadline_exceeded():
+    agent = _agent(FakeChatModel(ttft=30, response_tokens=1))
+
+    started_at = time.perf_counter()
+    with pytest.raises(DeadlineExceededError):
+        asyncio.run(agent.invoke("hello", deadline=Deadline(0.2)))
+    assert time.perf_counter() - started_at < 1.0
+
+
+def test_deadline_exceeded_maps_to_504(configure):
+    configure(agent_timeout=1, fake_llm_ttft=30)
+
+    async def run():
+        async with AsyncTestClient(app=create_app()) as client:
+            return await client.post("/api/chat", json={"message": "hello"})
+
+    response = asyncio.run(run())
+    assert response.status_code == 504
+
+
+def test_stream_retries_before_first_token():
+    llm = FlakyChatModel(ttft=0, tokens_per_second=0, response_tokens=4, fail_first=1)
+
+    async def run():
+        return [chunk async for chunk in _agent(llm).stream("hello")]
+
+    chunks = asyncio.run(run())
+    assert len(chunks) == 4
+    assert llm.calls == 2
+
+
+def test_stream_does_not_retry_after_first_token():
+    llm = FlakyChatModel(ttft=0, tokens_per_second=0, response_tokens=4, fail_after_tokens=2)
+    chunks = []
+
+    async def run():
+        async for chunk in _agent(llm).stream("hello"):
+            chunks.append(chunk)
+
+    with pytest.raises(openai.InternalServerError):
+        asyncio.run(run())
+    # 이미 보낸 토큰이 다시 전송되지 않도록 재시도하지 않음
+    assert len(chunks) == 2
+    assert llm.calls == 1
+
+
+def test_stream_with_retry_deadline_while_waiting_for_next_item():
+    async def hanging():
+        yield "first"
+        await asyncio.sleep(30)
+        yield "never"
+
+    async def run():
+        chunks = []
+        with pytest.raises(DeadlineExceededError):
+            async for chunk in stream_with_retry(hanging, FAST, Deadline(0.1)):
+                chunks.append(chunk)
+        return chunks
+
+    assert asyncio.run(run()) == ["first"]
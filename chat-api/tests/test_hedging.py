@@ -0,0 +1,141 @@
+"""HedgingExecutor 헤지/페일오버 테스트 (지연/오류를 주입한 가짜 모델 백엔드)"""
+
+import asyncio
+import time
+
+import httpx
+import openai
+import pytest
+
+from src.agents.fake import FakeChatModel
+from src.agents.hedging import MIN_SAMPLES, SWITCH_MARGIN, Backend, HedgingExecutor
+
+
+class TrackingChatModel(FakeChatModel):
+    """호출/취소 수를 세고, client_error면 400으로 실패하는 가짜 모델"""
+    calls: int = 0
+    cancelled: int = 0
+    client_error: bool = False
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        self.calls += 1
+        if self.client_error:
+            response = httpx.Response(400, request=httpx.Request("POST", "https://fake.invalid/v1/chat/completions"))
+            raise openai.BadRequestError("context_length_exceeded", response=response, body=None)
+        try:
+            return await super()._agenerate(messages, stop, run_manager, **kwargs)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+
+
+def _backend(name: str, **options) -> Backend:
+    return Backend(f"fake:{name}", TrackingChatModel(model_name=name, tokens_per_second=0, response_tokens=2, **options))
+
+
+async def _call(llm):
+    return await llm.ainvoke("hello")
+
+
+def _run(executor: HedgingExecutor, backends, **kwargs):
+    async def run():
+        started_at = time.perf_counter()
+        result = await executor.run(backends, _call, **kwargs)
+        await asyncio.sleep(0)  # 취소된 호출이 정리될 때까지
+        return result, time.perf_counter() - started_at
+    return asyncio.run(run())
+
+
+def test_hedge_fires_after_percentile_delay_and_cancels_slower_call():
+    executor = HedgingExecutor(default_delay=5.0, min_delay=0.01)
+    slow, fast = _backend("slow", ttft=5.0), _backend("fast", ttft=0.0)
+    for _ in range(MIN_SAMPLES):
+        executor.backend_stats(slow.name).record_success(0.1)
+        executor.backend_stats(fast.name).record_success(0.1)
+
+    result, elapsed = _run(executor, [slow, fast])
+
+    assert result.response_metadata["model_name"] == "fast"
+    # default_delay(5초)가 아니라 최근 지연 시간 백분위(0.1초)에서 헤지
+    assert 0.1 <= elapsed < 1.0
+    assert (executor.hedges, executor.hedge_wins) == (1, 1)
+    assert slow.llm.cancelled == 1
+    assert fast.llm.cancelled == 0
+
+
+def test_error_fails_over_to_next_backend():
+    executor = HedgingExecutor(hedge=False)
+    broken, healthy = _backend("broken", ttft=0.0, error_rate=1.0), _backend("healthy", ttft=0.0)
+
+    result, _ = _run(executor, [broken, healthy])
+
+    assert result.response_metadata["model_name"] == "healthy"
+    assert executor.failovers == 1
+    assert executor.backend_stats(broken.name).errors == 1
+
+
+def test_client_error_is_raised_without_failover():
+    executor = HedgingExecutor(hedge=False, failure_threshold=1)
+    invalid, fallback = _backend("invalid", client_error=True), _backend("fallback", ttft=0.0)
+
+    with pytest.raises(openai.BadRequestError):
+        _run(executor, [invalid, fallback])
+
+    assert fallback.llm.calls == 0
+    assert executor.failovers == 0
+    stats = executor.backend_stats(invalid.name)
+    assert (stats.errors, stats.consecutive_failures, stats.healthy) == (0, 0, True)
+
+
+def test_rank_prefers_faster_fallback_only_beyond_switch_margin():
+    executor = HedgingExecutor()
+    requested, fallback = _backend("requested"), _backend("fallback")
+    executor.backend_stats(requested.name).ewma = 1.0
+
+    # 요청한 모델보다 SWITCH_MARGIN 이내로만 빠르면 순서 유지
+    executor.backend_stats(fallback.name).ewma = 1.0 / (1 + SWITCH_MARGIN) + 0.01
+    assert executor.rank([requested, fallback])[0] is requested
+
+    executor.backend_stats(fallback.name).ewma = 1.0 / (1 + SWITCH_MARGIN) - 0.01
+    assert executor.rank([requested, fallback])[0] is fallback
+
+
+def test_ewma_tracks_recent_latency():
+    executor = HedgingExecutor(hedge=False)
+    requested, fallback = _backend("requested", ttft=0.15), _backend("fallback", ttft=0.0)
+
+    _run(executor, [requested, fallback])
+    _run(executor, [fallback])
+
+    # 측정한 지연 시간만으로 더 빠른 폴백이 먼저 호출됨
+    assert executor.rank([requested, fallback])[0] is fallback
+
+
+def test_consecutive_failures_quarantine_backend_until_cooldown():
+    executor = HedgingExecutor(hedge=False, failure_threshold=2, cooldown=0.2)
+    broken, healthy = _backend("broken", ttft=0.0, error_rate=1.0), _backend("healthy", ttft=0.0)
+
+    for _ in range(2):
+        with pytest.raises(openai.InternalServerError):
+            _run(executor, [broken], failover=False)
+
+    assert not executor.backend_stats(broken.name).healthy
+    assert executor.rank([broken, healthy])[0] is healthy
+    _run(executor, [broken, healthy])
+    assert broken.llm.calls == 2
+
+    time.sleep(0.25)
+    assert executor.backend_stats(broken.name).healthy
+    assert executor.rank([broken, healthy])[0] is broken
+
+
+def test_hedge_ratio_is_capped():
+    executor = HedgingExecutor(default_delay=0.02, min_delay=0.02, max_hedge_ratio=0.5)
+    slow = _backend("slow", ttft=0.1)
+
+    for _ in range(4):
+        _run(executor, [slow])
+
+    # 모든 호출이 임계값을 넘지만 최근 호출 중 헤지 비율이 0.5 미만일 때만 헤지 (1, 4번째 호출)
+    assert executor.hedges == 2
+    assert slow.llm.calls == 6
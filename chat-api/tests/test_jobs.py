@@ -0,0 +1,212 @@
+"""비동기 작업 API 테스트 (등록/조회, 취소, SSE, 재시작 복구, lease 만료)"""
+
+import asyncio
+import json
+import time
+
+from litestar.testing import AsyncTestClient
+
+from src.agents import DefaultAgent
+from src.agents.fake import FakeChatModel
+from src.app.dependencies import resolve_dependency
+from src.app.main import create_app
+from src.app.services.chat_service import ChatRequest, ChatService
+from src.app.services.job_manager import JobManager
+from src.app.services.job_store import CANCELLED, FAILED, QUEUED, RUNNING, SUCCEEDED, Job, SQLiteJobStore
+from tests.test_disconnect import _track_cancellations
+
+# 작업 상태를 기다리는 최대 시간 (초)
+WAIT_TIMEOUT = 5.0
+
+
+async def _wait_for(read, predicate):
+    """predicate를 만족할 때까지 read() 결과를 다시 읽음"""
+    deadline = time.monotonic() + WAIT_TIMEOUT
+    while True:
+        value = await read()
+        if predicate(value):
+            return value
+        assert time.monotonic() < deadline, f"제한 시간 안에 조건을 만족하지 않음: {value}"
+        await asyncio.sleep(0.01)
+
+
+def _configure_jobs(configure, **settings):
+    env = dict(job_workers=1, fake_llm_ttft=0, fake_llm_tokens_per_second=0, fake_llm_response_tokens=4)
+    env.update(settings)
+    configure(**env)
+
+
+def _manager(path, ttft: float = 0, **kwargs) -> JobManager:
+    agent = DefaultAgent(llm=FakeChatModel(ttft=ttft, tokens_per_second=0, response_tokens=4))
+    return JobManager(ChatService(agent), SQLiteJobStore(path=str(path)), workers=1, **kwargs)
+
+
+def test_jobs_api_is_disabled_by_default(configure):
+    async def run():
+        async with AsyncTestClient(app=create_app()) as client:
+            return await client.post("/api/jobs", json={"message": "hi"})
+
+    assert asyncio.run(run()).status_code == 404
+
+
+def test_submitted_job_is_polled_until_it_succeeds(configure):
+    _configure_jobs(configure)
+
+    async def run():
+        async with AsyncTestClient(app=create_app()) as client:
+            created = await client.post("/api/jobs", json={"message": "hi"}, headers={"X-Tenant-ID": "a"})
+            location = created.headers["location"]
+            finished = await _wait_for(
+                lambda: client.get(location), lambda response: response.json()["status"] == SUCCEEDED
+            )
+            return created, finished.json()
+
+    created, job = asyncio.run(run())
+
+    assert created.status_code == 202
+    assert created.json()["status"] == QUEUED
+    assert created.headers["location"] == f"/api/jobs/{created.json()['id']}"
+    assert job["attempts"] == 1
+    assert job["finished_at"] >= job["created_at"]
+    assert job["response"]["message"]
+    assert job["error"] is None
+
+
+def test_cancel_queued_and_running_jobs(configure, monkeypatch):
+    _configure_jobs(configure, fake_llm_ttft=30)
+    cancelled_calls = _track_cancellations(monkeypatch)
+    app = create_app()
+
+    async def run():
+        async with AsyncTestClient(app=app) as client:
+            manager = await resolve_dependency(app, "job_manager")
+            running = (await client.post("/api/jobs", json={"message": "slow"})).json()["id"]
+            await _wait_for(lambda: manager.get(running), lambda job: job.status == RUNNING)
+            # 워커가 하나뿐이라 두 번째 작업은 대기열에 남음
+            queued = (await client.post("/api/jobs", json={"message": "waiting"})).json()["id"]
+
+            cancelled_queued = await client.delete(f"/api/jobs/{queued}")
+            cancelled_running = await client.delete(f"/api/jobs/{running}")
+            await _wait_for(lambda: asyncio.sleep(0, manager.running), lambda count: count == 0)
+            again = await client.delete(f"/api/jobs/{running}")
+            missing = await client.delete("/api/jobs/unknown")
+            return (
+                cancelled_queued.json(), cancelled_running.json(), again.json(), missing.status_code,
+                (await manager.get(queued)).attempts, manager.stats()
+            )
+
+    queued, running, again, missing, queued_attempts, stats = asyncio.run(run())
+
+    assert queued["status"] == running["status"] == again["status"] == CANCELLED
+    assert queued_attempts == 0  # 대기 중에 취소된 작업은 실행되지 않음
+    assert len(cancelled_calls) == 1  # 실행 중인 작업은 LLM 호출까지 취소
+    assert missing == 404
+    assert stats["cancelled"] == 2
+    assert stats["queue_depth"] == stats["running"] == 0
+
+
+def test_job_events_stream_status_changes_until_finished(configure):
+    _configure_jobs(configure, fake_llm_ttft=0.2)
+
+    async def run():
+        async with AsyncTestClient(app=create_app()) as client:
+            job_id = (await client.post("/api/jobs", json={"message": "hi"})).json()["id"]
+            return await client.get(f"/api/jobs/{job_id}/events"), job_id
+
+    response, job_id = asyncio.run(run())
+    frames = [frame for frame in response.text.split("\n\n") if frame]
+    events = []
+    for frame in frames:
+        event_line, data_line = frame.split("\n")
+        assert event_line.startswith("event: ") and data_line.startswith("data: ")
+        data = json.loads(data_line[len("data: "):])
+        assert data["id"] == job_id
+        assert data["status"] == event_line[len("event: "):]
+        events.append(data)
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    # 구독 시점에 따라 queued는 건너뛸 수 있지만 순서는 유지되고 완료 상태로 끝남
+    statuses = [event["status"] for event in events]
+    assert statuses in ([QUEUED, RUNNING, SUCCEEDED], [RUNNING, SUCCEEDED])
+    assert events[-1]["response"]["message"]
+
+
+def test_sqlite_jobs_resume_after_restart(tmp_path):
+    path = tmp_path / "jobs.db"
+
+    async def run():
+        first = _manager(path, ttft=30)
+        await first.start()
+        job = await first.submit(ChatRequest(message="survives restart"))
+        await _wait_for(lambda: first.get(job.id), lambda current: current.status == RUNNING)
+        # 종료 시 실행 중이던 작업은 queued로 되돌림
+        await first.stop()
+
+        second = _manager(path)
+        await second.start()
+        try:
+            finished = await _wait_for(lambda: second.get(job.id), lambda current: current.finished)
+            return finished, second.stats()
+        finally:
+            await second.stop()
+
+    job, stats = asyncio.run(run())
+
+    assert job.status == SUCCEEDED
+    assert job.attempts == 2
+    assert stats["recovered"] == 1
+
+
+def test_expired_lease_is_taken_over_and_live_lease_is_not(tmp_path):
+    path = tmp_path / "jobs.db"
+
+    async def run():
+        # 다른 프로세스가 실행하다 종료된 작업(lease 만료)과 아직 살아 있는 작업
+        store = SQLiteJobStore(path=str(path))
+        now = time.time()
+        for job_id, owner in (("stale", "crashed"), ("live", "alive")):
+            await store.create(Job(id=job_id, request='{"message":"hi"}', created_at=now, updated_at=now))
+            await store.claim(job_id, owner)
+        store._conn.execute("UPDATE jobs SET updated_at = ? WHERE id = 'stale'", (now - 120,))
+        store._conn.commit()
+        await store.close()
+
+        manager = _manager(path, lease_timeout=60)
+        await manager.start()
+        try:
+            stale = await _wait_for(lambda: manager.get("stale"), lambda job: job.finished)
+            live = await manager.get("live")
+            return stale, live, manager.stats()
+        finally:
+            await manager.stop()
+
+    stale, live, stats = asyncio.run(run())
+
+    assert stale.status == SUCCEEDED
+    assert stale.attempts == 2
+    assert live.status == RUNNING
+    assert live.owner == "alive"
+    assert stats["recovered"] == 1
+
+
+def test_undecodable_request_fails_with_400_instead_of_retrying(tmp_path):
+    path = tmp_path / "jobs.db"
+
+    async def run():
+        store = SQLiteJobStore(path=str(path))
+        now = time.time()
+        await store.create(Job(id="poison", request='{"messag', created_at=now, updated_at=now))
+        await store.close()
+
+        manager = _manager(path)
+        await manager.start()
+        try:
+            return await _wait_for(lambda: manager.get("poison"), lambda job: job.finished)
+        finally:
+            await manager.stop()
+
+    job = asyncio.run(run())
+
+    assert job.status == FAILED
+    assert job.status_code == 400
+    assert job.attempts == 1
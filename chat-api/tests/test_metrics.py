@@ -0,0 +1,85 @@
+"""메트릭 레지스트리와 /metrics 엔드포인트 테스트"""
+
+import asyncio
+import re
+
+import pytest
+from litestar.testing import AsyncTestClient
+
+from src.app.main import create_app
+from src.app.metrics import REGISTRY, Counter, MetricsRegistry
+
+
+def test_register_rejects_duplicate_names():
+    registry = MetricsRegistry()
+    first = registry.counter("requests_total", "요청 수")
+
+    with pytest.raises(ValueError, match="requests_total"):
+        registry.gauge("requests_total", "같은 이름의 다른 메트릭")
+
+    # 같은 메트릭을 다시 등록하는 것은 허용
+    assert registry.register(first) is first
+    assert registry.get("requests_total") is first
+
+
+def test_register_replaces_only_when_asked():
+    registry = MetricsRegistry()
+    registry.gauge("pool_size", "이전 풀", collect=lambda: [({}, 1)])
+
+    replacement = registry.gauge("pool_size", "새 풀", collect=lambda: [({}, 2)], replace=True)
+
+    assert registry.get("pool_size") is replacement
+    assert "pool_size 2" in registry.render()
+
+
+def _parse_histogram(text: str, name: str, labels: str):
+    buckets = [
+        (le, float(value))
+        for le, value in re.findall(rf'^{name}_bucket\{{{labels},le="([^"]+)"\}} (\S+)$', text, re.MULTILINE)
+    ]
+    total = float(re.search(rf"^{name}_sum\{{{labels}\}} (\S+)$", text, re.MULTILINE).group(1))
+    count = float(re.search(rf"^{name}_count\{{{labels}\}} (\S+)$", text, re.MULTILINE).group(1))
+    return buckets, total, count
+
+
+def test_metrics_endpoint_renders_prometheus_text(configure, monkeypatch):
+    configure(llm_backend="fake", fake_llm_ttft=0, fake_llm_tokens_per_second=0)
+    # 테스트용 메트릭이 다른 테스트의 레지스트리에 남지 않도록 복사본에 등록
+    monkeypatch.setattr(REGISTRY, "_metrics", dict(REGISTRY._metrics))
+    REGISTRY.register(Counter(
+        "test_escaped_total", "라벨 이스케이프 확인용", ("value",),
+        collect=lambda: [({"value": 'say "hi"\\n\nnext'}, 3)]
+    ))
+    app = create_app()
+
+    async def run():
+        async with AsyncTestClient(app=app) as client:
+            assert (await client.post("/api/chat", json={"message": "hi"})).status_code == 201
+            return await client.get("/metrics")
+
+    response = asyncio.run(run())
+    text = response.text
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "text/plain; version=0.0.4; charset=utf-8"
+    assert text.endswith("\n")
+
+    # 모든 메트릭은 HELP, TYPE 순서로 한 번씩 선언
+    helps = re.findall(r"^# HELP (\S+) ", text, re.MULTILINE)
+    types = re.findall(r"^# TYPE (\S+) (counter|gauge|histogram)$", text, re.MULTILINE)
+    assert helps == [name for name, _ in types]
+    assert len(helps) == len(set(helps))
+    assert "# HELP chat_requests_total 처리한 HTTP 요청 수" in text
+    assert ("chat_request_duration_seconds", "histogram") in types
+    assert re.search(r'^chat_requests_total\{path="/api/chat",status="201"\} [1-9]', text, re.MULTILINE)
+
+    # 히스토그램: 누적 버킷은 단조 증가하고 +Inf 버킷은 _count와 같음
+    buckets, total, count = _parse_histogram(text, "chat_request_duration_seconds", 'path="/api/chat"')
+    assert buckets[-1][0] == "+Inf"
+    values = [value for _, value in buckets]
+    assert values == sorted(values)
+    assert values[-1] == count >= 1
+    assert total > 0
+
+    # 라벨 값의 역슬래시, 큰따옴표, 줄바꿈 이스케이프
+    assert 'test_escaped_total{value="say \\"hi\\"\\\\n\\nnext"} 3' in text
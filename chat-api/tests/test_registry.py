@@ -0,0 +1,32 @@
+"""LLM 클라이언트 레지스트리 테스트"""
+
+from src.agents import registry
+
+
+def _get(model: str = "fake", temperature: float = 0.7):
+    return registry.get_chat_model(model, temperature, None, "sk-test", backend="fake", ttft=0.0)
+
+
+def test_chat_model_cache_is_bounded(configure):
+    configure()
+    first = _get(temperature=0.0)
+    for i in range(registry.CHAT_MODEL_CACHE_SIZE + 10):
+        _get(model=f"fake-{i}")
+
+    assert len(registry._chat_models) == registry.CHAT_MODEL_CACHE_SIZE
+    # 가장 오래 쓰지 않은 클라이언트부터 제거되어 다시 요청하면 새로 생성
+    assert _get(temperature=0.0) is not first
+
+
+def test_recently_used_chat_model_is_kept(configure):
+    configure()
+    kept = _get(temperature=0.0)
+    for i in range(registry.CHAT_MODEL_CACHE_SIZE + 10):
+        assert _get(temperature=0.0) is kept
+        _get(model=f"fake-{i}")
+
+
+def test_temperature_is_quantized(configure):
+    configure()
+    assert _get(temperature=0.7) is _get(temperature=0.70000001)
+    assert _get(temperature=0.7) is not _get(temperature=0.71)
@@ -0,0 +1,50 @@
+"""응답 캐시 키 테스트"""
+
+import asyncio
+
+from src.agents import ChatMessage, DefaultAgent
+from src.agents.fake import FakeChatModel
+from src.app.services.chat_service import ChatRequest, ChatService
+from src.app.services.response_cache import InMemoryCacheBackend, ResponseCache, build_cache_key
+
+
+def _key(history=None, prefix=""):
+    return build_cache_key("gpt-4o-mini", 0.7, None, "hi", history, prefix=prefix)
+
+
+def test_key_includes_prompt_prefix():
+    assert _key(prefix="a") != _key(prefix="b")
+    assert _key(prefix="a") == _key(prefix="a")
+
+
+def test_key_keeps_system_message_position_in_history():
+    system = ChatMessage(role="system", content="answer in korean")
+    user = ChatMessage(role="user", content="question")
+    assistant = ChatMessage(role="assistant", content="answer")
+
+    assert _key([system, user, assistant]) != _key([user, assistant, system])
+    assert _key([user, system, assistant]) != _key([user, assistant, system])
+
+
+def test_agents_with_different_system_prompts_do_not_share_cached_responses(configure):
+    cache = ResponseCache(InMemoryCacheBackend())
+
+    def agent(system_prompt: str) -> DefaultAgent:
+        configure(agent_system_prompt=system_prompt)
+        return DefaultAgent(llm=FakeChatModel(ttft=0, tokens_per_second=0, response_tokens=4))
+
+    pirate_agent, butler_agent = agent("You are a pirate."), agent("You are a butler.")
+    assert pirate_agent.prompt.prefix_hash != butler_agent.prompt.prefix_hash
+    pirate = ChatService(pirate_agent, response_cache=cache)
+    butler = ChatService(butler_agent, response_cache=cache)
+
+    async def run():
+        first = await pirate.send_message(ChatRequest(message="hello"))
+        second = await butler.send_message(ChatRequest(message="hello"))
+        again = await pirate.send_message(ChatRequest(message="hello"))
+        return first, second, again
+
+    first, second, again = asyncio.run(run())
+    assert not first.cached
+    assert not second.cached
+    assert again.cached
@@ -0,0 +1,205 @@
+"""업스트림 스케줄러 테스트 (우선순위, 테넌트 라운드로빈, 응답 헤더 보정, 429, 사용량 정산)"""
+
+import asyncio
+from types import SimpleNamespace
+
+import openai
+import pytest
+from langchain_core.messages import AIMessage
+
+from src.agents import DefaultAgent, scheduler
+from src.agents.fake import FakeChatModel
+from src.agents.scheduler import UpstreamScheduler, get_scheduler, parse_model_limits
+
+MODEL = "fake"
+
+
+class Clock:
+    """스케줄러 버킷이 보는 monotonic 시계 (테스트가 직접 진행)"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = Clock()
+    monkeypatch.setattr(scheduler, "time", SimpleNamespace(monotonic=fake.monotonic))
+    return fake
+
+
+def _drain(upstream: UpstreamScheduler) -> None:
+    """응답 헤더로 모델 요청 버킷을 비워 이후 호출이 대기열에 들어가게 함"""
+    upstream.update_from_headers(MODEL, {"x-ratelimit-remaining-requests": "0"})
+
+
+async def _grant_order(upstream: UpstreamScheduler, calls):
+    """(이름, 우선순위, 테넌트) 순서로 대기열에 넣고 허가된 순서 반환"""
+    granted = []
+
+    async def call(name, priority, tenant):
+        await upstream.acquire(MODEL, 1, priority, tenant)
+        granted.append(name)
+
+    tasks = []
+    for name, priority, tenant in calls:
+        tasks.append(asyncio.create_task(call(name, priority, tenant)))
+        await asyncio.sleep(0)  # 도착 순서 고정
+    await asyncio.wait_for(asyncio.gather(*tasks), 5)
+    return granted
+
+
+def test_parse_model_limits():
+    assert parse_model_limits(" gpt-4o=500/30000, ,gpt-4o-mini=5000/200000") == {
+        "gpt-4o": (500, 30000),
+        "gpt-4o-mini": (5000, 200000),
+    }
+    assert parse_model_limits("") == {}
+    with pytest.raises(ValueError, match="gpt-4o=500"):
+        parse_model_limits("gpt-4o=500")
+
+
+def test_model_limits_from_settings_override_defaults(configure, clock):
+    configure(llm_scheduler_enabled=True, llm_scheduler_rpm=100, llm_scheduler_model_limits="fake=600/50000")
+    upstream = get_scheduler()
+
+    asyncio.run(upstream.acquire(MODEL, 1))
+    asyncio.run(upstream.acquire("other", 1))
+
+    buckets = upstream.buckets()
+    assert buckets[MODEL]["requests"] == {"capacity": 600, "available": 599}
+    assert buckets[MODEL]["tokens"]["capacity"] == 50000
+    assert buckets["other"] == {"requests": {"capacity": 100, "available": 99}}
+
+
+def test_interactive_calls_are_granted_before_batch():
+    # 600 RPM: 대기 중인 호출은 0.1초마다 하나씩 허가
+    upstream = UpstreamScheduler(rpm=600)
+
+    async def run():
+        _drain(upstream)
+        return await _grant_order(upstream, [
+            ("batch", "batch", "a"),
+            ("standard", "standard", "a"),
+            ("interactive", "interactive", "a"),
+        ])
+
+    assert asyncio.run(run()) == ["interactive", "standard", "batch"]
+
+
+def test_tenants_are_served_round_robin_within_a_priority():
+    upstream = UpstreamScheduler(rpm=600)
+
+    async def run():
+        _drain(upstream)
+        return await _grant_order(upstream, [
+            ("a1", "standard", "a"),
+            ("a2", "standard", "a"),
+            ("a3", "standard", "a"),
+            ("b1", "standard", "b"),
+            ("c1", "standard", "c"),
+        ])
+
+    # 먼저 온 테넌트가 몰아서 보내도 다른 테넌트가 한 번씩 끼어듦
+    assert asyncio.run(run()) == ["a1", "b1", "c1", "a2", "a3"]
+
+
+def test_rate_limit_headers_shrink_the_bucket(clock):
+    upstream = UpstreamScheduler(rpm=600, tpm=100000)
+
+    upstream.update_from_headers(MODEL, {
+        "X-RateLimit-Remaining-Requests": "5",
+        "x-ratelimit-remaining-tokens": "2000",
+        "x-ratelimit-reset-requests": "59.5s",
+    })
+    assert upstream.buckets()[MODEL] == {
+        "requests": {"capacity": 600, "available": 5},
+        "tokens": {"capacity": 100000, "available": 2000},
+    }
+
+    # 다른 프로세스와 한도를 공유할 수 있으므로 잔량이 더 많다고 알려줘도 올리지 않음
+    upstream.update_from_headers(MODEL, {"x-ratelimit-remaining-requests": "500"})
+    assert upstream.buckets()[MODEL]["requests"]["available"] == 5
+
+    # 한도 헤더로 용량을 알게 되고 시간이 지나면 연속 충전
+    upstream.update_from_headers(MODEL, {"x-ratelimit-limit-requests": "1200"})
+    clock.now += 1
+    assert upstream.buckets()[MODEL]["requests"] == {"capacity": 1200, "available": 25}
+
+
+def test_fake_model_headers_teach_an_unlimited_scheduler(configure, clock):
+    configure(
+        llm_scheduler_enabled=True, fake_llm_rpm=600, fake_llm_tpm=100000,
+        fake_llm_ttft=0, fake_llm_tokens_per_second=0, fake_llm_response_tokens=4
+    )
+    agent = DefaultAgent()
+    assert agent.scheduler.buckets() == {}
+
+    asyncio.run(agent.invoke("hi"))
+
+    bucket = agent.scheduler.buckets()["gpt-4o-mini"]
+    assert bucket["requests"] == {"capacity": 600, "available": 599}
+    assert bucket["tokens"]["capacity"] == 100000
+    assert bucket["tokens"]["available"] < 100000
+
+
+def test_upstream_429_pauses_the_model():
+    upstream = UpstreamScheduler()
+    llm = FakeChatModel(ttft=0, tokens_per_second=0, response_tokens=1, rpm=1)
+
+    async def call():
+        async with upstream.permit(MODEL, 10) as permit:
+            permit.settle(await llm.ainvoke("hi"))
+
+    async def run():
+        # 같은 키를 쓰는 다른 프로세스가 한도를 먼저 써버린 상황
+        await llm.ainvoke("hi")
+        with pytest.raises(openai.RateLimitError):
+            await call()
+        # 429의 retry-after-ms 동안(약 60초) 같은 모델 호출은 허가되지 않음
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(upstream.acquire(MODEL, 10), 0.2)
+        # 다른 모델은 영향 없음
+        await asyncio.wait_for(upstream.acquire("other", 10), 0.2)
+
+    asyncio.run(run())
+    stats = upstream.stats()
+    assert stats["rate_limited"] == 1
+    assert stats["queued"] == {"interactive": 0, "standard": 0, "batch": 0}
+    assert stats["buckets"][MODEL]["requests"] == {"capacity": 1, "available": 0}
+
+
+def test_settle_refunds_unused_tokens(clock):
+    upstream = UpstreamScheduler(tpm=10000, tenant_tpm=5000)
+    llm = FakeChatModel(ttft=0, tokens_per_second=0, response_tokens=4)
+
+    async def run():
+        async with upstream.permit(MODEL, 1000, tenant="a") as permit:
+            assert upstream.buckets()[MODEL]["tokens"]["available"] == 9000
+            response = await llm.ainvoke("hi")
+            permit.settle(response)
+        return response.usage_metadata["total_tokens"]
+
+    used = asyncio.run(run())
+    assert upstream.buckets()[MODEL]["tokens"]["available"] == 10000 - used
+    assert upstream._tenant("a").tokens.available() == 5000 - used
+
+
+def test_settle_charges_usage_above_the_estimate(clock):
+    upstream = UpstreamScheduler(tpm=10000)
+
+    async def run():
+        async with upstream.permit(MODEL, 100) as permit:
+            permit.settle(AIMessage(content="", usage_metadata={
+                "input_tokens": 1000, "output_tokens": 500, "total_tokens": 1500
+            }))
+            # 중복 정산은 무시
+            permit.settle(AIMessage(content="", usage_metadata={
+                "input_tokens": 0, "output_tokens": 0, "total_tokens": 0
+            }))
+
+    asyncio.run(run())
+    assert upstream.buckets()[MODEL]["tokens"]["available"] == 8500
@@ -0,0 +1,147 @@
+"""의미 캐시 벡터 인덱스와 임베더 설정 테스트"""
+
+import asyncio
+import time
+
+import pytest
+from litestar.testing import AsyncTestClient
+
+# 의미 캐시는 numpy가 설치된 경우에만 동작 (선택 의존성)
+np = pytest.importorskip("numpy")
+
+from src.app.main import create_app  # noqa: E402
+from src.app.services.semantic_cache import HashEmbedder, VectorIndex  # noqa: E402
+
+DIM = 8
+
+
+def _vector(i: int) -> np.ndarray:
+    vector = np.zeros(DIM, dtype=np.float32)
+    vector[i] = 1.0
+    return vector
+
+
+def test_search_returns_nearest_entry_above_threshold():
+    index = VectorIndex(DIM, max_size=4)
+    index.add("ns", _vector(0), "zero", ttl=60)
+    index.add("ns", _vector(1), "one", ttl=60)
+
+    assert index.search("ns", _vector(1), threshold=0.9) == ("one", 1.0)
+    assert index.search("ns", _vector(2), threshold=0.9) is None
+
+
+def test_expired_entries_are_not_returned_and_slots_are_reused(monkeypatch):
+    index = VectorIndex(DIM, max_size=2)
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now)
+    index.add("ns", _vector(0), "short", ttl=1)
+    index.add("ns", _vector(1), "long", ttl=60)
+
+    monkeypatch.setattr(time, "time", lambda: now + 2)
+    assert index.search("ns", _vector(0), threshold=0.9) is None
+    assert index.size() == 1
+
+    # 만료된 슬롯을 먼저 재사용하므로 유효한 항목은 유지
+    index.add("ns", _vector(2), "new", ttl=60)
+    assert index.search("ns", _vector(1), threshold=0.9) == ("long", 1.0)
+    assert index.search("ns", _vector(2), threshold=0.9) == ("new", 1.0)
+
+
+def test_full_index_replaces_least_recently_used(monkeypatch):
+    index = VectorIndex(DIM, max_size=2)
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now)
+    index.add("ns", _vector(0), "zero", ttl=60)
+    monkeypatch.setattr(time, "time", lambda: now + 1)
+    index.add("ns", _vector(1), "one", ttl=60)
+
+    # 조회하면 최근 사용 시각이 갱신되어 교체 대상에서 빠짐
+    monkeypatch.setattr(time, "time", lambda: now + 2)
+    assert index.search("ns", _vector(0), threshold=0.9) is not None
+    monkeypatch.setattr(time, "time", lambda: now + 3)
+    index.add("ns", _vector(2), "two", ttl=60)
+
+    assert index.search("ns", _vector(0), threshold=0.9) == ("zero", 1.0)
+    assert index.search("ns", _vector(1), threshold=0.9) is None
+    assert index.search("ns", _vector(2), threshold=0.9) == ("two", 1.0)
+
+
+def test_namespaces_are_isolated():
+    index = VectorIndex(DIM, max_size=4)
+    index.add("gpt-4o", _vector(0), "from gpt-4o", ttl=60)
+
+    assert index.search("gpt-4o-mini", _vector(0), threshold=0.9) is None
+    index.add("gpt-4o-mini", _vector(0), "from gpt-4o-mini", ttl=60)
+    assert index.search("gpt-4o", _vector(0), threshold=0.9) == ("from gpt-4o", 1.0)
+    assert index.search("gpt-4o-mini", _vector(0), threshold=0.9) == ("from gpt-4o-mini", 1.0)
+
+
+def test_mmap_index_reloads_saved_entries(tmp_path):
+    path = tmp_path / "index" / "vectors.npy"
+    index = VectorIndex(DIM, max_size=4, path=str(path))
+    index.add("ns", _vector(0), "kept", ttl=60)
+    index.add("other", _vector(1), "other", ttl=60)
+    index.add("ns", _vector(2), "expired", ttl=-1)
+    index.save()
+    del index
+
+    reloaded = VectorIndex(DIM, max_size=4, path=str(path))
+    assert reloaded.size() == 2
+    assert reloaded.search("ns", _vector(0), threshold=0.9) == ("kept", 1.0)
+    assert reloaded.search("other", _vector(1), threshold=0.9) == ("other", 1.0)
+    assert reloaded.search("ns", _vector(2), threshold=0.9) is None
+
+
+def test_mmap_index_with_different_shape_starts_empty(tmp_path):
+    path = tmp_path / "vectors.npy"
+    index = VectorIndex(DIM, max_size=4, path=str(path))
+    index.add("ns", _vector(0), "old", ttl=60)
+    index.save()
+    del index
+
+    resized = VectorIndex(DIM, max_size=8, path=str(path))
+    assert resized.size() == 0
+    assert resized.search("ns", _vector(0), threshold=0.0) is None
+
+
+def test_hash_embedder_ignores_word_order():
+    embedder = HashEmbedder(dim=512)
+
+    async def similarity():
+        a = await embedder.embed("convert 100 usd to eur")
+        b = await embedder.embed("convert 100 eur to usd")
+        return float(a @ b)
+
+    # 운영 환경에서 hash 임베더를 거부하는 이유
+    assert asyncio.run(similarity()) == pytest.approx(1.0)
+
+
+@pytest.mark.parametrize("env", [
+    {"semantic_cache_enabled": "true"},
+    {"semantic_cache_enabled": "true", "semantic_cache_embedder": "hash", "llm_backend": "openai"},
+])
+def test_app_refuses_to_start_with_unsafe_embedder(configure, env):
+    configure(**env)
+
+    async def run():
+        async with AsyncTestClient(app=create_app()):
+            pass
+
+    # lifespan 오류는 ExceptionGroup으로 감싸져 전달됨
+    with pytest.raises(BaseExceptionGroup) as exc_info:
+        asyncio.run(run())
+    assert exc_info.group_contains(ValueError, depth=None)
+
+
+def test_hash_embedder_is_allowed_with_fake_backend(configure):
+    configure(semantic_cache_enabled="true", semantic_cache_embedder="hash")
+
+    async def run():
+        async with AsyncTestClient(app=create_app()) as client:
+            first = await client.post("/api/chat", json={"message": "What is the capital of France?"})
+            second = await client.post("/api/chat", json={"message": "what is the capital of france"})
+            return first.json(), second.json()
+
+    first, second = asyncio.run(run())
+    assert second["metadata"]["cached"] is True
+    assert second["message"] == first["message"]
@@ -0,0 +1,153 @@
+"""SingleFlight 요청 coalescing 테스트"""
+
+import asyncio
+
+import pytest
+
+from src.agents import DefaultAgent
+from src.agents.fake import FakeChatModel
+from src.app.services.chat_service import ChatRequest, ChatService
+from src.app.services.single_flight import SingleFlight
+
+
+class CountingChatModel(FakeChatModel):
+    """업스트림 호출 수를 세는 가짜 모델"""
+    calls: int = 0
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        self.calls += 1
+        return await super()._agenerate(messages, stop, run_manager, **kwargs)
+
+
+def test_concurrent_identical_invokes_share_one_upstream_call():
+    llm = CountingChatModel(ttft=0.1, tokens_per_second=0, response_tokens=4)
+    single_flight = SingleFlight()
+    service = ChatService(DefaultAgent(llm=llm), single_flight=single_flight)
+
+    async def run():
+        return await asyncio.gather(*(service.send_message(ChatRequest(message="same")) for _ in range(10)))
+
+    responses = asyncio.run(run())
+
+    assert llm.calls == 1
+    assert len({response.message for response in responses}) == 1
+    assert single_flight.stats() == {"in_flight": 0, "upstream_calls": 1, "saved_calls": 9}
+
+
+def test_do_runs_again_after_completion():
+    single_flight = SingleFlight()
+    calls = 0
+
+    async def fn():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return calls
+
+    async def run():
+        first = await asyncio.gather(single_flight.do("k", fn), single_flight.do("k", fn))
+        second = await single_flight.do("k", fn)
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first == [1, 1]
+    assert second == 2
+    assert (single_flight.upstream_calls, single_flight.saved_calls) == (2, 1)
+
+
+def test_leader_error_propagates_to_all_waiters():
+    single_flight = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("upstream down")
+
+    async def run():
+        return await asyncio.gather(*(single_flight.do("k", fail) for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, RuntimeError) and str(result) == "upstream down" for result in results)
+    assert (single_flight.upstream_calls, single_flight.saved_calls) == (1, 2)
+
+
+def test_cancelled_waiter_does_not_cancel_shared_call():
+    single_flight = SingleFlight()
+
+    async def fn():
+        await asyncio.sleep(0.05)
+        return "done"
+
+    async def run():
+        leader = asyncio.create_task(single_flight.do("k", fn))
+        follower = asyncio.create_task(single_flight.do("k", fn))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        return await follower
+
+    assert asyncio.run(run()) == "done"
+
+
+def test_late_stream_joiner_receives_missed_chunks():
+    single_flight = SingleFlight()
+    upstream_started = 0
+
+    async def source():
+        nonlocal upstream_started
+        upstream_started += 1
+        for i in range(5):
+            await asyncio.sleep(0.02)
+            yield f"c{i}"
+
+    async def collect(delay: float):
+        await asyncio.sleep(delay)
+        return [chunk async for chunk in single_flight.stream("k", source)]
+
+    async def run():
+        # 늦은 구독자는 앞선 청크 3개쯤 지나서 합류
+        return await asyncio.gather(collect(0), collect(0.07))
+
+    early, late = asyncio.run(run())
+    assert early == late == ["c0", "c1", "c2", "c3", "c4"]
+    assert upstream_started == 1
+    assert (single_flight.upstream_calls, single_flight.saved_calls) == (1, 1)
+
+
+def test_stream_error_propagates_to_all_subscribers():
+    single_flight = SingleFlight()
+
+    async def source():
+        yield "partial"
+        await asyncio.sleep(0.02)
+        raise RuntimeError("stream broke")
+
+    async def collect():
+        chunks = []
+        with pytest.raises(RuntimeError, match="stream broke"):
+            async for chunk in single_flight.stream("k", source):
+                chunks.append(chunk)
+        return chunks
+
+    async def run():
+        return await asyncio.gather(collect(), collect())
+
+    assert asyncio.run(run()) == [["partial"], ["partial"]]
+
+
+def test_requests_from_different_tenants_or_priorities_are_not_coalesced():
+    llm = CountingChatModel(ttft=0.1, tokens_per_second=0, response_tokens=4)
+    single_flight = SingleFlight()
+    service = ChatService(DefaultAgent(llm=llm), single_flight=single_flight)
+    requests = [
+        ChatRequest(message="same", tenant="a"),
+        ChatRequest(message="same", tenant="a"),
+        ChatRequest(message="same", tenant="b"),
+        ChatRequest(message="same", tenant="a", priority="batch"),
+    ]
+
+    async def run():
+        return await asyncio.gather(*(service.send_message(request) for request in requests))
+
+    asyncio.run(run())
+
+    assert llm.calls == 3
+    assert single_flight.stats() == {"in_flight": 0, "upstream_calls": 3, "saved_calls": 1}
@@ -0,0 +1,88 @@
+"""StreamRegistry 테스트"""
+
+import asyncio
+
+import pytest
+from litestar.testing import AsyncTestClient
+
+from src.app.dependencies import resolve_dependency
+from src.app.main import create_app
+from src.app.services.concurrency import OverloadedError
+from src.app.services.stream_registry import StreamRegistry
+
+
+async def _slow_source():
+    for _ in range(100):
+        await asyncio.sleep(0.05)
+        yield "x"
+
+
+async def _short_source():
+    yield "x"
+
+
+def test_start_rejects_when_all_streams_are_active():
+    registry = StreamRegistry(max_streams=2, grace_period=10, retry_after=7)
+
+    async def run():
+        streams = [registry.start(_slow_source()) for _ in range(2)]
+        try:
+            with pytest.raises(OverloadedError) as exc_info:
+                registry.start(_slow_source())
+            return exc_info.value, registry.stats()
+        finally:
+            for stream in streams:
+                stream.cancel()
+            await asyncio.sleep(0)
+
+    error, stats = asyncio.run(run())
+    assert error.status_code == 503
+    assert error.retry_after == 7
+    assert stats["streams"] == 2
+
+
+def test_start_evicts_finished_streams():
+    registry = StreamRegistry(max_streams=1)
+
+    async def run():
+        finished = registry.start(_short_source())
+        await asyncio.sleep(0.01)
+        assert finished.done
+        active = registry.start(_slow_source())
+        active.cancel()
+        await asyncio.sleep(0)
+        return finished
+
+    finished = asyncio.run(run())
+    assert registry.stats()["streams"] == 1
+    with pytest.raises(Exception):
+        registry.get(finished.id)
+
+
+def test_stream_resume_is_disabled_by_default(configure):
+    async def run():
+        async with AsyncTestClient(app=create_app()) as client:
+            return await client.post("/api/chat/stream", json={"message": "hi"})
+
+    response = asyncio.run(run())
+    assert response.status_code == 201
+    assert "x-stream-id" not in response.headers
+
+
+def test_full_registry_returns_503(configure):
+    configure(stream_resume_enabled="true", stream_resume_max_streams=1)
+
+    async def run():
+        app = create_app()
+        async with AsyncTestClient(app=app) as client:
+            # 테스트 클라이언트는 요청을 하나씩 처리하므로 진행 중인 스트림은 레지스트리에 직접 등록
+            registry = await resolve_dependency(app, "stream_registry")
+            active = registry.start(_slow_source())
+            try:
+                return await client.post("/api/chat/stream", json={"message": "hi"})
+            finally:
+                active.cancel()
+
+    response = asyncio.run(run())
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "5"
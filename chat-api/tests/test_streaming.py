@@ -0,0 +1,180 @@
+"""SSE 인코더 테스트 (프레임 바이트, coalescing, heartbeat, 이벤트 id)"""
+
+import asyncio
+import json
+
+import pytest
+
+from src.app.streaming import HEARTBEAT, SSEEncoder
+
+# 테스트가 멈추지 않도록 프레임 하나를 기다리는 최대 시간 (초)
+FRAME_TIMEOUT = 2.0
+
+
+def _frame(content: str, event_id=None, is_final: bool = False) -> bytes:
+    data = json.dumps({"content": content, "is_final": is_final}, ensure_ascii=False, separators=(",", ":"))
+    prefix = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{prefix}data: {data}\n\n".encode()
+
+
+class Source:
+    """테스트가 조각을 밀어 넣는 업스트림 스트림 (큐가 비면 다음 조각이나 종료를 기다림)"""
+
+    _CLOSE = object()
+
+    def __init__(self):
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self.cancelled = False
+
+    def push(self, *chunks: str) -> None:
+        for chunk in chunks:
+            self._queue.put_nowait(chunk)
+
+    def fail(self, error: Exception) -> None:
+        self._queue.put_nowait(error)
+
+    def close(self) -> None:
+        self._queue.put_nowait(self._CLOSE)
+
+    async def __aiter__(self):
+        try:
+            while True:
+                item = await self._queue.get()
+                if item is self._CLOSE:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+
+
+async def _next(frames) -> bytes:
+    return await asyncio.wait_for(anext(frames), FRAME_TIMEOUT)
+
+
+async def _rest(frames) -> list:
+    return [frame async for frame in frames]
+
+
+def test_frame_bytes_match_stream_chunk_json():
+    assert SSEEncoder.frame('say "hi"\n안녕', event_id=3) == (
+        b'id: 3\ndata: {"content":"say \\"hi\\"\\n\xec\x95\x88\xeb\x85\x95","is_final":false}\n\n'
+    )
+    assert SSEEncoder.frame("", is_final=True) == b'data: {"content":"","is_final":true}\n\n'
+    # 미리 계산한 접두사 범위를 넘는 id
+    assert SSEEncoder.frame("x", event_id=5000) == _frame("x", 5000)
+
+
+def test_unbuffered_stream_numbers_events_from_start_id():
+    async def run(encoder, start_id=0):
+        async def chunks():
+            for chunk in ("a", "", "b"):
+                yield chunk
+        return await _rest(encoder.stream(chunks(), start_id=start_id))
+
+    assert asyncio.run(run(SSEEncoder())) == [_frame("a", 1), _frame("b", 2), _frame("", 3, is_final=True)]
+    # 이어받기: Last-Event-ID 다음 순번부터
+    assert asyncio.run(run(SSEEncoder(), start_id=2046)) == [
+        _frame("a", 2047), _frame("b", 2048), _frame("", 2049, is_final=True)
+    ]
+    assert asyncio.run(run(SSEEncoder(event_ids=False))) == [_frame("a"), _frame("b"), _frame("", is_final=True)]
+
+
+def test_coalescing_window_merges_chunks_into_one_frame():
+    encoder = SSEEncoder(coalesce_interval=0.05)
+
+    async def run():
+        source = Source()
+        frames = encoder.stream(source, start_id=10)
+        pending = asyncio.ensure_future(anext(frames))
+        source.push("a")
+        # 창(0.05초) 안에 도착한 조각은 같은 프레임에 합쳐짐
+        await asyncio.sleep(0.01)
+        assert not pending.done()
+        source.push("b", "c")
+        first = await asyncio.wait_for(pending, FRAME_TIMEOUT)
+        source.push("d")
+        second = await _next(frames)
+        source.close()
+        return [first, second] + await _rest(frames)
+
+    # 이벤트 id는 프레임에 담긴 마지막 조각의 순번
+    assert asyncio.run(run()) == [_frame("abc", 13), _frame("d", 14), _frame("", 15, is_final=True)]
+
+
+def test_coalesce_chars_flushes_without_waiting_for_the_window():
+    encoder = SSEEncoder(coalesce_interval=60, coalesce_chars=4)
+
+    async def run():
+        source = Source()
+        frames = encoder.stream(source)
+        source.push("ab", "cd")
+        first = await _next(frames)
+        source.push("e")
+        source.close()
+        return [first] + await asyncio.wait_for(_rest(frames), FRAME_TIMEOUT)
+
+    assert asyncio.run(run()) == [_frame("abcd", 2), _frame("e", 3), _frame("", 4, is_final=True)]
+
+
+def test_buffer_is_flushed_on_close_before_final_frame():
+    encoder = SSEEncoder(coalesce_interval=60)
+
+    async def run():
+        source = Source()
+        source.push("a", "b")
+        source.close()
+        return await asyncio.wait_for(_rest(encoder.stream(source)), FRAME_TIMEOUT)
+
+    assert asyncio.run(run()) == [_frame("ab", 2), _frame("", 3, is_final=True)]
+
+
+def test_buffer_is_flushed_before_upstream_error():
+    encoder = SSEEncoder(coalesce_interval=60)
+
+    async def run():
+        source = Source()
+        frames = encoder.stream(source)
+        source.push("partial")
+        source.fail(RuntimeError("upstream failed"))
+        first = await _next(frames)
+        with pytest.raises(RuntimeError, match="upstream failed"):
+            await _next(frames)
+        return first
+
+    assert asyncio.run(run()) == _frame("partial", 1)
+
+
+def test_heartbeat_is_sent_while_idle_and_does_not_use_event_ids():
+    encoder = SSEEncoder(heartbeat_interval=0.02)
+
+    async def run():
+        source = Source()
+        frames = encoder.stream(source)
+        idle = [await _next(frames), await _next(frames)]
+        source.push("a")
+        data = await _next(frames)
+        source.close()
+        return idle, data, await _rest(frames)
+
+    idle, data, rest = asyncio.run(run())
+    assert idle == [HEARTBEAT, HEARTBEAT] == [b": keep-alive\n\n"] * 2
+    assert data == _frame("a", 1)
+    assert rest == [_frame("", 2, is_final=True)]
+
+
+def test_closing_the_stream_cancels_the_upstream():
+    encoder = SSEEncoder(coalesce_chars=1)
+
+    async def run():
+        source = Source()
+        frames = encoder.stream(source)
+        source.push("a")
+        first = await _next(frames)
+        # 클라이언트 연결 종료 시 Litestar가 응답 제너레이터를 닫음
+        await frames.aclose()
+        return first, source.cancelled
+
+    assert asyncio.run(run()) == (_frame("a", 1), True)